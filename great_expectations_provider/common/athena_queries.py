@@ -0,0 +1,145 @@
+"""
+Record the data scanned and the execution time of the Athena queries of a validation run.
+
+Athena bills by the bytes a query scans, and most of a validation's time against Athena
+is spent queueing and running its metric queries. PyAthena cursors keep the statistics
+of the query they last ran, so a SQLAlchemy `after_cursor_execute` listener, added to
+every engine once on first use, records them for the trackers registered in the current
+context. Queries of other databases are ignored.
+
+Queries served from Athena's query result reuse scan no data; they are counted as
+reused, so a configured `result_reuse_minutes` can be checked to take effect.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, ContextManager, Iterator
+
+from great_expectations_provider.common.metrics import emit_incr, emit_timing
+
+ATHENA_QUERIES_KEY = "athena_queries"
+# the queries reported one by one, the slowest first
+MAX_REPORTED_QUERIES = 50
+_MAX_STATEMENT_CHARS = 200
+
+_active_trackers: ContextVar[tuple[AthenaQueryTracker, ...]] = ContextVar(
+    "gx_athena_query_trackers", default=()
+)
+_install_lock = threading.Lock()
+_installed = False
+
+
+def query_statistics(cursor: Any, statement: str) -> dict[str, Any] | None:
+    """Statistics of the query `cursor` last ran, or None if it is not a PyAthena cursor."""
+    query_id = getattr(cursor, "query_id", None)
+    if not isinstance(query_id, str):
+        return None
+    return {
+        "query_id": query_id,
+        "statement": statement[:_MAX_STATEMENT_CHARS],
+        "data_scanned_bytes": getattr(cursor, "data_scanned_in_bytes", None) or 0,
+        "engine_execution_ms": getattr(cursor, "engine_execution_time_in_millis", None)
+        or 0,
+        "total_execution_ms": getattr(cursor, "total_execution_time_in_millis", None)
+        or 0,
+        "reused": bool(getattr(cursor, "reused_previous_result", False)),
+    }
+
+
+class AthenaQueryTracker:
+    """Record the statistics of the Athena queries run in a block.
+
+    When disabled every method is a no-op, so operators can use the tracker unconditionally.
+
+    Args:
+        enabled: whether to record queries.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.queries: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statistics: dict[str, Any]) -> None:
+        """Record the statistics of one query."""
+        with self._lock:
+            self.queries.append(statistics)
+
+    @contextmanager
+    def _track(self) -> Iterator[None]:
+        _install()
+        token = _active_trackers.set((*_active_trackers.get(), self))
+        try:
+            yield
+        finally:
+            _active_trackers.reset(token)
+
+    def track(self) -> ContextManager[None]:
+        """Record the Athena queries run in the enclosed block."""
+        if not self.enabled:
+            return nullcontext()
+        return self._track()
+
+    def report(self) -> dict[str, Any] | None:
+        """Query count, data scanned, and execution time in total and per query, or None when disabled."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            queries = sorted(
+                self.queries, key=lambda query: -query["total_execution_ms"]
+            )
+        return {
+            "queries": len(queries),
+            "reused": sum(query["reused"] for query in queries),
+            "data_scanned_bytes": sum(query["data_scanned_bytes"] for query in queries),
+            "engine_execution_ms": sum(
+                query["engine_execution_ms"] for query in queries
+            ),
+            "total_execution_ms": sum(query["total_execution_ms"] for query in queries),
+            "slowest_queries": queries[:MAX_REPORTED_QUERIES],
+        }
+
+    def emit_metrics(self, task_id: str) -> None:
+        """Emit the query count, data scanned, and execution time as `gx.athena.*` metrics tagged with the task ID."""
+        report = self.report()
+        if report is None:
+            return
+        tags = {"task_id": task_id}
+        emit_incr("athena.queries", report["queries"], tags=tags)
+        emit_incr("athena.reused_queries", report["reused"], tags=tags)
+        emit_incr("athena.data_scanned_bytes", report["data_scanned_bytes"], tags=tags)
+        emit_timing(
+            "athena.execution_time", report["total_execution_ms"] / 1000, tags=tags
+        )
+
+
+def _install() -> None:
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        def record_query(
+            conn: Any,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: Any,
+            executemany: bool,
+        ) -> None:
+            trackers = _active_trackers.get()
+            if not trackers:
+                return
+            statistics = query_statistics(cursor, statement)
+            if statistics is None:
+                return
+            for tracker in trackers:
+                tracker.record(statistics)
+
+        event.listen(Engine, "after_cursor_execute", record_query)
+        _installed = True
@@ -0,0 +1,152 @@
+"""
+Memoize the Batch Definitions returned by `configure_batch_definition`.
+
+With a GX Cloud context, `configure_batch_definition` usually reads, and on a first run
+adds, a Data Source, an asset, and a Batch Definition, each a remote call. When memoized,
+the names and IDs of the Batch Definition it returned are kept in a local file, keyed by
+the callable's qualified name, a version string chosen by the user, and the GX Cloud
+workspace. Later runs rehydrate the Batch Definition from those names with a single read
+of its Data Source, and only call `configure_batch_definition` again when the version
+changes or the stored Batch Definition no longer exists with the same IDs.
+
+The version string is the contract: change it whenever `configure_batch_definition`
+would configure something different. Lambdas and functions defined inside other
+functions, such as closures made by a factory, have no distinguishing qualified name,
+so they are never memoized.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "gx_batch_definitions"
+
+
+def _qualified_name(configure: Callable[..., Any]) -> str | None:
+    qualname = getattr(configure, "__qualname__", None)
+    # lambdas and nested functions, like `make.<locals>.configure`, share qualified names
+    if qualname is None or "<" in qualname:
+        return None
+    return f"{configure.__module__}.{qualname}"
+
+
+def _workspace(gx_context: AbstractDataContext) -> dict[str, Any]:
+    cloud_config = getattr(gx_context, "ge_cloud_config", None)
+    return {
+        "base_url": getattr(cloud_config, "base_url", None),
+        "organization_id": getattr(cloud_config, "organization_id", None),
+        "workspace_id": getattr(cloud_config, "workspace_id", None),
+    }
+
+
+def _identifiers(batch_definition: BatchDefinition) -> dict[str, Any]:
+    asset = batch_definition.data_asset
+    datasource = asset.datasource
+    return {
+        "datasource": {"name": datasource.name, "id": str(datasource.id)},
+        "asset": {"name": asset.name, "id": str(asset.id)},
+        "batch_definition": {
+            "name": batch_definition.name,
+            "id": str(batch_definition.id),
+        },
+    }
+
+
+class BatchDefinitionCache:
+    """Keep the identifiers of configured Batch Definitions in a local directory.
+
+    Args:
+        cache_dir: directory of the cache files. Defaults to `gx_batch_definitions` in the
+            system temporary directory.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+
+    def _path(self, key: dict[str, Any]) -> Path:
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _load(self, path: Path) -> dict[str, Any] | None:
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, path: Path, entry: dict[str, Any]) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # write and rename, so concurrent tasks never read a partial file
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.cache_dir, suffix=".tmp", delete=False
+            ) as file:
+                json.dump(entry, file)
+            os.replace(file.name, path)
+        except OSError:
+            logger.warning("Could not write Batch Definition cache %s", path)
+
+    def _rehydrate(
+        self, gx_context: AbstractDataContext, identifiers: dict[str, Any]
+    ) -> BatchDefinition | None:
+        try:
+            batch_definition = (
+                gx_context.data_sources.get(name=identifiers["datasource"]["name"])
+                .get_asset(name=identifiers["asset"]["name"])
+                .get_batch_definition(name=identifiers["batch_definition"]["name"])
+            )
+        except (KeyError, LookupError):
+            return None
+        # the same names with other IDs were deleted and created again, maybe differently
+        if _identifiers(batch_definition) != identifiers:
+            return None
+        return batch_definition
+
+    def get_or_configure(
+        self,
+        configure: Callable[[AbstractDataContext], BatchDefinition],
+        gx_context: AbstractDataContext,
+        version: str,
+    ) -> BatchDefinition:
+        """Rehydrate the Batch Definition `configure` returned for `version`, or call it.
+
+        Args:
+            configure: the `configure_batch_definition` callable.
+            gx_context: the Data Context to rehydrate into, or pass to `configure`.
+            version: user-chosen version of `configure`.
+        """
+        qualified_name = _qualified_name(configure)
+        if qualified_name is None:
+            return configure(gx_context)
+        path = self._path(
+            {
+                "callable": qualified_name,
+                "version": version,
+                **_workspace(gx_context),
+            }
+        )
+        entry = self._load(path)
+        if entry is not None:
+            batch_definition = self._rehydrate(gx_context, entry)
+            if batch_definition is not None:
+                logger.info(
+                    "Rehydrated Batch Definition %s of %s version %s",
+                    batch_definition.name,
+                    qualified_name,
+                    version,
+                )
+                return batch_definition
+        batch_definition = configure(gx_context)
+        self._store(path, _identifiers(batch_definition))
+        return batch_definition
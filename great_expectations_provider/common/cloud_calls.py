@@ -0,0 +1,135 @@
+"""
+Count and time the HTTP requests a validation run makes to GX Cloud.
+
+A GX Cloud context reads and writes every Data Source, Expectation Suite, Validation
+Definition, and Validation Result through REST calls. `load_data_context` gives the
+stores of a GX Cloud context the shared sessions of
+`great_expectations_provider.common.cloud_sessions`, and `record_response` is a
+`requests` response hook of those sessions: each response is recorded by the trackers
+registered in the current context. Nothing is recorded for other contexts, which make
+no requests to GX Cloud. A request retried by the adapter counts once, with the time of
+all its attempts; a request that gets no response, such as one failing to connect, is
+not counted.
+
+Paths are reported with the organization, workspace, and resource IDs replaced by
+`{id}`, so the requests for the same kind of resource are counted together.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator
+from urllib.parse import urlsplit
+
+from great_expectations_provider.common.metrics import emit_incr, emit_timing
+
+if TYPE_CHECKING:
+    import requests
+
+CLOUD_CALLS_KEY = "cloud_calls"
+_ID_PATTERN = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+
+_active_trackers: ContextVar[tuple[CloudCallTracker, ...]] = ContextVar(
+    "gx_cloud_call_trackers", default=()
+)
+
+
+def endpoint_path(url: str) -> str:
+    """The path of `url`, with IDs replaced by `{id}`."""
+    return _ID_PATTERN.sub("{id}", urlsplit(url).path)
+
+
+class CloudCallTracker:
+    """Record the GX Cloud requests made in a block, per method and endpoint.
+
+    When disabled every method is a no-op, so operators can use the tracker unconditionally.
+
+    Args:
+        enabled: whether to record requests.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.requests = 0
+        self.seconds = 0.0
+        self.errors = 0
+        # (method, endpoint) -> request count, seconds, and errors
+        self._endpoints: dict[tuple[str, str], list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, url: str, seconds: float, error: bool) -> None:
+        """Record one request to `url`, taking `seconds`, failed or not."""
+        with self._lock:
+            self.requests += 1
+            self.seconds += seconds
+            self.errors += error
+            stats = self._endpoints.setdefault(
+                (method, endpoint_path(url)), [0, 0.0, 0]
+            )
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] += error
+
+    @contextmanager
+    def _track(self) -> Iterator[None]:
+        token = _active_trackers.set((*_active_trackers.get(), self))
+        try:
+            yield
+        finally:
+            _active_trackers.reset(token)
+
+    def track(self) -> ContextManager[None]:
+        """Record the GX Cloud requests made in the enclosed block."""
+        if not self.enabled:
+            return nullcontext()
+        return self._track()
+
+    def report(self) -> dict[str, Any] | None:
+        """Request count, time, and errors in total and per endpoint, or None when disabled."""
+        if not self.enabled:
+            return None
+        endpoints = [
+            {
+                "method": method,
+                "endpoint": endpoint,
+                "requests": count,
+                "seconds": round(seconds, 6),
+                "errors": errors,
+            }
+            for (method, endpoint), (count, seconds, errors) in sorted(
+                self._endpoints.items(), key=lambda item: -item[1][1]
+            )
+        ]
+        return {
+            "requests": self.requests,
+            "seconds": round(self.seconds, 6),
+            "errors": self.errors,
+            "endpoints": endpoints,
+        }
+
+    def emit_metrics(self, task_id: str) -> None:
+        """Emit the request count and time as `gx.cloud.*` metrics tagged with the task ID."""
+        if not self.enabled:
+            return
+        tags = {"task_id": task_id}
+        emit_incr("cloud.requests", self.requests, tags=tags)
+        emit_incr("cloud.errors", self.errors, tags=tags)
+        emit_timing("cloud.request_time", self.seconds, tags=tags)
+
+
+def record_response(response: requests.Response, *args: Any, **kwargs: Any) -> None:
+    """Response hook recording `response` with the trackers registered in the current context."""
+    trackers = _active_trackers.get()
+    if not trackers:
+        return
+    method = response.request.method or ""
+    url = response.request.url or ""
+    seconds = response.elapsed.total_seconds()
+    error = response.status_code >= 400
+    for tracker in trackers:
+        tracker.record(method, url, seconds, error)
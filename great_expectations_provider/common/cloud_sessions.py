@@ -0,0 +1,274 @@
+"""
+Share keep-alive HTTP sessions to GX Cloud between the Data Contexts of a process.
+
+Each GX Cloud store of a Data Context opens its own `requests` session, so a cloud
+context negotiates new TCP and TLS connections to GX Cloud for each of its stores, which
+is a large share of the time of a short task. While `load_data_context` builds a cloud
+context, GX is made to give its stores the session the process keeps for the access
+token instead, so the stores share its connections, and the pool size and retries of its
+adapter come from the GX Cloud connection. GX closes a store's session when the store is
+garbage collected; closing a shared session leaves its connections open.
+
+Sessions are kept by the process only. Airflow runs each task in a process of its own, so
+under the standard executors a task opens its own connections and later tasks do not
+reuse them; connections are reused across Data Contexts only in a long-lived process,
+such as the local validation service, `dag.test()`, or an executor running tasks in the
+worker process itself.
+
+The session of a store is given by replacing `create_session` in the GX Cloud store
+backend module, so stores share sessions only with the GX versions
+`great_expectations_provider.common.gx_internals` supports, and open their own otherwise.
+
+Requests sent through a shared session are counted by the `CloudCallTracker` of the task,
+see `great_expectations_provider.common.cloud_calls`. The response time of every request
+sent through a shared session is also recorded in a
+per-endpoint latency histogram, available from `CloudSessionPool.latency_histograms`,
+and emitted as the `gx.cloud.request_latency` timer.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from great_expectations_provider.common.cloud_calls import (
+    endpoint_path,
+    record_response,
+)
+from great_expectations_provider.common.gx_internals import internals_supported
+from great_expectations_provider.common.metrics import emit_timing
+
+if TYPE_CHECKING:
+    from great_expectations_provider.hooks.gx_cloud import GXCloudConfig
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_FACTOR = 1.0
+# seconds a request may wait for GX Cloud, the default of the sessions GX creates
+DEFAULT_TIMEOUT = 20
+# responses retried besides connection errors; POST is never retried, so no result is
+# uploaded twice
+RETRY_STATUSES = (429, 502, 503, 504)
+# upper bounds of the histogram buckets, the last bucket holds slower requests
+LATENCY_BUCKETS_SECONDS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_pooling: ContextVar[tuple[CloudSessionPool, dict[str, Any]] | None] = ContextVar(
+    "gx_cloud_session_pooling", default=None
+)
+_install_lock = threading.Lock()
+_installed = False
+
+
+class LatencyHistogram:
+    """Count request latencies in the buckets of `LATENCY_BUCKETS_SECONDS`."""
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_SECONDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = next(
+            (
+                index
+                for index, bound in enumerate(LATENCY_BUCKETS_SECONDS)
+                if seconds <= bound
+            ),
+            len(LATENCY_BUCKETS_SECONDS),
+        )
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """The count and total of the latencies, and the count in each bucket, keyed by its upper bound."""
+        bounds = [str(bound) for bound in LATENCY_BUCKETS_SECONDS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.sum, 6),
+            "buckets": dict(zip(bounds, self.counts)),
+        }
+
+
+class _TimeoutAdapter(HTTPAdapter):
+    # requests has no session-wide timeout, so the adapter applies one to every request
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: Any
+    ) -> requests.Response:
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = DEFAULT_TIMEOUT
+        return super().send(request, **kwargs)
+
+
+class _SharedSession(requests.Session):
+    def close(self) -> None:
+        # called by the finalizer of every GX Cloud store using the session
+        pass
+
+    def close_connections(self) -> None:
+        super().close()
+
+
+class CloudSessionPool:
+    """Keep one keep-alive session to GX Cloud per access token and adapter settings."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[tuple[str, int, int, float], _SharedSession] = {}
+        self._histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        access_token: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    ) -> requests.Session:
+        """Return the shared session for `access_token`, creating it on first use.
+
+        Args:
+            access_token: the GX Cloud access token the session authenticates with.
+            pool_size: connections the session keeps open to GX Cloud.
+            max_retries: retries of a request failing to connect, or answered with a
+                status in `RETRY_STATUSES`.
+            backoff_factor: factor of the exponential backoff between retries.
+        """
+        key = (access_token, pool_size, max_retries, backoff_factor)
+        with self._lock:
+            if key not in self._sessions:
+                self._sessions[key] = self._create(*key)
+            return self._sessions[key]
+
+    def get_for_config(self, gx_cloud_config: GXCloudConfig) -> requests.Session:
+        """Return the shared session for a GX Cloud connection."""
+        return self.get(
+            gx_cloud_config.cloud_access_token,
+            pool_size=gx_cloud_config.pool_size,
+            max_retries=gx_cloud_config.max_retries,
+            backoff_factor=gx_cloud_config.backoff_factor,
+        )
+
+    def _create(
+        self,
+        access_token: str,
+        pool_size: int,
+        max_retries: int,
+        backoff_factor: float,
+    ) -> _SharedSession:
+        from great_expectations.core.http import create_session
+
+        session = _SharedSession()
+        # the headers and hooks of the sessions GX creates itself
+        template = create_session(access_token=access_token)
+        session.headers.update(template.headers)
+        session.hooks["response"].extend(template.hooks["response"])
+        template.close()
+        session.hooks["response"].extend([self._observe, record_response])
+        adapter = _TimeoutAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=backoff_factor,
+                status_forcelist=RETRY_STATUSES,
+            ),
+        )
+        for protocol in ("http://", "https://"):
+            session.mount(protocol, adapter)
+        return session
+
+    def _observe(self, response: requests.Response, *args: Any, **kwargs: Any) -> None:
+        method = response.request.method or ""
+        endpoint = endpoint_path(response.request.url or "")
+        seconds = response.elapsed.total_seconds()
+        with self._lock:
+            self._histograms.setdefault((method, endpoint), LatencyHistogram()).observe(
+                seconds
+            )
+        emit_timing(
+            "cloud.request_latency",
+            seconds,
+            tags={"method": method, "endpoint": endpoint},
+        )
+
+    def latency_histograms(self) -> dict[str, dict[str, Any]]:
+        """Latency histogram of the requests sent through the shared sessions, per method and endpoint."""
+        with self._lock:
+            return {
+                f"{method} {endpoint}": histogram.as_dict()
+                for (method, endpoint), histogram in sorted(self._histograms.items())
+            }
+
+    @contextmanager
+    def pooling(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+    ) -> Iterator[None]:
+        """Give the GX Cloud stores created in the enclosed block the shared sessions."""
+        _install()
+        token = _pooling.set(
+            (
+                self,
+                {
+                    "pool_size": pool_size,
+                    "max_retries": max_retries,
+                    "backoff_factor": backoff_factor,
+                },
+            )
+        )
+        try:
+            yield
+        finally:
+            _pooling.reset(token)
+
+    def _reset_after_fork(self) -> None:
+        # a forked child, as run by subprocess isolation, must not use the parent's sockets
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def close(self) -> None:
+        """Close the connections of every shared session and forget them."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close_connections()
+
+
+cloud_sessions = CloudSessionPool()
+os.register_at_fork(after_in_child=cloud_sessions._reset_after_fork)
+
+
+def _install() -> None:
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        from great_expectations.data_context.store import gx_cloud_store_backend
+
+        if not internals_supported(
+            "Sharing GX Cloud sessions", (gx_cloud_store_backend, "create_session")
+        ):
+            return
+        create_session = gx_cloud_store_backend.create_session
+
+        def pooled_create_session(
+            access_token: str, *args: Any, **kwargs: Any
+        ) -> requests.Session:
+            pooling = _pooling.get()
+            if pooling is None:
+                return create_session(access_token, *args, **kwargs)
+            pool, settings = pooling
+            return pool.get(access_token, **settings)
+
+        gx_cloud_store_backend.create_session = pooled_create_session  # type: ignore[assignment]
+        _installed = True
@@ -0,0 +1,108 @@
+"""
+Validate only the columns of a DataFrame that an Expectation Suite references.
+
+Wide DataFrames are often validated by suites that check a few of their columns, yet every
+column is carried through batch loading, sampling, and result caching. The columns a suite
+references are read from the domain kwargs of its Expectations, `column`, `column_A`,
+`column_B`, and `column_list`, and the DataFrame is narrowed to them before it is
+validated: a pandas DataFrame to a new DataFrame sharing the memory of the kept columns,
+a Spark DataFrame with `select()`, which Spark pushes down to the scan.
+
+Columns named by `unexpected_index_column_names` in the result format of the operator or
+of an Expectation are kept as well, so that unexpected rows are still identified by them.
+
+The whole DataFrame is validated when the suite holds an Expectation that needs columns
+other than those of its domain: a table-level Expectation, such as a row count or column
+list check, `expect_column_to_exist`, whose `column_index` depends on every column, or an
+Expectation with a row condition, which can filter on any column. It is also validated
+whole when a referenced column is missing, so that the Expectation fails as it would
+without projection.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from great_expectations_provider.common.expectation_timing import DOMAIN_KWARGS
+
+if TYPE_CHECKING:
+    from great_expectations import ExpectationSuite
+
+logger = logging.getLogger(__name__)
+
+# Expectations with a column domain that still depend on the other columns
+WHOLE_TABLE_EXPECTATIONS = ("expect_column_to_exist",)
+
+
+def _index_columns(result_format: Any) -> list[str]:
+    """Columns a result format identifies unexpected rows by."""
+    if not isinstance(result_format, dict):
+        return []
+    return list(result_format.get("unexpected_index_column_names") or [])
+
+
+def referenced_columns(
+    suite: ExpectationSuite, result_format: Any = None
+) -> list[str] | None:
+    """The columns the Expectations of `suite` and `result_format` reference, in order of first reference.
+
+    Returns None when an Expectation may depend on columns outside its domain, so the
+    whole DataFrame must be validated.
+    """
+    columns: dict[str, None] = dict.fromkeys(_index_columns(result_format))
+    for expectation in suite.expectations:
+        configuration = expectation.configuration
+        kwargs = configuration.kwargs
+        domain = [kwargs[key] for key in DOMAIN_KWARGS if kwargs.get(key) is not None]
+        if (
+            not domain
+            or configuration.type in WHOLE_TABLE_EXPECTATIONS
+            or kwargs.get("row_condition")
+        ):
+            return None
+        for value in domain:
+            for column in value if isinstance(value, list) else [value]:
+                columns[column] = None
+        columns.update(dict.fromkeys(_index_columns(kwargs.get("result_format"))))
+    return list(columns) if columns else None
+
+
+def project_dataframe(
+    dataframe: Any, suite: ExpectationSuite, result_format: Any = None
+) -> Any:
+    """Narrow a pandas or Spark DataFrame to the columns `suite` and `result_format` reference.
+
+    Returns `dataframe` itself when the whole DataFrame must be validated.
+    """
+    from great_expectations.core.expectation_suite import ExpectationSuite
+    from pandas import DataFrame
+
+    if not isinstance(suite, ExpectationSuite):
+        return dataframe
+    columns = referenced_columns(suite, result_format)
+    if columns is None:
+        return dataframe
+    referenced = set(columns)
+    all_columns = list(dataframe.columns)
+    if len(referenced) == len(all_columns) or not referenced <= set(all_columns):
+        return dataframe
+    # keep the order of the DataFrame
+    columns = [column for column in all_columns if column in referenced]
+    if isinstance(dataframe, DataFrame):
+        if len(set(all_columns)) != len(all_columns):
+            # duplicate labels would select every column sharing a label
+            return dataframe
+        # without copying, unlike frame[columns] before pandas' copy-on-write
+        projected = DataFrame(
+            {column: dataframe[column] for column in columns}, copy=False
+        )
+        projected.attrs = dataframe.attrs
+    else:
+        projected = dataframe.select(*columns)
+    logger.info(
+        "Validating %d of the %d columns of the DataFrame",
+        len(columns),
+        len(all_columns),
+    )
+    return projected
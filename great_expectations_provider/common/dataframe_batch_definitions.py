@@ -0,0 +1,93 @@
+"""
+Resolve the Data Source, asset, and Batch Definition used to validate a DataFrame.
+
+GXValidateDataFrameOperator validates through a Data Source, DataFrame asset, and
+whole-DataFrame Batch Definition, all named after the task. Looking each up, and creating
+it when missing, one at a time costs a store round trip per step, and with a GX Cloud
+context each is a remote call. Instead the Data Source is read once and its asset and
+Batch Definition are found on it in memory. A missing Data Source is added with its asset
+and Batch Definition in a single call, and a missing Batch Definition is added to its
+asset with a single update of the Data Source. A missing asset, only left by an earlier
+version of the Data Source, is added through the Data Source as usual.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, cast
+
+from great_expectations.core.batch_definition import BatchDefinition
+from great_expectations.datasource.fluent import PandasDatasource, SparkDatasource
+from great_expectations.datasource.fluent.pandas_datasource import (
+    DataFrameAsset as PandasDataFrameAsset,
+)
+from great_expectations.datasource.fluent.spark_datasource import (
+    DataFrameAsset as SparkDataFrameAsset,
+)
+
+from great_expectations_provider.exceptions.exceptions import (
+    ExistingDataSourceTypeMismatch,
+)
+
+if TYPE_CHECKING:
+    from great_expectations.data_context import AbstractDataContext
+
+# Data Source type -> its DataFrame asset type and the DataSourceManager method adding it
+DATAFRAME_DATASOURCES: dict[type, tuple[type, str]] = {
+    PandasDatasource: (PandasDataFrameAsset, "add_pandas"),
+    SparkDatasource: (SparkDataFrameAsset, "add_spark"),
+}
+
+
+def get_dataframe_batch_definition(
+    gx_context: AbstractDataContext, name: str, datasource_type: type
+) -> BatchDefinition:
+    """Return the whole-DataFrame Batch Definition `name`, creating what is missing.
+
+    The Data Source, its asset, and the Batch Definition all take the same name.
+
+    Raises:
+        ExistingDataSourceTypeMismatch: if a Data Source named `name` exists but is
+            not of `datasource_type`.
+    """
+    asset_type, add_method = DATAFRAME_DATASOURCES[datasource_type]
+    try:
+        datasource = gx_context.data_sources.get(name=name)
+    except KeyError:
+        # the asset and Batch Definition are saved with the Data Source
+        datasource = getattr(gx_context.data_sources, add_method)(
+            datasource_type(
+                name=name,
+                assets=[
+                    asset_type(
+                        name=name, batch_definitions=[BatchDefinition(name=name)]
+                    )
+                ],
+            )
+        )
+        return datasource.get_asset(name=name).get_batch_definition(name=name)
+    if not isinstance(datasource, datasource_type):
+        raise ExistingDataSourceTypeMismatch(
+            expected_type=datasource_type,
+            actual_type=type(datasource),
+            name=name,
+        )
+
+    try:
+        asset = datasource.get_asset(name=name)
+    except LookupError:
+        dataframe_datasource = cast(
+            "Union[PandasDatasource, SparkDatasource]", datasource
+        )
+        return dataframe_datasource.add_dataframe_asset(
+            name=name
+        ).add_batch_definition_whole_dataframe(name=name)
+    try:
+        return asset.get_batch_definition(name=name)
+    except KeyError:
+        pass
+    batch_definition = BatchDefinition(name=name)
+    batch_definition.set_data_asset(asset)
+    asset.batch_definitions.append(batch_definition)
+    # a GX Cloud context returns the saved Data Source, with IDs assigned
+    datasource = gx_context.update_datasource(datasource)
+    return datasource.get_asset(name=name).get_batch_definition(name=name)
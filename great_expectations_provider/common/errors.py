@@ -1,29 +1,144 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import heapq
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Iterator
 
 from airflow.exceptions import AirflowException
 
 if TYPE_CHECKING:
-    from great_expectations.checkpoint.checkpoint import CheckpointDescriptionDict
+    from great_expectations.checkpoint.checkpoint import (
+        CheckpointDescriptionDict,
+        CheckpointResult,
+    )
+    from great_expectations.core.expectation_validation_result import (
+        ExpectationSuiteValidationResult,
+        ExpectationValidationResult,
+    )
 
+MAX_REPORTED_ITEMS = 10
+COLUMN_KWARGS = ("column", "column_A", "column_B")
 
-def _extract_failed_types_from_expectations(expectations: Any) -> set[str]:
-    """Helper function to extract failed expectation types from a list of expectations."""
-    failed_types: set[str] = set()
 
-    if not isinstance(expectations, list):
-        return failed_types
+def iter_expectation_results(
+    validation_result_dict: dict[str, Any] | CheckpointDescriptionDict,
+) -> Iterator[dict[str, Any]]:
+    """Yield every expectation result in a described validation result.
 
-    for expectation in expectations:
-        if (
-            isinstance(expectation, dict)
-            and expectation.get("success") is False
-            and "expectation_type" in expectation
-        ):
-            failed_types.add(expectation["expectation_type"])
+    Handles both the ExpectationSuiteValidationResult format (top-level ``expectations``)
+    and the CheckpointResult format (``validation_results`` each containing ``expectations``).
+    """
+    expectations = validation_result_dict.get("expectations")
+    if isinstance(expectations, list):
+        for expectation in expectations:
+            if isinstance(expectation, dict):
+                yield expectation
+
+    validation_results = validation_result_dict.get("validation_results")
+    if isinstance(validation_results, list):
+        for validation_result in validation_results:
+            if isinstance(validation_result, dict):
+                yield from iter_expectation_results(validation_result)
+
+
+def _columns_for_expectation(expectation: dict[str, Any]) -> list[str]:
+    kwargs = expectation.get("kwargs")
+    if not isinstance(kwargs, dict):
+        return []
+    columns = [kwargs[key] for key in COLUMN_KWARGS if isinstance(kwargs.get(key), str)]
+    column_list = kwargs.get("column_list")
+    if isinstance(column_list, list):
+        columns.extend(column for column in column_list if isinstance(column, str))
+    return columns
+
+
+class ValidationFailureCollector:
+    """Summarize the failed expectations of a described validation result in a single pass.
+
+    The described result is walked once after validation, counting failures per
+    expectation type and per column and keeping a bounded heap of the worst results.
+    Failures are not collected while GX produces the results: GX returns them only once
+    the whole suite is validated, and the operators hold the described result in full to
+    push it to XCom, so a walk over it holds nothing more in memory.
+    """
+
+    def __init__(self, max_ranked: int = MAX_REPORTED_ITEMS) -> None:
+        self.max_ranked = max_ranked
+        self.failures_by_expectation_type: Counter[str] = Counter()
+        self.failures_by_column: Counter[str] = Counter()
+        self._worst: list[tuple[float, int, str, str | None]] = []
+        self._seen = 0
+
+    def add(self, expectation: dict[str, Any]) -> None:
+        """Record one described expectation result."""
+        if expectation.get("success") is not False:
+            return
+        expectation_type = expectation.get("expectation_type")
+        if not isinstance(expectation_type, str):
+            return
 
-    return failed_types
+        self.failures_by_expectation_type[expectation_type] += 1
+        columns = _columns_for_expectation(expectation)
+        self.failures_by_column.update(columns)
+
+        result = expectation.get("result")
+        unexpected_percent = (
+            result.get("unexpected_percent") if isinstance(result, dict) else None
+        )
+        if isinstance(unexpected_percent, (int, float)):
+            # the sequence number keeps ordering stable between equal percentages
+            entry = (
+                float(unexpected_percent),
+                -self._seen,
+                expectation_type,
+                columns[0] if columns else None,
+            )
+            self._seen += 1
+            if len(self._worst) < self.max_ranked:
+                heapq.heappush(self._worst, entry)
+            else:
+                heapq.heappushpop(self._worst, entry)
+
+    def add_all(
+        self, validation_result_dict: dict[str, Any] | CheckpointDescriptionDict
+    ) -> None:
+        for expectation in iter_expectation_results(validation_result_dict):
+            self.add(expectation)
+
+    def to_context(self, task_id: str, statistics: Any) -> dict[str, Any]:
+        """Build the failure context dictionary used by GXValidationFailed."""
+        return {
+            "xcom_location": f"Task '{task_id}' -> XCom key 'return_value'",
+            "statistics": statistics,
+            "failed_expectation_types": sorted(self.failures_by_expectation_type)[
+                : self.max_ranked
+            ],
+            "failed_expectation_type_count": len(self.failures_by_expectation_type),
+            "failure_counts_by_expectation_type": _ranked_counts(
+                self.failures_by_expectation_type, "expectation_type"
+            ),
+            "failure_counts_by_column": _ranked_counts(
+                self.failures_by_column, "column"
+            ),
+            "worst_unexpected_percent": [
+                {
+                    "expectation_type": expectation_type,
+                    "column": column,
+                    "unexpected_percent": unexpected_percent,
+                }
+                for unexpected_percent, _, expectation_type, column in sorted(
+                    self._worst, reverse=True
+                )
+            ],
+        }
+
+
+def _ranked_counts(counter: Counter[str], label: str) -> list[dict[str, Any]]:
+    """Sort by descending count, breaking ties alphabetically."""
+    return [
+        {label: name, "count": count}
+        for name, count in sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+    ]
 
 
 def extract_validation_failure_context(
@@ -38,34 +153,14 @@ def extract_validation_failure_context(
 
     Returns:
         Dictionary containing failure context including xcom location, statistics,
-        and list of failed expectation types (max 10, unique)
+        the list of failed expectation types (max 10, unique), complete failure counts
+        per expectation type and per column, and the worst unexpected percentages, ranked
     """
-    context: dict[str, Any] = {
-        "xcom_location": f"Task '{task_id}' -> XCom key 'return_value'",
-        "statistics": validation_result_dict.get("statistics"),
-        "failed_expectation_types": [],
-    }
-
-    failed_types: set[str] = set()  # Use set to ensure uniqueness
-
-    # Check for expectations directly in the result (ExpectationSuiteValidationResult format)
-    expectations = validation_result_dict.get("expectations")
-    failed_types.update(_extract_failed_types_from_expectations(expectations))
-
-    # Check for validation_results containing expectations (CheckpointResult format)
-    validation_results = validation_result_dict.get("validation_results")
-    if isinstance(validation_results, list):
-        for validation_result in validation_results:
-            if isinstance(validation_result, dict):
-                expectations = validation_result.get("expectations")
-                failed_types.update(
-                    _extract_failed_types_from_expectations(expectations)
-                )
-
-    # Limit to first 10 unique types, sorted alphabetically
-    limited_failed_types = sorted(failed_types)[:10]
-    context["failed_expectation_types"] = limited_failed_types
-    return context
+    collector = ValidationFailureCollector()
+    collector.add_all(validation_result_dict)
+    return collector.to_context(
+        task_id=task_id, statistics=validation_result_dict.get("statistics")
+    )
 
 
 class GXValidationFailed(AirflowException):
@@ -78,6 +173,9 @@ class GXValidationFailed(AirflowException):
         xcom_location: Location of the full validation result in Airflow XCom
         statistics: Validation statistics if available
         failed_expectation_types: List of expectation types that failed (max 10, unique)
+        failure_counts_by_expectation_type: Number of failures per expectation type, most frequent first
+        failure_counts_by_column: Number of failures per column, most frequent first
+        worst_unexpected_percent: Failed expectations with the highest unexpected_percent (max 10)
         context: Full context dictionary
     """
 
@@ -96,6 +194,11 @@ class GXValidationFailed(AirflowException):
             self.xcom_location = self.context["xcom_location"]
             self.statistics = self.context["statistics"]
             self.failed_expectation_types = self.context["failed_expectation_types"]
+            self.failure_counts_by_expectation_type = self.context[
+                "failure_counts_by_expectation_type"
+            ]
+            self.failure_counts_by_column = self.context["failure_counts_by_column"]
+            self.worst_unexpected_percent = self.context["worst_unexpected_percent"]
 
             # Build detailed error message
             if not message:
@@ -105,6 +208,9 @@ class GXValidationFailed(AirflowException):
             self.xcom_location = None
             self.statistics = None
             self.failed_expectation_types = []
+            self.failure_counts_by_expectation_type = []
+            self.failure_counts_by_column = []
+            self.worst_unexpected_percent = []
             if not message:
                 message = "Great Expectations data validation failed. See the task xcom for the failing ValidationResult."
 
@@ -121,15 +227,276 @@ class GXValidationFailed(AirflowException):
             for key, value in self.statistics.items():
                 lines.append(f"  {key}: {value}")
 
-        if self.failed_expectation_types:
-            expectation_count = len(self.failed_expectation_types)
-            if expectation_count <= 10:
+        if self.failure_counts_by_expectation_type:
+            expectation_count = len(self.failure_counts_by_expectation_type)
+            if expectation_count <= MAX_REPORTED_ITEMS:
                 lines.append(f"Failed expectation types ({expectation_count}):")
             else:
                 lines.append(
-                    f"Failed expectation types (showing first 10 of {expectation_count}):"
+                    f"Failed expectation types (showing first {MAX_REPORTED_ITEMS} of {expectation_count}):"
                 )
+            for entry in self.failure_counts_by_expectation_type[:MAX_REPORTED_ITEMS]:
+                lines.append(f"  - {entry['expectation_type']}: {entry['count']}")
+        elif self.failed_expectation_types:
+            lines.append(
+                f"Failed expectation types ({len(self.failed_expectation_types)}):"
+            )
             for exp_type in self.failed_expectation_types:
                 lines.append(f"  - {exp_type}")
 
+        if self.failure_counts_by_column:
+            lines.append("Failures by column:")
+            for entry in self.failure_counts_by_column[:MAX_REPORTED_ITEMS]:
+                lines.append(f"  - {entry['column']}: {entry['count']}")
+
+        if self.worst_unexpected_percent:
+            lines.append("Highest unexpected percent:")
+            for entry in self.worst_unexpected_percent:
+                column = f" ({entry['column']})" if entry["column"] else ""
+                lines.append(
+                    f"  - {entry['expectation_type']}{column}: {entry['unexpected_percent']:.2f}%"
+                )
+
         return "\n".join(lines)
+
+
+# fragments of the errors databases raise when they cancel a statement at its timeout
+STATEMENT_TIMEOUT_MESSAGES = (
+    "canceling statement due to statement timeout",  # Postgres, Redshift
+    "maximum statement execution time exceeded",  # MySQL
+    "exceeded maximum time limit",  # Trino
+    "reached its statement or warehouse timeout",  # Snowflake
+)
+
+
+def is_statement_timeout(message: str) -> bool:
+    """Whether an error message is that of a statement cancelled at its timeout."""
+    message = message.lower()
+    return any(fragment in message for fragment in STATEMENT_TIMEOUT_MESSAGES)
+
+
+def _statement_timeout_message(result: ExpectationValidationResult) -> str | None:
+    exception_info = result.exception_info or {}
+    # GX records the errors of metrics under their metric IDs
+    if "raised_exception" in exception_info:
+        exception_info = {"": exception_info}
+    for info in exception_info.values():
+        if isinstance(info, dict) and info.get("raised_exception"):
+            message = str(info.get("exception_message") or "")
+            if is_statement_timeout(message):
+                return message.strip().splitlines()[0]
+    return None
+
+
+def record_statement_timeouts(
+    result: ExpectationSuiteValidationResult | CheckpointResult,
+    result_dict: dict[str, Any] | CheckpointDescriptionDict,
+) -> None:
+    """Add the error of expectations whose query exceeded the statement timeout to a described result.
+
+    Described results leave out the errors GX records per metric, so the `exception_info`
+    of those expectations is added to `result_dict` in place, in the described format.
+    """
+    from great_expectations.checkpoint.checkpoint import CheckpointResult
+    from great_expectations.core.expectation_validation_result import (
+        ExpectationSuiteValidationResult,
+    )
+
+    # a CheckpointResult describes the result of each of its validations in turn
+    if isinstance(result, CheckpointResult):
+        suite_results = list(result.run_results.values())
+        suite_dicts = list(result_dict.get("validation_results", []))
+    elif isinstance(result, ExpectationSuiteValidationResult):
+        suite_results = [result]
+        suite_dicts = [result_dict]
+    else:
+        return
+    for suite_result, suite_dict in zip(suite_results, suite_dicts):
+        for expectation_result, expectation_dict in zip(
+            suite_result.results, suite_dict.get("expectations", [])
+        ):
+            message = _statement_timeout_message(expectation_result)
+            if message is not None:
+                expectation_dict["exception_info"] = {
+                    "raised_exception": True,
+                    "exception_message": message,
+                }
+
+
+def timed_out_expectations(
+    validation_result_dict: dict[str, Any] | CheckpointDescriptionDict,
+) -> list[dict[str, Any]]:
+    """Expectation type and column of each expectation whose query exceeded the statement timeout."""
+    timed_out = []
+    for expectation in iter_expectation_results(validation_result_dict):
+        exception_info = expectation.get("exception_info")
+        if not isinstance(exception_info, dict):
+            continue
+        if is_statement_timeout(str(exception_info.get("exception_message", ""))):
+            columns = _columns_for_expectation(expectation)
+            timed_out.append(
+                {
+                    "expectation_type": expectation.get("expectation_type"),
+                    "column": columns[0] if columns else None,
+                }
+            )
+    return timed_out
+
+
+class GXStatementTimeout(GXValidationFailed):
+    """Great Expectations data validation failed because queries exceeded the statement timeout.
+
+    Raised instead of GXValidationFailed when the database cancelled the query of at least
+    one expectation at the `statement_timeout_seconds` of its connection, so that timeouts
+    can be told apart from data that does not meet its expectations.
+
+    Attributes:
+        timed_out_expectations: Expectation type and column of each expectation whose
+            query was cancelled
+    """
+
+    def __init__(
+        self,
+        validation_result_dict: dict[str, Any]
+        | CheckpointDescriptionDict
+        | None = None,
+        task_id: str | None = None,
+        message: str | None = None,
+        timed_out: list[dict[str, Any]] | None = None,
+    ):
+        if timed_out is None and validation_result_dict:
+            timed_out = timed_out_expectations(validation_result_dict)
+        self.timed_out_expectations = timed_out or []
+        super().__init__(validation_result_dict, task_id, message)
+
+    def _build_error_message(self) -> str:
+        lines = [
+            super()._build_error_message(),
+            f"Queries exceeding the statement timeout ({len(self.timed_out_expectations)}):",
+        ]
+        for entry in self.timed_out_expectations[:MAX_REPORTED_ITEMS]:
+            column = f" ({entry['column']})" if entry["column"] else ""
+            lines.append(f"  - {entry['expectation_type']}{column}")
+        return "\n".join(lines)
+
+
+class GXTimeBudgetExceeded(GXValidationFailed):
+    """Great Expectations data validation did not evaluate every expectation within its time budget.
+
+    Raised instead of GXValidationFailed when the `time_budget` of the operator ran out
+    before every expectation was evaluated on the whole Batch, so that a result covering
+    part of the suite never passes.
+
+    Args:
+        time_budget: the time budget report of the result, listing the expectations
+
+    Attributes:
+        unevaluated_expectations: Expectations left unevaluated
+        sampled_expectations: Expectations evaluated on a sample of the Batch only
+    """
+
+    def __init__(
+        self,
+        validation_result_dict: dict[str, Any]
+        | CheckpointDescriptionDict
+        | None = None,
+        task_id: str | None = None,
+        message: str | None = None,
+        time_budget: dict[str, Any] | None = None,
+    ):
+        report = time_budget or {}
+        self.unevaluated_expectations = report.get("unevaluated_expectations", [])
+        self.sampled_expectations = report.get("sampled_expectations", [])
+        super().__init__(validation_result_dict, task_id, message)
+
+    def _build_error_message(self) -> str:
+        lines = [super()._build_error_message()]
+        for title, expectations in (
+            (
+                "Expectations not evaluated within the time budget",
+                self.unevaluated_expectations,
+            ),
+            ("Expectations evaluated on a sample only", self.sampled_expectations),
+        ):
+            if not expectations:
+                continue
+            lines.append(f"{title} ({len(expectations)}):")
+            for entry in expectations[:MAX_REPORTED_ITEMS]:
+                columns = _columns_for_expectation(entry)
+                column = f" ({columns[0]})" if columns else ""
+                lines.append(f"  - {entry['expectation_type']}{column}")
+        return "\n".join(lines)
+
+
+class GXValidationServiceError(AirflowException):
+    """The local validation service failed to run a validation job.
+
+    Raised when the service accepted the job but did not return a result, or when an
+    error raised by the job could not be sent back to the task.
+
+    Attributes:
+        remote_traceback: Traceback of the error in the service process, if available
+    """
+
+    def __init__(self, message: str, remote_traceback: str | None = None):
+        self.remote_traceback = remote_traceback
+        if remote_traceback:
+            message = (
+                f"{message}\n\nTraceback in the validation service:\n{remote_traceback}"
+            )
+        super().__init__(message)
+
+
+class GXValidationProcessError(AirflowException):
+    """The child process running an isolated validation failed without a result.
+
+    Attributes:
+        exitcode: Exit code of the child process; negative for the signal that ended it
+        remote_traceback: Traceback of the error in the child process, if available
+    """
+
+    def __init__(
+        self,
+        message: str,
+        exitcode: int | None = None,
+        remote_traceback: str | None = None,
+    ):
+        self.exitcode = exitcode
+        self.remote_traceback = remote_traceback
+        if remote_traceback:
+            message = (
+                f"{message}\n\nTraceback in the validation process:\n{remote_traceback}"
+            )
+        super().__init__(message)
+
+
+class GXResourceLimitExceeded(GXValidationProcessError):
+    """An isolated validation exceeded the memory or CPU time limit of its process.
+
+    Attributes:
+        resource: `memory` or `cpu_time`
+        limit: The limit that was exceeded, in bytes or seconds
+    """
+
+    def __init__(
+        self, message: str, resource: str, limit: int, exitcode: int | None = None
+    ):
+        self.resource = resource
+        self.limit = limit
+        super().__init__(message, exitcode=exitcode)
+
+
+class GXResultUploadError(AirflowException):
+    """Spooled Validation Results could not be uploaded to GX Cloud.
+
+    Attributes:
+        report: Results uploaded, rejected, and failed, and those left in the spool
+    """
+
+    def __init__(self, report: dict[str, int], spool_dir: str):
+        self.report = report
+        super().__init__(
+            f"{report['failed']} spooled results failed to upload and "
+            f"{report['rejected']} were rejected by GX Cloud; "
+            f"{report['remaining']} are left in {spool_dir}"
+        )
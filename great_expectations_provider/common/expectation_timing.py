@@ -0,0 +1,193 @@
+"""
+Attribute the wall time of a validation run to individual Expectations.
+
+GX resolves the metrics of every Expectation in a suite together, so an Expectation's
+cost is the time spent on the metrics it depends on plus the time spent evaluating its
+result from them. Each directly computed metric is timed on its own; aggregate metrics
+that GX bundles into one query share that query's time equally. A metric that several
+Expectations depend on, such as a table row count, is reported in its own table and its
+time is split equally between those Expectations.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator
+
+from great_expectations_provider.common.gx_phases import (
+    DEPENDENCY_GRAPH,
+    EXPECTATION_EVALUATION,
+    METRIC_RESOLUTION,
+    VALIDATION_DEFINITION,
+    observe_phases,
+    phases_supported,
+)
+
+EXPECTATION_TIMINGS_KEY = "expectation_timings"
+DOMAIN_KWARGS = ("column", "column_A", "column_B", "column_list")
+
+# (validation definition name, expectation type, kwargs)
+ExpectationKey = tuple[Any, str, str]
+
+
+def _round(seconds: float) -> float:
+    return round(seconds, 6)
+
+
+def _expectation_key(
+    validation_definition: str | None, configuration: Any
+) -> ExpectationKey:
+    # the batch ID is added to the kwargs during validation
+    kwargs = {
+        key: value for key, value in configuration.kwargs.items() if key != "batch_id"
+    }
+    return (
+        validation_definition,
+        configuration.type,
+        json.dumps(kwargs, sort_keys=True, default=str),
+    )
+
+
+def _metric_domain(metric_configuration: Any) -> str:
+    domain_kwargs = metric_configuration.metric_domain_kwargs or {}
+    for key in DOMAIN_KWARGS:
+        if key in domain_kwargs:
+            return str(domain_kwargs[key])
+    return "table"
+
+
+class ExpectationTimer:
+    """Record the time spent on each Expectation, and on the metrics they share.
+
+    When disabled every method is a no-op, so operators can use the timer unconditionally.
+    The timer is also disabled when the installed GX does not support observing the phases.
+
+    Args:
+        enabled: whether to record timings.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled and phases_supported()
+        self._validation_definition: str | None = None
+        # metric ID -> Expectations depending on it
+        self._dependents: defaultdict[Any, set[ExpectationKey]] = defaultdict(set)
+        self._expectation_metrics: dict[ExpectationKey, set[Any]] = {}
+        self._metric_seconds: defaultdict[Any, float] = defaultdict(float)
+        self._metric_info: dict[Any, dict[str, Any]] = {}
+        self._evaluation_seconds: defaultdict[ExpectationKey, float] = defaultdict(
+            float
+        )
+        self._phase_seconds: defaultdict[str, float] = defaultdict(float)
+
+    def _record_dependencies(self, expectation_validation_graphs: list[Any]) -> None:
+        for expectation_validation_graph in expectation_validation_graphs:
+            key = _expectation_key(
+                self._validation_definition, expectation_validation_graph.configuration
+            )
+            metric_ids = self._expectation_metrics.setdefault(key, set())
+            for edge in expectation_validation_graph.graph.edges:
+                for metric_configuration in (edge.left, edge.right):
+                    if metric_configuration is None:
+                        continue
+                    metric_ids.add(metric_configuration.id)
+                    self._dependents[metric_configuration.id].add(key)
+
+    def _record_metrics(
+        self, metric_configurations: list[Any], bundled: bool, seconds: float
+    ) -> None:
+        share = seconds / len(metric_configurations)
+        for metric_configuration in metric_configurations:
+            self._metric_seconds[metric_configuration.id] += share
+            self._metric_info[metric_configuration.id] = {
+                "metric_name": metric_configuration.metric_name,
+                "domain": _metric_domain(metric_configuration),
+                "bundled": bundled,
+            }
+
+    @contextmanager
+    def _observe(self, phase: str, info: dict[str, Any]) -> Iterator[None]:
+        if phase == VALIDATION_DEFINITION:
+            self._validation_definition = info["name"]
+            try:
+                yield
+            finally:
+                self._validation_definition = None
+            return
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+        self._phase_seconds[phase] += seconds
+        if phase == DEPENDENCY_GRAPH:
+            expectation_validation_graphs, _, _ = info["result"]
+            self._record_dependencies(expectation_validation_graphs)
+        elif phase == METRIC_RESOLUTION:
+            self._record_metrics(
+                info["metric_configurations"], info["bundled"], seconds
+            )
+        elif phase == EXPECTATION_EVALUATION:
+            key = _expectation_key(self._validation_definition, info["configuration"])
+            self._evaluation_seconds[key] += seconds
+
+    def track(self) -> ContextManager[None]:
+        """Record the time of each Expectation validated in the enclosed block."""
+        if not self.enabled:
+            return nullcontext()
+        return observe_phases(self._observe)
+
+    def _expectation_rows(self) -> list[dict[str, Any]]:
+        rows = []
+        for key in self._expectation_metrics.keys() | self._evaluation_seconds.keys():
+            validation_definition, expectation_type, kwargs = key
+            own_seconds = shared_seconds = 0.0
+            for metric_id in self._expectation_metrics.get(key, ()):
+                dependents = len(self._dependents[metric_id])
+                if dependents > 1:
+                    shared_seconds += self._metric_seconds[metric_id] / dependents
+                else:
+                    own_seconds += self._metric_seconds[metric_id]
+            evaluation_seconds = self._evaluation_seconds[key]
+            row = {
+                "expectation_type": expectation_type,
+                "kwargs": json.loads(kwargs),
+                "total_seconds": _round(
+                    own_seconds + shared_seconds + evaluation_seconds
+                ),
+                "own_metric_seconds": _round(own_seconds),
+                "shared_metric_seconds": _round(shared_seconds),
+                "evaluation_seconds": _round(evaluation_seconds),
+            }
+            if validation_definition is not None:
+                row["validation_definition"] = validation_definition
+            rows.append(row)
+        return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+    def _shared_metric_rows(self) -> list[dict[str, Any]]:
+        rows = [
+            {
+                **self._metric_info[metric_id],
+                "seconds": _round(seconds),
+                "expectation_count": len(self._dependents[metric_id]),
+            }
+            for metric_id, seconds in self._metric_seconds.items()
+            if len(self._dependents[metric_id]) > 1
+        ]
+        return sorted(rows, key=lambda row: row["seconds"], reverse=True)
+
+    def report(self) -> dict[str, Any] | None:
+        """Timing tables, slowest first, or None when disabled.
+
+        `expectations` lists each Expectation's total time, split into the metrics only it
+        depends on, its equal share of shared metrics, and evaluating its result;
+        `shared_metrics` lists the metrics several Expectations depend on.
+        """
+        if not self.enabled:
+            return None
+        return {
+            "metric_resolution_seconds": _round(self._phase_seconds[METRIC_RESOLUTION]),
+            "dependency_graph_seconds": _round(self._phase_seconds[DEPENDENCY_GRAPH]),
+            "expectations": self._expectation_rows(),
+            "shared_metrics": self._shared_metric_rows(),
+        }
@@ -4,8 +4,9 @@ from Airflow connections.
 """
 
 import logging
+import math
 from pathlib import Path
-from typing import Literal, Optional, Union
+from typing import Any, Callable, Literal, Optional, Union
 from urllib.parse import quote_plus, urlencode
 
 try:  # airflow 3
@@ -19,8 +20,23 @@ except ImportError:  # airflow 2
 
 from pydantic import BaseModel, Field
 
+from great_expectations_provider.common.read_replicas import select_host
+
 logger = logging.getLogger(__name__)
 
+# connection extras read by build_engine_kwargs rather than put in connection strings
+ENGINE_EXTRAS = ("stream_results", "fetch_size", "statement_timeout_seconds")
+# connection types whose SQLAlchemy dialects fetch rows through server-side cursors
+STREAMING_CONNECTION_TYPES = ("postgres", "redshift", "mysql", "trino")
+# connection types whose databases can cancel statements running longer than a timeout
+STATEMENT_TIMEOUT_CONNECTION_TYPES = (
+    "postgres",
+    "redshift",
+    "mysql",
+    "trino",
+    "snowflake",
+)
+
 
 class SnowflakeUriConnection(BaseModel):
     """Pydantic model for URI-based Snowflake connection."""
@@ -85,6 +101,10 @@ def build_mysql_connection_string(conn_id: str, schema: Optional[str] = None) ->
     """
     Build connection string for MySQL connections.
 
+    Read replicas listed in the `read_replicas` connection extra are connected to instead of
+    the host of the connection, chosen by the `replica_policy` extra, as described in
+    `great_expectations_provider.common.read_replicas`.
+
     Args:
         conn_id: Airflow connection ID
         schema: Optional schema override
@@ -103,15 +123,20 @@ def build_mysql_connection_string(conn_id: str, schema: Optional[str] = None) ->
             f"Schema/database name is required for MySQL connection: {conn_id}"
         )
 
-    return (
-        f"mysql://{conn.login}:{conn.password}@{conn.host}:{conn.port}/{database_name}"
+    host, port = select_host(
+        conn_id, conn.host, conn.port, conn.extra_dejson, default_port=3306
     )
+    return f"mysql://{conn.login}:{conn.password}@{host}:{port}/{database_name}"
 
 
 def build_mssql_connection_string(conn_id: str, schema: Optional[str] = None) -> str:
     """
     Build connection string for Microsoft SQL Server connections.
 
+    Read replicas listed in the `read_replicas` connection extra are connected to instead of
+    the host of the connection, chosen by the `replica_policy` extra, as described in
+    `great_expectations_provider.common.read_replicas`.
+
     Args:
         conn_id: Airflow connection ID
         schema: Optional schema override
@@ -130,9 +155,12 @@ def build_mssql_connection_string(conn_id: str, schema: Optional[str] = None) ->
     ms_driver = conn.extra_dejson.get("driver", "ODBC Driver 17 for SQL Server")
     driver_param = f"?driver={ms_driver}"
 
+    host, port = select_host(
+        conn_id, conn.host, conn.port, conn.extra_dejson, default_port=1433
+    )
     return (
         f"mssql+pyodbc://{conn.login}:{conn.password}@"
-        f"{conn.host}:{conn.port}/{database_name}{driver_param}"
+        f"{host}:{port}/{database_name}{driver_param}"
     )
 
 
@@ -140,6 +168,10 @@ def build_postgres_connection_string(conn_id: str, schema: Optional[str] = None)
     """
     Build connection string for PostgreSQL connections.
 
+    Read replicas listed in the `read_replicas` connection extra are connected to instead of
+    the host of the connection, chosen by the `replica_policy` extra, as described in
+    `great_expectations_provider.common.read_replicas`.
+
     Args:
         conn_id: Airflow connection ID
         schema: Optional schema override (used as database name)
@@ -159,9 +191,12 @@ def build_postgres_connection_string(conn_id: str, schema: Optional[str] = None)
             "See: https://airflow.apache.org/docs/apache-airflow-providers-postgres/stable/connections/postgres.html"
         )
 
+    host, port = select_host(
+        conn_id, conn.host, conn.port, conn.extra_dejson, default_port=5432
+    )
     return (
         f"postgresql+psycopg2://{conn.login}:{conn.password}@"
-        f"{conn.host}:{conn.port}/{postgres_database}"
+        f"{host}:{port}/{postgres_database}"
     )
 
 
@@ -411,6 +446,17 @@ def build_sqlite_connection_string(conn_id: str) -> str:
     return f"sqlite:///{conn.host}"
 
 
+def _positive_number(
+    extras: dict[str, Any], key: str, conn_id: str, cast: Callable[[Any], Any]
+) -> Any:
+    value = extras.get(key)
+    if value is None:
+        return None
+    if cast(value) <= 0:
+        raise ValueError(f"{key} must be a positive number for connection: {conn_id}")
+    return cast(value)
+
+
 def build_aws_connection_string(
     conn_id: str,
     schema: Optional[str] = None,
@@ -421,6 +467,16 @@ def build_aws_connection_string(
     """
     Build connection string for AWS connections (currently supports Athena).
 
+    These optional connection extras configure the Athena queries:
+
+    - `work_group` (or `workgroup`): workgroup the queries run in. Its query result
+      location is used when no `s3_path` is given.
+    - `result_reuse_minutes`: reuse the results of an identical query run within that
+      many minutes, instead of scanning S3 again.
+    - `poll_interval`: seconds between polls of a running query's state. Defaults to 1.
+    - `unload`: if true, fetch results through `UNLOAD` as Parquet, with the PyAthena
+      pandas cursor, which requires `pyarrow`.
+
     Args:
         conn_id: Airflow connection ID
         schema: Optional schema override
@@ -432,23 +488,43 @@ def build_aws_connection_string(
         Connection string for AWS Athena
 
     Raises:
-        ValueError: If connection doesn't exist or required parameters are missing
+        ValueError: If connection doesn't exist, required parameters are missing, or
+            `result_reuse_minutes` or `poll_interval` is not positive
     """
     conn = get_connection_by_id(conn_id=conn_id)
 
-    if not s3_path:
+    extras = conn.extra_dejson
+    work_group = extras.get("work_group") or extras.get("workgroup")
+    if not s3_path and not work_group:
         raise ValueError("s3_path parameter is required for AWS connections")
     if not region:
         raise ValueError("region parameter is required for AWS connections")
 
+    query: dict[str, Any] = {}
+    if work_group:
+        query["work_group"] = work_group
+    result_reuse_minutes = _positive_number(
+        extras, "result_reuse_minutes", conn_id, int
+    )
+    if result_reuse_minutes is not None:
+        query["result_reuse_enable"] = "true"
+        query["result_reuse_minutes"] = result_reuse_minutes
+    poll_interval = _positive_number(extras, "poll_interval", conn_id, float)
+    if poll_interval is not None:
+        query["poll_interval"] = poll_interval
+    # only the PyAthena cursors returning DataFrames can UNLOAD
+    if _is_true(extras.get("unload", False)):
+        driver = "awsathena+pandas"
+        query["unload"] = "true"
+    else:
+        driver = "awsathena+rest"
+
     athena_db = database or schema or conn.schema
+    params = [f"s3_staging_dir={s3_path}"] if s3_path else []
+    if query:
+        params.append(urlencode(query))
 
-    if athena_db:
-        return f"awsathena+rest://@athena.{region}.amazonaws.com/{athena_db}?s3_staging_dir={s3_path}"
-    else:
-        return (
-            f"awsathena+rest://@athena.{region}.amazonaws.com/?s3_staging_dir={s3_path}"
-        )
+    return f"{driver}://@athena.{region}.amazonaws.com/{athena_db or ''}?{'&'.join(params)}"
 
 
 def build_trino_connection_string(
@@ -490,7 +566,164 @@ def build_trino_connection_string(
     if effective_schema:
         path += f"/{effective_schema}"
 
-    extras = {k: v for k, v in conn.extra_dejson.items() if k != "catalog"}
+    extras = {
+        k: v
+        for k, v in conn.extra_dejson.items()
+        if k != "catalog" and k not in ENGINE_EXTRAS
+    }
     query = f"?{urlencode(extras)}" if extras else ""
 
     return f"trino://{userinfo}{host_port}{path}{query}"
+
+
+def _is_true(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value)
+
+
+def statement_timeout_connect_args(conn_type: str, seconds: float) -> dict[str, Any]:
+    """
+    DBAPI connect arguments that make the database cancel statements running longer than `seconds`.
+
+    Each database takes the timeout as its own session setting: `statement_timeout` on
+    Postgres and Redshift, `max_execution_time` on MySQL, the `query_max_run_time` session
+    property on Trino, and the `STATEMENT_TIMEOUT_IN_SECONDS` session parameter on Snowflake.
+
+    Args:
+        conn_type: Airflow connection type, one of `STATEMENT_TIMEOUT_CONNECTION_TYPES`
+        seconds: the timeout
+
+    Raises:
+        ValueError: If the connection type has no statement timeout
+    """
+    milliseconds = math.ceil(seconds * 1000)
+    if conn_type in ("postgres", "redshift"):
+        return {"options": f"-c statement_timeout={milliseconds}"}
+    if conn_type == "mysql":
+        return {"init_command": f"SET SESSION max_execution_time={milliseconds}"}
+    if conn_type == "trino":
+        return {"session_properties": {"query_max_run_time": f"{milliseconds}ms"}}
+    if conn_type == "snowflake":
+        return {
+            "session_parameters": {"STATEMENT_TIMEOUT_IN_SECONDS": math.ceil(seconds)}
+        }
+    raise ValueError(f"Connection type {conn_type!r} has no statement timeout")
+
+
+def build_engine_kwargs(conn_id: str) -> dict[str, Any]:
+    """
+    Build SQLAlchemy engine arguments for an Airflow connection.
+
+    For Postgres, Redshift, MySQL, and Trino connections, the `stream_results` and
+    `fetch_size` connection extras set the execution options of the engine: with
+    `stream_results`, rows are fetched through a server-side cursor instead of being
+    buffered client-side in full, and `fetch_size` bounds the rows buffered at a time. On
+    MySQL the server-side cursor is an unbuffered `SSCursor`, which blocks its connection
+    for other queries until all its rows are read or it is closed.
+
+    For Postgres, Redshift, MySQL, Trino, and Snowflake connections, the
+    `statement_timeout_seconds` connection extra sets the connect arguments of the engine
+    so that the database cancels any statement running longer, as described in
+    `statement_timeout_connect_args`. Operators raise `GXStatementTimeout` when an
+    expectation fails because its query was cancelled.
+
+    The extras take effect only through these arguments: the connection string builders
+    leave them out. `GXValidateSQLTablesOperator` applies them to the Data Source it builds;
+    pass them as the `kwargs` of the SQL Data Sources built for other operators.
+
+    Args:
+        conn_id: Airflow connection ID
+
+    Returns:
+        Keyword arguments for `sqlalchemy.create_engine`, empty if the extras set none
+
+    Raises:
+        ValueError: If connection doesn't exist, or `fetch_size` or
+            `statement_timeout_seconds` is not positive
+    """
+    conn = get_connection_by_id(conn_id=conn_id)
+
+    extras = conn.extra_dejson
+    engine_kwargs: dict[str, Any] = {}
+    stream_results = _is_true(extras.get("stream_results", False))
+    fetch_size = extras.get("fetch_size")
+    if stream_results or fetch_size is not None:
+        if conn.conn_type in STREAMING_CONNECTION_TYPES:
+            # a fetch size implies streaming, its buffer holds at most that many rows
+            execution_options: dict[str, Any] = {"stream_results": True}
+            if fetch_size is not None:
+                if int(fetch_size) < 1:
+                    raise ValueError(
+                        f"fetch_size must be a positive integer for connection: {conn_id}"
+                    )
+                execution_options["max_row_buffer"] = int(fetch_size)
+            engine_kwargs["execution_options"] = execution_options
+        else:
+            logger.warning(
+                "Ignoring stream_results and fetch_size of connection %s, "
+                "streaming is supported for connection types: %s",
+                conn_id,
+                ", ".join(STREAMING_CONNECTION_TYPES),
+            )
+
+    statement_timeout = _positive_number(
+        extras, "statement_timeout_seconds", conn_id, float
+    )
+    if statement_timeout is not None:
+        if conn.conn_type in STATEMENT_TIMEOUT_CONNECTION_TYPES:
+            engine_kwargs["connect_args"] = statement_timeout_connect_args(
+                conn.conn_type, statement_timeout
+            )
+        else:
+            logger.warning(
+                "Ignoring statement_timeout_seconds of connection %s, "
+                "statement timeouts are supported for connection types: %s",
+                conn_id,
+                ", ".join(STATEMENT_TIMEOUT_CONNECTION_TYPES),
+            )
+    return engine_kwargs
+
+
+def _build_sqlite_connection_string_for_schema(
+    conn_id: str, schema: Optional[str] = None
+) -> str:
+    return build_sqlite_connection_string(conn_id)
+
+
+# Airflow connection types whose connection string needs no more than a schema
+CONNECTION_STRING_BUILDERS: dict[str, Callable[[str, Optional[str]], str]] = {
+    "postgres": build_postgres_connection_string,
+    "redshift": build_redshift_connection_string,
+    "mysql": build_mysql_connection_string,
+    "mssql": build_mssql_connection_string,
+    "snowflake": build_snowflake_connection_string,
+    "gcpbigquery": build_gcpbigquery_connection_string,
+    "sqlite": _build_sqlite_connection_string_for_schema,
+    "trino": build_trino_connection_string,
+}
+
+
+def build_connection_string(conn_id: str, schema: Optional[str] = None) -> str:
+    """
+    Build connection string for an Airflow connection of any supported type.
+
+    Args:
+        conn_id: Airflow connection ID
+        schema: Optional schema override
+
+    Returns:
+        Connection string from the builder for the connection's type
+
+    Raises:
+        ValueError: If connection doesn't exist or its type is not supported
+    """
+    conn = get_connection_by_id(conn_id=conn_id)
+
+    builder = CONNECTION_STRING_BUILDERS.get(conn.conn_type or "")
+    if builder is None:
+        raise ValueError(
+            f"Connection type {conn.conn_type!r} of conn_id {conn_id} is not supported, "
+            f"use one of: {', '.join(CONNECTION_STRING_BUILDERS)}"
+        )
+    return builder(conn_id, schema)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Literal, Union
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Literal, Union
 
+from great_expectations_provider.common.cloud_sessions import cloud_sessions
 from great_expectations_provider.common.constants import USER_AGENT_STR
 
 if TYPE_CHECKING:
-    from great_expectations import ExpectationSuite
+    from great_expectations import ExpectationSuite, ValidationDefinition
     from great_expectations.core.batch_definition import BatchDefinition
     from great_expectations.core.expectation_validation_result import (
         ExpectationSuiteValidationResult,
@@ -16,6 +19,15 @@ if TYPE_CHECKING:
     from great_expectations_provider.hooks.gx_cloud import GXCloudConfig
 
 
+def as_suite(task_id: str, expect: Expectation | ExpectationSuite) -> ExpectationSuite:
+    """The suite validated for `expect`: itself, or a suite named after the task holding it."""
+    import great_expectations as gx
+
+    if isinstance(expect, gx.expectations.Expectation):
+        return gx.ExpectationSuite(name=task_id, expectations=[expect])
+    return expect
+
+
 def run_validation_definition(
     task_id: str,
     expect: Expectation | ExpectationSuite,
@@ -26,18 +38,11 @@ def run_validation_definition(
 ) -> ExpectationSuiteValidationResult:
     """Given a BatchDefinition and an Expectation or ExpectationSuite, ensure a
     ValidationDefinition and run it."""
-    import great_expectations as gx
-
-    if isinstance(expect, gx.expectations.Expectation):
-        suite = gx.ExpectationSuite(name=task_id, expectations=[expect])
-    else:
-        suite = expect
-    validation_definition = gx_context.validation_definitions.add_or_update(
-        validation=gx.ValidationDefinition(
-            name=task_id,
-            suite=suite,
-            data=batch_definition,
-        ),
+    validation_definition = add_or_update_validation_definition(
+        gx_context=gx_context,
+        name=task_id,
+        suite=as_suite(task_id, expect),
+        batch_definition=batch_definition,
     )
     if result_format:
         result = validation_definition.run(
@@ -51,6 +56,145 @@ def run_validation_definition(
     return result
 
 
+def _normalized_expectation(expectation: Expectation) -> dict[str, Any]:
+    # as Expectation equality does, but IDs are assigned by the store and ignored here
+    expectation_dict = expectation.dict(exclude={"id", "rendered_content"})
+    for attribute in ("notes", "meta"):
+        expectation_dict[attribute] = expectation_dict.get(attribute) or None
+    return expectation_dict
+
+
+def suite_fingerprint(suite: ExpectationSuite) -> str:
+    """Hash of a suite: its name, Expectations in order, parameters, notes, and meta.
+
+    IDs and rendered content are ignored, so a suite built in code and the same suite
+    read back from a store have the same fingerprint.
+    """
+    expectations = [
+        json.dumps(_normalized_expectation(expectation), sort_keys=True, default=str)
+        for expectation in suite.expectations
+    ]
+    payload = json.dumps(
+        {
+            "name": suite.name,
+            "expectations": expectations,
+            "suite_parameters": suite.suite_parameters,
+            "notes": suite.notes,
+            "meta": suite.meta,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _add_or_update_suite(
+    gx_context: AbstractDataContext, suite: ExpectationSuite
+) -> ExpectationSuite:
+    from great_expectations.exceptions import DataContextError
+
+    try:
+        existing_suite = gx_context.suites.get(name=suite.name)
+    except DataContextError:
+        return gx_context.suites.add(suite=suite)
+    if suite_fingerprint(existing_suite) == suite_fingerprint(suite):
+        return existing_suite
+    return gx_context.suites.add_or_update(suite=suite)
+
+
+def _datasource_config(datasource: Any) -> str:
+    return json.dumps(datasource.dict(), sort_keys=True, default=str)
+
+
+def _batch_definition_saved(
+    gx_context: AbstractDataContext, batch_definition: BatchDefinition
+) -> bool:
+    # a Batch Definition is saved as part of the config of its Data Source
+    if batch_definition.id is None:
+        return False
+    datasource = batch_definition.data_asset.datasource
+    store = gx_context.datasource_store
+    try:
+        if store.cloud_mode:
+            stored = store.retrieve_by_name(datasource.name)
+        else:
+            # file and ephemeral contexts keep their Data Sources in memory
+            stored = gx_context.data_sources.get(datasource.name)
+    except (KeyError, ValueError):
+        return False
+    return _datasource_config(stored) == _datasource_config(datasource)
+
+
+def add_or_update_validation_definition(
+    gx_context: AbstractDataContext,
+    name: str,
+    suite: ExpectationSuite,
+    batch_definition: BatchDefinition,
+) -> ValidationDefinition:
+    """Ensure a ValidationDefinition of the suite and Batch Definition.
+
+    GX Cloud contexts write only what changed, with
+    `add_or_update_cloud_validation_definition`. Other contexts use
+    `validation_definitions.add_or_update`.
+    """
+    import great_expectations as gx
+    from great_expectations.data_context import CloudDataContext
+
+    if isinstance(gx_context, CloudDataContext):
+        return add_or_update_cloud_validation_definition(
+            gx_context, name, suite, batch_definition
+        )
+    return gx_context.validation_definitions.add_or_update(
+        validation=gx.ValidationDefinition(
+            name=name, suite=suite, data=batch_definition
+        )
+    )
+
+
+def add_or_update_cloud_validation_definition(
+    gx_context: AbstractDataContext,
+    name: str,
+    suite: ExpectationSuite,
+    batch_definition: BatchDefinition,
+) -> ValidationDefinition:
+    """Ensure a ValidationDefinition of the suite and Batch Definition, writing only changes.
+
+    `validation_definitions.add_or_update` writes the suite, the Batch Definition's Data
+    Source, and the ValidationDefinition on every call, and reads each back; with a GX
+    Cloud context each is a request. Here the stored suite, Data Source, and
+    ValidationDefinition are read once, and written only when they differ from the ones
+    given, so changes to the Batch Definition or its asset are saved as they would be by
+    `add_or_update`.
+    """
+    import great_expectations as gx
+    from great_expectations.exceptions import DataContextError
+
+    suite = _add_or_update_suite(gx_context, suite)
+    if not _batch_definition_saved(gx_context, batch_definition):
+        batch_definition.save()
+    try:
+        existing = gx_context.validation_definitions.get(name=name)
+    except DataContextError:
+        return gx_context.validation_definitions.add(
+            validation=gx.ValidationDefinition(
+                name=name, suite=suite, data=batch_definition
+            )
+        )
+    # a ValidationDefinition is stored as the IDs of its suite and Batch Definition
+    if (
+        suite.id is not None
+        and batch_definition.id is not None
+        and existing.suite.id == suite.id
+        and existing.data.id == batch_definition.id
+    ):
+        return existing
+    validation_definition = gx.ValidationDefinition(
+        name=name, suite=suite, data=batch_definition, id=existing.id
+    )
+    validation_definition.save()
+    return validation_definition
+
+
 def load_data_context(
     context_type: Literal["ephemeral", "cloud"],
     gx_cloud_config: Union[GXCloudConfig, None],
@@ -58,15 +202,27 @@ def load_data_context(
     import great_expectations as gx
 
     if context_type == "cloud" and gx_cloud_config:
-        return gx.get_context(
-            mode="cloud",
-            cloud_access_token=gx_cloud_config.cloud_access_token,
-            cloud_organization_id=gx_cloud_config.cloud_organization_id,
-            cloud_workspace_id=gx_cloud_config.cloud_workspace_id,
-            user_agent_str=USER_AGENT_STR,
-        )
+        # the context's stores share the process's keep-alive session to GX Cloud
+        with cloud_sessions.pooling(
+            pool_size=gx_cloud_config.pool_size,
+            max_retries=gx_cloud_config.max_retries,
+            backoff_factor=gx_cloud_config.backoff_factor,
+        ):
+            return gx.get_context(
+                mode="cloud",
+                cloud_access_token=gx_cloud_config.cloud_access_token,
+                cloud_organization_id=gx_cloud_config.cloud_organization_id,
+                cloud_workspace_id=gx_cloud_config.cloud_workspace_id,
+                user_agent_str=USER_AGENT_STR,
+            )
+    elif context_type == "cloud":
+        # CloudDataContext with env vars
+        with cloud_sessions.pooling():
+            return gx.get_context(
+                mode=context_type,
+                user_agent_str=USER_AGENT_STR,
+            )
     else:
-        # EphemeralDataContext or CloudDataContext with env vars
         return gx.get_context(
             mode=context_type,
             user_agent_str=USER_AGENT_STR,
@@ -0,0 +1,82 @@
+"""
+Check the internals of Great Expectations that features of the provider hook into.
+
+A few features observe or change what GX does inside its public calls, such as the phases
+of a validation run, and can only do so by replacing or reading private attributes of GX
+classes. Private attributes may change in any release of GX, so each such feature names
+the attributes it relies on, and is turned off, with a warning, unless the installed GX
+version is within `MIN_GX_VERSION` and `MAX_GX_VERSION`, the versions it was tested with,
+and defines every one of those attributes.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# inclusive lower and exclusive upper bound of the GX versions the internals were tested with
+MIN_GX_VERSION = (1, 7, 0)
+MAX_GX_VERSION = (1, 25, 0)
+
+# feature -> whether its internals are available
+_checked: dict[str, bool] = {}
+_checked_lock = threading.Lock()
+
+
+def _version_tuple(version: str) -> tuple[int, ...]:
+    match = re.match(r"\d+(\.\d+)*", version)
+    if match is None:
+        return ()
+    return tuple(int(part) for part in match.group().split("."))
+
+
+def _missing_attributes(attributes: tuple[tuple[Any, str], ...]) -> list[str]:
+    return [
+        f"{getattr(owner, '__name__', owner)}.{name}"
+        for owner, name in attributes
+        if not hasattr(owner, name)
+    ]
+
+
+def internals_supported(feature: str, *attributes: tuple[Any, str]) -> bool:
+    """Whether the installed GX supports `feature`, which relies on the given internals.
+
+    The outcome is checked once per feature and process, and a warning is logged when the
+    feature is turned off.
+
+    Args:
+        feature: name of the feature, used in the warning.
+        attributes: `(owner, name)` of each class or module attribute the feature relies on.
+    """
+    with _checked_lock:
+        if feature in _checked:
+            return _checked[feature]
+        from great_expectations import __version__
+
+        version = _version_tuple(__version__)
+        if not MIN_GX_VERSION <= version < MAX_GX_VERSION:
+            logger.warning(
+                "%s is turned off: it relies on internals of Great Expectations, tested "
+                "with versions %s to before %s, and %s is installed",
+                feature,
+                ".".join(map(str, MIN_GX_VERSION)),
+                ".".join(map(str, MAX_GX_VERSION)),
+                __version__,
+            )
+            supported = False
+        else:
+            missing = _missing_attributes(attributes)
+            if missing:
+                logger.warning(
+                    "%s is turned off: Great Expectations %s does not define %s",
+                    feature,
+                    __version__,
+                    ", ".join(missing),
+                )
+            supported = not missing
+        _checked[feature] = supported
+        return supported
@@ -0,0 +1,246 @@
+"""
+Observe the phases of a Great Expectations validation run.
+
+GX loads the Batch lazily, the first time its Validator needs it, and then computes
+every metric in one graph. Both happen inside `ValidationDefinition.run`, which
+`Checkpoint.run` calls once per Validation Definition, so the operators cannot wrap them
+directly. Instead GX is wrapped once, on first use, at those boundaries, and each wrapper
+notifies the observers registered by `observe_phases` in the current context. Without
+registered observers the wrappers only look up an empty context variable.
+
+The boundaries are private methods of GX, so phases are observed only with the GX versions
+`great_expectations_provider.common.gx_internals` supports. With other versions GX is left
+as it is, and `observe_phases` observes nothing.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import inspect
+import threading
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, ContextManager, Iterator
+
+from great_expectations_provider.common.gx_internals import internals_supported
+
+VALIDATION_DEFINITION = "validation_definition"
+BATCH_LOADING = "batch_loading"
+METRIC_COMPUTATION = "metric_computation"
+RESULT_SERIALIZATION = "result_serialization"
+# finer grained phases inside metric computation
+DEPENDENCY_GRAPH = "dependency_graph"
+METRIC_RESOLUTION = "metric_resolution"
+EXPECTATION_EVALUATION = "expectation_evaluation"
+
+# Called with the phase name and a dict describing the phase. The dict holds the phase
+# inputs when the returned context manager is entered; the validation definition, metric
+# computation, and dependency graph phases add their output under "result" before it exits.
+# The validation definition phase also holds its "batch_definition" and "batch_parameters".
+PhaseObserver = Callable[[str, dict[str, Any]], ContextManager[Any]]
+
+_observers: ContextVar[tuple[PhaseObserver, ...]] = ContextVar(
+    "gx_phase_observers", default=()
+)
+_install_lock = threading.Lock()
+_installed = False
+
+
+@contextmanager
+def notify_phase(phase: str, **info: Any) -> Iterator[dict[str, Any]]:
+    """Run the enclosed block as `phase` for every registered observer.
+
+    Yields the info dict passed to the observers, so the block can record its output.
+    """
+    observers = _observers.get()
+    if not observers:
+        yield info
+        return
+    with ExitStack() as stack:
+        for observer in observers:
+            stack.enter_context(observer(phase, info))
+        yield info
+
+
+def _install() -> bool:
+    global _installed
+    with _install_lock:
+        if _installed:
+            return True
+        from great_expectations.core.validation_definition import (
+            ValidationDefinition,
+        )
+        from great_expectations.execution_engine.execution_engine import (
+            ExecutionEngine,
+        )
+        from great_expectations.expectations.expectation import Expectation
+        from great_expectations.validator.v1_validator import Validator
+        from great_expectations.validator.validator import Validator as GraphValidator
+
+        if not internals_supported(
+            "Observing validation phases",
+            (Validator, "_wrapped_validator"),
+            (Validator, "_validate_expectation_configs"),
+            (
+                GraphValidator,
+                "_generate_metric_dependency_subgraphs_for_each_expectation_configuration",
+            ),
+            (
+                ExecutionEngine,
+                "_process_direct_and_bundled_metric_computation_configurations",
+            ),
+            (Expectation, "metrics_validate"),
+            (ValidationDefinition, "run"),
+        ):
+            return False
+
+        # the wrapped validator is built, and the Batch loaded, on first access
+        wrapped_validator = inspect.getattr_static(Validator, "_wrapped_validator")
+
+        def is_built(validator: Any) -> bool:
+            # GX caches the built validator in an attribute, or in the instance
+            # dict on versions where this is a cached_property
+            return getattr(
+                validator, "_wrapped_validator_cache", None
+            ) is not None or "_wrapped_validator" in vars(validator)
+
+        def get_wrapped_validator(self: Any) -> Any:
+            if is_built(self) or not _observers.get():
+                return wrapped_validator.__get__(self, type(self))
+            with notify_phase(BATCH_LOADING):
+                return wrapped_validator.__get__(self, type(self))
+
+        validate_expectation_configs = Validator._validate_expectation_configs
+
+        def observed_validate_expectation_configs(
+            self: Any, expectation_configs: list, *args: Any, **kwargs: Any
+        ) -> Any:
+            if not _observers.get():
+                return validate_expectation_configs(
+                    self, expectation_configs, *args, **kwargs
+                )
+            # load the Batch first so its cost is not attributed to metric computation
+            get_wrapped_validator(self)
+            with notify_phase(
+                METRIC_COMPUTATION, expectation_count=len(expectation_configs)
+            ) as info:
+                info["result"] = validate_expectation_configs(
+                    self, expectation_configs, *args, **kwargs
+                )
+            return info["result"]
+
+        run_validation_definition = ValidationDefinition.run
+
+        def observed_run(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not _observers.get():
+                return run_validation_definition(self, *args, **kwargs)
+            with notify_phase(
+                VALIDATION_DEFINITION,
+                name=self.name,
+                suite_name=self.suite.name,
+                expectation_count=len(self.suite.expectations),
+                batch_definition=self.batch_definition,
+                batch_parameters=kwargs.get("batch_parameters"),
+            ) as info:
+                info["result"] = run_validation_definition(self, *args, **kwargs)
+            return info["result"]
+
+        generate_dependency_graphs = GraphValidator._generate_metric_dependency_subgraphs_for_each_expectation_configuration
+
+        def observed_generate_dependency_graphs(
+            self: Any, *args: Any, **kwargs: Any
+        ) -> Any:
+            if not _observers.get():
+                return generate_dependency_graphs(self, *args, **kwargs)
+            with notify_phase(DEPENDENCY_GRAPH) as info:
+                info["result"] = generate_dependency_graphs(self, *args, **kwargs)
+            return info["result"]
+
+        process_metric_computations = ExecutionEngine._process_direct_and_bundled_metric_computation_configurations
+
+        def timed_metric_fn(configuration: Any) -> Any:
+            def metric_fn(**kwargs: Any) -> Any:
+                with notify_phase(
+                    METRIC_RESOLUTION,
+                    metric_configurations=[configuration.metric_configuration],
+                    bundled=False,
+                ):
+                    return configuration.metric_fn(**kwargs)
+
+            return dataclasses.replace(configuration, metric_fn=metric_fn)
+
+        def observed_process_metric_computations(
+            self: Any,
+            metric_fn_direct_configurations: list,
+            metric_fn_bundle_configurations: list,
+        ) -> Any:
+            if not _observers.get():
+                return process_metric_computations(
+                    self,
+                    metric_fn_direct_configurations,
+                    metric_fn_bundle_configurations,
+                )
+            # direct metrics are computed one at a time, bundled metrics in one query
+            resolved_metrics = process_metric_computations(
+                self,
+                [timed_metric_fn(c) for c in metric_fn_direct_configurations],
+                [],
+            )
+            if metric_fn_bundle_configurations:
+                with notify_phase(
+                    METRIC_RESOLUTION,
+                    metric_configurations=[
+                        c.metric_configuration for c in metric_fn_bundle_configurations
+                    ],
+                    bundled=True,
+                ):
+                    resolved_metrics.update(
+                        process_metric_computations(
+                            self, [], metric_fn_bundle_configurations
+                        )
+                    )
+            return resolved_metrics
+
+        metrics_validate = Expectation.metrics_validate
+
+        def observed_metrics_validate(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not _observers.get():
+                return metrics_validate(self, *args, **kwargs)
+            with notify_phase(EXPECTATION_EVALUATION, configuration=self.configuration):
+                return metrics_validate(self, *args, **kwargs)
+
+        GraphValidator._generate_metric_dependency_subgraphs_for_each_expectation_configuration = observed_generate_dependency_graphs  # type: ignore[method-assign]
+        ExecutionEngine._process_direct_and_bundled_metric_computation_configurations = observed_process_metric_computations  # type: ignore[method-assign]
+        Expectation.metrics_validate = observed_metrics_validate  # type: ignore[method-assign]
+        Validator._wrapped_validator = property(get_wrapped_validator)  # type: ignore[method-assign,assignment]
+        Validator._validate_expectation_configs = observed_validate_expectation_configs  # type: ignore[method-assign]
+        ValidationDefinition.run = observed_run  # type: ignore[method-assign]
+        _installed = True
+        return True
+
+
+def phases_supported() -> bool:
+    """Whether the installed GX supports observing the phases of a validation run."""
+    return _install()
+
+
+@contextmanager
+def observe_phases(observer: PhaseObserver) -> Iterator[None]:
+    """Call `observer(phase, info)` around each validation phase run in the enclosed block.
+
+    `observer` returns a context manager entered for the duration of the phase, which is
+    one of `validation_definition`, `batch_loading`, or `metric_computation`, or, within
+    metric computation, `dependency_graph`, `metric_resolution` (once per directly computed
+    metric and once per bundle of aggregate metrics computed in one query), or
+    `expectation_evaluation` (once per Expectation).
+
+    Nothing is observed when the installed GX does not support it, see `phases_supported`.
+    """
+    if not _install():
+        yield
+        return
+    token = _observers.set((*_observers.get(), observer))
+    try:
+        yield
+    finally:
+        _observers.reset(token)
@@ -0,0 +1,224 @@
+"""
+Compose the instrumentation an operator applies to a validation run.
+
+Each validating operator can bound its run with a time budget, observe it with the memory,
+Expectation, GX Cloud, and Athena trackers, a tracer, and a profiler, spool its result
+upload, and cache its metrics. `ValidationInstrumentation` builds all of them from the
+operator's arguments, enters them around the run, and merges their reports into the value
+pushed to XCom, so each operator only runs its own validation. Instrumentation an operator
+has no arguments for, such as Athena query tracking on DataFrames, stays disabled. A failed
+result is raised as the exception matching what its instrumentation recorded, with
+`validation_failure`.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, cast
+
+from great_expectations_provider.common.athena_queries import (
+    ATHENA_QUERIES_KEY,
+    AthenaQueryTracker,
+)
+from great_expectations_provider.common.cloud_calls import (
+    CLOUD_CALLS_KEY,
+    CloudCallTracker,
+)
+from great_expectations_provider.common.errors import (
+    GXStatementTimeout,
+    GXTimeBudgetExceeded,
+    GXValidationFailed,
+    record_statement_timeouts,
+    timed_out_expectations,
+)
+from great_expectations_provider.common.expectation_timing import (
+    EXPECTATION_TIMINGS_KEY,
+    ExpectationTimer,
+)
+from great_expectations_provider.common.gx_phases import RESULT_SERIALIZATION
+from great_expectations_provider.common.memory import MEMORY_USAGE_KEY, MemoryTracker
+from great_expectations_provider.common.metric_cache import (
+    DEFAULT_MAX_ENTRIES,
+    METRIC_CACHE_KEY,
+    MetricCache,
+)
+from great_expectations_provider.common.profiling import profile_validation
+from great_expectations_provider.common.result_spool import (
+    SPOOLED_RESULTS_KEY,
+    ResultSpool,
+)
+from great_expectations_provider.common.time_budget import (
+    TIME_BUDGET_KEY,
+    TimeBudget,
+)
+from great_expectations_provider.common.tracing import ValidationTracer
+from great_expectations_provider.common.xcom import truncate_result_for_xcom
+
+if TYPE_CHECKING:
+    from great_expectations.checkpoint.checkpoint import CheckpointDescriptionDict
+
+    from great_expectations_provider.common.xcom import ResultDict
+
+
+def validation_failure(
+    validation_result_dict: dict[str, Any] | CheckpointDescriptionDict, task_id: str
+) -> GXValidationFailed:
+    """The exception to raise for a failed validation result.
+
+    GXStatementTimeout if queries of its expectations exceeded the statement timeout,
+    GXTimeBudgetExceeded if its time budget left expectations unevaluated or sampled,
+    GXValidationFailed otherwise.
+    """
+    timed_out = timed_out_expectations(validation_result_dict)
+    if timed_out:
+        return GXStatementTimeout(validation_result_dict, task_id, timed_out=timed_out)
+    time_budget = cast("dict[str, Any]", validation_result_dict).get(TIME_BUDGET_KEY)
+    if time_budget:
+        return GXTimeBudgetExceeded(
+            validation_result_dict, task_id, time_budget=time_budget
+        )
+    return GXValidationFailed(validation_result_dict, task_id)
+
+
+def runs_in_task_process(operator: Any) -> bool:
+    """Whether the operator's arguments require validating in the task process.
+
+    Instrumentation observes the task process, and the validation service applies no
+    resource limits, time budgets, result spooling, metric caching, or skipping of
+    unchanged Batches.
+    """
+    return bool(
+        operator.profile
+        or operator.track_memory
+        or operator.tracing
+        or operator.time_expectations
+        or operator.track_cloud_calls
+        or getattr(operator, "track_athena_queries", False)
+        or operator.isolation == "subprocess"
+        or operator.time_budget is not None
+        or operator.result_upload == "spool"
+        or getattr(operator, "metric_cache", False)
+        or getattr(operator, "skip_unchanged", False)
+    )
+
+
+class ValidationInstrumentation:
+    """The time budget, trackers, tracer, profiler, result spool, and metric cache of one run.
+
+    Each is configured from the arguments of `operator` and is a no-op when disabled, so
+    operators use the instrumentation unconditionally.
+
+    Args:
+        operator: the validating operator.
+        ti: the Airflow task instance, whose map index and try number name profiles.
+    """
+
+    def __init__(self, operator: Any, ti: Any = None) -> None:
+        self.task_id = operator.task_id
+        self.operator_name = type(operator).__name__
+        self.ti = ti
+        self.profile = operator.profile
+        self.profile_dir = operator.profile_dir
+        self.budget = TimeBudget(
+            operator.time_budget,
+            action=operator.time_budget_action,
+            sample_fraction=operator.time_budget_sample_fraction,
+        )
+        self.memory = MemoryTracker(enabled=operator.track_memory)
+        self.timer = ExpectationTimer(enabled=operator.time_expectations)
+        self.cloud_calls = CloudCallTracker(enabled=operator.track_cloud_calls)
+        self.athena_queries = AthenaQueryTracker(
+            enabled=getattr(operator, "track_athena_queries", False)
+        )
+        self.tracer = ValidationTracer(enabled=operator.tracing, task_id=self.task_id)
+        self.spool = ResultSpool(
+            operator.result_spool_dir, enabled=operator.result_upload == "spool"
+        )
+        self.metric_cache = MetricCache(
+            getattr(operator, "metric_cache_path", None),
+            max_entries=getattr(
+                operator, "metric_cache_max_entries", DEFAULT_MAX_ENTRIES
+            ),
+            version_column=getattr(operator, "metric_cache_version_column", None),
+            enabled=getattr(operator, "metric_cache", False),
+        )
+
+    @contextmanager
+    def tracking(self) -> Iterator[None]:
+        """Instrument the whole run in the enclosed block, from loading the Data Context to describing the result."""
+        with (
+            self.cloud_calls.track(),
+            self.athena_queries.track(),
+            self.spool.spooling(),
+            self.metric_cache.caching(),
+            self.tracer.track(operator=self.operator_name),
+            self.memory.track(),
+        ):
+            yield
+
+    @contextmanager
+    def validating(self) -> Iterator[None]:
+        """Profile, time, and budget the Validation Definitions or Checkpoint run in the enclosed block."""
+        with (
+            profile_validation(
+                enabled=self.profile,
+                task_id=self.task_id,
+                profile_dir=self.profile_dir,
+                ti=self.ti,
+            ),
+            self.timer.track(),
+            self.budget.track(),
+        ):
+            yield
+
+    def describe(self, result: Any) -> ResultDict:
+        """Describe a Validation or Checkpoint Result as the result serialization phase."""
+        with self.memory.phase(RESULT_SERIALIZATION):
+            with self.tracer.span(RESULT_SERIALIZATION) as span:
+                result_dict = result.describe_dict()
+                record_statement_timeouts(result, result_dict)
+                self.budget.mark_incomplete(result_dict)
+                self.tracer.record_result(span, result_dict)
+        return result_dict
+
+    def succeeded(self, result: Any) -> bool:
+        """Whether the result succeeded and evaluated its whole suite."""
+        return bool(result.success) and not self.budget.incomplete
+
+    def reports(self) -> dict[str, Any]:
+        """The reports of the enabled instrumentation, by the XCom key each is pushed under."""
+        reports = {
+            MEMORY_USAGE_KEY: self.memory.report(),
+            EXPECTATION_TIMINGS_KEY: self.timer.report(),
+            TIME_BUDGET_KEY: self.budget.report(),
+            CLOUD_CALLS_KEY: self.cloud_calls.report(),
+            ATHENA_QUERIES_KEY: self.athena_queries.report(),
+            SPOOLED_RESULTS_KEY: self.spool.report(),
+            METRIC_CACHE_KEY: self.metric_cache.report(),
+        }
+        return {key: report for key, report in reports.items() if report is not None}
+
+    def emit_metrics(self) -> None:
+        """Emit the metrics of the enabled trackers, tagged with the task ID."""
+        for tracker in (
+            self.memory,
+            self.cloud_calls,
+            self.athena_queries,
+            self.metric_cache,
+        ):
+            tracker.emit_metrics(self.task_id)
+
+    def xcom_value(
+        self, result_dict: ResultDict, max_xcom_bytes: int | None
+    ) -> dict[str, Any]:
+        """The value to push to XCom: the result and the reports, within `max_xcom_bytes`.
+
+        The limit applies to the whole value, so the tables of the reports may be dropped
+        as well as the details of the result. Call it once the block of `tracking` has
+        exited, when the result spool and the metric cache have written their last
+        entries. The metrics are emitted too.
+        """
+        reports = self.reports()
+        xcom_value = {**result_dict, **reports} if reports else result_dict
+        self.emit_metrics()
+        return truncate_result_for_xcom(xcom_value, max_xcom_bytes, report_keys=reports)
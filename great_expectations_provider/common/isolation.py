@@ -0,0 +1,233 @@
+"""
+Run a validation in a child process with memory and CPU time limits.
+
+A validation that runs out of memory in the task process can take the whole worker down
+with it. In a forked child with `RLIMIT_AS` and `RLIMIT_CPU` set, it instead fails its
+own allocations, or is stopped by `SIGXCPU`, and the task fails with an error naming the
+limit. The child sends its result back pickled, in chunks over a pipe, after a header
+giving its length, so that a result cut short by a `MemoryError` is discarded in favour of
+the error sent after it; errors raised by the validation are re-raised in the task process.
+
+The child is forked, so the configuration callables need not be importable or picklable.
+Only the result, and any error, cross the process boundary. Limits require a POSIX system.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+import signal
+import traceback
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from great_expectations_provider.common.errors import (
+    GXResourceLimitExceeded,
+    GXValidationProcessError,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+T = TypeVar("T")
+
+ISOLATION_MODES = ("none", "subprocess")
+CHUNK_BYTES = 1 << 20
+# the first byte of every message over the pipe: a payload's header, or one of its chunks
+_HEADER = b"H"
+_CHUNK = b"C"
+# seconds between the soft CPU limit, which sends SIGXCPU, and the hard limit's SIGKILL
+CPU_HARD_LIMIT_GRACE = 5
+
+
+def format_bytes(size: int) -> str:
+    """Format a size as the largest binary unit that keeps it at least 1, e.g. `6 GiB`."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024:
+            break
+        value /= 1024
+    else:
+        unit = "TiB"
+    return f"{value:.3g} {unit}"
+
+
+def transferable_error(error: BaseException) -> BaseException | None:
+    """Return `error` if it can be pickled and rebuilt in another process, otherwise None.
+
+    Exceptions whose __init__ takes other arguments than it passes on cannot be rebuilt.
+    """
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return None
+    return error
+
+
+def check_isolation(
+    isolation: str, max_memory_bytes: int | None, max_cpu_seconds: int | None
+) -> None:
+    """Validate an operator's isolation arguments.
+
+    Raises:
+        ValueError: if the isolation mode is unknown or unsupported on this system, or
+            if limits are given without subprocess isolation.
+    """
+    if isolation not in ISOLATION_MODES:
+        raise ValueError(
+            f"Parameter `isolation` must be one of {', '.join(ISOLATION_MODES)}, "
+            f"got {isolation!r}"
+        )
+    if isolation == "subprocess" and not hasattr(os, "fork"):
+        raise ValueError("Subprocess isolation requires a system that supports fork")
+    if isolation != "subprocess" and (
+        max_memory_bytes is not None or max_cpu_seconds is not None
+    ):
+        raise ValueError(
+            "Parameters `max_memory_bytes` and `max_cpu_seconds` require "
+            "`isolation` to be `subprocess`"
+        )
+
+
+def _apply_limits(max_memory_bytes: int | None, max_cpu_seconds: int | None) -> None:
+    import resource
+
+    if max_memory_bytes is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+    if max_cpu_seconds is not None:
+        resource.setrlimit(
+            resource.RLIMIT_CPU,
+            (max_cpu_seconds, max_cpu_seconds + CPU_HARD_LIMIT_GRACE),
+        )
+
+
+def _send(conn: Connection, payload: dict[str, Any]) -> None:
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    conn.send_bytes(_HEADER + len(data).to_bytes(8, "big"))
+    for start in range(0, len(data), CHUNK_BYTES):
+        conn.send_bytes(_CHUNK + data[start : start + CHUNK_BYTES])
+
+
+def _child(
+    conn: Connection,
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+    max_memory_bytes: int | None,
+    max_cpu_seconds: int | None,
+) -> None:
+    _apply_limits(max_memory_bytes, max_cpu_seconds)
+    try:
+        payload: dict[str, Any] = {"ok": True, "result": fn(*args)}
+    except MemoryError:
+        payload = {"ok": False, "resource": "memory"}
+    except Exception as error:
+        payload = {
+            "ok": False,
+            "error": transferable_error(error),
+            "message": f"{type(error).__name__}: {error}",
+            "traceback": traceback.format_exc(),
+        }
+    try:
+        _send(conn, payload)
+    except MemoryError:
+        # pickling the result can need as much memory again
+        _send(conn, {"ok": False, "resource": "memory"})
+    finally:
+        conn.close()
+
+
+def _receive(conn: Connection) -> dict[str, Any] | None:
+    chunks: list[bytes] = []
+    received = 0
+    length = None
+    try:
+        while length is None or received < length:
+            message = conn.recv_bytes()
+            if message[:1] == _HEADER:
+                # a new payload replaces one the child could not finish sending
+                length = int.from_bytes(message[1:], "big")
+                chunks = []
+                received = 0
+            elif length is not None:
+                chunks.append(message[1:])
+                received += len(message) - 1
+    except EOFError:
+        # the child died before sending all of its result
+        return None
+    return pickle.loads(b"".join(chunks))
+
+
+def run_isolated(
+    fn: Callable[..., T],
+    *args: Any,
+    max_memory_bytes: int | None = None,
+    max_cpu_seconds: int | None = None,
+) -> T:
+    """Call `fn(*args)` in a forked child process with resource limits, and return its result.
+
+    Args:
+        fn: the function to call in the child. Its return value must be picklable.
+        max_memory_bytes: limit on the child's address space, in bytes.
+        max_cpu_seconds: limit on the child's CPU time, in seconds.
+
+    Raises:
+        GXResourceLimitExceeded: if the child ran out of memory or CPU time.
+        GXValidationProcessError: if the child died without a result, or raised an error
+            that cannot be rebuilt in this process.
+        Exception: the error raised by `fn`, when it can be sent back.
+    """
+    mp_context = multiprocessing.get_context("fork")
+    receive_conn, send_conn = mp_context.Pipe(duplex=False)
+    process = mp_context.Process(
+        target=_child,
+        args=(send_conn, fn, args, max_memory_bytes, max_cpu_seconds),
+        name="gx-isolated-validation",
+        daemon=True,
+    )
+    process.start()
+    send_conn.close()
+    try:
+        payload = _receive(receive_conn)
+    finally:
+        receive_conn.close()
+        process.join()
+    exitcode = process.exitcode
+
+    if payload is not None and payload["ok"]:
+        return payload["result"]
+    if payload is not None and payload.get("resource") == "memory":
+        if max_memory_bytes is None:
+            # out of the memory of the system, or of a limit set outside the provider
+            raise GXValidationProcessError(
+                "The isolated validation process ran out of memory", exitcode=exitcode
+            )
+        raise GXResourceLimitExceeded(
+            f"Validation exceeded its memory limit of {format_bytes(max_memory_bytes)}",
+            "memory",
+            max_memory_bytes,
+            exitcode=exitcode,
+        )
+    if payload is not None:
+        if isinstance(payload.get("error"), BaseException):
+            raise payload["error"]
+        raise GXValidationProcessError(
+            payload["message"], exitcode=exitcode, remote_traceback=payload["traceback"]
+        )
+
+    if max_cpu_seconds is not None and exitcode == -signal.SIGXCPU:
+        raise GXResourceLimitExceeded(
+            f"Validation exceeded its CPU time limit of {max_cpu_seconds} seconds",
+            "cpu_time",
+            max_cpu_seconds,
+            exitcode=exitcode,
+        )
+    if exitcode is not None and exitcode < 0:
+        description = f"was killed by {signal.Signals(-exitcode).name}"
+        if exitcode == -signal.SIGKILL:
+            description += ", possibly by the kernel out-of-memory killer"
+    else:
+        description = f"exited with code {exitcode}"
+    raise GXValidationProcessError(
+        f"The isolated validation process {description} without a result",
+        exitcode=exitcode,
+    )
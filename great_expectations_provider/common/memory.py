@@ -0,0 +1,171 @@
+"""
+Peak memory accounting for the phases of a validation run.
+
+For each phase the tracker records the resident set size (RSS) high-water mark, sampled
+by a background thread, and the peak of Python allocations traced by tracemalloc.
+RSS covers native allocations made by pandas, Arrow, or database drivers that
+tracemalloc cannot see, while tracemalloc isolates what Python code allocated.
+"""
+
+from __future__ import annotations
+
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator
+
+from great_expectations_provider.common.gx_phases import (
+    BATCH_LOADING,
+    METRIC_COMPUTATION,
+    observe_phases,
+    phases_supported,
+)
+from great_expectations_provider.common.metrics import emit_gauge
+
+MEMORY_USAGE_KEY = "memory_usage"
+RSS_SAMPLE_INTERVAL_SECONDS = 0.01
+
+
+def current_rss_bytes() -> int:
+    """Current resident set size, falling back to the process high-water mark off Linux."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return max_rss_bytes()
+
+
+def max_rss_bytes() -> int:
+    """RSS high-water mark of the whole process."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class _RssSampler(threading.Thread):
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="gx-rss-sampler", daemon=True)
+        self.interval = interval
+        self.peak = current_rss_bytes()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+    def stop(self) -> int:
+        self._stopped.set()
+        self.join()
+        return max(self.peak, current_rss_bytes())
+
+
+class MemoryTracker:
+    """Record RSS and tracemalloc peaks per validation phase.
+
+    When disabled every method is a no-op, so operators can use the tracker unconditionally.
+    The tracker is also disabled when the installed GX does not support observing the phases.
+
+    Args:
+        enabled: whether to record memory usage.
+        sample_interval: seconds between RSS samples while a phase runs.
+    """
+
+    def __init__(
+        self, enabled: bool = True, sample_interval: float = RSS_SAMPLE_INTERVAL_SECONDS
+    ) -> None:
+        self.enabled = enabled and phases_supported()
+        self.sample_interval = sample_interval
+        self.phases: dict[str, dict[str, Any]] = {}
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        rss_before = current_rss_bytes()
+        tracemalloc.reset_peak()
+        traced_before = tracemalloc.get_traced_memory()[0]
+        sampler = _RssSampler(self.sample_interval)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            rss_peak = sampler.stop()
+            traced_peak = tracemalloc.get_traced_memory()[1] - traced_before
+            stats = self.phases.setdefault(
+                name,
+                {
+                    "rss_peak_bytes": 0,
+                    "rss_growth_bytes": 0,
+                    "tracemalloc_peak_bytes": 0,
+                    "duration_seconds": 0.0,
+                    "count": 0,
+                },
+            )
+            stats["rss_peak_bytes"] = max(stats["rss_peak_bytes"], rss_peak)
+            stats["rss_growth_bytes"] = max(
+                stats["rss_growth_bytes"], rss_peak - rss_before
+            )
+            stats["tracemalloc_peak_bytes"] = max(
+                stats["tracemalloc_peak_bytes"], traced_peak
+            )
+            stats["duration_seconds"] += duration
+            stats["count"] += 1
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """Record memory usage of the enclosed block as phase `name`."""
+        if not self.enabled or not tracemalloc.is_tracing():
+            return nullcontext()
+        return self._phase(name)
+
+    def _observe(self, phase: str, info: dict[str, Any]) -> ContextManager[None]:
+        # validation definitions enclose the other phases, whose peaks would be reset
+        if phase not in (BATCH_LOADING, METRIC_COMPUTATION):
+            return nullcontext()
+        return self.phase(phase)
+
+    @contextmanager
+    def _track(self) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        try:
+            with observe_phases(self._observe):
+                yield
+        finally:
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def track(self) -> ContextManager[None]:
+        """Trace allocations in the enclosed block and record the GX validation phases run in it.
+
+        Batch loading and metric computation are recorded automatically; use `phase` for
+        other blocks, such as result serialization, inside the tracked block.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._track()
+
+    def report(self) -> dict[str, Any] | None:
+        if not self.enabled:
+            return None
+        return {"phases": self.phases, "process_max_rss_bytes": max_rss_bytes()}
+
+    def emit_metrics(self, task_id: str) -> None:
+        """Emit each phase's peaks as `gx.memory.<phase>.*` gauges tagged with the task ID."""
+        if not self.enabled:
+            return
+        tags = {"task_id": task_id}
+        for name, stats in self.phases.items():
+            for stat in (
+                "rss_peak_bytes",
+                "rss_growth_bytes",
+                "tracemalloc_peak_bytes",
+            ):
+                emit_gauge(f"memory.{name}.{stat}", stats[stat], tags=tags)
+        emit_gauge("memory.process_max_rss_bytes", max_rss_bytes(), tags=tags)
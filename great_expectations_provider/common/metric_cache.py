@@ -0,0 +1,515 @@
+"""
+Reuse the metrics computed for unchanged data in earlier validation runs.
+
+Late-arriving-data checks and retried tasks often validate a table or file that has not
+changed since the last run. The metric cache keeps the values of the metrics a run
+computes in a local SQLite database, keyed by the Data Source, asset, and batch options
+of the Batch, the metric and its arguments, and a data-version token of the Batch. While
+a cache is active, GX is wrapped so that a cached metric is added to the metric
+dependency graph without its dependencies, and its value is served from the cache
+instead of being computed, so the queries or DataFrame passes behind it never run.
+
+The data-version token tells whether the data changed:
+
+- files: the size and modification time of the Batch's file;
+- SQLite tables: the size and modification time of the database file;
+- Snowflake tables: `LAST_ALTERED` of `information_schema.tables`;
+- tables of any database, given a version column: the maximum of that column, such as
+  an `updated_at` timestamp or a load ID, and the row count of the table.
+
+The statistics other databases keep are not authoritative, so their tables are cached
+only with a version column: Postgres' `pg_stat_all_tables` counters lag, are reset by
+`pg_stat_reset()`, and on a hot standby miss the writes it replays, and MySQL caches
+`UPDATE_TIME` for `information_schema_stats_expiry` seconds, a day by default. The
+version column is read on the connection the Batch is validated on, so it tells the
+data of a read replica as well as that of a primary.
+
+Batches with no token, such as queries and in-memory DataFrames, are never cached,
+unless the caller gives a data version of its own, for instance a partition's load ID.
+
+Only final metric values are cached. Intermediate metrics, which hold SQL expressions or
+Series, and values that do not survive a JSON round trip unchanged are always computed.
+The least recently used entries are evicted beyond `max_entries`.
+
+The database is shared by the tasks of a host, so it is written in WAL mode with every
+write committed at once, and no task holds its write lock while it validates. A read or
+write failing, for instance on a lock held for longer than `LOCK_TIMEOUT_SECONDS`, is
+logged and treated as a miss, and never fails the validation.
+
+The dependency graph and metric resolution are wrapped through GX internals, so metrics
+are cached only with the GX versions `great_expectations_provider.common.gx_internals`
+supports, and always computed otherwise.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator
+
+from great_expectations_provider.common.gx_internals import internals_supported
+from great_expectations_provider.common.metrics import emit_gauge, emit_incr
+
+if TYPE_CHECKING:
+    from great_expectations.execution_engine import ExecutionEngine
+    from great_expectations.validator.metric_configuration import (
+        MetricConfiguration,
+    )
+
+logger = logging.getLogger(__name__)
+
+METRIC_CACHE_KEY = "metric_cache"
+DEFAULT_CACHE_PATH = Path(tempfile.gettempdir()) / "gx_metric_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 100_000
+# seconds a read or write waits for another task's write to the cache
+LOCK_TIMEOUT_SECONDS = 5.0
+# intermediate metrics, whose values are engine objects or partial aggregates
+UNCACHED_METRIC_SUFFIXES = (
+    ".condition",
+    ".map",
+    ".aggregate_fn",
+    ".unexpected_index_query",
+)
+
+# only databases whose table metadata changes with every write
+_TABLE_VERSION_QUERIES = {
+    "snowflake": (
+        "SELECT LAST_ALTERED FROM information_schema.tables "
+        "WHERE table_name = UPPER(:table) "
+        "AND table_schema = UPPER(COALESCE(:schema, CURRENT_SCHEMA()))"
+    ),
+}
+
+_active_cache: ContextVar[MetricCache | None] = ContextVar(
+    "gx_metric_cache", default=None
+)
+_install_lock = threading.Lock()
+_installed = False
+
+
+def _file_version(path: str | Path) -> str | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _table_version(
+    execution_engine: Any,
+    table_name: str,
+    schema_name: str | None,
+    version_column: str | None = None,
+) -> str | None:
+    engine = execution_engine.engine
+    dialect = engine.dialect.name
+    if version_column is not None:
+        return _column_version(engine, table_name, schema_name, version_column)
+    if dialect == "sqlite":
+        database = engine.url.database
+        if not database or database == ":memory:":
+            return None
+        # a database in WAL mode is written to the -wal file first
+        versions = [_file_version(database), _file_version(f"{database}-wal")]
+        return None if versions[0] is None else f"sqlite:{versions}"
+    query = _TABLE_VERSION_QUERIES.get(dialect)
+    if query is None:
+        return None
+    import sqlalchemy as sa
+
+    try:
+        with engine.connect() as connection:
+            row = connection.execute(
+                sa.text(query), {"table": table_name, "schema": schema_name}
+            ).first()
+    except Exception:
+        logger.debug("Could not read the data version of %s", table_name, exc_info=True)
+        return None
+    if row is None or all(value is None for value in row):
+        return None
+    return f"{dialect}:{[str(value) for value in row]}"
+
+
+def _column_version(
+    engine: Any, table_name: str, schema_name: str | None, version_column: str
+) -> str | None:
+    import sqlalchemy as sa
+
+    table = sa.table(table_name, sa.column(version_column), schema=schema_name)
+    try:
+        with engine.connect() as connection:
+            row = connection.execute(
+                sa.select(sa.func.max(table.c[version_column]), sa.func.count())
+            ).first()
+    except Exception:
+        logger.debug("Could not read the data version of %s", table_name, exc_info=True)
+        return None
+    if row is None:
+        return None
+    return f"column:{version_column}:{[str(value) for value in row]}"
+
+
+def data_version(
+    batch: Any, execution_engine: Any, version_column: str | None = None
+) -> str | None:
+    """Token that changes when the data of `batch` changes, or None if it cannot be told.
+
+    Args:
+        batch: the Batch whose data is versioned.
+        execution_engine: the execution engine the Batch was loaded by.
+        version_column: column of SQL tables whose maximum changes with their data.
+    """
+    batch_spec = batch.batch_spec
+    path = batch_spec.get("path")
+    if isinstance(path, str) and os.path.isfile(path):
+        version = _file_version(path)
+        return None if version is None else f"file:{version}"
+    if batch_spec.get("type") == "table" and batch_spec.get("table_name"):
+        return _table_version(
+            execution_engine,
+            batch_spec["table_name"],
+            batch_spec.get("schema_name"),
+            version_column,
+        )
+    return None
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+class MetricCache:
+    """A persistent LRU cache of metric values.
+
+    When disabled, `caching` is a no-op, so operators can use the cache unconditionally.
+
+    Args:
+        path: SQLite database of the cache. Defaults to `gx_metric_cache.sqlite3` in the
+            system temporary directory.
+        max_entries: entries kept, the least recently used are evicted beyond it.
+        data_version: data-version token used for every Batch instead of the detected one.
+        version_column: column of SQL tables whose maximum, with the row count, is their
+            data version, such as an `updated_at` timestamp or a load ID.
+        enabled: whether to cache metrics in `caching` blocks.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        data_version: str | None = None,
+        version_column: str | None = None,
+        enabled: bool = True,
+    ) -> None:
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.max_entries = max_entries
+        self.data_version = data_version
+        self.version_column = version_column
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+        # batch ID -> key prefix of its metrics, None when its data version is unknown
+        self._batch_keys: dict[str, str | None] = {}
+        # metric ID -> cached value, found while building the dependency graph
+        self._found: dict[Any, Any] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # autocommit, so each write releases the lock at once
+            connection = sqlite3.connect(
+                self.path,
+                timeout=LOCK_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            try:
+                # readers do not wait for writers in WAL mode
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS metrics "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS metrics_last_used ON metrics (last_used)"
+                )
+            except sqlite3.Error:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
+
+    def _batch_key(
+        self, execution_engine: ExecutionEngine, batch_id: str | None
+    ) -> str | None:
+        batch_id = batch_id or execution_engine.batch_manager.active_batch_id
+        if batch_id is None:
+            return None
+        if batch_id not in self._batch_keys:
+            batch = execution_engine.batch_manager.batch_cache.get(batch_id)
+            key = None
+            if batch is not None:
+                version = self.data_version or data_version(
+                    batch, execution_engine, self.version_column
+                )
+                if version is not None:
+                    request = batch.batch_request
+                    key = json.dumps(
+                        [
+                            request.datasource_name,
+                            request.data_asset_name,
+                            request.options,
+                            version,
+                        ],
+                        sort_keys=True,
+                        default=str,
+                    )
+            self._batch_keys[batch_id] = key
+        return self._batch_keys[batch_id]
+
+    def _key(
+        self, execution_engine: ExecutionEngine, metric: MetricConfiguration
+    ) -> str | None:
+        if metric.metric_name.endswith(UNCACHED_METRIC_SUFFIXES):
+            return None
+        batch_key = self._batch_key(
+            execution_engine, metric.metric_domain_kwargs.get("batch_id")
+        )
+        if batch_key is None:
+            return None
+        payload = json.dumps([batch_key, list(metric.id)], default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def lookup(
+        self, execution_engine: ExecutionEngine, metric: MetricConfiguration
+    ) -> bool:
+        """Whether `metric` is cached; if so, its value is served when GX resolves it."""
+        with self._lock:
+            if metric.id in self._found:
+                return True
+            key = self._key(execution_engine, metric)
+            if key is None:
+                return False
+            try:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT value FROM metrics WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE metrics SET last_used = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+            except sqlite3.Error:
+                logger.warning(
+                    "Could not read the metric cache %s", self.path, exc_info=True
+                )
+                row = None
+            if row is None:
+                self.misses += 1
+                return False
+            self.hits += 1
+            self._found[metric.id] = json.loads(row[0])
+            return True
+
+    def pop_found(self, metric: MetricConfiguration) -> tuple[bool, Any]:
+        """The cached value found for `metric` by `lookup`, if any."""
+        with self._lock:
+            if metric.id not in self._found:
+                return False, None
+            return True, self._found.pop(metric.id)
+
+    def store(
+        self, execution_engine: ExecutionEngine, metric: MetricConfiguration, value: Any
+    ) -> None:
+        """Cache the computed value of `metric`, if it and its Batch can be cached."""
+        with self._lock:
+            key = self._key(execution_engine, metric)
+            if key is None:
+                return
+            try:
+                encoded = json.dumps(value, default=_json_default, allow_nan=False)
+            except (TypeError, ValueError):
+                return
+            if json.loads(encoded) != value:
+                # tuples and other values JSON cannot restore as they were
+                return
+            try:
+                self._connect().execute(
+                    "INSERT OR REPLACE INTO metrics (key, value, last_used) VALUES (?, ?, ?)",
+                    (key, encoded, time.time()),
+                )
+            except sqlite3.Error:
+                logger.warning(
+                    "Could not write to the metric cache %s", self.path, exc_info=True
+                )
+
+    def _evict(self) -> None:
+        connection = self._connect()
+        (count,) = connection.execute("SELECT COUNT(*) FROM metrics").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            connection.execute(
+                "DELETE FROM metrics WHERE key IN "
+                "(SELECT key FROM metrics ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def flush(self) -> None:
+        """Evict the entries beyond `max_entries`."""
+        with self._lock:
+            if self._connection is None:
+                return
+            try:
+                self._evict()
+            except sqlite3.Error:
+                logger.warning(
+                    "Could not evict entries of the metric cache %s",
+                    self.path,
+                    exc_info=True,
+                )
+
+    @contextmanager
+    def _caching(self) -> Iterator[None]:
+        if not _install():
+            # every metric is computed instead
+            self.enabled = False
+            yield
+            return
+        token = _active_cache.set(self)
+        try:
+            yield
+        finally:
+            _active_cache.reset(token)
+            self.flush()
+            self.close()
+
+    def caching(self) -> ContextManager[None]:
+        """Serve cached metrics, and cache computed ones, in the enclosed block."""
+        if not self.enabled:
+            return nullcontext()
+        return self._caching()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def report(self) -> dict[str, Any] | None:
+        """Hits, misses, hit rate, and evictions of the cache, or None when disabled."""
+        if not self.enabled:
+            return None
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+    def emit_metrics(self, task_id: str) -> None:
+        """Emit the hits, misses, and hit rate as `gx.metric_cache.*` metrics tagged with the task ID."""
+        if not self.enabled:
+            return
+        tags = {"task_id": task_id}
+        emit_incr("metric_cache.hits", self.hits, tags=tags)
+        emit_incr("metric_cache.misses", self.misses, tags=tags)
+        lookups = self.hits + self.misses
+        if lookups:
+            emit_gauge("metric_cache.hit_rate", self.hits / lookups, tags=tags)
+
+
+def _install() -> bool:
+    global _installed
+    with _install_lock:
+        if _installed:
+            return True
+        from great_expectations.execution_engine.execution_engine import (
+            ExecutionEngine,
+        )
+        from great_expectations.validator.validation_graph import (
+            MetricEdge,
+            ValidationGraph,
+        )
+
+        if not internals_supported(
+            "Caching metrics",
+            (ValidationGraph, "build_metric_dependency_graph"),
+            (ValidationGraph, "set_metric_configuration_default_kwargs_if_absent"),
+            (ExecutionEngine, "resolve_metrics"),
+        ):
+            return False
+
+        build_metric_dependency_graph = ValidationGraph.build_metric_dependency_graph
+
+        def cached_build_metric_dependency_graph(
+            self: ValidationGraph,
+            metric_configuration: MetricConfiguration,
+            runtime_configuration: dict | None = None,
+        ) -> None:
+            cache = _active_cache.get()
+            if cache is not None:
+                # completes the metric's arguments, and so its ID
+                self.set_metric_configuration_default_kwargs_if_absent(
+                    metric_configuration
+                )
+                if cache.lookup(self._execution_engine, metric_configuration):
+                    # a cached metric needs none of its dependencies
+                    self.add(MetricEdge(left=metric_configuration))
+                    return
+            build_metric_dependency_graph(
+                self, metric_configuration, runtime_configuration
+            )
+
+        resolve_metrics = ExecutionEngine.resolve_metrics
+
+        def cached_resolve_metrics(
+            self: ExecutionEngine,
+            metrics_to_resolve: Any,
+            metrics: dict | None = None,
+            runtime_configuration: dict | None = None,
+        ) -> dict:
+            cache = _active_cache.get()
+            if cache is None:
+                return resolve_metrics(
+                    self, metrics_to_resolve, metrics, runtime_configuration
+                )
+            cached = {}
+            to_compute = []
+            for metric in metrics_to_resolve:
+                found, value = cache.pop_found(metric)
+                if found:
+                    cached[metric.id] = value
+                else:
+                    to_compute.append(metric)
+            if not to_compute:
+                return cached
+            computed = resolve_metrics(self, to_compute, metrics, runtime_configuration)
+            for metric in to_compute:
+                if metric.id in computed:
+                    cache.store(self, metric, computed[metric.id])
+            return {**computed, **cached}
+
+        ValidationGraph.build_metric_dependency_graph = (  # type: ignore[method-assign]
+            cached_build_metric_dependency_graph
+        )
+        ExecutionEngine.resolve_metrics = cached_resolve_metrics  # type: ignore[method-assign]
+        _installed = True
+        return True
@@ -0,0 +1,24 @@
+"""Emit provider metrics through Airflow's configured StatsD / OpenTelemetry metrics logger."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+try:  # airflow >= 3.2
+    from airflow.sdk.observability.stats import Stats
+except ImportError:  # airflow 2 and earlier airflow 3
+    from airflow.stats import Stats  # type: ignore[no-redef]
+
+METRIC_PREFIX = "gx"
+
+
+def emit_gauge(name: str, value: float, tags: dict[str, str] | None = None) -> None:
+    Stats.gauge(f"{METRIC_PREFIX}.{name}", value, tags=tags or {})
+
+
+def emit_incr(name: str, count: int = 1, tags: dict[str, str] | None = None) -> None:
+    Stats.incr(f"{METRIC_PREFIX}.{name}", count, tags=tags or {})
+
+
+def emit_timing(name: str, seconds: float, tags: dict[str, str] | None = None) -> None:
+    Stats.timing(f"{METRIC_PREFIX}.{name}", timedelta(seconds=seconds), tags=tags or {})
@@ -0,0 +1,138 @@
+"""
+Opt-in profiling of validation runs.
+
+A background thread samples the calling thread's stack at a fixed interval while the
+validation runs. The samples are written to a collapsed-stack `.folded` file that
+flamegraph tools (flamegraph.pl, speedscope, inferno) read directly, and the functions
+seen most often at the top of the stack are summarized in the task log. A sampler adds
+little overhead and leaves the timing of the validation as it is; a deterministic
+profiler such as cProfile is not run alongside it, as each would skew the other.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = Path(tempfile.gettempdir()) / "gx_profiles"
+TOP_FUNCTIONS = 20
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+
+class _StackSampler(threading.Thread):
+    """Sample one thread's stack at a fixed interval, counting collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="gx-profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+def _collapse(frame: FrameType | None) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _file_stem(task_id: str, ti: Any) -> str:
+    # a mapped or retried task instance must not overwrite the profile of another
+    parts = [task_id]
+    map_index = getattr(ti, "map_index", None)
+    if isinstance(map_index, int) and map_index >= 0:
+        parts.append(f"map{map_index}")
+    try_number = getattr(ti, "try_number", None)
+    if isinstance(try_number, int):
+        parts.append(f"try{try_number}")
+    parts.append(time.strftime("%Y%m%dT%H%M%S"))
+    return "-".join(parts)
+
+
+def _top_functions(stacks: Counter[str]) -> list[tuple[str, int]]:
+    own: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        own[stack.rsplit(";", 1)[-1]] += count
+    return own.most_common(TOP_FUNCTIONS)
+
+
+@contextmanager
+def _profile(
+    task_id: str, profile_dir: str | Path | None, interval: float, ti: Any
+) -> Iterator[None]:
+    output_dir = Path(profile_dir) if profile_dir else DEFAULT_PROFILE_DIR
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # not with_suffix, which would cut the task ID of a task group at its first dot
+    folded_path = output_dir / f"{_file_stem(task_id, ti)}.folded"
+
+    sampler = _StackSampler(threading.get_ident(), interval)
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+
+        folded_path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in sampler.stacks.items())
+        )
+        samples = sum(sampler.stacks.values())
+        report = "\n".join(
+            f"{count:>8} {count / samples:>7.1%}  {function}"
+            for function, count in _top_functions(sampler.stacks)
+        )
+        logger.info(
+            "Collapsed stacks of the validation written to %s. "
+            "Top %d functions by own time, of %d samples taken every %.0f ms:\n%s",
+            folded_path,
+            TOP_FUNCTIONS,
+            samples,
+            interval * 1000,
+            report,
+        )
+
+
+def profile_validation(
+    enabled: bool,
+    task_id: str,
+    profile_dir: str | Path | None = None,
+    interval: float = SAMPLE_INTERVAL_SECONDS,
+    ti: Any = None,
+) -> ContextManager[None]:
+    """Profile the enclosed block if enabled, otherwise do nothing.
+
+    Args:
+        enabled: whether to profile. When False a no-op context manager is returned.
+        task_id: Airflow task ID, used to name the output file.
+        profile_dir: directory for the `.folded` file. Defaults to a `gx_profiles`
+            directory in the system temporary directory.
+        interval: seconds between stack samples.
+        ti: the Airflow task instance, whose map index and try number name the output file.
+    """
+    if not enabled:
+        return nullcontext()
+    return _profile(task_id=task_id, profile_dir=profile_dir, interval=interval, ti=ti)
@@ -0,0 +1,165 @@
+"""
+Route validation queries to read replicas of a database.
+
+Validations scan whole tables, and on a primary they compete with production writes. A
+Postgres, MySQL, or Microsoft SQL Server connection can list read replicas in the
+`read_replicas` key of its extras, as a list or a comma-separated string of `host` or
+`host:port` entries, replicas without a port using the port of the connection, or the
+default port of the database when the connection has none. Its connection string is
+then built for a replica, chosen by the `replica_policy` extra:
+
+- `round_robin` (default): the next replica in turn, per worker process, starting from
+  a random one so concurrent processes spread over the replicas. Replicas are not probed.
+- `least_latency`: the replica that accepts a TCP connection the fastest, or the primary
+  when none does.
+- `primary_fallback`: the first replica, in the listed order, that accepts a TCP
+  connection, or the primary when none does.
+
+Replicas apply the writes of the primary with a lag, so a validation on a replica may not
+see the latest writes. Validate data written just before on the primary itself.
+
+Probes wait at most `replica_probe_timeout` seconds, 1 by default, for each replica.
+Their outcome is kept for `PROBE_CACHE_SECONDS` per worker process, so connection strings
+built in quick succession do not probe the replicas again.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import random
+import socket
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+REPLICA_POLICIES = ("round_robin", "least_latency", "primary_fallback")
+DEFAULT_PROBE_TIMEOUT = 1.0
+PROBE_CACHE_SECONDS = 30.0
+
+# conn ID -> the rotation of its replicas in this process
+_rotations: dict[str, Iterator[int]] = {}
+_rotations_lock = threading.Lock()
+# (host, port) -> when it was probed and its latency, None if unreachable
+_probes: dict[tuple[str, int], tuple[float, float | None]] = {}
+_probes_lock = threading.Lock()
+
+
+def parse_replicas(
+    value: Any, default_port: Optional[int]
+) -> list[tuple[str, Optional[int]]]:
+    """The `(host, port)` of each `host` or `host:port` entry of a list or comma-separated string."""
+    if isinstance(value, str):
+        value = value.split(",")
+    replicas: list[tuple[str, Optional[int]]] = []
+    for entry in value or []:
+        entry = str(entry).strip()
+        if not entry:
+            continue
+        host, _, port = entry.rpartition(":")
+        if host and port.isdigit():
+            replicas.append((host, int(port)))
+        else:
+            replicas.append((entry, default_port))
+    return replicas
+
+
+def probe_latency(host: str, port: Optional[int], timeout: float) -> float | None:
+    """Seconds taken to open a TCP connection to `host:port`, or None if it cannot be opened."""
+    if port is None:
+        return None
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return time.perf_counter() - start
+    except OSError:
+        return None
+
+
+def _cached_latency(host: str, port: Optional[int], timeout: float) -> float | None:
+    if port is None:
+        return None
+    now = time.monotonic()
+    with _probes_lock:
+        probed = _probes.get((host, port))
+    if probed is not None and now - probed[0] < PROBE_CACHE_SECONDS:
+        return probed[1]
+    latency = probe_latency(host, port, timeout)
+    with _probes_lock:
+        _probes[(host, port)] = (now, latency)
+    return latency
+
+
+def _next_in_rotation(conn_id: str, count: int) -> int:
+    with _rotations_lock:
+        if conn_id not in _rotations:
+            _rotations[conn_id] = itertools.count(random.randrange(count))
+        return next(_rotations[conn_id]) % count
+
+
+def _primary(
+    conn_id: str, host: Optional[str], port: Optional[int]
+) -> tuple[Optional[str], Optional[int]]:
+    logger.warning(
+        "No read replica is reachable for connection %s, using the primary", conn_id
+    )
+    return host, port
+
+
+def select_host(
+    conn_id: str,
+    host: Optional[str],
+    port: Optional[int],
+    extras: dict[str, Any],
+    default_port: Optional[int] = None,
+) -> tuple[Optional[str], Optional[int]]:
+    """The host and port to connect to for a connection: a read replica, or its own if it has none.
+
+    Args:
+        conn_id: Airflow connection ID
+        host: host of the connection, the primary
+        port: port of the connection, also used for replicas listed without one
+        extras: extras of the connection
+        default_port: port of the database, used for the primary and replicas when the
+            connection has none
+
+    Raises:
+        ValueError: If the replica policy is unknown
+    """
+    port = port or default_port
+    replicas = parse_replicas(extras.get("read_replicas"), port)
+    if not replicas:
+        return host, port
+    policy = extras.get("replica_policy", "round_robin")
+    if policy not in REPLICA_POLICIES:
+        raise ValueError(
+            f"replica_policy must be one of {', '.join(REPLICA_POLICIES)} "
+            f"for connection: {conn_id}"
+        )
+    timeout = float(extras.get("replica_probe_timeout", DEFAULT_PROBE_TIMEOUT))
+
+    if policy == "round_robin":
+        replica = replicas[_next_in_rotation(conn_id, len(replicas))]
+    elif policy == "least_latency":
+        latencies = {
+            replica: _cached_latency(replica[0], replica[1], timeout)
+            for replica in replicas
+        }
+        reachable = {
+            replica: latency
+            for replica, latency in latencies.items()
+            if latency is not None
+        }
+        if not reachable:
+            return _primary(conn_id, host, port)
+        replica = min(reachable, key=reachable.__getitem__)
+    else:
+        for replica in replicas:
+            if _cached_latency(*replica, timeout) is not None:
+                break
+        else:
+            return _primary(conn_id, host, port)
+    logger.info("Using read replica %s:%s of connection %s", *replica, conn_id)
+    return replica
@@ -0,0 +1,164 @@
+"""
+Reuse the result of validating an identical DataFrame with an identical suite.
+
+The same DataFrame, such as a reference table or an unchanged extract, is often validated
+by several tasks, or again by a retried task. Before a pandas DataFrame is validated, its
+content is hashed: the memory of each numeric, boolean, and datetime column and of each
+Arrow-backed column is hashed as it is, without copying, and other columns, such as
+Python strings, by pandas' vectorized row hash. Combined with the fingerprint of the
+suite and the result format, the hash keys the result of the last complete, successful
+validation, which is returned instead of validating again. Results a time budget cut short
+or sampled are not stored. Hashing reads every value once, about as
+much work as one simple expectation, so it pays off only where identical DataFrames are
+validated again, see `scripts/benchmark_dataframe_hash.py`.
+
+Entries are shared by every task validating with the same suite, so a reused result
+carries the Batch ID of the task that validated it. Spark DataFrames are always
+validated: hashing one would compute it in full.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Mapping
+
+from great_expectations_provider.common.gx_context_actions import suite_fingerprint
+
+if TYPE_CHECKING:
+    from great_expectations import ExpectationSuite
+    from pandas import DataFrame, Index, Series
+
+logger = logging.getLogger(__name__)
+
+REUSED_RESULT_KEY = "reused_result"
+DEFAULT_RESULT_CACHE_DIR = Path(tempfile.gettempdir()) / "gx_result_cache"
+# numpy dtype kinds whose memory holds the values themselves: bool, integers, floats,
+# complex numbers, and datetimes and timedeltas
+_BUFFER_KINDS = "biufcmM"
+
+
+def _is_arrow_backed(values: Series | Index) -> bool:
+    dtype = values.dtype
+    return type(dtype).__name__ == "ArrowDtype" or getattr(dtype, "storage", None) in (
+        "pyarrow",
+        "pyarrow_numpy",
+    )
+
+
+def _update_digest(digest: Any, values: Series | Index) -> None:
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in _BUFFER_KINDS:
+        array = np.ascontiguousarray(values.to_numpy())
+        digest.update(array.view(np.uint8).data)
+    elif _is_arrow_backed(values):
+        import pyarrow as pa
+
+        arrow = pa.array(values.array)
+        chunks = arrow.chunks if isinstance(arrow, pa.ChunkedArray) else [arrow]
+        for chunk in chunks:
+            # slices share the buffers of their parent array
+            digest.update(f"{chunk.offset}:{len(chunk)}".encode())
+            for buffer in chunk.buffers():
+                if buffer is not None:
+                    digest.update(buffer)
+    else:
+        hashes = pd.util.hash_pandas_object(values, index=False)
+        digest.update(np.ascontiguousarray(hashes.to_numpy()).data)
+
+
+def dataframe_hash(frame: DataFrame) -> str:
+    """Hash of the shape, columns, dtypes, index, and values of a pandas DataFrame."""
+    digest = hashlib.blake2b(digest_size=16)
+    header = [
+        list(frame.shape),
+        [str(column) for column in frame.columns],
+        [str(dtype) for dtype in frame.dtypes],
+        str(frame.index.dtype),
+    ]
+    digest.update(json.dumps(header).encode())
+    _update_digest(digest, frame.index)
+    for _, column in frame.items():
+        _update_digest(digest, column)
+    return digest.hexdigest()
+
+
+class DataFrameResultCache:
+    """Store the results of successful DataFrame validations by the content of the DataFrame.
+
+    When disabled, nothing is hashed, looked up, or stored, so operators can use the cache
+    unconditionally.
+
+    Args:
+        cache_dir: directory of the stored results. Defaults to `gx_result_cache` in the
+            system temporary directory.
+        enabled: whether to reuse results.
+    """
+
+    def __init__(
+        self, cache_dir: str | Path | None = None, enabled: bool = True
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_RESULT_CACHE_DIR
+        self.enabled = enabled
+
+    def key(
+        self, dataframe: Any, suite: ExpectationSuite, result_format: Any = None
+    ) -> str | None:
+        """Key of the result of validating `dataframe` with `suite`, or None for other than pandas DataFrames."""
+        from pandas import DataFrame
+
+        if not self.enabled or not isinstance(dataframe, DataFrame):
+            return None
+        payload = json.dumps(
+            [dataframe_hash(dataframe), suite_fingerprint(suite), result_format],
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def lookup(self, key: str | None) -> dict[str, Any] | None:
+        """The result stored for `key`, with the task and time it was validated."""
+        if key is None:
+            return None
+        try:
+            entry = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        logger.info(
+            "Reusing the result of validating an identical DataFrame in task %s at %s",
+            entry["task_id"],
+            entry["validated_at"],
+        )
+        return entry
+
+    def store(
+        self, key: str | None, task_id: str, result_dict: Mapping[str, Any]
+    ) -> None:
+        """Store the result of a successful validation under `key`."""
+        if key is None:
+            return
+        entry = {
+            "task_id": task_id,
+            "validated_at": datetime.now(timezone.utc).isoformat(),
+            "result": result_dict,
+        }
+        path = self._path(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # write and rename, so concurrent tasks never read a partial file
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.cache_dir, suffix=".tmp", delete=False
+            ) as file:
+                json.dump(entry, file, default=str)
+            os.replace(file.name, path)
+        except OSError:
+            logger.warning("Could not write cached result %s", path)
@@ -0,0 +1,220 @@
+"""
+Compact binary encoding for described Great Expectations validation results.
+
+A payload is laid out as::
+
+    b"GXR" | version (1 byte) | compression (1 byte) | summary length (4 bytes, big endian)
+    | summary (msgpack) | body (compressed msgpack)
+
+The summary holds the top-level success flag and statistics (plus those of each
+validation result of a CheckpointResult) and is never compressed, so it can be
+decoded without touching the body. The body is a msgpack string table followed by
+the full result, in which dict keys and repeated values such as expectation types
+and column names are replaced by references into the table.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Any
+
+MAGIC = b"GXR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">3sBBI")
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_ZSTD = 2
+
+# ext type code used for references into the string table
+STRING_REF = 1
+
+# string values worth interning; dict keys are always interned
+INTERNED_VALUE_KEYS = frozenset(
+    {"expectation_type", "column", "column_A", "column_B", "batch_id", "type"}
+)
+NESTED_RESULT_KEYS = ("expectations", "validation_results")
+
+
+def _import_msgpack() -> Any:
+    try:
+        import msgpack
+    except ImportError as error:
+        raise ImportError(
+            "msgpack is required to encode validation results, "
+            "install it with `pip install airflow-provider-great-expectations[xcom]`"
+        ) from error
+    return msgpack
+
+
+def _is_suite_result(value: Any) -> bool:
+    return (
+        isinstance(value.get("statistics"), dict)
+        and "evaluated_expectations" in value["statistics"]
+        and isinstance(value.get("expectations"), list)
+        and all(
+            isinstance(expectation, dict) and "expectation_type" in expectation
+            for expectation in value["expectations"]
+        )
+    )
+
+
+def _is_checkpoint_result(value: Any) -> bool:
+    return (
+        isinstance(value.get("statistics"), dict)
+        and "evaluated_validations" in value["statistics"]
+        and isinstance(value.get("validation_results"), list)
+        and all(
+            is_validation_result(validation_result)
+            for validation_result in value["validation_results"]
+        )
+    )
+
+
+def is_validation_result(value: Any) -> bool:
+    """Whether value looks like the describe_dict() of a validation or checkpoint result.
+
+    Besides the success flag, the statistics of the result and the Expectation types of
+    its Expectations are required, so other dicts with `success` and `expectations` keys
+    keep the default serialization.
+    """
+    return (
+        isinstance(value, dict)
+        and isinstance(value.get("success"), bool)
+        and (_is_suite_result(value) or _is_checkpoint_result(value))
+    )
+
+
+def is_encoded_result(data: bytes) -> bool:
+    return data[: len(MAGIC)] == MAGIC
+
+
+class _StringTable:
+    def __init__(self, msgpack: Any) -> None:
+        self._msgpack = msgpack
+        self.strings: list[str] = []
+        self._refs: dict[str, Any] = {}
+
+    def ref(self, value: str) -> Any:
+        ref = self._refs.get(value)
+        if ref is None:
+            index = len(self.strings)
+            self.strings.append(value)
+            width = 1 if index < 0x100 else 2 if index < 0x10000 else 4
+            ref = self._msgpack.ExtType(STRING_REF, index.to_bytes(width, "big"))
+            self._refs[value] = ref
+        return ref
+
+    def intern(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                self.ref(key) if isinstance(key, str) else key: (
+                    self.ref(item)
+                    if isinstance(item, str) and key in INTERNED_VALUE_KEYS
+                    else self.intern(item)
+                )
+                for key, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [self.intern(item) for item in value]
+        return value
+
+
+def summarize_result(result_dict: dict[str, Any]) -> dict[str, Any]:
+    """The success flag and statistics of a result, and of each of its validation results."""
+    summary = {
+        key: value
+        for key, value in result_dict.items()
+        if key not in NESTED_RESULT_KEYS
+    }
+    validation_results = result_dict.get("validation_results")
+    if isinstance(validation_results, list):
+        summary["validation_results"] = [
+            summarize_result(validation_result)
+            for validation_result in validation_results
+            if isinstance(validation_result, dict)
+        ]
+    return summary
+
+
+def _compress(body: bytes) -> tuple[int, bytes]:
+    try:
+        import zstandard
+    except ImportError:
+        return COMPRESSION_ZLIB, zlib.compress(body, 6)
+    return COMPRESSION_ZSTD, zstandard.ZstdCompressor(level=3).compress(body)
+
+
+def _decompress(compression: int, body: bytes) -> bytes:
+    if compression == COMPRESSION_NONE:
+        return body
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(body)
+    if compression == COMPRESSION_ZSTD:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(body)
+    raise ValueError(f"Unknown validation result compression: {compression}")
+
+
+def _read_header(data: bytes) -> tuple[int, int]:
+    if len(data) < HEADER.size or not is_encoded_result(data):
+        raise ValueError("Data is not an encoded validation result")
+    _, version, compression, summary_length = HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported validation result format version: {version}")
+    return compression, summary_length
+
+
+def encode_result(result_dict: dict[str, Any], compress: bool = True) -> bytes:
+    """Encode a described validation result into the compact binary format.
+
+    Values msgpack cannot represent natively (dates, numpy scalars, ...) are stored
+    as their string representation, matching what a JSON round trip with
+    ``default=str`` would produce.
+    """
+    msgpack = _import_msgpack()
+    summary = msgpack.packb(summarize_result(result_dict), default=str)
+
+    table = _StringTable(msgpack)
+    tree = table.intern(result_dict)
+    packer = msgpack.Packer(default=str)
+    body = packer.pack(table.strings) + packer.pack(tree)
+
+    compression = COMPRESSION_NONE
+    if compress:
+        compression, body = _compress(body)
+    return (
+        HEADER.pack(MAGIC, FORMAT_VERSION, compression, len(summary)) + summary + body
+    )
+
+
+def decode_result_summary(data: bytes) -> dict[str, Any]:
+    """Decode only the success flag and statistics, without decompressing the body."""
+    msgpack = _import_msgpack()
+    _, summary_length = _read_header(data)
+    return msgpack.unpackb(
+        data[HEADER.size : HEADER.size + summary_length], strict_map_key=False
+    )
+
+
+def decode_result(data: bytes) -> dict[str, Any]:
+    """Decode a full validation result produced by encode_result."""
+    msgpack = _import_msgpack()
+    compression, summary_length = _read_header(data)
+    body = _decompress(compression, data[HEADER.size + summary_length :])
+
+    strings: list[str] = []
+
+    def resolve(code: int, ref: bytes) -> Any:
+        if code == STRING_REF:
+            return strings[int.from_bytes(ref, "big")]
+        return msgpack.ExtType(code, ref)
+
+    unpacker = msgpack.Unpacker(
+        ext_hook=resolve, strict_map_key=False, max_buffer_size=len(body) or 1
+    )
+    unpacker.feed(body)
+    strings.extend(unpacker.unpack())
+    return unpacker.unpack()
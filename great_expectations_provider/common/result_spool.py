@@ -0,0 +1,407 @@
+"""
+Upload Validation Results to GX Cloud from a local spool, after the task has decided.
+
+Uploading the Validation Result is the largest GX Cloud request of a validation run. When
+results are spooled, the request GX would send is written to a file in a local spool
+directory instead, and the run continues as if GX Cloud had accepted it. The outcome of
+the task then depends only on the data, and a slow or failing GX Cloud neither delays
+nor fails it. The Validation Result in XCom has no GX Cloud ID or URL.
+
+The spool directory must be durable and shared by the workers that validate and
+`GXUploadSpooledResultsOperator`, which uploads the spooled results oldest first, in
+batches, from a periodic task that Airflow retries. Each file holds the URL and JSON
+payload of one request and is written atomically, so a result survives worker restarts
+until GX Cloud accepts it. Access tokens are never written to the spool.
+
+An uploader claims a file by renaming it, with its host name and process ID, before
+sending it, so concurrent uploaders never send the same result twice. A claim is
+released only once its uploader has exited on the host releasing it, so a slow upload
+is never sent again by another uploader. An uploader that exited after GX Cloud accepted
+the result but before removing the claim leaves it to be uploaded again, and claims
+held by uploaders of other hosts for longer than `STALE_CLAIM_SECONDS` are logged to be
+released by hand. A result GX Cloud rejects with a client error other than 408 or 429 is
+moved to the `rejected` subdirectory.
+
+Results are spooled by replacing the private `_post` of the GX Cloud store backend, so
+they are spooled only with the GX versions `great_expectations_provider.common.gx_internals`
+supports. With other versions they are uploaded during the run, as with `sync`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator
+
+import requests
+
+from great_expectations_provider.common.gx_internals import internals_supported
+from great_expectations_provider.common.metrics import emit_gauge, emit_incr
+
+if TYPE_CHECKING:
+    from great_expectations_provider.hooks.gx_cloud import GXCloudConfig
+
+logger = logging.getLogger(__name__)
+
+RESULT_UPLOAD_MODES = ("sync", "spool")
+SPOOLED_RESULTS_KEY = "spooled_results"
+DEFAULT_BATCH_SIZE = 50
+STALE_CLAIM_SECONDS = 600
+REJECTED_DIR = "rejected"
+# client errors worth retrying, every server error is retried
+RETRY_CLIENT_STATUSES = (408, 429)
+
+_ENTRY_SUFFIX = ".json"
+_CLAIM_SUFFIX = ".uploading"
+# separates the entry name, host name, and process ID of a claim
+_CLAIM_SEPARATOR = "@"
+
+_active_spool: ContextVar[ResultSpool | None] = ContextVar(
+    "gx_result_spool", default=None
+)
+_install_lock = threading.Lock()
+_installed = False
+
+
+def check_result_upload(
+    result_upload: str, context_type: str, result_spool_dir: str | None
+) -> None:
+    """Validate an operator's result upload arguments.
+
+    Raises:
+        ValueError: if the upload mode is unknown, or results are spooled without a GX Cloud
+            context or a spool directory.
+    """
+    if result_upload not in RESULT_UPLOAD_MODES:
+        raise ValueError(
+            f"Parameter `result_upload` must be one of {', '.join(RESULT_UPLOAD_MODES)}, "
+            f"got {result_upload!r}"
+        )
+    if result_upload == "spool" and context_type != "cloud":
+        raise ValueError(
+            "Parameter `result_upload` set to `spool` requires `context_type` to be `cloud`"
+        )
+    if result_upload == "spool" and not result_spool_dir:
+        raise ValueError(
+            "Parameter `result_upload` set to `spool` requires `result_spool_dir`, a durable "
+            "directory shared with `GXUploadSpooledResultsOperator`"
+        )
+
+
+@dataclass
+class UploadReport:
+    """Outcome of one pass over the spool."""
+
+    uploaded: int = 0
+    rejected: int = 0
+    failed: int = 0
+    remaining: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "uploaded": self.uploaded,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "remaining": self.remaining,
+        }
+
+
+class ResultSpool:
+    """A directory of Validation Result uploads waiting to be sent to GX Cloud.
+
+    When disabled, `spooling` is a no-op and results are uploaded by GX as usual, so
+    operators can use the spool unconditionally.
+
+    Args:
+        spool_dir: durable directory of the spooled results, shared by the workers. Required
+            when enabled.
+        enabled: whether to spool the results uploaded in `spooling` blocks.
+
+    Raises:
+        ValueError: if enabled without a spool directory.
+    """
+
+    def __init__(self, spool_dir: str | Path | None, enabled: bool = True) -> None:
+        if enabled and not spool_dir:
+            raise ValueError("Spooling results requires a spool directory")
+        # a disabled spool never reads or writes its directory
+        self.spool_dir = Path(spool_dir or os.curdir)
+        self.enabled = enabled
+        self.spooled: list[str] = []
+
+    def put(
+        self,
+        url: str,
+        payload: dict[str, Any],
+        organization_id: str,
+        workspace_id: str | None,
+    ) -> Path:
+        """Write the upload of one result to the spool and return the path of its file."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "url": url,
+            "payload": payload,
+            "organization_id": organization_id,
+            "workspace_id": workspace_id,
+            "spooled_at": time.time(),
+        }
+        # names sort by spooling time, so results are uploaded in order
+        path = (
+            self.spool_dir / f"{time.time_ns():020d}-{uuid.uuid4().hex}{_ENTRY_SUFFIX}"
+        )
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.spool_dir, suffix=".tmp", delete=False
+        ) as file:
+            json.dump(entry, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(file.name, path)
+        return path
+
+    def pending(self) -> list[Path]:
+        """Files of the results waiting to be uploaded, oldest first."""
+        if not self.spool_dir.is_dir():
+            return []
+        self._release_abandoned_claims()
+        return sorted(self.spool_dir.glob(f"*{_ENTRY_SUFFIX}"))
+
+    def _release_abandoned_claims(self) -> None:
+        host = socket.gethostname()
+        cutoff = time.time() - STALE_CLAIM_SECONDS
+        for claim in self.spool_dir.glob(f"*{_CLAIM_SUFFIX}"):
+            parts = claim.name[: -len(_CLAIM_SUFFIX)].split(_CLAIM_SEPARATOR)
+            if len(parts) != 3:
+                continue
+            entry_name, claim_host, pid = parts
+            try:
+                if claim_host == host:
+                    if not _process_exists(int(pid)):
+                        # the uploader exited before finishing
+                        os.replace(claim, claim.with_name(entry_name))
+                elif claim.stat().st_mtime < cutoff:
+                    logger.warning(
+                        "Spooled result %s has been claimed by process %s on %s since %s. "
+                        "If that uploader is gone, rename the file back to %s to upload it.",
+                        entry_name,
+                        pid,
+                        claim_host,
+                        time.ctime(claim.stat().st_mtime),
+                        entry_name,
+                    )
+            except FileNotFoundError:
+                pass
+
+    def upload(
+        self,
+        session: requests.Session,
+        organization_id: str,
+        workspace_id: str | None,
+        batch_size: int | None = DEFAULT_BATCH_SIZE,
+    ) -> UploadReport:
+        """Upload the spooled results of a GX Cloud workspace, oldest first.
+
+        The pass stops at the first result that fails with a retryable error, so later
+        results wait for the next pass.
+
+        Args:
+            session: session authenticated for the workspace.
+            organization_id: GX Cloud organization of the results to upload.
+            workspace_id: GX Cloud workspace of the results to upload.
+            batch_size: most results to upload in this pass. Defaults to 50, None uploads all.
+
+        Returns:
+            the results uploaded, rejected, and failed in this pass, and those left in the spool.
+        """
+        report = UploadReport()
+        pending = self.pending()
+        for path in pending:
+            if (
+                batch_size is not None
+                and report.uploaded + report.rejected >= batch_size
+            ):
+                break
+            claim = path.with_name(
+                _CLAIM_SEPARATOR.join(
+                    (path.name, socket.gethostname(), str(os.getpid()))
+                )
+                + _CLAIM_SUFFIX
+            )
+            try:
+                os.replace(path, claim)
+                claim.touch()
+                entry = json.loads(claim.read_text())
+            except FileNotFoundError:
+                # claimed by another uploader
+                continue
+            if (entry["organization_id"], entry["workspace_id"]) != (
+                organization_id,
+                workspace_id,
+            ):
+                os.replace(claim, path)
+                continue
+            try:
+                response = session.post(entry["url"], json=entry["payload"])
+            except requests.RequestException as error:
+                logger.warning(
+                    "Uploading spooled result %s failed: %s", path.name, error
+                )
+                status = None
+            else:
+                status = response.status_code
+            if status is not None and status < 400:
+                claim.unlink()
+                report.uploaded += 1
+            elif (
+                status is not None
+                and status < 500
+                and status not in RETRY_CLIENT_STATUSES
+            ):
+                rejected_dir = self.spool_dir / REJECTED_DIR
+                rejected_dir.mkdir(exist_ok=True)
+                os.replace(claim, rejected_dir / path.name)
+                logger.error(
+                    "GX Cloud rejected spooled result %s with status %s, moved it to %s",
+                    path.name,
+                    status,
+                    rejected_dir,
+                )
+                report.rejected += 1
+            else:
+                os.replace(claim, path)
+                if status is not None:
+                    logger.warning(
+                        "Uploading spooled result %s failed with status %s",
+                        path.name,
+                        status,
+                    )
+                report.failed += 1
+                break
+        report.remaining = len(self.pending())
+        tags = {"organization_id": organization_id}
+        emit_incr("result_spool.uploaded", report.uploaded, tags=tags)
+        emit_incr("result_spool.rejected", report.rejected, tags=tags)
+        emit_gauge("result_spool.pending", report.remaining, tags=tags)
+        return report
+
+    def upload_for_config(
+        self, gx_cloud_config: GXCloudConfig, batch_size: int | None = None
+    ) -> UploadReport:
+        """Upload the spooled results of the workspace of a GX Cloud connection."""
+        from great_expectations_provider.common.cloud_sessions import cloud_sessions
+
+        return self.upload(
+            cloud_sessions.get_for_config(gx_cloud_config),
+            gx_cloud_config.cloud_organization_id,
+            gx_cloud_config.cloud_workspace_id,
+            batch_size=batch_size,
+        )
+
+    @contextmanager
+    def _spooling(self) -> Iterator[None]:
+        if not _install():
+            # results are uploaded during the run instead
+            self.enabled = False
+            yield
+            return
+        token = _active_spool.set(self)
+        try:
+            yield
+        finally:
+            _active_spool.reset(token)
+
+    def spooling(self) -> ContextManager[None]:
+        """Spool the Validation Results GX uploads to GX Cloud in the enclosed block."""
+        if not self.enabled:
+            return nullcontext()
+        return self._spooling()
+
+    def report(self) -> dict[str, Any] | None:
+        """The spool directory and the files of the results spooled, or None when disabled."""
+        if not self.enabled:
+            return None
+        return {"spool_dir": str(self.spool_dir), "files": list(self.spooled)}
+
+
+def _process_exists(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # a process of another user
+        return True
+    return True
+
+
+def _install() -> bool:
+    global _installed
+    with _install_lock:
+        if _installed:
+            return True
+        from great_expectations.data_context.cloud_constants import GXCloudRESTResource
+        from great_expectations.data_context.store.gx_cloud_store_backend import (
+            GXCloudStoreBackend,
+        )
+        from great_expectations.data_context.types.refs import GXCloudResourceRef
+
+        if not internals_supported(
+            "Spooling results",
+            *(
+                (GXCloudStoreBackend, name)
+                for name in (
+                    "_post",
+                    "validate_set_kwargs",
+                    "construct_versioned_payload",
+                    "construct_versioned_url",
+                    "PAYLOAD_ATTRIBUTES_KEYS",
+                )
+            ),
+        ):
+            return False
+        post = GXCloudStoreBackend._post
+
+        def spooled_post(self: GXCloudStoreBackend, value: Any, **kwargs: Any) -> Any:
+            spool = _active_spool.get()
+            resource_type = self.ge_cloud_resource_type
+            if spool is None or resource_type != GXCloudRESTResource.VALIDATION_RESULT:
+                return post(self, value, **kwargs)
+            # the request GX would send, see GXCloudStoreBackend._post
+            organization_id = self.ge_cloud_credentials["organization_id"]
+            workspace_id = self.ge_cloud_credentials.get("workspace_id")
+            kwargs = kwargs if self.validate_set_kwargs(kwargs) else {}
+            payload = self.construct_versioned_payload(
+                resource_type=resource_type,
+                attributes_key=self.PAYLOAD_ATTRIBUTES_KEYS[resource_type],
+                attributes_value=value,
+                organization_id=organization_id,
+                **kwargs,
+            )
+            url = self.construct_versioned_url(
+                base_url=self.ge_cloud_base_url,
+                organization_id=organization_id,
+                resource_name=self.ge_cloud_resource_name,
+                workspace_id=workspace_id,
+            )
+            path = spool.put(url, payload, organization_id, workspace_id)
+            spool.spooled.append(path.name)
+            # GX Cloud assigns the ID and URL on upload, so the result has neither yet
+            return GXCloudResourceRef(
+                resource_type=resource_type,
+                id=None,  # type: ignore[arg-type]
+                url=None,  # type: ignore[arg-type]
+                response_json={"data": {"id": None, "result_url": None}},
+            )
+
+        GXCloudStoreBackend._post = spooled_post  # type: ignore[method-assign]
+        _installed = True
+        return True
@@ -0,0 +1,132 @@
+"""
+Validate the assets of one SQL Data Source from several threads over one engine.
+
+GX keeps a single execution engine per Data Source, and an execution engine holds the
+Batch it is validating, so two validations cannot use it at the same time. Each thread
+validating in a `SharedSQLEngine.using` block is given an execution engine of its own
+instead, and every one of them runs its queries on the Data Source's SQLAlchemy engine,
+so the validations share one connection pool sized for the concurrency.
+
+GX looks the execution engine up through `SQLDatasource.get_execution_engine`, which is
+replaced only while a `SharedSQLEngine.sharing` block runs, and restored when the last
+one exits. The execution engines of the threads are closed when their block exits.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from great_expectations.datasource.fluent import SQLDatasource
+    from great_expectations.execution_engine import SqlAlchemyExecutionEngine
+
+# (Data Source name, execution engine of the current thread)
+_thread_engine: ContextVar[tuple[str, SqlAlchemyExecutionEngine] | None] = ContextVar(
+    "gx_shared_sql_engine", default=None
+)
+_install_lock = threading.Lock()
+# sharing blocks running, and the method of GX they replaced
+_sharing_count = 0
+_get_execution_engine: Any = None
+
+
+def pool_kwargs(connection_string: str, pool_size: int) -> dict[str, Any]:
+    """Engine arguments for a connection pool of `pool_size` connections.
+
+    SQLite databases are local files or memory, and their pools take no size.
+    """
+    from sqlalchemy.engine import make_url
+
+    if make_url(connection_string).get_backend_name() == "sqlite":
+        return {}
+    return {"pool_size": pool_size, "max_overflow": 0}
+
+
+class SharedSQLEngine:
+    """Give each validating thread an execution engine on the SQLAlchemy engine of a Data Source.
+
+    Args:
+        datasource: the SQL Data Source whose assets are validated.
+    """
+
+    def __init__(self, datasource: SQLDatasource) -> None:
+        self.datasource = datasource
+        self.engine = datasource.get_engine()
+        self._execution_engines: dict[int, SqlAlchemyExecutionEngine] = {}
+        self._lock = threading.Lock()
+
+    def _execution_engine(self) -> SqlAlchemyExecutionEngine:
+        from great_expectations.execution_engine import SqlAlchemyExecutionEngine
+
+        thread_id = threading.get_ident()
+        with self._lock:
+            if thread_id not in self._execution_engines:
+                self._execution_engines[thread_id] = SqlAlchemyExecutionEngine(
+                    engine=self.engine,
+                    create_temp_table=self.datasource.create_temp_table,
+                )
+            return self._execution_engines[thread_id]
+
+    @contextmanager
+    def sharing(self) -> Iterator[None]:
+        """Let threads validate in `using` blocks within the enclosed block, closing their execution engines at exit."""
+        _install()
+        try:
+            yield
+        finally:
+            _uninstall()
+            self.close()
+
+    @contextmanager
+    def using(self) -> Iterator[None]:
+        """Validate assets of the Data Source with this thread's execution engine in the enclosed block.
+
+        Must run within the `sharing` block of this instance.
+        """
+        token = _thread_engine.set((self.datasource.name, self._execution_engine()))
+        try:
+            yield
+        finally:
+            _thread_engine.reset(token)
+
+    def close(self) -> None:
+        """Close the execution engines of the threads, and dispose the pool of the engine."""
+        with self._lock:
+            execution_engines = list(self._execution_engines.values())
+            self._execution_engines.clear()
+        for execution_engine in execution_engines:
+            execution_engine.close()
+
+
+def _thread_execution_engine(self: SQLDatasource) -> SqlAlchemyExecutionEngine:
+    thread_engine = _thread_engine.get()
+    # assets hold copies of their Data Source, so it is matched by name
+    if thread_engine is None or thread_engine[0] != self.name:
+        return _get_execution_engine(self)
+    return thread_engine[1]
+
+
+def _install() -> None:
+    global _sharing_count, _get_execution_engine
+    with _install_lock:
+        _sharing_count += 1
+        if _sharing_count > 1:
+            return
+        from great_expectations.datasource.fluent import SQLDatasource
+
+        _get_execution_engine = SQLDatasource.get_execution_engine
+        SQLDatasource.get_execution_engine = _thread_execution_engine  # type: ignore[method-assign]
+
+
+def _uninstall() -> None:
+    global _sharing_count
+    with _install_lock:
+        _sharing_count -= 1
+        if _sharing_count:
+            return
+        from great_expectations.datasource.fluent import SQLDatasource
+
+        SQLDatasource.get_execution_engine = _get_execution_engine  # type: ignore[method-assign]
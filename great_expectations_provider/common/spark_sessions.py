@@ -0,0 +1,285 @@
+"""
+Keep warm SparkSessions between the validations of a process.
+
+Building a SparkSession starts a JVM, and a Spark Connect session opens a channel to its
+server; either often takes longer than validating the DataFrame. `get_spark_session`,
+called in the `configure_dataframe` of a `GXValidateDataFrameOperator`, returns the
+session the process keeps for a master or Spark Connect URL and configuration, building
+it on first use. Before a kept session is reused it must answer a trivial query, or it is
+stopped and built again. A session idle for longer than its idle timeout is stopped. While
+the operator validates a DataFrame of a kept session, the session is in use and is not
+stopped.
+
+Sessions are kept by the process only, and a forked child starts without them. Airflow
+runs each task in a process of its own, so a session is not reused by later tasks; it is
+reused by the operators executed in one long-lived process, such as `dag.test()` or an
+executor running tasks in the worker process itself.
+
+A process runs at most one classic SparkContext, so getting a classic session with another
+master or configuration stops the kept classic session first, unless a validation is
+using it. Spark Connect sessions to different servers, or with different configurations,
+are kept side by side.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, Mapping
+
+if TYPE_CHECKING:
+    from pyspark.sql import SparkSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+HEALTH_CHECK_QUERY = "SELECT 1"
+
+# ("master" or "remote", URL, sorted configuration items)
+SessionKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+@dataclass
+class _KeptSession:
+    session: Any
+    idle_timeout: float
+    last_used: float
+    in_use: int = 0
+
+
+def _session_key(
+    master: str | None, remote: str | None, config: Mapping[str, Any] | None
+) -> SessionKey:
+    if (master is None) == (remote is None):
+        raise ValueError("Pass exactly one of master and remote")
+    items = tuple(
+        sorted((str(key), str(value)) for key, value in (config or {}).items())
+    )
+    if master is not None:
+        return ("master", master, items)
+    assert remote is not None
+    return ("remote", remote, items)
+
+
+def _is_healthy(session: Any) -> bool:
+    try:
+        session.sql(HEALTH_CHECK_QUERY).collect()
+    except Exception:
+        logger.warning("Kept SparkSession failed its health check", exc_info=True)
+        return False
+    return True
+
+
+class SparkSessionPool:
+    """Keep one SparkSession per master or Spark Connect URL and configuration."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[SessionKey, _KeptSession] = {}
+        self._lock = threading.Lock()
+        self._reaper: threading.Timer | None = None
+
+    def get(
+        self,
+        master: str | None = None,
+        remote: str | None = None,
+        config: Mapping[str, Any] | None = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        health_check: bool = True,
+    ) -> SparkSession:
+        """Return the kept session for a master or Spark Connect URL and configuration, building it if needed.
+
+        Args:
+            master: master URL of a classic session, such as `local[*]` or `yarn`.
+            remote: URL of a Spark Connect server, such as `sc://spark-connect:15002`.
+            config: Spark configuration of the session.
+            idle_timeout: seconds the session is kept while not used.
+            health_check: if True, check that a kept session answers a trivial query before
+                reusing it.
+
+        Raises:
+            ValueError: If not exactly one of `master` and `remote` is given, or
+                `idle_timeout` is not positive
+            RuntimeError: If a classic session with another master or configuration is in use
+        """
+        key = _session_key(master, remote, config)
+        if idle_timeout <= 0:
+            raise ValueError("idle_timeout must be a positive number of seconds")
+        with self._lock:
+            self._stop_idle()
+            kept = self._sessions.get(key)
+            if kept is not None:
+                # not stopped by the reaper while it is checked
+                kept.in_use += 1
+        # the query can take long, so it runs without the lock
+        healthy = kept is None or not health_check or _is_healthy(kept.session)
+        with self._lock:
+            if kept is not None:
+                kept.in_use -= 1
+                if not healthy:
+                    if self._sessions.get(key) is kept:
+                        self._stop(key)
+                    # unless another thread built a session meanwhile
+                    kept = self._sessions.get(key)
+            if kept is None:
+                if master is not None:
+                    for other in [
+                        other for other in self._sessions if other[0] == "master"
+                    ]:
+                        if self._sessions[other].in_use:
+                            raise RuntimeError(
+                                f"Cannot start a SparkSession with master {master}: "
+                                "the process's SparkContext is in use by another validation"
+                            )
+                        self._stop(other)
+                kept = _KeptSession(
+                    self._create(master, remote, dict(key[2])),
+                    idle_timeout=idle_timeout,
+                    last_used=time.monotonic(),
+                )
+                self._sessions[key] = kept
+            kept.idle_timeout = idle_timeout
+            kept.last_used = time.monotonic()
+            self._schedule_reap()
+        return kept.session
+
+    def _create(
+        self, master: str | None, remote: str | None, config: dict[str, str]
+    ) -> SparkSession:
+        from pyspark.sql import SparkSession
+
+        if master is not None:
+            logger.info("Starting SparkSession with master %s", master)
+            builder = SparkSession.builder.master(master)
+        else:
+            logger.info("Connecting SparkSession to %s", remote)
+            builder = SparkSession.builder.remote(remote)
+        for key, value in config.items():
+            builder = builder.config(key, value)
+        if remote is not None:
+            # a session of its own rather than the process's default Spark Connect session
+            return builder.create()
+        return builder.getOrCreate()
+
+    @contextmanager
+    def using(self, dataframe: Any) -> Iterator[None]:
+        """Keep the session of `dataframe` from being stopped in the enclosed block, if it is a kept session."""
+        session = getattr(dataframe, "sparkSession", None)
+        with self._lock:
+            kept = next(
+                (kept for kept in self._sessions.values() if kept.session is session),
+                None,
+            )
+            if kept is not None:
+                kept.in_use += 1
+        try:
+            yield
+        finally:
+            if kept is not None:
+                with self._lock:
+                    kept.in_use -= 1
+                    kept.last_used = time.monotonic()
+                    self._schedule_reap()
+
+    def _schedule_reap(self) -> None:
+        # a single timer stops idle sessions, set for the earliest idle deadline
+        if self._reaper is not None:
+            return
+        deadlines = [
+            kept.last_used + kept.idle_timeout
+            for kept in self._sessions.values()
+            if not kept.in_use
+        ]
+        if not deadlines:
+            return
+        self._reaper = threading.Timer(
+            max(min(deadlines) - time.monotonic(), 0), self._reap
+        )
+        self._reaper.daemon = True
+        self._reaper.start()
+
+    def _reap(self) -> None:
+        with self._lock:
+            self._reaper = None
+            self._stop_idle()
+            self._schedule_reap()
+
+    def stop_idle(self) -> None:
+        """Stop the sessions not in use that have been idle for longer than their idle timeout."""
+        with self._lock:
+            self._stop_idle()
+
+    def _stop_idle(self) -> None:
+        now = time.monotonic()
+        for key, kept in list(self._sessions.items()):
+            if not kept.in_use and now - kept.last_used >= kept.idle_timeout:
+                logger.info(
+                    "Stopping SparkSession idle for %.0f seconds", now - kept.last_used
+                )
+                self._stop(key)
+
+    def _stop(self, key: SessionKey) -> None:
+        kept = self._sessions.pop(key)
+        try:
+            kept.session.stop()
+        except Exception:
+            logger.warning("Failed to stop SparkSession", exc_info=True)
+
+    def _reset_after_fork(self) -> None:
+        # a forked child cannot use the parent's JVM gateway or channels
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._reaper = None
+
+    def close(self) -> None:
+        """Stop every kept session."""
+        with self._lock:
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+            for key in list(self._sessions):
+                self._stop(key)
+
+
+spark_sessions = SparkSessionPool()
+os.register_at_fork(after_in_child=spark_sessions._reset_after_fork)
+atexit.register(spark_sessions.close)
+
+
+def get_spark_session(
+    master: str | None = None,
+    remote: str | None = None,
+    config: Mapping[str, Any] | None = None,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    health_check: bool = True,
+) -> SparkSession:
+    """Return the SparkSession this process keeps for a master or Spark Connect URL and configuration.
+
+    Call it in `configure_dataframe` to build the DataFrames of the operators executed in
+    one process from a warm session. Sessions are not shared between processes, so tasks
+    Airflow runs in processes of their own each build one.
+
+    Args:
+        master: master URL of a classic session, such as `local[*]` or `yarn`.
+        remote: URL of a Spark Connect server, such as `sc://spark-connect:15002`.
+        config: Spark configuration of the session.
+        idle_timeout: seconds the session is kept while not used. Defaults to 600.
+        health_check: if True, check that a kept session answers a trivial query before
+            reusing it. Defaults to True.
+
+    Raises:
+        ValueError: If not exactly one of `master` and `remote` is given, or
+            `idle_timeout` is not positive
+        RuntimeError: If a classic session with another master or configuration is in use
+    """
+    return spark_sessions.get(
+        master=master,
+        remote=remote,
+        config=config,
+        idle_timeout=idle_timeout,
+        health_check=health_check,
+    )
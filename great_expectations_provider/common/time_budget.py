@@ -0,0 +1,371 @@
+"""
+Bound the time a validation run may take, keeping the results computed within it.
+
+When Airflow's `execution_timeout` kills a task, everything the validation computed is
+lost. With a time budget, the Expectations of each Validation Definition are evaluated in
+groups instead of in one metric graph, and the elapsed time is checked between groups.
+Expectations on the same column share most of their metrics, so each group holds the
+Expectations of one column, or of the table. Before each group, its cost is estimated from
+the average time per Expectation so far. If it would not fit in the remaining budget, the
+remaining Expectations are either left unevaluated, or evaluated against a random sample
+of the DataFrame being validated. Row counts and other table-level metrics computed on a
+sample describe the sample, not the DataFrame.
+
+Evaluating the groups one by one splits the single metric graph GX builds for a suite, so
+metrics shared across groups, such as the row count of the table, are computed again for
+each group that needs them. A budget therefore makes a run that fits within it slower than
+the same run without one.
+
+The Validation Result then holds only the evaluated Expectations, and its statistics cover
+those alone. A result that leaves any Expectation unevaluated, or evaluated only on a
+sample, is never a success: its success flag is cleared as soon as GX builds it, before it
+is stored, uploaded to GX Cloud, or passed to the actions of a Checkpoint. The described
+result also lists those Expectations under its `time_budget` key, so that the task fails
+with `GXTimeBudgetExceeded` instead of passing on a part of its suite.
+
+The budget wraps private methods of the GX Validator, so it applies only with the GX
+versions `great_expectations_provider.common.gx_internals` supports. With other versions
+the whole suite is evaluated, as without a budget.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator, Union, cast
+
+from great_expectations_provider.common.expectation_timing import DOMAIN_KWARGS
+from great_expectations_provider.common.gx_internals import internals_supported
+from great_expectations_provider.common.gx_phases import (
+    VALIDATION_DEFINITION,
+    observe_phases,
+)
+
+if TYPE_CHECKING:
+    from great_expectations_provider.common.xcom import ResultDict
+
+logger = logging.getLogger(__name__)
+
+TIME_BUDGET_KEY = "time_budget"
+TIME_BUDGET_ACTIONS = ("stop", "sample")
+DEFAULT_SAMPLE_FRACTION = 0.1
+
+TimeBudgetValue = Union[timedelta, float]
+
+_active_budget: ContextVar[TimeBudget | None] = ContextVar(
+    "gx_time_budget", default=None
+)
+_install_lock = threading.Lock()
+_installed = False
+
+
+def check_time_budget(
+    time_budget: TimeBudgetValue | None, action: str, sample_fraction: float
+) -> None:
+    """Validate an operator's time budget arguments.
+
+    Raises:
+        ValueError: if the budget is not positive, the action is unknown, or the sample
+            fraction is not in (0, 1].
+    """
+    if time_budget is not None and _seconds(time_budget) <= 0:
+        raise ValueError("Parameter `time_budget` must be positive")
+    if action not in TIME_BUDGET_ACTIONS:
+        raise ValueError(
+            f"Parameter `time_budget_action` must be one of "
+            f"{', '.join(TIME_BUDGET_ACTIONS)}, got {action!r}"
+        )
+    if not 0 < sample_fraction <= 1:
+        raise ValueError(
+            "Parameter `time_budget_sample_fraction` must be greater than 0 and at most 1"
+        )
+
+
+def _seconds(time_budget: TimeBudgetValue) -> float:
+    if isinstance(time_budget, timedelta):
+        return time_budget.total_seconds()
+    return float(time_budget)
+
+
+def _domain(configuration: Any) -> str:
+    for key in DOMAIN_KWARGS:
+        if key in configuration.kwargs:
+            return json.dumps(configuration.kwargs[key], default=str)
+    return "table"
+
+
+def _group_by_domain(expectation_configs: list[Any]) -> list[list[Any]]:
+    # groups are ordered by the first Expectation of each
+    groups: dict[str, list[Any]] = {}
+    for configuration in expectation_configs:
+        groups.setdefault(_domain(configuration), []).append(configuration)
+    return list(groups.values())
+
+
+def _sample(dataframe: Any, fraction: float) -> Any | None:
+    from pandas import DataFrame
+
+    if isinstance(dataframe, DataFrame):
+        return dataframe.sample(frac=fraction, random_state=0)
+    if type(dataframe).__name__ == "DataFrame" and hasattr(dataframe, "sample"):
+        # Spark and Spark Connect DataFrames
+        return dataframe.sample(fraction=fraction, seed=0)
+    return None
+
+
+class TimeBudget:
+    """Stop, or sample, the Expectations validated once a time budget is nearly spent.
+
+    The clock starts when the budget is created. When disabled every method is a no-op,
+    so operators can use the budget unconditionally.
+
+    Args:
+        time_budget: the time the validation may take, as a timedelta or in seconds.
+            None disables the budget.
+        action: `stop` to leave the remaining Expectations unevaluated, or `sample` to
+            evaluate them against a sample of the validated DataFrame. Sampling requires
+            the Batch to be a pandas or Spark DataFrame; otherwise the run stops.
+        sample_fraction: fraction of rows sampled when `action` is `sample`.
+    """
+
+    def __init__(
+        self,
+        time_budget: TimeBudgetValue | None,
+        action: str = "stop",
+        sample_fraction: float = DEFAULT_SAMPLE_FRACTION,
+    ) -> None:
+        self.enabled = time_budget is not None
+        self.budget_seconds = _seconds(time_budget) if time_budget is not None else 0.0
+        self.action = action
+        self.sample_fraction = sample_fraction
+        self._start = time.monotonic()
+        self._validation_definition: str | None = None
+        # Batch Definition and parameters of the Validation Definition being run
+        self._batch_definition: Any = None
+        self._batch_parameters: dict[str, Any] | None = None
+        self._unevaluated: list[dict[str, Any]] = []
+        self._sampled: list[dict[str, Any]] = []
+        # Expectations evaluated and seconds taken, on the full Batch and on a sample
+        self._rates: dict[bool, list[float]] = {False: [0, 0.0], True: [0, 0.0]}
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def _fits(self, group: list[Any], sampling: bool) -> bool:
+        """Whether `group` is expected to finish within the budget."""
+        remaining = self.budget_seconds - self._elapsed()
+        if remaining <= 0:
+            return False
+        evaluated, seconds = self._rates[sampling]
+        if not evaluated and sampling:
+            # assume a sample takes its fraction of the full evaluation time
+            evaluated, seconds = self._rates[False]
+            seconds *= self.sample_fraction
+        return not evaluated or seconds / evaluated * len(group) <= remaining
+
+    def _record(
+        self, rows: list[dict[str, Any]], expectation_configs: list[Any]
+    ) -> None:
+        for configuration in expectation_configs:
+            row = {
+                "expectation_type": configuration.type,
+                "kwargs": json.loads(
+                    json.dumps(
+                        {
+                            key: value
+                            for key, value in configuration.kwargs.items()
+                            if key != "batch_id"
+                        },
+                        default=str,
+                    )
+                ),
+            }
+            if self._validation_definition is not None:
+                row["validation_definition"] = self._validation_definition
+            rows.append(row)
+
+    def _sampled_validator(self, validator: Any) -> Any | None:
+        from great_expectations.validator.v1_validator import Validator
+
+        batch_parameters = self._batch_parameters or {}
+        sample = _sample(batch_parameters.get("dataframe"), self.sample_fraction)
+        if sample is None or self._batch_definition is None:
+            logger.warning(
+                "Time budget sampling requires a DataFrame Batch, "
+                "leaving the remaining Expectations unevaluated"
+            )
+            return None
+        return Validator(
+            batch_definition=self._batch_definition,
+            result_format=validator.result_format,
+            batch_parameters={**batch_parameters, "dataframe": sample},
+        )
+
+    def validate(
+        self,
+        validate_expectation_configs: Any,
+        validator: Any,
+        expectation_configs: list[Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """Evaluate `expectation_configs` group by group while the budget allows."""
+        results: list[Any] = []
+        sampled_validator = None
+        groups = _group_by_domain(expectation_configs)
+        for index, group in enumerate(groups):
+            sampling = sampled_validator is not None
+            if not self._fits(group, sampling):
+                if not sampling and self.action == "sample":
+                    sampled_validator = self._sampled_validator(validator)
+                sampling = sampled_validator is not None
+                if not sampling or not self._fits(group, sampling):
+                    remaining_configs = [c for g in groups[index:] for c in g]
+                    self._record(self._unevaluated, remaining_configs)
+                    break
+            start = self._elapsed()
+            group_results = validate_expectation_configs(
+                sampled_validator if sampling else validator, group, *args, **kwargs
+            )
+            rate = self._rates[sampling]
+            rate[0] += len(group)
+            rate[1] += self._elapsed() - start
+            if sampling:
+                for result in group_results:
+                    result.meta = {
+                        **(result.meta or {}),
+                        "sample_fraction": self.sample_fraction,
+                    }
+                self._record(self._sampled, group)
+            results.extend(group_results)
+        return results
+
+    def validate_suite(
+        self, validate_expectation_suite: Any, validator: Any, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Run `validate_expectation_suite`, clearing the success flag of an incomplete result.
+
+        The flag is cleared on the result GX builds, so the stored and uploaded result, and
+        the result the actions of a Checkpoint receive, fail too.
+        """
+        incomplete_before = len(self._unevaluated) + len(self._sampled)
+        result = validate_expectation_suite(validator, *args, **kwargs)
+        if len(self._unevaluated) + len(self._sampled) > incomplete_before:
+            result.success = False
+        return result
+
+    @contextmanager
+    def _observe(self, phase: str, info: dict[str, Any]) -> Iterator[None]:
+        if phase != VALIDATION_DEFINITION:
+            yield
+            return
+        self._validation_definition = info["name"]
+        self._batch_definition = info.get("batch_definition")
+        self._batch_parameters = info.get("batch_parameters")
+        try:
+            yield
+        finally:
+            self._validation_definition = None
+            self._batch_definition = None
+            self._batch_parameters = None
+
+    @contextmanager
+    def _track(self) -> Iterator[None]:
+        if not _install():
+            # the whole suite is evaluated instead
+            self.enabled = False
+            yield
+            return
+        token = _active_budget.set(self)
+        try:
+            with observe_phases(self._observe):
+                yield
+        finally:
+            _active_budget.reset(token)
+
+    def track(self) -> ContextManager[None]:
+        """Apply the budget to the Validation Definitions run in the enclosed block."""
+        if not self.enabled:
+            return nullcontext()
+        return self._track()
+
+    @property
+    def incomplete(self) -> bool:
+        """Whether Expectations were left unevaluated, or evaluated only on a sample."""
+        return bool(self._unevaluated or self._sampled)
+
+    def mark_incomplete(self, result_dict: ResultDict) -> None:
+        """Fail a described result that is incomplete, listing the Expectations under its `time_budget` key."""
+        if not self.incomplete:
+            return
+        result = cast("dict[str, Any]", result_dict)
+        result["success"] = False
+        result[TIME_BUDGET_KEY] = self.report()
+
+    def report(self) -> dict[str, Any] | None:
+        """The budget, the time spent, and the Expectations not evaluated or sampled, or None when disabled."""
+        if not self.enabled:
+            return None
+        return {
+            "budget_seconds": self.budget_seconds,
+            "elapsed_seconds": round(self._elapsed(), 6),
+            "exhausted": self.incomplete,
+            "action": self.action,
+            "unevaluated_expectations": self._unevaluated,
+            "sampled_expectations": self._sampled,
+        }
+
+
+def _install() -> bool:
+    global _installed
+    with _install_lock:
+        if _installed:
+            return True
+        from great_expectations.validator.v1_validator import Validator
+
+        if not internals_supported(
+            "Time budgets",
+            (Validator, "_validate_expectation_configs"),
+            (Validator, "validate_expectation_suite"),
+        ):
+            return False
+
+        validate_expectation_configs = Validator._validate_expectation_configs
+
+        def budgeted_validate_expectation_configs(
+            self: Any, expectation_configs: list, *args: Any, **kwargs: Any
+        ) -> Any:
+            budget = _active_budget.get()
+            if budget is None:
+                return validate_expectation_configs(
+                    self, expectation_configs, *args, **kwargs
+                )
+            return budget.validate(
+                validate_expectation_configs,
+                self,
+                expectation_configs,
+                *args,
+                **kwargs,
+            )
+
+        validate_expectation_suite = Validator.validate_expectation_suite
+
+        def budgeted_validate_expectation_suite(
+            self: Any, *args: Any, **kwargs: Any
+        ) -> Any:
+            budget = _active_budget.get()
+            if budget is None:
+                return validate_expectation_suite(self, *args, **kwargs)
+            return budget.validate_suite(
+                validate_expectation_suite, self, *args, **kwargs
+            )
+
+        Validator._validate_expectation_configs = budgeted_validate_expectation_configs  # type: ignore[method-assign]
+        Validator.validate_expectation_suite = budgeted_validate_expectation_suite  # type: ignore[method-assign]
+        _installed = True
+        return True
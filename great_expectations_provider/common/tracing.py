@@ -0,0 +1,209 @@
+"""
+OpenTelemetry tracing of validation runs.
+
+Spans are created with the globally configured tracer provider, so they nest under the
+Airflow task span when Airflow's OpenTelemetry integration is enabled, and are exported
+wherever the worker sends its traces. The operators open spans for loading the Data
+Context and configuring the Batch Definition and Expectations; the GX phases observed
+by `gx_phases` add a span per Validation Definition, with child spans for batch loading
+and metric computation. GX computes the metrics of all Expectations in one graph, so the
+child span recorded for each Expectation only marks it: it is opened and closed at once,
+after the validation, and carries its outcome and row counts but no duration. The time
+of each Expectation is attributed by `time_expectations` instead. The spans of GX phases
+are recorded only with the GX versions whose phases `gx_phases` can observe.
+
+Requires the `opentelemetry-api` package; without it tracing is a no-op.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator
+
+from great_expectations_provider.common.constants import VERSION
+from great_expectations_provider.common.gx_phases import (
+    BATCH_LOADING,
+    METRIC_COMPUTATION,
+    VALIDATION_DEFINITION,
+    observe_phases,
+)
+
+logger = logging.getLogger(__name__)
+
+TRACER_NAME = "great_expectations_provider"
+SPAN_PREFIX = "gx"
+ATTRIBUTE_PREFIX = "gx"
+# result fields recorded on Expectation spans when GX reports them
+RESULT_COUNT_FIELDS = (
+    "element_count",
+    "missing_count",
+    "unexpected_count",
+    "unexpected_percent",
+    "observed_value",
+)
+TRACED_PHASES = (VALIDATION_DEFINITION, BATCH_LOADING, METRIC_COMPUTATION)
+# phase info that is not recorded as span attributes, such as the Batch and its DataFrame
+UNTRACED_PHASE_INFO = ("result", "batch_definition", "batch_parameters")
+
+
+def _get_tracer() -> Any | None:
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        return None
+    return trace.get_tracer(TRACER_NAME, VERSION)
+
+
+def _attribute_value(value: Any) -> Any:
+    # span attributes must be primitives or homogeneous sequences of primitives
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _prefixed(attributes: dict[str, Any]) -> dict[str, Any]:
+    return {
+        f"{ATTRIBUTE_PREFIX}.{key}": _attribute_value(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+def _statistics_attributes(statistics: dict[str, Any] | None) -> dict[str, Any]:
+    statistics = statistics or {}
+    return {
+        "evaluated_expectations": statistics.get("evaluated_expectations"),
+        "successful_expectations": statistics.get("successful_expectations"),
+        "unsuccessful_expectations": statistics.get("unsuccessful_expectations"),
+    }
+
+
+def _row_count(expectation_results: list[Any]) -> int | None:
+    counts = [
+        result.result["element_count"]
+        for result in expectation_results
+        if isinstance(getattr(result, "result", None), dict)
+        and isinstance(result.result.get("element_count"), int)
+    ]
+    return max(counts) if counts else None
+
+
+class ValidationTracer:
+    """Record a validation run as OpenTelemetry spans.
+
+    When disabled, or when `opentelemetry-api` is not installed, every method is a no-op,
+    so operators can use the tracer unconditionally.
+
+    Args:
+        enabled: whether to record spans.
+        task_id: Airflow task ID, recorded on every span as `gx.task_id`.
+    """
+
+    def __init__(self, enabled: bool, task_id: str) -> None:
+        self.task_id = task_id
+        self._tracer = _get_tracer() if enabled else None
+        if enabled and self._tracer is None:
+            logger.warning(
+                "Tracing was requested but opentelemetry-api is not installed, "
+                "install it with `pip install airflow-provider-great-expectations[tracing]`"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self._tracer is not None
+
+    @contextmanager
+    def _span(self, name: str, attributes: dict[str, Any]) -> Iterator[Any]:
+        assert self._tracer is not None
+        with self._tracer.start_as_current_span(
+            f"{SPAN_PREFIX}.{name}",
+            attributes=_prefixed({"task_id": self.task_id, **attributes}),
+        ) as span:
+            yield span
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[Any]:
+        """Record the enclosed block as span `gx.<name>`, yielding the span (None when disabled)."""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, attributes)
+
+    def set_attributes(self, span: Any, **attributes: Any) -> None:
+        if span is not None:
+            span.set_attributes(_prefixed(attributes))
+
+    def record_expectations(self, expectation_results: list[Any]) -> None:
+        """Record one zero-duration `gx.expectation` child span per Expectation Validation Result."""
+        if not self.enabled:
+            return
+        for expectation_result in expectation_results:
+            config = expectation_result.expectation_config
+            kwargs = getattr(config, "kwargs", None) or {}
+            result = getattr(expectation_result, "result", None) or {}
+            with self._span(
+                "expectation",
+                {
+                    "expectation.type": getattr(config, "type", None),
+                    "expectation.column": kwargs.get("column"),
+                    "expectation.success": expectation_result.success,
+                    **{
+                        f"expectation.{field}": result.get(field)
+                        for field in RESULT_COUNT_FIELDS
+                    },
+                },
+            ):
+                pass
+
+    def record_result(self, span: Any, xcom_value: dict[str, Any]) -> None:
+        """Record the outcome and serialized size of the described result."""
+        if span is None:
+            return
+        self.set_attributes(
+            span,
+            success=xcom_value.get("success"),
+            **{
+                "result.size_bytes": len(json.dumps(xcom_value, default=str)),
+                **_statistics_attributes(xcom_value.get("statistics")),
+            },
+        )
+
+    def _observe(self, phase: str, info: dict[str, Any]) -> ContextManager[None]:
+        if phase not in TRACED_PHASES:
+            return nullcontext()
+        return self._phase_span(phase, info)
+
+    @contextmanager
+    def _phase_span(self, phase: str, info: dict[str, Any]) -> Iterator[None]:
+        attributes = {
+            f"{phase}.{key}": value
+            for key, value in info.items()
+            if key not in UNTRACED_PHASE_INFO
+        }
+        with self._span(phase, attributes) as span:
+            yield
+            result = info.get("result")
+            if result is None:
+                return
+            if phase == VALIDATION_DEFINITION:
+                self.set_attributes(
+                    span,
+                    success=result.success,
+                    row_count=_row_count(result.results),
+                    **_statistics_attributes(result.statistics),
+                )
+            elif phase == METRIC_COMPUTATION:
+                self.set_attributes(span, row_count=_row_count(result))
+                self.record_expectations(result)
+
+    @contextmanager
+    def _track(self, attributes: dict[str, Any]) -> Iterator[Any]:
+        with self._span("validate", attributes) as span:
+            with observe_phases(self._observe):
+                yield span
+
+    def track(self, **attributes: Any) -> ContextManager[Any]:
+        """Record the enclosed block as a `gx.validate` span, with the GX phases run in it as child spans."""
+        if not self.enabled:
+            return nullcontext()
+        return self._track(attributes)
@@ -0,0 +1,284 @@
+"""
+Skip validating files that have not changed since their last successful validation.
+
+Filesystem Batch Definitions are often validated again over the same file, for instance
+a monthly Batch revalidated on every daily run. Before validating, the files the Batch
+Definitions resolve to are fingerprinted by their size and modification time, or by
+their size and a SHA-256 hash of their content. The fingerprints, together with the
+fingerprints of the suites, of the Data Source, asset, and Batch Definition configs, such as
+CSV reader options, and of the result format, are compared with the ones stored by the
+last successful validation of the same task of the same DAG over the same files; when
+they all match, that validation's result is returned and no data is read.
+
+Files are resolved as GX resolves them, the last Batch matching the Batch Parameters,
+which relies on internals of GX; with GX versions they are not supported in, every Batch
+is validated.
+Batch Definitions of other assets, such as SQL tables, DataFrames, and files in cloud
+storage, cannot be fingerprinted, and are always validated. Only complete, successful
+validations are stored, never those a time budget cut short or sampled, and a file
+changing while it is validated changes its fingerprint for the next run, so a skipped
+validation never hides a failure or a change.
+
+A skipped validation runs nothing: no result is stored or uploaded to GX Cloud. Checkpoints
+with actions are therefore always run, so that their actions are never skipped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+from great_expectations_provider.common.gx_context_actions import suite_fingerprint
+from great_expectations_provider.common.gx_internals import internals_supported
+
+if TYPE_CHECKING:
+    from great_expectations import Checkpoint, ExpectationSuite
+    from great_expectations.core.batch_definition import BatchDefinition
+
+logger = logging.getLogger(__name__)
+
+SKIPPED_UNCHANGED_KEY = "skipped_unchanged"
+DEFAULT_FINGERPRINT_DIR = Path(tempfile.gettempdir()) / "gx_batch_fingerprints"
+_HASH_CHUNK_BYTES = 1 << 20
+# config fields that change with every Data Context, or are fingerprinted on their own
+_UNFINGERPRINTED_FIELDS = {"id", "assets", "batch_definitions"}
+
+
+def _supported() -> bool:
+    from great_expectations.datasource.fluent.data_asset.path.path_data_asset import (
+        PathDataAsset,
+    )
+
+    return internals_supported(
+        "Skipping unchanged Batches",
+        (PathDataAsset, "_get_batch_definition_list"),
+        (PathDataAsset, "_get_sortable_partitioner"),
+        (PathDataAsset, "_data_connector"),
+    )
+
+
+def resolve_batch_path(
+    batch_definition: BatchDefinition, batch_parameters: dict | None
+) -> Path | None:
+    """Local file or directory GX would validate for `batch_definition`, or None if it has none."""
+    from great_expectations.datasource.fluent.data_asset.path.path_data_asset import (
+        PathDataAsset,
+    )
+
+    asset = batch_definition.data_asset
+    if not isinstance(asset, PathDataAsset) or not _supported():
+        return None
+    batch_request = batch_definition.build_batch_request(batch_parameters)
+    try:
+        # as PathDataAsset.get_batch picks its Batch, without reading it
+        legacy_batch_definitions = asset._get_batch_definition_list(batch_request)
+        if not legacy_batch_definitions:
+            return None
+        if partitioner := asset._get_sortable_partitioner(batch_request.partitioner):
+            legacy_batch_definitions = asset.sort_legacy_batch_definitions(
+                legacy_batch_definitions, partitioner
+            )
+        batch_spec = asset._data_connector.build_batch_spec(
+            batch_definition=legacy_batch_definitions[-1]
+        )
+    except Exception:
+        logger.debug("Could not resolve the files of %s", batch_definition.name)
+        return None
+    path = Path(batch_spec["path"])
+    return path if path.exists() else None
+
+
+def _content_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(_HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def config_fingerprint(batch_definition: BatchDefinition) -> str:
+    """SHA-256 hash of the configs of `batch_definition`, its asset, and its Data Source.
+
+    IDs are left out, as Data Contexts such as ephemeral ones assign new IDs on every run.
+    """
+    asset = batch_definition.data_asset
+    configs = [
+        config.dict(exclude=_UNFINGERPRINTED_FIELDS)
+        for config in (asset.datasource, asset, batch_definition)
+    ]
+    payload = json.dumps(configs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def file_fingerprints(path: Path, content_hash: bool = False) -> list[dict[str, Any]]:
+    """Size and modification time, or size and content hash, of `path` or of each file under it."""
+    if path.is_dir():
+        files = sorted(file for file in path.rglob("*") if file.is_file())
+    else:
+        files = [path]
+    fingerprints = []
+    for file in files:
+        stat = file.stat()
+        fingerprint: dict[str, Any] = {"path": str(file), "size": stat.st_size}
+        if content_hash:
+            fingerprint["sha256"] = _content_hash(file)
+        else:
+            fingerprint["mtime_ns"] = stat.st_mtime_ns
+        fingerprints.append(fingerprint)
+    return fingerprints
+
+
+@dataclass(frozen=True)
+class BatchFingerprint:
+    """What a validation read and checked: its files, their configs, suites, and result format."""
+
+    dag_id: str
+    task_id: str
+    files: list[dict[str, Any]]
+    configs: list[str]
+    suites: list[str]
+    result_format: Any
+
+    @property
+    def key(self) -> str:
+        """Name of the stored entry: the DAG, the task, the paths it validates, and their configs."""
+        paths = [file["path"] for file in self.files]
+        payload = json.dumps([self.dag_id, self.task_id, paths, self.configs])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class UnchangedBatchSkipper:
+    """Store the results of successful validations of files by their fingerprints.
+
+    When disabled, nothing is fingerprinted, looked up, or stored, so operators can use
+    the skipper unconditionally.
+
+    Args:
+        fingerprint_dir: directory of the stored fingerprints and results. Defaults to
+            `gx_batch_fingerprints` in the system temporary directory.
+        content_hash: whether to fingerprint files by their content hash instead of their
+            modification time, so rewritten files with unchanged content are skipped too.
+        enabled: whether to skip validations of unchanged files.
+    """
+
+    def __init__(
+        self,
+        fingerprint_dir: str | Path | None = None,
+        content_hash: bool = False,
+        enabled: bool = True,
+    ) -> None:
+        self.fingerprint_dir = (
+            Path(fingerprint_dir) if fingerprint_dir else DEFAULT_FINGERPRINT_DIR
+        )
+        self.content_hash = content_hash
+        self.enabled = enabled
+
+    def fingerprint(
+        self,
+        dag_id: str,
+        task_id: str,
+        validations: Iterable[tuple[BatchDefinition, ExpectationSuite]],
+        batch_parameters: dict | None,
+        result_format: Any = None,
+    ) -> BatchFingerprint | None:
+        """Fingerprint the files, configs, and suites of `validations`, or None if any has no local files."""
+        if not self.enabled:
+            return None
+        files = []
+        configs = []
+        suites = []
+        for batch_definition, suite in validations:
+            path = resolve_batch_path(batch_definition, batch_parameters)
+            if path is None:
+                return None
+            files.extend(file_fingerprints(path, self.content_hash))
+            configs.append(config_fingerprint(batch_definition))
+            suites.append(suite_fingerprint(suite))
+        if not files:
+            return None
+        return BatchFingerprint(
+            dag_id=dag_id,
+            task_id=task_id,
+            files=files,
+            configs=configs,
+            suites=suites,
+            result_format=result_format,
+        )
+
+    def fingerprint_checkpoint(
+        self,
+        dag_id: str,
+        task_id: str,
+        checkpoint: Checkpoint,
+        batch_parameters: dict | None,
+    ) -> BatchFingerprint | None:
+        """Fingerprint the files and suites of the Validation Definitions of `checkpoint`, or None if it has actions."""
+        if not self.enabled:
+            return None
+        if checkpoint.actions:
+            logger.info(
+                "Checkpoint %s has actions, so it is run even if its files are unchanged",
+                checkpoint.name,
+            )
+            return None
+        return self.fingerprint(
+            dag_id,
+            task_id,
+            [
+                (validation_definition.batch_definition, validation_definition.suite)
+                for validation_definition in checkpoint.validation_definitions
+            ],
+            batch_parameters,
+            result_format=checkpoint.result_format,
+        )
+
+    def _path(self, fingerprint: BatchFingerprint) -> Path:
+        return self.fingerprint_dir / f"{fingerprint.key}.json"
+
+    def lookup(self, fingerprint: BatchFingerprint | None) -> dict[str, Any] | None:
+        """The result and validation time stored for `fingerprint`, if it is unchanged."""
+        if fingerprint is None:
+            return None
+        try:
+            entry = json.loads(self._path(fingerprint).read_text())
+        except (OSError, ValueError):
+            return None
+        # a JSON round trip, as the stored fingerprint had
+        current = json.loads(json.dumps(asdict(fingerprint), default=str))
+        if entry.get("fingerprint") != current:
+            return None
+        logger.info(
+            "Skipping the validation of unchanged files, last validated at %s",
+            entry["validated_at"],
+        )
+        return entry
+
+    def store(
+        self, fingerprint: BatchFingerprint | None, result_dict: Mapping[str, Any]
+    ) -> None:
+        """Store the result of a complete, successful validation of `fingerprint`."""
+        if fingerprint is None:
+            return
+        entry = {
+            "fingerprint": asdict(fingerprint),
+            "validated_at": datetime.now(timezone.utc).isoformat(),
+            "result": result_dict,
+        }
+        path = self._path(fingerprint)
+        try:
+            self.fingerprint_dir.mkdir(parents=True, exist_ok=True)
+            # write and rename, so concurrent tasks never read a partial file
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.fingerprint_dir, suffix=".tmp", delete=False
+            ) as file:
+                json.dump(entry, file, default=str)
+            os.replace(file.name, path)
+        except OSError:
+            logger.warning("Could not write batch fingerprint %s", path)
@@ -0,0 +1,498 @@
+"""
+Long-lived local validation service.
+
+Each Airflow task process otherwise imports Great Expectations, builds a Data Context,
+and creates database engines before validating anything. The service is a worker-side
+daemon that keeps those warm: it imports GX once, caches GX Cloud Data Contexts per set
+of credentials, and shares the SQLAlchemy engines, and their connection pools, that the
+datasources of its jobs create. Engines created outside a job, by the service itself or
+by a DAG file while it is imported, are not shared. Start it on each worker with::
+
+    python -m great_expectations_provider.common.validation_service --socket /run/gx/validation.sock
+
+Operators given the socket path send the job over it: the task ID, batch parameters, and
+the configuration callables as references the service can import. The DAG file or module
+defining them is imported by the service too, and kept for later jobs until its file
+changes, when it is imported again. Modules those modules import are not reloaded, so
+restart the service after changing them.
+When no service listens on the socket, operators validate in-process as usual.
+
+Jobs run in threads of their own. Data Contexts and their stores are not thread-safe, so
+the jobs sharing a GX Cloud Data Context run one at a time, while jobs with other
+credentials, or with ephemeral or file Data Contexts, which each job builds for itself,
+run concurrently.
+
+Jobs and results are exchanged as length-prefixed pickles, so the socket is created
+readable and writable by its owner only; run the service as the Airflow worker user.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import inspect
+import logging
+import os
+import pickle
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal
+
+from great_expectations_provider.common.errors import (
+    GXValidationServiceError,
+    record_statement_timeouts,
+)
+from great_expectations_provider.common.isolation import transferable_error
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from great_expectations.data_context import AbstractDataContext
+
+    from great_expectations_provider.hooks.gx_cloud import GXCloudConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = str(Path(tempfile.gettempdir()) / "gx-validation.sock")
+PROTOCOL_VERSION = 1
+FRAME_HEADER = struct.Struct(">Q")
+
+# the service whose job is running in this thread, which shares the engines it creates
+_running_service: ContextVar[ValidationService | None] = ContextVar(
+    "gx_validation_service", default=None
+)
+_install_lock = threading.Lock()
+_installed = False
+
+
+@dataclass(frozen=True)
+class CallableRef:
+    """Reference to a module-level function, resolvable in another process."""
+
+    module: str
+    qualname: str
+    path: str | None = None
+
+    @classmethod
+    def from_callable(cls, fn: Callable[..., Any]) -> CallableRef | None:
+        """Reference `fn`, or return None if it is a lambda or nested function."""
+        module = getattr(fn, "__module__", None)
+        qualname = getattr(fn, "__qualname__", None)
+        if not module or not qualname or "<" in qualname:
+            return None
+        try:
+            path = inspect.getsourcefile(fn)
+        except TypeError:
+            path = None
+        return cls(module=module, qualname=qualname, path=path)
+
+
+@dataclass(frozen=True)
+class ValidationJob:
+    """A validation run by the service on behalf of an operator."""
+
+    kind: Literal["batch", "checkpoint"]
+    task_id: str
+    context_type: Literal["ephemeral", "cloud", "file"]
+    batch_parameters: dict[str, Any] = field(default_factory=dict)
+    result_format: str | None = None
+    gx_cloud_config: GXCloudConfig | None = None
+    configure_batch_definition: CallableRef | None = None
+    configure_expectations: CallableRef | None = None
+    configure_checkpoint: CallableRef | None = None
+    configure_file_data_context: CallableRef | None = None
+
+    @classmethod
+    def from_callables(
+        cls,
+        callables: dict[str, Callable[..., Any] | None],
+        **fields: Any,
+    ) -> ValidationJob | None:
+        """Build a job referencing `callables` by name, or None if one cannot be referenced."""
+        refs: dict[str, Any] = {}
+        for name, fn in callables.items():
+            if fn is None:
+                continue
+            ref = CallableRef.from_callable(fn)
+            if ref is None:
+                logger.info(
+                    "Validating in-process: %s must be a module-level function "
+                    "to run in the validation service",
+                    name,
+                )
+                return None
+            refs[name] = ref
+        return cls(**fields, **refs)
+
+
+def _send_frame(sock: socket.socket, payload: Any) -> None:
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    sock.sendall(FRAME_HEADER.pack(len(data)) + data)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Validation service connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _receive_frame(sock: socket.socket) -> Any:
+    (size,) = FRAME_HEADER.unpack(_receive_exactly(sock, FRAME_HEADER.size))
+    return pickle.loads(_receive_exactly(sock, size))
+
+
+def submit_validation_job(
+    socket_path: str, job: ValidationJob
+) -> dict[str, Any] | None:
+    """Run `job` in the validation service listening on `socket_path`.
+
+    Returns:
+        The described validation result, or None if no service is listening, in which
+        case the caller validates in-process.
+
+    Raises:
+        GXValidationServiceError: if the service dropped the connection, or returned an
+            error that could not be unpickled.
+        Exception: the error raised by the job in the service, when it can be sent back.
+    """
+    try:
+        request = pickle.dumps(
+            {"version": PROTOCOL_VERSION, "job": job}, protocol=pickle.HIGHEST_PROTOCOL
+        )
+    except Exception as error:
+        logger.info(
+            "Validating in-process: the job cannot be sent to the validation service (%s)",
+            error,
+        )
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as error:
+            logger.info(
+                "Validating in-process: no validation service at %s (%s)",
+                socket_path,
+                error,
+            )
+            return None
+        sock.sendall(FRAME_HEADER.pack(len(request)) + request)
+        try:
+            response = _receive_frame(sock)
+        except (ConnectionError, pickle.UnpicklingError, EOFError) as error:
+            raise GXValidationServiceError(
+                f"The validation service at {socket_path} did not return a result: {error}"
+            ) from error
+    finally:
+        sock.close()
+
+    if response["ok"]:
+        return response["result"]
+    remote_error = response.get("error")
+    if isinstance(remote_error, BaseException):
+        raise remote_error
+    raise GXValidationServiceError(
+        response.get("message", "The validation service failed to run the job"),
+        remote_traceback=response.get("traceback"),
+    )
+
+
+class ValidationService:
+    """Run validation jobs with warm imports, Data Contexts, and engines.
+
+    Args:
+        socket_path: path of the Unix socket to listen on.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH) -> None:
+        self.socket_path = socket_path
+        self._lock = threading.Lock()
+        # path -> modification time and module of the version last imported
+        self._modules: dict[str, tuple[float, ModuleType]] = {}
+        self._contexts: dict[GXCloudConfig | None, AbstractDataContext] = {}
+        self._context_locks: dict[GXCloudConfig | None, threading.Lock] = {}
+        self._engines: dict[str, Any] = {}
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+
+    def _reload_if_changed(self, module: ModuleType) -> ModuleType:
+        path = getattr(module, "__file__", None)
+        if not path:
+            return module
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            cached = self._modules.get(path)
+            if cached is not None and cached[0] != mtime:
+                module = importlib.reload(module)
+            self._modules[path] = (mtime, module)
+        return module
+
+    def _load_module(self, ref: CallableRef) -> ModuleType:
+        if ref.module != "__main__":
+            try:
+                module = importlib.import_module(ref.module)
+            except ImportError:
+                # Airflow imports DAG files under generated module names
+                if not ref.path:
+                    raise
+            else:
+                return self._reload_if_changed(module)
+        if not ref.path:
+            raise ImportError(f"Cannot import {ref.qualname} from {ref.module}")
+        mtime = os.path.getmtime(ref.path)
+        with self._lock:
+            cached = self._modules.get(ref.path)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            spec = importlib.util.spec_from_file_location(ref.module, ref.path)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"Cannot import {ref.module} from {ref.path}")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            # replaces the version the file had before
+            self._modules[ref.path] = (mtime, module)
+        return module
+
+    def resolve(self, ref: CallableRef) -> Callable[..., Any]:
+        target: Any = self._load_module(ref)
+        for name in ref.qualname.split("."):
+            target = getattr(target, name)
+        return target
+
+    def _create_engine(
+        self, create_engine: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        url = str(args[0] if args else kwargs.get("url", ""))
+        # in-memory and file databases gain nothing from pooling and must not be shared
+        if url.startswith("sqlite"):
+            return create_engine(*args, **kwargs)
+        key = repr((args, sorted(kwargs.items())))
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = self._engines[key] = create_engine(*args, **kwargs)
+        return engine
+
+    def share_engines(self) -> None:
+        """Share the SQLAlchemy engines, and so the pools, that the datasources of jobs create.
+
+        Within a job run by `run_job`, engines created with identical arguments are the
+        same engine. Elsewhere in the process `sqlalchemy.create_engine` is unchanged.
+        """
+        global _installed
+        with _install_lock:
+            if _installed:
+                return
+            import sqlalchemy
+
+            create_engine = sqlalchemy.create_engine
+
+            def shared_create_engine(*args: Any, **kwargs: Any) -> Any:
+                service = _running_service.get()
+                if service is None:
+                    return create_engine(*args, **kwargs)
+                return service._create_engine(create_engine, *args, **kwargs)
+
+            sqlalchemy.create_engine = shared_create_engine  # type: ignore[assignment]
+            _installed = True
+
+    @contextmanager
+    def _data_context(self, job: ValidationJob) -> Iterator[AbstractDataContext]:
+        from great_expectations_provider.common.constants import USER_AGENT_STR
+        from great_expectations_provider.common.gx_context_actions import (
+            load_data_context,
+        )
+
+        if job.context_type == "file":
+            if job.configure_file_data_context is None:
+                raise ValueError(
+                    "Parameter `configure_file_data_context` must be specified if `context_type` is `file`"
+                )
+            configured = self.resolve(job.configure_file_data_context)()
+            if inspect.isgenerator(configured):
+                gx_context = next(configured)
+                gx_context.set_user_agent_str(USER_AGENT_STR)
+                yield gx_context
+                for _ in configured:
+                    raise RuntimeError(
+                        "Generator must yield exactly once; yielded more than once"
+                    )
+            else:
+                configured.set_user_agent_str(USER_AGENT_STR)
+                yield configured
+        elif job.context_type == "cloud":
+            # Cloud contexts load their configuration over the network, so are reused,
+            # by one job at a time as contexts and their stores are not thread-safe
+            key = job.gx_cloud_config
+            with self._lock:
+                context_lock = self._context_locks.setdefault(key, threading.Lock())
+            with context_lock:
+                gx_context = self._contexts.get(key)
+                if gx_context is None:
+                    gx_context = self._contexts[key] = load_data_context(
+                        context_type="cloud", gx_cloud_config=job.gx_cloud_config
+                    )
+                yield gx_context
+        else:
+            # ephemeral contexts are cheap once GX is imported, and must start empty
+            yield load_data_context(context_type="ephemeral", gx_cloud_config=None)
+
+    def run_job(self, job: ValidationJob) -> dict[str, Any]:
+        """Run `job` and return its described validation result."""
+        token = _running_service.set(self)
+        try:
+            return self._run_job(job)
+        finally:
+            _running_service.reset(token)
+
+    def _run_job(self, job: ValidationJob) -> dict[str, Any]:
+        from great_expectations_provider.common.gx_context_actions import (
+            run_validation_definition,
+        )
+
+        with self._data_context(job) as gx_context:
+            if job.kind == "checkpoint":
+                assert job.configure_checkpoint is not None
+                checkpoint = self.resolve(job.configure_checkpoint)(gx_context)
+                result = checkpoint.run(batch_parameters=job.batch_parameters)
+            else:
+                assert job.configure_batch_definition is not None
+                assert job.configure_expectations is not None
+                result = run_validation_definition(
+                    task_id=job.task_id,
+                    expect=self.resolve(job.configure_expectations)(gx_context),
+                    batch_definition=self.resolve(job.configure_batch_definition)(
+                        gx_context
+                    ),
+                    result_format=job.result_format,  # type: ignore[arg-type]
+                    batch_parameters=job.batch_parameters,
+                    gx_context=gx_context,
+                )
+            result_dict = dict(result.describe_dict())
+            record_statement_timeouts(result, result_dict)
+            return result_dict
+
+    def handle(self, sock: socket.socket) -> None:
+        """Read one job from `sock`, run it, and send back the result or the error."""
+        request = _receive_frame(sock)
+        if request.get("version") != PROTOCOL_VERSION:
+            response: dict[str, Any] = {
+                "ok": False,
+                "message": f"Unsupported validation service protocol version: {request.get('version')}",
+            }
+        else:
+            job = request["job"]
+            logger.info("Running validation job for task %s", job.task_id)
+            try:
+                response = {"ok": True, "result": self.run_job(job)}
+            except Exception as error:
+                logger.exception("Validation job for task %s failed", job.task_id)
+                response = {
+                    "ok": False,
+                    "error": transferable_error(error),
+                    "message": f"{type(error).__name__}: {error}",
+                    "traceback": traceback.format_exc(),
+                }
+        _send_frame(sock, response)
+
+    def serve_forever(self) -> None:
+        service = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self) -> None:
+                service.handle(self.request)
+
+        self._remove_stale_socket()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(
+                self.socket_path, Handler
+            )
+        finally:
+            os.umask(old_umask)
+        socket_inode = os.stat(self.socket_path).st_ino
+        self._server.daemon_threads = True
+        logger.info("Validation service listening on %s", self.socket_path)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            # unless another service has replaced the socket since
+            try:
+                if os.stat(self.socket_path).st_ino == socket_inode:
+                    os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket left behind at the socket path by a service that has exited.
+
+        Raises:
+            GXValidationServiceError: if another service listens on the socket path, or
+                the path is not a socket.
+        """
+        try:
+            mode = os.stat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise GXValidationServiceError(
+                f"Cannot listen on {self.socket_path}: the path exists and is not a socket"
+            )
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except ConnectionRefusedError:
+            os.unlink(self.socket_path)
+            return
+        except FileNotFoundError:
+            return
+        finally:
+            probe.close()
+        raise GXValidationServiceError(
+            f"Another validation service is listening on {self.socket_path}"
+        )
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the local Great Expectations validation service."
+    )
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Unix socket path to listen on (default: {DEFAULT_SOCKET_PATH})",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    service = ValidationService(socket_path=args.socket)
+    # before GX is imported, so every module sees the shared engines
+    service.share_engines()
+    import great_expectations  # noqa: F401
+
+    service.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
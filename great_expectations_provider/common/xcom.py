@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Iterable, Union, cast
+
+if TYPE_CHECKING:
+    from great_expectations.checkpoint.checkpoint import CheckpointDescriptionDict
+
+    ResultDict = Union[dict[str, Any], CheckpointDescriptionDict]
+
+TRUNCATION_KEY = "xcom_truncation"
+
+# Fields of an expectation's `result` dropped in order, cheapest information loss first.
+ROW_SAMPLE_FIELDS = (
+    "partial_unexpected_list",
+    "partial_unexpected_counts",
+    "partial_unexpected_index_list",
+    "unexpected_list",
+)
+INDEX_FIELDS = (
+    "unexpected_index_list",
+    "unexpected_index_query",
+    "unexpected_index_column_names",
+)
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _field_size(key: str, value: Any) -> int:
+    # `"key": value, ` -- the value plus the quoted key, colon, and separators
+    return _json_size(value) + len(key) + 6
+
+
+def _is_detail(value: Any) -> bool:
+    """Statistics are scalars; anything nested is a per-row or per-value detail."""
+    return isinstance(value, (list, dict))
+
+
+def truncate_result_for_xcom(
+    result_dict: ResultDict,
+    max_xcom_bytes: int | None,
+    report_keys: Iterable[str] = (),
+) -> dict[str, Any]:
+    """Trim a described validation result so its JSON form fits within max_xcom_bytes.
+
+    The result is serialized once to measure it. Only if it is too large are the droppable
+    fields measured individually; their sizes are then subtracted as they are removed, so
+    the payload is never re-serialized while trimming. Fields are dropped in stages:
+    row samples (`partial_unexpected_list` and friends), then index lists
+    (`unexpected_index_list`, `unexpected_index_query`), then the tables of the reports
+    under `report_keys`, such as the per-Expectation timings, then any remaining nested
+    `result` details. Success flags, kwargs, and scalar statistics and report totals are
+    always kept.
+
+    The input is not modified. When anything is dropped, the returned copy records each
+    dropped field path and its size under the `xcom_truncation` key.
+
+    Args:
+        result_dict: The result.describe_dict() from a Great Expectations validation,
+            with the reports pushed alongside it.
+        max_xcom_bytes: Maximum size of the JSON-serialized result. None disables the check.
+        report_keys: keys of the instrumentation reports in `result_dict`, whose nested
+            tables may be dropped.
+
+    Returns:
+        The original result_dict if it fits, otherwise a trimmed copy.
+    """
+    if max_xcom_bytes is None:
+        return cast("dict[str, Any]", result_dict)
+
+    original_bytes = _json_size(result_dict)
+    if original_bytes <= max_xcom_bytes:
+        return cast("dict[str, Any]", result_dict)
+
+    truncated: dict[str, Any] = dict(result_dict)
+    results = [
+        (f"{path}.result", result)
+        for path, result in _copy_result_containers(truncated)
+    ]
+    reports = _copy_reports(truncated, report_keys)
+
+    dropped: list[dict[str, Any]] = []
+    record: dict[str, Any] = {
+        "max_xcom_bytes": max_xcom_bytes,
+        "original_bytes": original_bytes,
+        "estimated_bytes": original_bytes,
+        "within_limit": False,
+        "dropped": dropped,
+    }
+    # leave room for the truncation record itself; each dropped path is added as it goes
+    estimated_bytes = original_bytes + _field_size(TRUNCATION_KEY, record)
+    stages = (
+        (results, lambda key, value: key in ROW_SAMPLE_FIELDS),
+        (results, lambda key, value: key in INDEX_FIELDS),
+        (reports, lambda key, value: _is_detail(value)),
+        (results, lambda key, value: _is_detail(value)),
+    )
+    for containers, should_drop in stages:
+        candidates = [
+            (_field_size(key, value), path, container, key)
+            for path, container in containers
+            for key, value in container.items()
+            if should_drop(key, value)
+        ]
+        # drop the largest fields first so as few fields as possible are lost
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        for size, path, container, key in candidates:
+            if estimated_bytes <= max_xcom_bytes:
+                break
+            del container[key]
+            field_path = f"{path}.{key}"
+            dropped.append({"path": field_path, "bytes": size})
+            estimated_bytes -= size
+            estimated_bytes += _json_size(dropped[-1]) + 2
+        if estimated_bytes <= max_xcom_bytes:
+            break
+
+    record["estimated_bytes"] = estimated_bytes
+    record["within_limit"] = estimated_bytes <= max_xcom_bytes
+    truncated[TRUNCATION_KEY] = record
+    return truncated
+
+
+def _copy_result_containers(
+    truncated: dict[str, Any],
+) -> list[tuple[str, dict[str, Any]]]:
+    """Shallow-copy every container on the way to each expectation's `result`.
+
+    Returns (path, result) pairs for each copied `result` dict, handling both the
+    ExpectationSuiteValidationResult and CheckpointResult formats.
+    """
+    results: list[tuple[str, dict[str, Any]]] = []
+
+    def copy_expectations(parent: dict[str, Any], prefix: str) -> None:
+        expectations = parent.get("expectations")
+        if not isinstance(expectations, list):
+            return
+        parent["expectations"] = copied = list(expectations)
+        for index, expectation in enumerate(copied):
+            if isinstance(expectation, dict) and isinstance(
+                expectation.get("result"), dict
+            ):
+                copied[index] = expectation = dict(expectation)
+                expectation["result"] = result = dict(expectation["result"])
+                results.append((f"{prefix}expectations[{index}]", result))
+
+    copy_expectations(truncated, "")
+    validation_results = truncated.get("validation_results")
+    if isinstance(validation_results, list):
+        truncated["validation_results"] = copied_results = list(validation_results)
+        for index, validation_result in enumerate(copied_results):
+            if isinstance(validation_result, dict):
+                copied_results[index] = validation_result = dict(validation_result)
+                copy_expectations(validation_result, f"validation_results[{index}].")
+    return results
+
+
+def _copy_reports(
+    truncated: dict[str, Any], report_keys: Iterable[str]
+) -> list[tuple[str, dict[str, Any]]]:
+    """Shallow-copy each report under `report_keys`, returning (key, report) pairs."""
+    reports: list[tuple[str, dict[str, Any]]] = []
+    for key in report_keys:
+        if isinstance(truncated.get(key), dict):
+            truncated[key] = report = dict(truncated[key])
+            reports.append((key, report))
+    return reports
@@ -19,7 +19,7 @@ def get_provider_info():
                 "hook-class-name": "great_expectations_provider.hooks.gx_cloud.GXCloudHook",
                 "hook-name": "Great Expectations Cloud",
                 "ui_field_behaviour": {
-                    "hidden_fields": ["port", "host", "extra"],
+                    "hidden_fields": ["port", "host"],
                     "relabeling": {
                         "login": "GX Cloud Organization ID",
                         "password": "GX Cloud Access Token",
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from airflow.exceptions import AirflowException
 
@@ -11,8 +11,17 @@ except ImportError:  # airflow 2
     from airflow.hooks.base import BaseHook  # type: ignore[attr-defined,no-redef]
 
 
+from great_expectations_provider.common.cloud_sessions import (
+    DEFAULT_BACKOFF_FACTOR,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_POOL_SIZE,
+    cloud_sessions,
+)
 from great_expectations_provider.common.gx_context_actions import load_data_context
 
+if TYPE_CHECKING:
+    import requests
+
 
 class IncompleteGXCloudConfigError(AirflowException):
     """Great Expectations connection configuration is not complete.
@@ -38,12 +47,20 @@ class GXCloudConfig:
     cloud_access_token: str
     cloud_organization_id: str
     cloud_workspace_id: str
+    # settings of the HTTP session shared by the process's contexts, see common.cloud_sessions
+    pool_size: int = DEFAULT_POOL_SIZE
+    max_retries: int = DEFAULT_MAX_RETRIES
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR
 
 
 class GXCloudHook(BaseHook):
     """
     Connect to the GX Cloud managed backend.
 
+    The optional connection extras `pool_size`, `max_retries`, and `backoff_factor` set
+    the connection pool size and retries of the HTTP session to GX Cloud that the Data
+    Contexts of a process share.
+
     :gx_cloud_conn_id str: name of the GX Cloud connection
     """
 
@@ -69,17 +86,25 @@ class GXCloudHook(BaseHook):
         if missing_keys:
             raise IncompleteGXCloudConfigError(missing_keys)
 
+        extras = config.extra_dejson
         return GXCloudConfig(
             cloud_access_token=config.password,  # type: ignore[arg-type]
             cloud_organization_id=config.login,  # type: ignore[arg-type]
             cloud_workspace_id=config.schema,  # type: ignore[arg-type]
+            pool_size=int(extras.get("pool_size", DEFAULT_POOL_SIZE)),
+            max_retries=int(extras.get("max_retries", DEFAULT_MAX_RETRIES)),
+            backoff_factor=float(extras.get("backoff_factor", DEFAULT_BACKOFF_FACTOR)),
         )
 
+    def get_session(self) -> requests.Session:
+        """Return the keep-alive session to GX Cloud the process shares for this connection."""
+        return cloud_sessions.get_for_config(self.get_conn())
+
     @classmethod
     def get_ui_field_behaviour(cls) -> dict[str, Any]:
         """Return custom field behaviour."""
         return {
-            "hidden_fields": ["port", "host", "extra"],
+            "hidden_fields": ["port", "host"],
             "relabeling": {
                 "login": "GX Cloud Organization ID",
                 "schema": "GX Cloud Workspace ID",
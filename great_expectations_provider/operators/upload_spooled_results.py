@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from airflow.models import BaseOperator
+
+from great_expectations_provider.common.errors import GXResultUploadError
+from great_expectations_provider.common.result_spool import ResultSpool
+from great_expectations_provider.hooks.gx_cloud import GXCloudHook
+
+if TYPE_CHECKING:
+    from airflow.utils.context import Context
+
+
+class GXUploadSpooledResultsOperator(BaseOperator):
+    """
+    An operator to upload the Validation Results spooled by validation tasks to GX Cloud.
+
+    Validation operators with `result_upload="spool"` write their Validation Results to a spool
+    directory instead of uploading them. Schedule this operator periodically, with retries, to
+    upload them, for instance every few minutes. Only the results of the workspace of `conn_id`
+    are uploaded.
+
+    Args:
+        result_spool_dir: spool directory the validation tasks write to, durable and shared with
+            the workers running them.
+        conn_id: name of the GX Cloud connection whose spooled results to upload.
+        max_results: most results to upload in one run. Defaults to all.
+    """
+
+    def __init__(
+        self,
+        result_spool_dir: str,
+        conn_id: str = GXCloudHook.default_conn_name,
+        max_results: int | None = None,
+        *args,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.conn_id = conn_id
+        self.result_spool_dir = result_spool_dir
+        self.max_results = max_results
+
+    def execute(self, context: Context) -> dict[str, Any]:
+        gx_cloud_config = GXCloudHook(gx_cloud_conn_id=self.conn_id).get_conn()
+        spool = ResultSpool(self.result_spool_dir)
+        report = spool.upload_for_config(gx_cloud_config, batch_size=self.max_results)
+        self.log.info(
+            "Uploaded %s spooled results, %s are left",
+            report.uploaded,
+            report.remaining,
+        )
+        if report.failed or report.rejected:
+            # fail the run, so Airflow retries it and the failure is visible
+            raise GXResultUploadError(report.as_dict(), str(spool.spool_dir))
+        return report.as_dict()
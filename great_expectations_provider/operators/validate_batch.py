@@ -1,15 +1,70 @@
 from __future__ import annotations
 
 import warnings
-from typing import TYPE_CHECKING, Callable, Literal, Union
+from typing import TYPE_CHECKING, Any, Callable, Literal, Union, cast
 
 from airflow.models import BaseOperator
 
-from great_expectations_provider.common.errors import GXValidationFailed
+from great_expectations_provider.common.athena_queries import (
+    ATHENA_QUERIES_KEY,
+    AthenaQueryTracker,
+)
+from great_expectations_provider.common.batch_definition_cache import (
+    BatchDefinitionCache,
+)
+from great_expectations_provider.common.cloud_calls import (
+    CLOUD_CALLS_KEY,
+    CloudCallTracker,
+)
+from great_expectations_provider.common.errors import record_statement_timeouts
+from great_expectations_provider.common.expectation_timing import (
+    EXPECTATION_TIMINGS_KEY,
+    ExpectationTimer,
+)
 from great_expectations_provider.common.gx_context_actions import (
+    as_suite,
     load_data_context,
     run_validation_definition,
 )
+from great_expectations_provider.common.gx_phases import RESULT_SERIALIZATION
+from great_expectations_provider.common.instrumentation import (
+    ValidationInstrumentation,
+    runs_in_task_process,
+    validation_failure,
+)
+from great_expectations_provider.common.isolation import (
+    check_isolation,
+    run_isolated,
+)
+from great_expectations_provider.common.memory import MEMORY_USAGE_KEY, MemoryTracker
+from great_expectations_provider.common.metric_cache import (
+    DEFAULT_MAX_ENTRIES,
+    METRIC_CACHE_KEY,
+    MetricCache,
+)
+from great_expectations_provider.common.profiling import profile_validation
+from great_expectations_provider.common.result_spool import (
+    SPOOLED_RESULTS_KEY,
+    ResultSpool,
+    check_result_upload,
+)
+from great_expectations_provider.common.time_budget import (
+    DEFAULT_SAMPLE_FRACTION,
+    TIME_BUDGET_KEY,
+    TimeBudget,
+    TimeBudgetValue,
+    check_time_budget,
+)
+from great_expectations_provider.common.tracing import ValidationTracer
+from great_expectations_provider.common.unchanged_batches import (
+    SKIPPED_UNCHANGED_KEY,
+    UnchangedBatchSkipper,
+)
+from great_expectations_provider.common.validation_service import (
+    ValidationJob,
+    submit_validation_job,
+)
+from great_expectations_provider.common.xcom import truncate_result_for_xcom
 from great_expectations_provider.hooks.gx_cloud import GXCloudHook
 
 if TYPE_CHECKING:
@@ -20,6 +75,8 @@ if TYPE_CHECKING:
     from great_expectations.data_context import AbstractDataContext
     from great_expectations.expectations import Expectation
 
+    from great_expectations_provider.hooks.gx_cloud import GXCloudConfig
+
 
 class GXValidateBatchOperator(BaseOperator):
     """
@@ -44,6 +101,102 @@ class GXValidateBatchOperator(BaseOperator):
             Defaults to `ephemeral`, which does not persist results between runs.
             To save and view Validation Results in GX Cloud, use `cloud` and include
             GX Cloud credentials in your environment.
+        max_xcom_bytes: optional upper bound, in bytes, on the JSON size of the value pushed to XCom, the
+            Validation Result with the reports pushed alongside it. Larger values are trimmed by dropping row
+            samples, unexpected index lists, the tables of reports such as `expectation_timings`, and then
+            other per-Expectation result details, keeping success flags, statistics, and report totals. The
+            pushed result records what was dropped under the `xcom_truncation` key. Defaults to no limit.
+        profile: if True, profile the validation run with a stack sampler. A collapsed-stack flamegraph
+            file (`.folded`), named after the task ID, map index, and try number, is written to
+            `profile_dir`, and the 20 functions with the most own time are logged. Defaults to False.
+        profile_dir: directory for profiling output. Defaults to `gx_profiles` in the system
+            temporary directory.
+        track_memory: if True, record the RSS high-water mark and tracemalloc peak of the batch loading,
+            metric computation, and result serialization phases. The figures are pushed with the
+            Validation Result under the `memory_usage` key and emitted as `gx.memory.*` gauges.
+            Defaults to False.
+        tracing: if True, record the run as OpenTelemetry spans: context loading, Batch Definition and
+            Expectation configuration, the Validation Definition with its batch loading and metric computation,
+            one zero-duration span marking each Expectation, and result serialization, with row counts and
+            result sizes as span attributes. Spans use the worker's configured tracer provider and require `opentelemetry-api`.
+            Defaults to False.
+        time_expectations: if True, attribute the wall time of the validation to each Expectation: the
+            metrics only it depends on, its share of metrics shared with other Expectations, and the
+            evaluation of its result. Tables of Expectations and shared metrics, slowest first, are pushed
+            with the Validation Result under the `expectation_timings` key. Defaults to False.
+        track_cloud_calls: if True, count and time the HTTP requests made to GX Cloud, in total and per
+            method and endpoint, and push the counts with the Validation Result under the `cloud_calls`
+            key. The counts are also emitted as `gx.cloud.*` metrics. Defaults to False.
+        validation_socket: path of the Unix socket of a local validation service started with
+            `python -m great_expectations_provider.common.validation_service`. The validation then runs in
+            the service, which keeps GX imported and Data Contexts and database engines warm between tasks.
+            `configure_batch_definition` and `configure_expectations` must be module-level functions.
+            The task validates in-process if no service is listening, or if profiling, memory tracking,
+            tracing, expectation timing, query tracking, or subprocess isolation is enabled. Defaults to None.
+        isolation: accepts `none` or `subprocess`. With `subprocess`, the validation runs in a forked child
+            process, so running out of memory or CPU time fails the task with `GXResourceLimitExceeded`
+            instead of taking down the worker. Only the result is sent back to the task process.
+            Requires a POSIX system. Defaults to `none`.
+        max_memory_bytes: limit on the address space of the isolated validation process, in bytes.
+            Requires `isolation="subprocess"`. Defaults to no limit.
+        max_cpu_seconds: limit on the CPU time of the isolated validation process, in seconds.
+            Requires `isolation="subprocess"`. Defaults to no limit.
+        time_budget: time the validation may take, as a timedelta or in seconds. Expectations are then
+            evaluated in groups, one per column, and the time is checked between groups. When the next
+            group is not expected to finish within the budget, the rest are handled by `time_budget_action`,
+            and the pushed result lists them under the `time_budget` key. The statistics of the result
+            cover the evaluated Expectations only, and a result leaving any Expectation unevaluated or
+            sampled fails the task with `GXTimeBudgetExceeded`. Defaults to no budget.
+        time_budget_action: `stop` to leave the remaining Expectations unevaluated, or `sample` to evaluate
+            them against a random sample of the validated DataFrame. Without a DataFrame Batch to sample,
+            `sample` stops. Defaults to `stop`.
+        time_budget_sample_fraction: fraction of rows sampled when `time_budget_action` is `sample`.
+            Defaults to 0.1.
+        batch_definition_version: version of `configure_batch_definition`. When set, the names and IDs of
+            the Batch Definition it returns are kept in a local file keyed by its qualified name, this
+            version, and the GX Cloud workspace, and later runs rehydrate the Batch Definition from them
+            with one read of its Data Source instead of calling `configure_batch_definition`. Change the
+            version whenever the callable would configure something different. Lambdas are not memoized.
+            Requires `context_type="cloud"`. Defaults to None, which calls `configure_batch_definition`
+            on every run.
+        batch_definition_cache_dir: directory of the memoized Batch Definitions. Defaults to
+            `gx_batch_definitions` in the system temporary directory.
+        result_upload: `sync` to upload the Validation Result to GX Cloud during the run, or `spool` to
+            write it to a spool directory that `GXUploadSpooledResultsOperator` uploads, so the outcome of
+            the task depends only on the data. The pushed result then has no GX Cloud ID or URL, and lists
+            the spooled files under the `spooled_results` key. Requires `context_type="cloud"` and
+            `result_spool_dir`. Defaults to `sync`.
+        result_spool_dir: spool directory of `result_upload="spool"`. It must be durable and shared by the
+            workers running this task and `GXUploadSpooledResultsOperator`.
+        metric_cache: whether to reuse the metric values computed in earlier runs for data that has not
+            changed since, told by the size and modification time of files, the modification time of
+            Snowflake and SQLite tables, and `metric_cache_version_column` of other tables. Queries and
+            other Batches without such a data version are always computed. Hits, misses, and the hit rate are
+            pushed under the `metric_cache` key. Defaults to False.
+        metric_cache_path: SQLite database of the metric cache. Defaults to `gx_metric_cache.sqlite3` in
+            the system temporary directory.
+        metric_cache_max_entries: metric values kept in the cache, the least recently used are evicted
+            beyond it. Defaults to 100000.
+        metric_cache_version_column: column of SQL tables whose maximum, with the row count, is their
+            data version, such as an `updated_at` timestamp or a load ID. Required to cache metrics of
+            tables other than Snowflake and SQLite ones. Defaults to None.
+        skip_unchanged: if True, fingerprint the files the Batch Definition resolves to before validating,
+            and when the files, their asset and Batch Definition configs, the suite, and the result format
+            are unchanged since the last successful validation of this task and DAG over the same files,
+            push that validation's result instead of
+            validating again, without reading any data. The pushed result then records when it was
+            validated under the `skipped_unchanged` key, and no result is uploaded to GX Cloud. Batches
+            of other assets than local files are always validated. Results cut short or sampled by
+            `time_budget` are never reused. Defaults to False.
+        skip_unchanged_content_hash: if True, fingerprint files by their size and a SHA-256 hash of their
+            content instead of their size and modification time, so files rewritten with the same content
+            are skipped too, at the cost of reading them to hash. Defaults to False.
+        skip_unchanged_dir: directory of the fingerprints and results of `skip_unchanged`. Defaults to
+            `gx_batch_fingerprints` in the system temporary directory.
+        track_athena_queries: if True, record the data scanned and the engine and total execution time of
+            each Athena query of the validation, and push the totals, the count of queries served from
+            reused results, and the slowest queries with the Validation Result under the `athena_queries`
+            key. The totals are also emitted as `gx.athena.*` metrics. Defaults to False.
     """
 
     def __init__(
@@ -59,6 +212,32 @@ class GXValidateBatchOperator(BaseOperator):
             Literal["BOOLEAN_ONLY", "BASIC", "SUMMARY", "COMPLETE"] | None
         ) = None,
         conn_id: Union[str, None] = None,
+        max_xcom_bytes: int | None = None,
+        profile: bool = False,
+        profile_dir: str | None = None,
+        track_memory: bool = False,
+        tracing: bool = False,
+        time_expectations: bool = False,
+        track_cloud_calls: bool = False,
+        validation_socket: str | None = None,
+        isolation: Literal["none", "subprocess"] = "none",
+        max_memory_bytes: int | None = None,
+        max_cpu_seconds: int | None = None,
+        time_budget: TimeBudgetValue | None = None,
+        time_budget_action: Literal["stop", "sample"] = "stop",
+        time_budget_sample_fraction: float = DEFAULT_SAMPLE_FRACTION,
+        batch_definition_version: str | None = None,
+        batch_definition_cache_dir: str | None = None,
+        result_upload: Literal["sync", "spool"] = "sync",
+        result_spool_dir: str | None = None,
+        metric_cache: bool = False,
+        metric_cache_path: str | None = None,
+        metric_cache_max_entries: int = DEFAULT_MAX_ENTRIES,
+        metric_cache_version_column: str | None = None,
+        skip_unchanged: bool = False,
+        skip_unchanged_content_hash: bool = False,
+        skip_unchanged_dir: str | None = None,
+        track_athena_queries: bool = False,
         *args,
         **kwargs,
     ) -> None:
@@ -88,38 +267,180 @@ class GXValidateBatchOperator(BaseOperator):
         self.configure_expectations = configure_expectations
         self.result_format = result_format
         self.conn_id = conn_id
+        self.max_xcom_bytes = max_xcom_bytes
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.track_memory = track_memory
+        self.tracing = tracing
+        self.time_expectations = time_expectations
+        self.track_cloud_calls = track_cloud_calls
+        self.validation_socket = validation_socket
+        check_isolation(isolation, max_memory_bytes, max_cpu_seconds)
+        self.isolation = isolation
+        self.max_memory_bytes = max_memory_bytes
+        self.max_cpu_seconds = max_cpu_seconds
+        check_time_budget(time_budget, time_budget_action, time_budget_sample_fraction)
+        self.time_budget = time_budget
+        self.time_budget_action = time_budget_action
+        self.time_budget_sample_fraction = time_budget_sample_fraction
+        if batch_definition_version is not None and context_type != "cloud":
+            raise ValueError(
+                "Parameter `batch_definition_version` requires `context_type` to be `cloud`"
+            )
+        self.batch_definition_version = batch_definition_version
+        self.batch_definition_cache_dir = batch_definition_cache_dir
+        check_result_upload(result_upload, context_type, result_spool_dir)
+        self.result_upload = result_upload
+        self.result_spool_dir = result_spool_dir
+        self.metric_cache = metric_cache
+        self.metric_cache_path = metric_cache_path
+        self.metric_cache_max_entries = metric_cache_max_entries
+        self.metric_cache_version_column = metric_cache_version_column
+        self.skip_unchanged = skip_unchanged
+        self.skip_unchanged_content_hash = skip_unchanged_content_hash
+        self.skip_unchanged_dir = skip_unchanged_dir
+        self.track_athena_queries = track_athena_queries
 
     def execute(self, context: Context) -> None:
         if self.conn_id:
             gx_cloud_config = GXCloudHook(gx_cloud_conn_id=self.conn_id).get_conn()
         else:
             gx_cloud_config = None
-        gx_context = load_data_context(
-            gx_cloud_config=gx_cloud_config, context_type=self.context_type
-        )
-        batch_definition = self.configure_batch_definition(gx_context)
-
-        if self.configure_expectations is not None:
-            expect = self.configure_expectations(gx_context)
-        elif self._deprecated_expect is not None:
-            expect = self._deprecated_expect
-        else:
-            raise ValueError("configure_expectations is required")
-
         runtime_batch_params = context.get("params", {}).get("gx_batch_parameters")  # type: ignore[call-overload]
         if runtime_batch_params:
             batch_parameters = runtime_batch_params
         else:
             batch_parameters = self.batch_parameters
-        result = run_validation_definition(
+
+        if self._run_in_validation_service(context, gx_cloud_config, batch_parameters):
+            return
+
+        if self.isolation == "subprocess":
+            xcom_value, result_dict, success = run_isolated(
+                self._validate,
+                gx_cloud_config,
+                batch_parameters,
+                context["ti"],
+                max_memory_bytes=self.max_memory_bytes,
+                max_cpu_seconds=self.max_cpu_seconds,
+            )
+        else:
+            xcom_value, result_dict, success = self._validate(
+                gx_cloud_config, batch_parameters, context["ti"]
+            )
+        context["ti"].xcom_push(key="return_value", value=xcom_value)
+        if not success:
+            raise validation_failure(result_dict, self.task_id)
+
+    def _validate(
+        self,
+        gx_cloud_config: GXCloudConfig | None,
+        batch_parameters: BatchParameters,
+        ti: Any = None,
+    ) -> tuple[dict[str, Any], dict[str, Any], bool]:
+        """Run the validation of the task instance `ti`.
+
+        Returns:
+            the value to push to XCom, the full Validation Result, and whether it succeeded.
+        """
+        instrumentation = ValidationInstrumentation(self, ti)
+        tracer = instrumentation.tracer
+        with instrumentation.tracking():
+            with tracer.span("load_context", context_type=self.context_type):
+                gx_context = load_data_context(
+                    gx_cloud_config=gx_cloud_config, context_type=self.context_type
+                )
+            with tracer.span("configure_batch_definition"):
+                if self.batch_definition_version is not None:
+                    batch_definition = BatchDefinitionCache(
+                        self.batch_definition_cache_dir
+                    ).get_or_configure(
+                        self.configure_batch_definition,
+                        gx_context,
+                        version=self.batch_definition_version,
+                    )
+                else:
+                    batch_definition = self.configure_batch_definition(gx_context)
+
+            with tracer.span("configure_expectations"):
+                if self.configure_expectations is not None:
+                    expect = self.configure_expectations(gx_context)
+                elif self._deprecated_expect is not None:
+                    expect = self._deprecated_expect
+                else:
+                    raise ValueError("configure_expectations is required")
+
+            skipper = UnchangedBatchSkipper(
+                self.skip_unchanged_dir,
+                content_hash=self.skip_unchanged_content_hash,
+                enabled=self.skip_unchanged,
+            )
+            fingerprint = skipper.fingerprint(
+                self.dag_id,
+                self.task_id,
+                [(batch_definition, as_suite(self.task_id, expect))],
+                batch_parameters,
+                result_format=self.result_format,
+            )
+            unchanged = skipper.lookup(fingerprint)
+            if unchanged is not None:
+                skipped: dict[str, Any] = {
+                    **unchanged["result"],
+                    SKIPPED_UNCHANGED_KEY: {"validated_at": unchanged["validated_at"]},
+                }
+                xcom_value = truncate_result_for_xcom(skipped, self.max_xcom_bytes)
+                return xcom_value, unchanged["result"], True
+
+            with instrumentation.validating():
+                result = run_validation_definition(
+                    task_id=self.task_id,
+                    expect=expect,
+                    batch_definition=batch_definition,
+                    result_format=self.result_format,
+                    batch_parameters=batch_parameters,
+                    gx_context=gx_context,
+                )
+            result_dict = cast("dict[str, Any]", instrumentation.describe(result))
+            success = instrumentation.succeeded(result)
+            if success:
+                skipper.store(fingerprint, result_dict)
+        xcom_value = instrumentation.xcom_value(result_dict, self.max_xcom_bytes)
+        return xcom_value, result_dict, success
+
+    def _run_in_validation_service(
+        self,
+        context: Context,
+        gx_cloud_config: GXCloudConfig | None,
+        batch_parameters: BatchParameters,
+    ) -> bool:
+        """Validate in the local validation service, if one is configured and listening.
+
+        Returns:
+            whether the validation ran in the service and its result was pushed.
+        """
+        if not self.validation_socket:
+            return False
+        if runs_in_task_process(self):
+            return False
+        job = ValidationJob.from_callables(
+            callables={
+                "configure_batch_definition": self.configure_batch_definition,
+                "configure_expectations": self.configure_expectations,
+            },
+            kind="batch",
             task_id=self.task_id,
-            expect=expect,
-            batch_definition=batch_definition,
+            context_type=self.context_type,
+            batch_parameters=dict(batch_parameters),
             result_format=self.result_format,
-            batch_parameters=batch_parameters,
-            gx_context=gx_context,
+            gx_cloud_config=gx_cloud_config,
         )
-        result_dict = result.describe_dict()
-        context["ti"].xcom_push(key="return_value", value=result_dict)
-        if not result.success:
-            raise GXValidationFailed(result_dict, self.task_id)
+        if job is None or job.configure_expectations is None:
+            return False
+        result_dict = submit_validation_job(self.validation_socket, job)
+        if result_dict is None:
+            return False
+        xcom_value = truncate_result_for_xcom(result_dict, self.max_xcom_bytes)
+        context["ti"].xcom_push(key="return_value", value=xcom_value)
+        if not result_dict["success"]:
+            raise validation_failure(result_dict, self.task_id)
+        return True
@@ -1,26 +1,65 @@
 from __future__ import annotations
 
 import warnings
-from typing import TYPE_CHECKING, Callable, Literal, Union
+from typing import TYPE_CHECKING, Any, Callable, Literal, Union, cast
 
 from airflow.models import BaseOperator
 from great_expectations.datasource.fluent import PandasDatasource, SparkDatasource
 
-from great_expectations_provider.common.errors import GXValidationFailed
+from great_expectations_provider.common.cloud_calls import (
+    CLOUD_CALLS_KEY,
+    CloudCallTracker,
+)
+from great_expectations_provider.common.column_projection import project_dataframe
+from great_expectations_provider.common.dataframe_batch_definitions import (
+    get_dataframe_batch_definition,
+)
+from great_expectations_provider.common.expectation_timing import (
+    EXPECTATION_TIMINGS_KEY,
+    ExpectationTimer,
+)
 from great_expectations_provider.common.gx_context_actions import (
+    as_suite,
     load_data_context,
     run_validation_definition,
 )
-from great_expectations_provider.exceptions.exceptions import (
-    ExistingDataSourceTypeMismatch,
+from great_expectations_provider.common.gx_phases import RESULT_SERIALIZATION
+from great_expectations_provider.common.instrumentation import (
+    ValidationInstrumentation,
+    runs_in_task_process,
+    validation_failure,
+)
+from great_expectations_provider.common.isolation import (
+    check_isolation,
+    run_isolated,
+)
+from great_expectations_provider.common.memory import MEMORY_USAGE_KEY, MemoryTracker
+from great_expectations_provider.common.profiling import profile_validation
+from great_expectations_provider.common.result_cache import (
+    REUSED_RESULT_KEY,
+    DataFrameResultCache,
+)
+from great_expectations_provider.common.result_spool import (
+    SPOOLED_RESULTS_KEY,
+    ResultSpool,
+    check_result_upload,
 )
+from great_expectations_provider.common.spark_sessions import spark_sessions
+from great_expectations_provider.common.time_budget import (
+    DEFAULT_SAMPLE_FRACTION,
+    TIME_BUDGET_KEY,
+    TimeBudget,
+    TimeBudgetValue,
+    check_time_budget,
+)
+from great_expectations_provider.common.tracing import ValidationTracer
+from great_expectations_provider.common.xcom import truncate_result_for_xcom
 from great_expectations_provider.hooks.gx_cloud import GXCloudHook
 
 if TYPE_CHECKING:
     import pyspark.sql as pyspark
     from airflow.utils.context import Context
     from great_expectations import ExpectationSuite
-    from great_expectations.core.batch_definition import BatchDefinition
     from great_expectations.data_context import AbstractDataContext
     from great_expectations.expectations import Expectation
     from pandas import DataFrame
@@ -33,7 +72,13 @@ class GXValidateDataFrameOperator(BaseOperator):
 
     Args:
         task_id: Airflow task ID. Alphanumeric name used in the Airflow UI and to name components in GX Cloud.
-        configure_dataframe: A callable which returns the DataFrame to be validated.
+        configure_dataframe: A callable which returns the DataFrame to be validated, called when the task
+            runs rather than when the DAG is parsed. To build Spark DataFrames of the operators run in one
+            process from a single session, get the session with
+            `great_expectations_provider.common.spark_sessions.get_spark_session`. Under the standard
+            executors each task runs in a process of its own and builds its own session, so keeping sessions
+            only helps where operators run one after another in a single process, such as `dag.test()` in
+            development and tests.
         configure_expectations: A callable that takes an AbstractDataContext and returns an Expectation or
             ExpectationSuite to validate against the DataFrame. Available Expectations can be found at
             https://greatexpectations.io/expectations.
@@ -45,6 +90,74 @@ class GXValidateDataFrameOperator(BaseOperator):
             Defaults to `ephemeral`, which does not persist results between runs.
             To save and view Validation Results in GX Cloud, use `cloud` and include
             GX Cloud credentials in your environment.
+        max_xcom_bytes: optional upper bound, in bytes, on the JSON size of the value pushed to XCom, the
+            Validation Result with the reports pushed alongside it. Larger values are trimmed by dropping row
+            samples, unexpected index lists, the tables of reports such as `expectation_timings`, and then
+            other per-Expectation result details, keeping success flags, statistics, and report totals. The
+            pushed result records what was dropped under the `xcom_truncation` key. Defaults to no limit.
+        profile: if True, profile the validation run with a stack sampler. A collapsed-stack flamegraph
+            file (`.folded`), named after the task ID, map index, and try number, is written to
+            `profile_dir`, and the 20 functions with the most own time are logged. Defaults to False.
+        profile_dir: directory for profiling output. Defaults to `gx_profiles` in the system
+            temporary directory.
+        track_memory: if True, record the RSS high-water mark and tracemalloc peak of the batch loading,
+            metric computation, and result serialization phases. The figures are pushed with the
+            Validation Result under the `memory_usage` key and emitted as `gx.memory.*` gauges.
+            Defaults to False.
+        tracing: if True, record the run as OpenTelemetry spans: context loading, Batch Definition and
+            Expectation configuration, the Validation Definition with its batch loading and metric computation,
+            one zero-duration span marking each Expectation, and result serialization, with row counts and
+            result sizes as span attributes. Spans use the worker's configured tracer provider and require `opentelemetry-api`.
+            Defaults to False.
+        time_expectations: if True, attribute the wall time of the validation to each Expectation: the
+            metrics only it depends on, its share of metrics shared with other Expectations, and the
+            evaluation of its result. Tables of Expectations and shared metrics, slowest first, are pushed
+            with the Validation Result under the `expectation_timings` key. Defaults to False.
+        track_cloud_calls: if True, count and time the HTTP requests made to GX Cloud, in total and per
+            method and endpoint, and push the counts with the Validation Result under the `cloud_calls`
+            key. The counts are also emitted as `gx.cloud.*` metrics. Defaults to False.
+        isolation: accepts `none` or `subprocess`. With `subprocess`, the validation runs in a forked child
+            process, so running out of memory or CPU time fails the task with `GXResourceLimitExceeded`
+            instead of taking down the worker. Only the result is sent back to the task process.
+            Supports pandas DataFrames only and requires a POSIX system. Defaults to `none`.
+        max_memory_bytes: limit on the address space of the isolated validation process, in bytes.
+            Requires `isolation="subprocess"`. Defaults to no limit.
+        max_cpu_seconds: limit on the CPU time of the isolated validation process, in seconds.
+            Requires `isolation="subprocess"`. Defaults to no limit.
+        time_budget: time the validation may take, as a timedelta or in seconds. Expectations are then
+            evaluated in groups, one per column, and the time is checked between groups. When the next
+            group is not expected to finish within the budget, the rest are handled by `time_budget_action`,
+            and the pushed result lists them under the `time_budget` key. The statistics of the result
+            cover the evaluated Expectations only, and a result leaving any Expectation unevaluated or
+            sampled fails the task with `GXTimeBudgetExceeded`. Defaults to no budget.
+        time_budget_action: `stop` to leave the remaining Expectations unevaluated, or `sample` to evaluate
+            them against a random sample of the validated DataFrame. Without a DataFrame Batch to sample,
+            `sample` stops. Defaults to `stop`.
+        time_budget_sample_fraction: fraction of rows sampled when `time_budget_action` is `sample`.
+            Defaults to 0.1.
+        result_upload: `sync` to upload the Validation Result to GX Cloud during the run, or `spool` to
+            write it to a spool directory that `GXUploadSpooledResultsOperator` uploads, so the outcome of
+            the task depends only on the data. The pushed result then has no GX Cloud ID or URL, and lists
+            the spooled files under the `spooled_results` key. Requires `context_type="cloud"` and
+            `result_spool_dir`. Defaults to `sync`.
+        result_spool_dir: spool directory of `result_upload="spool"`. It must be durable and shared by the
+            workers running this task and `GXUploadSpooledResultsOperator`.
+        result_cache: if True, hash the content of a pandas DataFrame before validating it, and reuse the
+            result of the last successful validation of an identical DataFrame with the same suite and
+            result format, by any task of the worker host, instead of validating again. The pushed result
+            then records the task and time it was validated under the `reused_result` key, and nothing is
+            uploaded to GX Cloud. Hashing reads every value once and costs about as much as one simple
+            Expectation, a third to a half of validating a short suite, so the cache pays off only where
+            identical DataFrames are validated again, such as by retries or by several tasks; otherwise it
+            adds that cost to every run. Results that `time_budget` cut short or sampled are never reused.
+            Spark DataFrames are always validated. Defaults to False.
+        result_cache_dir: directory of the results of `result_cache`. Defaults to `gx_result_cache` in the
+            system temporary directory.
+        column_projection: if True, validate only the columns the Expectations reference, and those named by
+            `unexpected_index_column_names` in the result format: a pandas DataFrame is narrowed to them
+            without copying, and a Spark DataFrame with `select()`. The whole DataFrame is validated when an
+            Expectation is table-level, is `expect_column_to_exist`, has a row condition, or references a
+            missing column. Defaults to False.
     """
 
     def __init__(
@@ -61,6 +174,24 @@ class GXValidateDataFrameOperator(BaseOperator):
             Literal["BOOLEAN_ONLY", "BASIC", "SUMMARY", "COMPLETE"] | None
         ) = None,
         conn_id: Union[str, None] = None,
+        max_xcom_bytes: int | None = None,
+        profile: bool = False,
+        profile_dir: str | None = None,
+        track_memory: bool = False,
+        tracing: bool = False,
+        time_expectations: bool = False,
+        track_cloud_calls: bool = False,
+        isolation: Literal["none", "subprocess"] = "none",
+        max_memory_bytes: int | None = None,
+        max_cpu_seconds: int | None = None,
+        time_budget: TimeBudgetValue | None = None,
+        time_budget_action: Literal["stop", "sample"] = "stop",
+        time_budget_sample_fraction: float = DEFAULT_SAMPLE_FRACTION,
+        result_upload: Literal["sync", "spool"] = "sync",
+        result_spool_dir: str | None = None,
+        result_cache: bool = False,
+        result_cache_dir: str | None = None,
+        column_projection: bool = False,
         *args,
         **kwargs,
     ) -> None:
@@ -82,105 +213,159 @@ class GXValidateDataFrameOperator(BaseOperator):
             raise ValueError("configure_expectations is required")
 
         self.context_type = context_type
-        self.dataframe = configure_dataframe()
+        self.configure_dataframe = configure_dataframe
         self.configure_expectations = configure_expectations
         self.result_format = result_format
         self.conn_id = conn_id
+        self.max_xcom_bytes = max_xcom_bytes
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.track_memory = track_memory
+        self.tracing = tracing
+        self.time_expectations = time_expectations
+        self.track_cloud_calls = track_cloud_calls
+        check_isolation(isolation, max_memory_bytes, max_cpu_seconds)
+        self.isolation = isolation
+        self.max_memory_bytes = max_memory_bytes
+        self.max_cpu_seconds = max_cpu_seconds
+        check_time_budget(time_budget, time_budget_action, time_budget_sample_fraction)
+        self.time_budget = time_budget
+        self.time_budget_action = time_budget_action
+        self.time_budget_sample_fraction = time_budget_sample_fraction
+        check_result_upload(result_upload, context_type, result_spool_dir)
+        self.result_upload = result_upload
+        self.result_spool_dir = result_spool_dir
+        self.result_cache = result_cache
+        self.result_cache_dir = result_cache_dir
+        self.column_projection = column_projection
+
+    @property
+    def dataframe(self) -> DataFrame | pyspark.DataFrame | SparkConnectDataFrame:
+        """The DataFrame `configure_dataframe` returns, configured anew on each access."""
+        warnings.warn(
+            "The 'dataframe' attribute is deprecated. The DataFrame is configured when the task runs; "
+            "call 'configure_dataframe' instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self.configure_dataframe()
+
+    @dataframe.setter
+    def dataframe(
+        self, dataframe: DataFrame | pyspark.DataFrame | SparkConnectDataFrame
+    ) -> None:
+        warnings.warn(
+            "The 'dataframe' attribute is deprecated. Set 'configure_dataframe' to a callable "
+            "returning the DataFrame instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.configure_dataframe = lambda: dataframe
 
     def execute(self, context: Context) -> None:
         from pandas import DataFrame
 
-        if self.conn_id:
-            gx_cloud_config = GXCloudHook(gx_cloud_conn_id=self.conn_id).get_conn()
+        # called when the task runs, not when the DAG is parsed
+        dataframe = self.configure_dataframe()
+        if self.isolation == "subprocess":
+            if not isinstance(dataframe, DataFrame):
+                # a Spark DataFrame is bound to a session that cannot be shared with a fork
+                raise ValueError("Subprocess isolation supports only pandas DataFrames")
+            xcom_value, result_dict, success = run_isolated(
+                self._validate,
+                dataframe,
+                context["ti"],
+                max_memory_bytes=self.max_memory_bytes,
+                max_cpu_seconds=self.max_cpu_seconds,
+            )
         else:
-            gx_cloud_config = None
-        gx_context = load_data_context(
-            gx_cloud_config=gx_cloud_config, context_type=self.context_type
-        )
+            xcom_value, result_dict, success = self._validate(dataframe, context["ti"])
+        context["ti"].xcom_push(key="return_value", value=xcom_value)
+        if not success:
+            raise validation_failure(result_dict, self.task_id)
 
-        if isinstance(self.dataframe, DataFrame):
-            batch_definition = self._get_pandas_batch_definition(gx_context)
-        elif type(self.dataframe).__name__ == "DataFrame":
-            # if it's not pandas, but the classname is Dataframe, we assume spark
-            batch_definition = self._get_spark_batch_definition(gx_context)
-        else:
-            raise ValueError(
-                f"Unsupported dataframe type: {type(self.dataframe).__name__}"
-            )
+    def _validate(
+        self, dataframe: Any, ti: Any = None
+    ) -> tuple[dict[str, Any], dict[str, Any], bool]:
+        """Run the validation of `dataframe` for the task instance `ti`.
 
-        if self.configure_expectations is not None:
-            expect = self.configure_expectations(gx_context)
-        elif self._deprecated_expect is not None:
-            expect = self._deprecated_expect
-        else:
-            raise ValueError("configure_expectations is required")
+        Returns:
+            the value to push to XCom, the full Validation Result, and whether it succeeded.
+        """
+        from pandas import DataFrame
 
-        batch_parameters = {
-            "dataframe": self.dataframe,
-        }
-        result = run_validation_definition(
-            task_id=self.task_id,
-            expect=expect,
-            batch_definition=batch_definition,
-            result_format=self.result_format,
-            batch_parameters=batch_parameters,
-            gx_context=gx_context,
-        )
-        result_dict = result.describe_dict()
-        context["ti"].xcom_push(key="return_value", value=result_dict)
-        if not result.success:
-            raise GXValidationFailed(result_dict, self.task_id)
-
-    def _get_spark_batch_definition(
-        self, gx_context: AbstractDataContext
-    ) -> BatchDefinition:
-        name = self.task_id
-        try:
-            data_source = gx_context.data_sources.get(name=name)
-            if not isinstance(data_source, SparkDatasource):
-                raise ExistingDataSourceTypeMismatch(
-                    expected_type=SparkDatasource,
-                    actual_type=type(data_source),
-                    name=name,
-                )
-        except KeyError:
-            data_source = gx_context.data_sources.add_spark(name=name)
-
-        try:
-            asset = data_source.get_asset(name=name)
-        except LookupError:
-            asset = data_source.add_dataframe_asset(name=name)
-
-        try:
-            batch_definition = asset.get_batch_definition(name=name)
-        except KeyError:
-            batch_definition = asset.add_batch_definition_whole_dataframe(name=name)
-
-        return batch_definition
-
-    def _get_pandas_batch_definition(
-        self, gx_context: AbstractDataContext
-    ) -> BatchDefinition:
-        name = self.task_id
-        try:
-            data_source = gx_context.data_sources.get(name=name)
-            if not isinstance(data_source, PandasDatasource):
-                raise ExistingDataSourceTypeMismatch(
-                    expected_type=PandasDatasource,
-                    actual_type=type(data_source),
-                    name=name,
+        instrumentation = ValidationInstrumentation(self, ti)
+        tracer = instrumentation.tracer
+        with instrumentation.tracking(), spark_sessions.using(dataframe):
+            if self.conn_id:
+                gx_cloud_config = GXCloudHook(gx_cloud_conn_id=self.conn_id).get_conn()
+            else:
+                gx_cloud_config = None
+            with tracer.span("load_context", context_type=self.context_type):
+                gx_context = load_data_context(
+                    gx_cloud_config=gx_cloud_config, context_type=self.context_type
                 )
-        except KeyError:
-            data_source = gx_context.data_sources.add_pandas(name=name)
 
-        try:
-            asset = data_source.get_asset(name=name)
-        except LookupError:
-            asset = data_source.add_dataframe_asset(name=name)
+            with tracer.span(
+                "configure_batch_definition",
+                dataframe_type=type(dataframe).__module__,
+            ):
+                if isinstance(dataframe, DataFrame):
+                    batch_definition = get_dataframe_batch_definition(
+                        gx_context, name=self.task_id, datasource_type=PandasDatasource
+                    )
+                elif type(dataframe).__name__ == "DataFrame":
+                    # if it's not pandas, but the classname is Dataframe, we assume spark
+                    batch_definition = get_dataframe_batch_definition(
+                        gx_context, name=self.task_id, datasource_type=SparkDatasource
+                    )
+                else:
+                    raise ValueError(
+                        f"Unsupported dataframe type: {type(dataframe).__name__}"
+                    )
 
-        try:
-            batch_definition = asset.get_batch_definition(name=name)
-        except KeyError:
-            batch_definition = asset.add_batch_definition_whole_dataframe(name=name)
+            with tracer.span("configure_expectations"):
+                if self.configure_expectations is not None:
+                    expect = self.configure_expectations(gx_context)
+                elif self._deprecated_expect is not None:
+                    expect = self._deprecated_expect
+                else:
+                    raise ValueError("configure_expectations is required")
 
-        return batch_definition
+            suite = as_suite(self.task_id, expect)
+            if self.column_projection:
+                dataframe = project_dataframe(dataframe, suite, self.result_format)
+            result_cache = DataFrameResultCache(
+                self.result_cache_dir, enabled=self.result_cache
+            )
+            cache_key = result_cache.key(dataframe, suite, self.result_format)
+            cached = result_cache.lookup(cache_key)
+            if cached is not None:
+                reused: dict[str, Any] = {
+                    **cached["result"],
+                    REUSED_RESULT_KEY: {
+                        "task_id": cached["task_id"],
+                        "validated_at": cached["validated_at"],
+                    },
+                }
+                xcom_value = truncate_result_for_xcom(reused, self.max_xcom_bytes)
+                return xcom_value, cached["result"], True
+
+            batch_parameters = {
+                "dataframe": dataframe,
+            }
+            with instrumentation.validating():
+                result = run_validation_definition(
+                    task_id=self.task_id,
+                    expect=expect,
+                    batch_definition=batch_definition,
+                    result_format=self.result_format,
+                    batch_parameters=batch_parameters,
+                    gx_context=gx_context,
+                )
+            result_dict = cast("dict[str, Any]", instrumentation.describe(result))
+            success = instrumentation.succeeded(result)
+            if success:
+                result_cache.store(cache_key, self.task_id, result_dict)
+        xcom_value = instrumentation.xcom_value(result_dict, self.max_xcom_bytes)
+        return xcom_value, result_dict, success
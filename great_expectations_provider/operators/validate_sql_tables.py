@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal, Mapping, Union
+
+from airflow.models import BaseOperator
+
+from great_expectations_provider.common.athena_queries import (
+    ATHENA_QUERIES_KEY,
+    AthenaQueryTracker,
+)
+from great_expectations_provider.common.errors import record_statement_timeouts
+from great_expectations_provider.common.external_connections import (
+    build_connection_string,
+    build_engine_kwargs,
+)
+from great_expectations_provider.common.gx_context_actions import (
+    add_or_update_validation_definition,
+    load_data_context,
+)
+from great_expectations_provider.common.instrumentation import validation_failure
+from great_expectations_provider.common.metric_cache import (
+    DEFAULT_MAX_ENTRIES,
+    METRIC_CACHE_KEY,
+    MetricCache,
+)
+from great_expectations_provider.common.shared_sql_engine import (
+    SharedSQLEngine,
+    pool_kwargs,
+)
+from great_expectations_provider.common.xcom import truncate_result_for_xcom
+from great_expectations_provider.hooks.gx_cloud import GXCloudHook
+
+if TYPE_CHECKING:
+    from airflow.utils.context import Context
+    from great_expectations import ExpectationSuite, ValidationDefinition
+    from great_expectations.data_context import AbstractDataContext
+    from great_expectations.datasource.fluent import SQLDatasource
+    from great_expectations.datasource.fluent.sql_datasource import (
+        QueryAsset,
+        TableAsset,
+    )
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 4
+# XCom keys the operator pushes besides the results of the tables
+RESERVED_XCOM_KEYS = ("return_value", METRIC_CACHE_KEY, ATHENA_QUERIES_KEY)
+
+
+@contextmanager
+def _serialized_result_writes(gx_context: AbstractDataContext) -> Iterator[None]:
+    """Store the Validation Results of `gx_context` one at a time in the enclosed block.
+
+    Data Contexts and their stores are not thread-safe, and each validating thread writes
+    its result to the same store, or the same GX Cloud backend.
+    """
+    store = gx_context.validation_results_store
+    store_validation_results = store.store_validation_results
+    lock = threading.Lock()
+
+    def locked_store_validation_results(*args: Any, **kwargs: Any) -> Any:
+        with lock:
+            return store_validation_results(*args, **kwargs)
+
+    store.store_validation_results = locked_store_validation_results  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        del store.store_validation_results
+
+
+def asset_name(table_or_query: str) -> str:
+    """Name of the asset, and of the XCom key of the result, for a table name or SQL query.
+
+    Queries, told apart from table names by containing whitespace, are named after a hash
+    of their text.
+    """
+    if len(table_or_query.split()) > 1:
+        digest = hashlib.sha256(table_or_query.encode()).hexdigest()[:12]
+        return f"query_{digest}"
+    return table_or_query
+
+
+class GXValidateSQLTablesOperator(BaseOperator):
+    """
+    An operator to use Great Expectations to validate several tables or queries of a database in one task.
+
+    The tables are read through one SQL Data Source on the connection string built for `conn_id`, and
+    validated concurrently over its SQLAlchemy engine, so they share one connection pool instead of a
+    task, a Data Source, and an engine each. Every table is validated before the task fails: a table
+    whose validation raises is recorded as not succeeded, and the first error is raised once the
+    results of the other tables are pushed.
+
+    Args:
+        task_id: Airflow task ID. Alphanumeric name used in the Airflow UI and to name components in GX Cloud.
+        conn_id: Airflow connection of the database. Supported connection types are `postgres`, `redshift`,
+            `mysql`, `mssql`, `snowflake`, `gcpbigquery`, `sqlite`, and `trino`.
+        configure_tables: A callable that takes an AbstractDataContext and returns a mapping of table name or
+            SQL query to the ExpectationSuite to validate it against. Keys containing whitespace are
+            validated as queries.
+        schema: optional schema, or database, overriding the one of the connection.
+        max_concurrency: most tables validated at the same time, and the size of the connection pool.
+            Defaults to 4.
+        result_format: control the verbosity of returned Validation Results. Possible values are
+            "BOOLEAN_ONLY", "BASIC", "SUMMARY", "COMPLETE". Defaults to "SUMMARY". See
+            https://docs.greatexpectations.io/docs/core/trigger_actions_based_on_results/choose_a_result_format
+            for more information.
+        context_type: accepts `ephemeral` or `cloud` to set the DataContext used by the Operator.
+            Defaults to `ephemeral`, which does not persist results between runs.
+            To save and view Validation Results in GX Cloud, use `cloud` and complete the additional
+            Cloud Data Context configuration.
+        gx_cloud_conn_id: A `gx_cloud` Airflow connection ID. If not provided, GX Cloud credentials are read
+            from environment variables. Applies only when `context_type` is `cloud`.
+        max_xcom_bytes: optional upper bound, in bytes, on the JSON size of each Validation Result pushed
+            to XCom. Larger results are trimmed by dropping row samples, unexpected index lists, and then
+            other per-Expectation result details, keeping success flags and statistics. Defaults to no limit.
+        metric_cache: whether to reuse the metric values computed in earlier runs for tables that have not
+            changed since, told by the modification time of Snowflake and SQLite tables and by
+            `metric_cache_version_column` of other tables. Queries are always computed. Hits, misses, and the hit rate are pushed under
+            the `metric_cache` key. Defaults to False.
+        metric_cache_path: SQLite database of the metric cache. Defaults to `gx_metric_cache.sqlite3` in
+            the system temporary directory.
+        metric_cache_max_entries: metric values kept in the cache, the least recently used are evicted
+            beyond it. Defaults to 100000.
+        metric_cache_version_column: column of SQL tables whose maximum, with the row count, is their
+            data version, such as an `updated_at` timestamp or a load ID. Required to cache metrics of
+            tables other than Snowflake and SQLite ones. Defaults to None.
+        track_athena_queries: if True, record the data scanned and the engine and total execution time of
+            each Athena query of the validations, and push the totals, the count of queries served from
+            reused results, and the slowest queries under the `athena_queries` XCom
+            key. The totals are also emitted as `gx.athena.*` metrics. Defaults to False.
+
+    The Validation Result of each table is pushed to XCom under the key of its asset name: the table
+    name, or `query_` and a hash of the query. The `return_value` XCom maps asset names to whether their
+    validation succeeded. If any did not, the task fails with `GXValidationFailed` once all are validated,
+    or with its subclass `GXStatementTimeout` if queries exceeded the `statement_timeout_seconds` of the
+    Connection. Tables named like the other XCom keys of the operator, `return_value`, `metric_cache`, and
+    `athena_queries`, are rejected; validate them with a query such as `SELECT * FROM metric_cache`.
+    """
+
+    def __init__(
+        self,
+        conn_id: str,
+        configure_tables: Callable[
+            [AbstractDataContext], Mapping[str, ExpectationSuite]
+        ],
+        schema: str | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        result_format: (
+            Literal["BOOLEAN_ONLY", "BASIC", "SUMMARY", "COMPLETE"] | None
+        ) = None,
+        context_type: Literal["ephemeral", "cloud"] = "ephemeral",
+        gx_cloud_conn_id: Union[str, None] = None,
+        max_xcom_bytes: int | None = None,
+        metric_cache: bool = False,
+        metric_cache_path: str | None = None,
+        metric_cache_max_entries: int = DEFAULT_MAX_ENTRIES,
+        metric_cache_version_column: str | None = None,
+        track_athena_queries: bool = False,
+        *args,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+
+        if max_concurrency < 1:
+            raise ValueError("Parameter `max_concurrency` must be at least 1")
+        self.conn_id = conn_id
+        self.configure_tables = configure_tables
+        self.schema = schema
+        self.max_concurrency = max_concurrency
+        self.result_format = result_format
+        self.context_type = context_type
+        self.gx_cloud_conn_id = gx_cloud_conn_id
+        self.max_xcom_bytes = max_xcom_bytes
+        self.metric_cache = metric_cache
+        self.metric_cache_path = metric_cache_path
+        self.metric_cache_max_entries = metric_cache_max_entries
+        self.metric_cache_version_column = metric_cache_version_column
+        self.track_athena_queries = track_athena_queries
+
+    def execute(self, context: Context) -> None:
+        if self.gx_cloud_conn_id:
+            gx_cloud_config = GXCloudHook(
+                gx_cloud_conn_id=self.gx_cloud_conn_id
+            ).get_conn()
+        else:
+            gx_cloud_config = None
+        gx_context = load_data_context(
+            gx_cloud_config=gx_cloud_config, context_type=self.context_type
+        )
+        connection_string = build_connection_string(self.conn_id, self.schema)
+        datasource = gx_context.data_sources.add_or_update_sql(
+            name=self.task_id,
+            connection_string=connection_string,
+            # passed on to create_engine, missing from the GX type stubs
+            kwargs={  # type: ignore[call-arg]
+                **pool_kwargs(connection_string, self.max_concurrency),
+                **build_engine_kwargs(self.conn_id),
+            },
+        )
+        tables = self.configure_tables(gx_context)
+        reserved = sorted(
+            table for table in tables if asset_name(table) in RESERVED_XCOM_KEYS
+        )
+        if reserved:
+            raise ValueError(
+                f"Tables {', '.join(reserved)} would be pushed to XCom under keys the operator "
+                "uses for other values; validate them with a query, such as "
+                f"`SELECT * FROM {reserved[0]}`"
+            )
+        validation_definitions = {
+            asset_name(table_or_query): self._add_validation_definition(
+                gx_context, datasource, table_or_query, suite
+            )
+            for table_or_query, suite in tables.items()
+        }
+
+        shared_engine = SharedSQLEngine(datasource)
+
+        def validate(validation_definition: ValidationDefinition) -> dict[str, Any]:
+            with shared_engine.using():
+                if self.result_format:
+                    result = validation_definition.run(result_format=self.result_format)
+                else:
+                    result = validation_definition.run()
+            result_dict = result.describe_dict()
+            record_statement_timeouts(result, result_dict)
+            return result_dict
+
+        metric_cache = MetricCache(
+            self.metric_cache_path,
+            max_entries=self.metric_cache_max_entries,
+            version_column=self.metric_cache_version_column,
+            enabled=self.metric_cache,
+        )
+        athena_queries = AthenaQueryTracker(enabled=self.track_athena_queries)
+        with (
+            athena_queries.track(),
+            metric_cache.caching(),
+            shared_engine.sharing(),
+            _serialized_result_writes(gx_context),
+            ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix=f"{self.task_id}-validate",
+            ) as executor,
+        ):
+            # each validation runs in a copy of this context, so it uses the metric cache and trackers
+            futures = {
+                name: executor.submit(
+                    contextvars.copy_context().run, validate, validation_definition
+                )
+                for name, validation_definition in validation_definitions.items()
+            }
+        # every table is validated before any error is raised
+        result_dicts: dict[str, dict[str, Any]] = {}
+        errors: dict[str, BaseException] = {}
+        for name, future in futures.items():
+            error = future.exception()
+            if error is None:
+                result_dicts[name] = future.result()
+            else:
+                logger.error("Validating %s failed", name, exc_info=error)
+                errors[name] = error
+
+        for name, result_dict in result_dicts.items():
+            context["ti"].xcom_push(
+                key=name,
+                value=truncate_result_for_xcom(result_dict, self.max_xcom_bytes),
+            )
+        successes = {
+            name: name not in errors and bool(result_dicts[name]["success"])
+            for name in futures
+        }
+        metric_cache_report = metric_cache.report()
+        if metric_cache_report is not None:
+            context["ti"].xcom_push(key=METRIC_CACHE_KEY, value=metric_cache_report)
+            metric_cache.emit_metrics(self.task_id)
+        athena_query_report = athena_queries.report()
+        if athena_query_report is not None:
+            context["ti"].xcom_push(key=ATHENA_QUERIES_KEY, value=athena_query_report)
+            athena_queries.emit_metrics(self.task_id)
+        context["ti"].xcom_push(key="return_value", value=successes)
+        if errors:
+            # the first, with the others logged above
+            raise next(iter(errors.values()))
+        if not all(successes.values()):
+            raise validation_failure(
+                {
+                    "success": False,
+                    "validation_results": list(result_dicts.values()),
+                },
+                self.task_id,
+            )
+
+    def _add_validation_definition(
+        self,
+        gx_context: AbstractDataContext,
+        datasource: SQLDatasource,
+        table_or_query: str,
+        suite: ExpectationSuite,
+    ) -> ValidationDefinition:
+        name = asset_name(table_or_query)
+        asset: TableAsset | QueryAsset
+        if name == table_or_query:
+            asset = datasource.add_table_asset(name=name, table_name=table_or_query)
+        else:
+            asset = datasource.add_query_asset(name=name, query=table_or_query)
+        return add_or_update_validation_definition(
+            gx_context=gx_context,
+            name=f"{self.task_id}.{name}",
+            suite=suite,
+            batch_definition=asset.add_batch_definition_whole_table(name),
+        )
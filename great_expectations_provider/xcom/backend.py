@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import base64
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+try:  # airflow 3
+    from airflow.sdk.bases.xcom import BaseXCom
+
+    # XComs are stored as JSON, so encoded results are stored as Base85 text
+    _STORES_BYTES = False
+except ImportError:  # airflow 2
+    from airflow.models.xcom import BaseXCom  # type: ignore[no-redef]
+
+    # XComs are stored as bytes, so encoded results are stored as they are
+    _STORES_BYTES = True
+
+from great_expectations_provider.common.result_codec import (
+    decode_result,
+    decode_result_summary,
+    encode_result,
+    is_encoded_result,
+    is_validation_result,
+    summarize_result,
+)
+
+ENCODED_RESULT_PREFIX = "gx-result:"
+
+# whether XComs pulled in the current context decode only the summary of results
+_summary_only: ContextVar[bool] = ContextVar("gx_xcom_summary_only", default=False)
+
+
+def _encode_reference(value: dict[str, Any]) -> str:
+    return ENCODED_RESULT_PREFIX + base64.b85encode(encode_result(value)).decode(
+        "ascii"
+    )
+
+
+def _decode_reference(value: Any, summary_only: bool = False) -> Any:
+    if isinstance(value, str) and value.startswith(ENCODED_RESULT_PREFIX):
+        data = base64.b85decode(value[len(ENCODED_RESULT_PREFIX) :])
+    elif isinstance(value, bytes) and is_encoded_result(value):
+        data = value
+    else:
+        return value
+    return decode_result_summary(data) if summary_only else decode_result(data)
+
+
+def decode_xcom_result_summary(value: Any) -> Any:
+    """Decode only the summary of a validation result stored by GXResultXComBackend.
+
+    Accepts the raw stored XCom value, such as one read from the XCom table; values that
+    are not encoded results are returned unchanged. To pull summaries in a task, use
+    `pull_result_summary`.
+    """
+    return _decode_reference(value, summary_only=True)
+
+
+@contextmanager
+def result_summaries() -> Iterator[None]:
+    """Decode only the success flag and statistics of the results pulled in the enclosed block.
+
+    Applies to XComs pulled through GXResultXComBackend, which then never decompresses
+    the bodies of the results.
+    """
+    token = _summary_only.set(True)
+    try:
+        yield
+    finally:
+        _summary_only.reset(token)
+
+
+def pull_result_summary(ti: Any, **kwargs: Any) -> Any:
+    """Pull the success flag and statistics of validation results pushed by upstream tasks.
+
+    With GXResultXComBackend configured, only the summaries stored ahead of the compressed
+    results are decoded. With other XCom backends, the full results are pulled and then
+    summarized, so the same value is returned either way.
+
+    Args:
+        ti: the Airflow task instance pulling the XComs.
+        kwargs: arguments of `ti.xcom_pull`, such as `task_ids` and `key`.
+    """
+    with result_summaries():
+        value = ti.xcom_pull(**kwargs)
+    if is_validation_result(value):
+        return summarize_result(value)
+    if isinstance(value, list):
+        return [
+            summarize_result(item) if is_validation_result(item) else item
+            for item in value
+        ]
+    return value
+
+
+class GXResultXComBackend(BaseXCom):
+    """
+    XCom backend storing Great Expectations validation results in a compact binary format.
+
+    Validation results pushed by the GX operators (and any other value shaped like a
+    described ExpectationSuiteValidationResult or CheckpointResult) are encoded with
+    msgpack, interned strings, and zstd (or zlib) compression before being stored, as
+    bytes on Airflow 2 and as Base85 text in the JSON XCom values of Airflow 3. All other
+    values are handled by the default XCom backend. Pull results with
+    `pull_result_summary` to decode only their success flags and statistics.
+
+    Enable it by setting `xcom_backend` in the `core` section of the Airflow configuration:
+    `AIRFLOW__CORE__XCOM_BACKEND=great_expectations_provider.xcom.backend.GXResultXComBackend`.
+    Requires the `xcom` extra.
+    """
+
+    @staticmethod
+    def serialize_value(value: Any, **kwargs: Any) -> Any:  # type: ignore[override]
+        if is_validation_result(value):
+            if _STORES_BYTES:
+                return encode_result(value)
+            value = _encode_reference(value)
+        return BaseXCom.serialize_value(value, **kwargs)
+
+    @staticmethod
+    def deserialize_value(result: Any) -> Any:
+        if isinstance(result.value, bytes) and is_encoded_result(result.value):
+            value = result.value
+        else:
+            value = BaseXCom.deserialize_value(result)
+        return _decode_reference(value, summary_only=_summary_only.get())
+
+    def orm_deserialize_value(self) -> Any:
+        """Show only the summary in the Airflow 2 UI so listing XComs never decodes full results."""
+        value = self.value  # type: ignore[attr-defined]
+        if not (isinstance(value, bytes) and is_encoded_result(value)):
+            value = super().orm_deserialize_value()  # type: ignore[misc]
+        return _decode_reference(value, summary_only=True)
@@ -0,0 +1,94 @@
+"""
+Benchmark hashing pandas DataFrames for result reuse against validating them.
+
+Times `dataframe_hash` and a GXValidateDataFrameOperator run of a three-expectation
+suite for DataFrames of numeric, Python string, and, if pyarrow is installed, Arrow
+string columns of growing row counts.
+
+Usage:
+    python scripts/benchmark_dataframe_hash.py [--rows 100000 1000000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from typing import Any, Callable
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+from great_expectations import ExpectationSuite
+from great_expectations.expectations import (
+    ExpectColumnValuesToBeBetween,
+    ExpectColumnValuesToBeUnique,
+    ExpectColumnValuesToNotBeNull,
+)
+
+from great_expectations_provider.common.result_cache import dataframe_hash
+from great_expectations_provider.operators.validate_dataframe import (
+    GXValidateDataFrameOperator,
+)
+
+
+def build_frames(rows: int) -> dict[str, pd.DataFrame]:
+    generator = np.random.default_rng(0)
+    numbers = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "amount": generator.random(rows) * 100,
+            "created": pd.date_range("2024-01-01", periods=rows, freq="s"),
+        }
+    )
+    codes = pd.Series(generator.integers(0, 1000, rows)).map("code_{}".format)
+    frames = {"numeric": numbers, "str": numbers.assign(code=codes.astype(object))}
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return frames
+    frames["arrow str"] = numbers.assign(code=codes.astype("string[pyarrow]"))
+    return frames
+
+
+def validate(frame: pd.DataFrame) -> None:
+    GXValidateDataFrameOperator(
+        task_id="benchmark",
+        configure_dataframe=lambda: frame,
+        configure_expectations=lambda context: ExpectationSuite(
+            name="benchmark",
+            expectations=[
+                ExpectColumnValuesToBeUnique(column="id"),
+                ExpectColumnValuesToBeBetween(
+                    column="amount", min_value=0, max_value=100
+                ),
+                ExpectColumnValuesToNotBeNull(column="created"),
+            ],
+        ),
+    ).execute(context={"ti": Mock()})  # type: ignore[typeddict-item]
+
+
+def time_ms(function: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>10}  {'columns':<12}{'hash ms':>12}{'validate ms':>14}{'ratio':>8}"
+    )
+    for rows in args.rows:
+        for name, frame in build_frames(rows).items():
+            hash_ms = time_ms(lambda: dataframe_hash(frame), args.repeat)
+            validate_ms = time_ms(lambda: validate(frame), args.repeat)
+            print(
+                f"{rows:>10}  {name:<12}{hash_ms:>12.1f}{validate_ms:>14.1f}"
+                f"{hash_ms / validate_ms:>8.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark the overhead of running small validations with subprocess isolation.
+
+Runs GXValidateBatchOperator over a pandas DataFrame in the task process and in a forked
+child process with resource limits, and reports the median and best wall time of each.
+
+Usage:
+    python scripts/benchmark_isolation.py [--rows 1000] [--expectations 5] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock
+
+import pandas as pd
+from great_expectations import ExpectationSuite
+from great_expectations.expectations import (
+    ExpectColumnValuesToBeBetween,
+    ExpectColumnValuesToNotBeNull,
+)
+
+from great_expectations_provider.operators.validate_batch import GXValidateBatchOperator
+
+if TYPE_CHECKING:
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+
+
+def configure_batch_definition(context: AbstractDataContext) -> BatchDefinition:
+    return (
+        context.data_sources.add_pandas(name="benchmark datasource")
+        .add_dataframe_asset("benchmark asset")
+        .add_batch_definition_whole_dataframe("benchmark batch def")
+    )
+
+
+def build_operator(
+    isolation: str, rows: int, expectations: int, **limits: Any
+) -> GXValidateBatchOperator:
+    columns = [f"col_{index}" for index in range(expectations)]
+    dataframe = pd.DataFrame({column: range(rows) for column in columns})
+
+    def configure_expectations(context: AbstractDataContext) -> ExpectationSuite:
+        suite = ExpectationSuite(name="benchmark suite")
+        for index, column in enumerate(columns):
+            if index % 2:
+                suite.add_expectation(ExpectColumnValuesToNotBeNull(column=column))
+            else:
+                suite.add_expectation(
+                    ExpectColumnValuesToBeBetween(
+                        column=column, min_value=0, max_value=rows
+                    )
+                )
+        return suite
+
+    return GXValidateBatchOperator(
+        task_id=f"benchmark_{isolation}",
+        configure_batch_definition=configure_batch_definition,
+        configure_expectations=configure_expectations,
+        batch_parameters={"dataframe": dataframe},
+        isolation=isolation,  # type: ignore[arg-type]
+        **limits,
+    )
+
+
+def time_ms(operator: GXValidateBatchOperator, repeat: int) -> list[float]:
+    context: Any = {"ti": Mock()}
+    # the first run imports and registers everything GX needs
+    operator.execute(context=context)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operator.execute(context=context)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--expectations", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    modes = (
+        ("in-process", build_operator("none", args.rows, args.expectations)),
+        ("subprocess", build_operator("subprocess", args.rows, args.expectations)),
+        (
+            "subprocess+limits",
+            build_operator(
+                "subprocess",
+                args.rows,
+                args.expectations,
+                max_memory_bytes=16 << 30,
+                max_cpu_seconds=600,
+            ),
+        ),
+    )
+    baseline = None
+    print(f"{'isolation':<20}{'median ms':>12}{'best ms':>12}{'overhead ms':>14}")
+    for name, operator in modes:
+        timings = time_ms(operator, args.repeat)
+        median = statistics.median(timings)
+        if baseline is None:
+            baseline = median
+        print(
+            f"{name:<20}{median:>12.1f}{min(timings):>12.1f}{median - baseline:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
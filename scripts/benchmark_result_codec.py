@@ -0,0 +1,132 @@
+"""
+Benchmark payload size and encode/decode time of validation results pushed to XCom.
+
+Compares plain JSON (the default XCom serialization), JSON with zlib, and the
+GXResultXComBackend binary format for synthetic results shaped like each result format.
+
+Usage:
+    python scripts/benchmark_result_codec.py [--expectations 200] [--rows 1000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+import zlib
+from typing import Any, Callable
+
+from great_expectations_provider.common.result_codec import (
+    decode_result,
+    decode_result_summary,
+    encode_result,
+)
+
+RESULT_FORMATS = ("BOOLEAN_ONLY", "BASIC", "SUMMARY", "COMPLETE")
+
+
+def build_result(result_format: str, expectations: int, rows: int) -> dict[str, Any]:
+    def result_for(index: int) -> dict[str, Any]:
+        if result_format == "BOOLEAN_ONLY":
+            return {}
+        unexpected = [f"value_{row}" for row in range(min(rows, 20))]
+        result: dict[str, Any] = {
+            "element_count": rows,
+            "unexpected_count": rows // 10,
+            "unexpected_percent": 10.0,
+            "missing_count": 0,
+            "missing_percent": 0.0,
+            "unexpected_percent_total": 10.0,
+            "unexpected_percent_nonmissing": 10.0,
+            "partial_unexpected_list": unexpected,
+        }
+        if result_format in ("SUMMARY", "COMPLETE"):
+            result["partial_unexpected_counts"] = [
+                {"value": value, "count": 1} for value in unexpected
+            ]
+            result["partial_unexpected_index_list"] = list(range(len(unexpected)))
+        if result_format == "COMPLETE":
+            result["unexpected_list"] = [f"value_{row}" for row in range(rows // 10)]
+            result["unexpected_index_list"] = list(range(rows // 10))
+            result["unexpected_index_query"] = "df.filter(items=[...], axis=0)"
+        return result
+
+    return {
+        "success": False,
+        "statistics": {
+            "evaluated_expectations": expectations,
+            "successful_expectations": expectations // 2,
+            "unsuccessful_expectations": expectations - expectations // 2,
+            "success_percent": 50.0,
+        },
+        "expectations": [
+            {
+                "expectation_type": "expect_column_values_to_be_in_set",
+                "success": index % 2 == 0,
+                "kwargs": {
+                    "batch_id": "datasource-asset",
+                    "column": f"column_{index % 25}",
+                    "value_set": ["a", "b", "c"],
+                },
+                "result": result_for(index),
+            }
+            for index in range(expectations)
+        ],
+        "result_url": None,
+    }
+
+
+def time_ms(function: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--expectations", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'result_format':<14}{'codec':<16}{'bytes':>12}{'encode ms':>12}"
+        f"{'decode ms':>12}{'summary ms':>12}"
+    )
+    for result_format in RESULT_FORMATS:
+        result = build_result(result_format, args.expectations, args.rows)
+        json_payload = json.dumps(result).encode()
+        zlib_payload = zlib.compress(json_payload, 6)
+        binary_payload = encode_result(result)
+        codecs = (
+            (
+                "json",
+                json_payload,
+                lambda: json.dumps(result).encode(),
+                lambda: json.loads(json_payload),
+                lambda: json.loads(json_payload)["statistics"],
+            ),
+            (
+                "json+zlib",
+                zlib_payload,
+                lambda: zlib.compress(json.dumps(result).encode(), 6),
+                lambda: json.loads(zlib.decompress(zlib_payload)),
+                lambda: json.loads(zlib.decompress(zlib_payload))["statistics"],
+            ),
+            (
+                "gx-binary",
+                binary_payload,
+                lambda: encode_result(result),
+                lambda: decode_result(binary_payload),
+                lambda: decode_result_summary(binary_payload),
+            ),
+        )
+        for name, payload, encode, decode, summary in codecs:
+            print(
+                f"{result_format:<14}{name:<16}{len(payload):>12}"
+                f"{time_ms(encode, args.repeat):>12.2f}"
+                f"{time_ms(decode, args.repeat):>12.2f}"
+                f"{time_ms(summary, args.repeat):>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
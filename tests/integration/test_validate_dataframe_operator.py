@@ -17,6 +17,7 @@ from tests.integration.conftest import is_valid_gx_cloud_url, rand_name
 if TYPE_CHECKING:
     from airflow.utils.context import Context
     from great_expectations.data_context import AbstractDataContext
+    from pyspark.sql import DataFrame as SparkDataFrame
     from pyspark.sql import SparkSession
     from pyspark.sql.connect.session import SparkSession as SparkConnectSession
 
@@ -166,6 +167,41 @@ class TestGXValidateDataFrameOperator:
         pushed_result = mock_ti.xcom_push.call_args[1]["value"]
         assert pushed_result["success"]
 
+    @pytest.mark.spark_integration
+    def test_spark_with_kept_session(self) -> None:
+        from great_expectations_provider.common.spark_sessions import (
+            get_spark_session,
+        )
+
+        column_name = "col_A"
+        sessions = []
+
+        def configure_dataframe() -> SparkDataFrame:
+            session = get_spark_session(
+                master="local[1]", config={"spark.ui.enabled": "false"}
+            )
+            sessions.append(session)
+            return session.createDataFrame(pd.DataFrame({column_name: ["a", "b"]}))
+
+        def configure_expectations(
+            context: AbstractDataContext,
+        ) -> ExpectColumnValuesToBeInSet:
+            return ExpectColumnValuesToBeInSet(column=column_name, value_set=["a", "b"])
+
+        mock_ti = Mock()
+
+        # act
+        for _ in range(2):
+            GXValidateDataFrameOperator(
+                task_id=f"test_spark_kept_session_{rand_name()}",
+                configure_dataframe=configure_dataframe,
+                configure_expectations=configure_expectations,
+            ).execute(context={"ti": mock_ti})
+
+        # assert
+        assert sessions[1] is sessions[0]
+        assert mock_ti.xcom_push.call_args[1]["value"]["success"]
+
     @pytest.mark.spark_connect_integration
     def test_spark_connect(self, spark_connect_session: SparkConnectSession) -> None:
         from pyspark.sql.connect.dataframe import DataFrame as SparkConnectDataFrame
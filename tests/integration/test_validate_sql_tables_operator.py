@@ -0,0 +1,122 @@
+import json
+import os
+from typing import Callable
+from unittest.mock import Mock
+
+import pytest
+from great_expectations import ExpectationSuite
+from great_expectations import expectations as gxe
+from great_expectations.data_context import AbstractDataContext
+
+from great_expectations_provider.common.errors import GXValidationFailed
+from great_expectations_provider.operators.validate_sql_tables import (
+    GXValidateSQLTablesOperator,
+    asset_name,
+)
+from tests.integration.conftest import rand_name
+
+
+@pytest.fixture
+def postgres_conn_id(monkeypatch: pytest.MonkeyPatch) -> str:
+    conn_id = "gx_postgres"
+    monkeypatch.setenv(
+        f"AIRFLOW_CONN_{conn_id.upper()}",
+        json.dumps(
+            {
+                "conn_type": "postgres",
+                "host": "localhost",
+                "port": int(os.environ["POSTGRES_PORT"]),
+                "login": os.environ["POSTGRES_USER"],
+                "password": os.environ["POSTGRES_PASSWORD"],
+                "schema": os.environ["POSTGRES_DB"],
+            }
+        ),
+    )
+    return conn_id
+
+
+class TestValidateSQLTablesOperator:
+    @pytest.mark.postgres
+    def test_tables_and_queries(
+        self,
+        table_name: str,
+        load_postgres_data: Callable[[list[dict]], None],
+        postgres_conn_id: str,
+    ) -> None:
+        task_id = f"validate_sql_tables_integration_test_{rand_name()}"
+        query = f"SELECT * FROM {table_name} WHERE age > 30"
+        load_postgres_data(
+            [
+                {"name": "Alice", "age": 30},
+                {"name": "Bob", "age": 31},
+            ]
+        )
+
+        def configure_tables(
+            context: AbstractDataContext,
+        ) -> dict[str, ExpectationSuite]:
+            return {
+                table_name: ExpectationSuite(
+                    name=f"{task_id} table",
+                    expectations=[
+                        gxe.ExpectColumnValuesToBeBetween(
+                            column="age", min_value=0, max_value=100
+                        )
+                    ],
+                ),
+                query: ExpectationSuite(
+                    name=f"{task_id} query",
+                    expectations=[gxe.ExpectTableRowCountToEqual(value=1)],
+                ),
+            }
+
+        validate_tables = GXValidateSQLTablesOperator(
+            task_id=task_id,
+            conn_id=postgres_conn_id,
+            configure_tables=configure_tables,
+            max_concurrency=2,
+        )
+
+        mock_ti = Mock()
+        validate_tables.execute(context={"ti": mock_ti})
+
+        pushed = {
+            call.kwargs["key"]: call.kwargs["value"]
+            for call in mock_ti.xcom_push.call_args_list
+        }
+        assert pushed["return_value"] == {table_name: True, asset_name(query): True}
+        assert pushed[table_name]["statistics"]["evaluated_expectations"] == 1
+
+    @pytest.mark.postgres
+    def test_failed_table_fails_task(
+        self,
+        table_name: str,
+        load_postgres_data: Callable[[list[dict]], None],
+        postgres_conn_id: str,
+    ) -> None:
+        task_id = f"validate_sql_tables_failure_integration_test_{rand_name()}"
+        load_postgres_data([{"name": "Alice", "age": 130}])
+
+        def configure_tables(
+            context: AbstractDataContext,
+        ) -> dict[str, ExpectationSuite]:
+            return {
+                table_name: ExpectationSuite(
+                    name=f"{task_id} table",
+                    expectations=[
+                        gxe.ExpectColumnValuesToBeBetween(
+                            column="age", min_value=0, max_value=100
+                        )
+                    ],
+                )
+            }
+
+        validate_tables = GXValidateSQLTablesOperator(
+            task_id=task_id,
+            conn_id=postgres_conn_id,
+            configure_tables=configure_tables,
+        )
+
+        mock_ti = Mock()
+        with pytest.raises(GXValidationFailed):
+            validate_tables.execute(context={"ti": mock_ti})
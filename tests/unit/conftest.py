@@ -1,7 +1,15 @@
-from typing import Generator
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Generator, Iterator
 from unittest.mock import Mock
 
 import pytest
+from great_expectations.data_context.cloud_constants import GXCloudRESTResource
+from great_expectations.data_context.store.gx_cloud_store_backend import (
+    GXCloudStoreBackend,
+)
 from great_expectations.expectations import Expectation
 from pytest_mock import MockerFixture
 
@@ -19,3 +27,84 @@ def mock_gx(mocker: MockerFixture) -> Generator[Mock, None, None]:
     mock_gx.expectations.Expectation = Expectation  # required for isinstance check
     mocker.patch.dict("sys.modules", {"great_expectations": mock_gx})
     yield mock_gx
+
+
+ORGANIZATION_ID = str(uuid.uuid4())
+WORKSPACE_ID = str(uuid.uuid4())
+MISSING_ID = str(uuid.uuid4())
+
+
+class MockGXCloud(ThreadingHTTPServer):
+    """A local stand-in for the GX Cloud API, recording every request it serves.
+
+    Every resource exists, except those with the ID `MISSING_ID`. Connections are kept
+    alive between requests. Statuses appended to `fail_with` are answered to the next
+    requests, one each.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _MockGXCloudHandler)
+        self.requests: list[tuple[str, str]] = []
+        self.client_ports: set[int] = set()
+        self.fail_with: list[int] = []
+        self.bodies: list[Any] = []
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/"
+
+    def assert_within_budget(self, budget: int) -> None:
+        assert len(self.requests) <= budget, (
+            f"{len(self.requests)} requests exceed the budget of {budget}: "
+            f"{self.requests}"
+        )
+
+    def store_backend(self, resource_type: GXCloudRESTResource) -> GXCloudStoreBackend:
+        """A GX Cloud store backend of `resource_type` sending its requests here."""
+        return GXCloudStoreBackend(
+            ge_cloud_credentials={
+                "access_token": "token",
+                "organization_id": ORGANIZATION_ID,
+                "workspace_id": WORKSPACE_ID,
+            },
+            ge_cloud_base_url=self.url,
+            ge_cloud_resource_type=resource_type,
+        )
+
+
+class _MockGXCloudHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: MockGXCloud
+
+    def _respond(self) -> None:
+        self.server.requests.append((self.command, self.path))
+        self.server.client_ports.add(self.client_address[1])
+        length = int(self.headers.get("Content-Length") or 0)
+        request_body = self.rfile.read(length)
+        self.server.bodies.append(json.loads(request_body) if request_body else None)
+        if self.server.fail_with:
+            status = self.server.fail_with.pop(0)
+        else:
+            status = 404 if MISSING_ID in self.path else 200
+        body = json.dumps(
+            {"data": [{"id": str(uuid.uuid4()), "name": "test"}]}
+            if status == 200
+            else {"errors": [{"detail": "not found"}]}
+        ).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def mock_gx_cloud() -> Iterator[MockGXCloud]:
+    server = MockGXCloud()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
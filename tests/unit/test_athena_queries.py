@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import itertools
+import sqlite3
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+import sqlalchemy as sa
+from great_expectations.expectations import ExpectTableRowCountToBeBetween
+
+from great_expectations_provider.common.athena_queries import (
+    ATHENA_QUERIES_KEY,
+    AthenaQueryTracker,
+)
+from great_expectations_provider.operators.validate_batch import (
+    GXValidateBatchOperator,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from airflow.utils.context import Context
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+
+pytestmark = pytest.mark.unit
+
+_query_ids = itertools.count()
+
+
+class AthenaLikeCursor(sqlite3.Cursor):
+    """A SQLite cursor with the query statistics of a PyAthena cursor."""
+
+    def execute(self, *args, **kwargs):  # type: ignore[override]
+        self.query_id = f"query-{next(_query_ids)}"
+        self.data_scanned_in_bytes = 1024
+        self.engine_execution_time_in_millis = 40
+        self.total_execution_time_in_millis = 100
+        self.reused_previous_result = False
+        return super().execute(*args, **kwargs)
+
+
+class AthenaLikeConnection(sqlite3.Connection):
+    def cursor(self, *args, **kwargs):  # type: ignore[override]
+        return super().cursor(AthenaLikeCursor)
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Path:
+    database = tmp_path / "warehouse.db"
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE orders (id INTEGER)")
+        connection.executemany(
+            "INSERT INTO orders VALUES (?)", [(i,) for i in range(10)]
+        )
+    return database
+
+
+def athena_like_creator(database: Path):
+    return lambda: sqlite3.connect(
+        database, factory=AthenaLikeConnection, check_same_thread=False
+    )
+
+
+class TestAthenaQueryTracker:
+    def test_records_athena_queries(self, database: Path):
+        engine = sa.create_engine("sqlite://", creator=athena_like_creator(database))
+        tracker = AthenaQueryTracker()
+
+        with tracker.track(), engine.connect() as connection:
+            connection.execute(sa.text("SELECT COUNT(*) FROM orders")).scalar()
+            connection.execute(sa.text("SELECT MAX(id) FROM orders")).scalar()
+
+        report = tracker.report()
+        assert report is not None
+        assert report["queries"] == 2
+        assert report["data_scanned_bytes"] == 2048
+        assert report["engine_execution_ms"] == 80
+        assert report["total_execution_ms"] == 200
+        assert report["reused"] == 0
+        assert report["slowest_queries"][0]["statement"] == (
+            "SELECT COUNT(*) FROM orders"
+        )
+
+    def test_ignores_other_databases(self, database: Path):
+        engine = sa.create_engine(f"sqlite:///{database}")
+        tracker = AthenaQueryTracker()
+
+        with tracker.track(), engine.connect() as connection:
+            connection.execute(sa.text("SELECT COUNT(*) FROM orders")).scalar()
+
+        assert tracker.report() == {
+            "queries": 0,
+            "reused": 0,
+            "data_scanned_bytes": 0,
+            "engine_execution_ms": 0,
+            "total_execution_ms": 0,
+            "slowest_queries": [],
+        }
+
+    def test_ignores_queries_outside_the_block(self, database: Path):
+        engine = sa.create_engine("sqlite://", creator=athena_like_creator(database))
+        tracker = AthenaQueryTracker()
+        with tracker.track():
+            pass
+
+        with engine.connect() as connection:
+            connection.execute(sa.text("SELECT COUNT(*) FROM orders")).scalar()
+
+        assert tracker.report()["queries"] == 0
+
+    def test_disabled_tracker(self):
+        tracker = AthenaQueryTracker(enabled=False)
+
+        with tracker.track():
+            pass
+
+        assert tracker.report() is None
+
+    @patch("great_expectations_provider.common.athena_queries.emit_timing")
+    @patch("great_expectations_provider.common.athena_queries.emit_incr")
+    def test_emit_metrics(self, mock_emit_incr: Mock, mock_emit_timing: Mock):
+        tracker = AthenaQueryTracker()
+        tracker.record(
+            {
+                "query_id": "query",
+                "statement": "SELECT 1",
+                "data_scanned_bytes": 512,
+                "engine_execution_ms": 900,
+                "total_execution_ms": 1500,
+                "reused": True,
+            }
+        )
+
+        tracker.emit_metrics("validate")
+
+        tags = {"task_id": "validate"}
+        mock_emit_incr.assert_any_call("athena.queries", 1, tags=tags)
+        mock_emit_incr.assert_any_call("athena.reused_queries", 1, tags=tags)
+        mock_emit_incr.assert_any_call("athena.data_scanned_bytes", 512, tags=tags)
+        mock_emit_timing.assert_called_once_with(
+            "athena.execution_time", 1.5, tags=tags
+        )
+
+
+class TestGXValidateBatchOperatorAthenaQueries:
+    def test_athena_queries_are_pushed(self, database: Path):
+        # arrange
+        def configure_batch_definition(context: AbstractDataContext) -> BatchDefinition:
+            datasource = context.data_sources.add_sql(
+                name="athena",
+                connection_string="sqlite://",
+                kwargs={"creator": athena_like_creator(database)},  # type: ignore[call-arg]
+            )
+            asset = datasource.add_table_asset("orders", table_name="orders")
+            return asset.add_batch_definition_whole_table("orders")
+
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_orders",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=lambda context: ExpectTableRowCountToBeBetween(
+                min_value=1, max_value=100
+            ),
+            track_athena_queries=True,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        report = pushed_result[ATHENA_QUERIES_KEY]
+        assert report["queries"] > 0
+        assert report["data_scanned_bytes"] == 1024 * report["queries"]
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable
+from unittest.mock import Mock
+
+import great_expectations as gx
+import pytest
+
+from great_expectations_provider.common.batch_definition_cache import (
+    BatchDefinitionCache,
+)
+from great_expectations_provider.operators.validate_batch import GXValidateBatchOperator
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+
+def configure_batch_definition(context: AbstractDataContext) -> BatchDefinition:
+    try:
+        datasource = context.data_sources.get(name="test datasource")
+    except KeyError:
+        return (
+            context.data_sources.add_pandas(name="test datasource")
+            .add_dataframe_asset("test asset")
+            .add_batch_definition_whole_dataframe("test batch def")
+        )
+    return datasource.get_asset("test asset").get_batch_definition("test batch def")
+
+
+def _spy(configure: Callable[..., BatchDefinition]) -> Mock:
+    spy = Mock(wraps=configure)
+    spy.__qualname__ = configure.__qualname__
+    spy.__module__ = configure.__module__
+    return spy
+
+
+@pytest.fixture
+def gx_context() -> AbstractDataContext:
+    return gx.get_context(mode="ephemeral")
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> BatchDefinitionCache:
+    return BatchDefinitionCache(tmp_path)
+
+
+class TestBatchDefinitionCache:
+    def test_later_run_rehydrates_without_configuring(
+        self,
+        gx_context: AbstractDataContext,
+        cache: BatchDefinitionCache,
+        mocker: MockerFixture,
+    ):
+        configure = _spy(configure_batch_definition)
+        configured = cache.get_or_configure(configure, gx_context, version="1")
+        get_datasource = mocker.spy(gx_context.data_sources, "get")
+
+        batch_definition = cache.get_or_configure(configure, gx_context, version="1")
+
+        configure.assert_called_once()
+        get_datasource.assert_called_once()
+        assert batch_definition.id == configured.id
+        assert batch_definition.data_asset.name == "test asset"
+
+    def test_new_version_configures_again(
+        self, gx_context: AbstractDataContext, cache: BatchDefinitionCache
+    ):
+        configure = _spy(configure_batch_definition)
+        cache.get_or_configure(configure, gx_context, version="1")
+
+        cache.get_or_configure(configure, gx_context, version="2")
+
+        assert configure.call_count == 2
+
+    def test_deleted_datasource_configures_again(
+        self, cache: BatchDefinitionCache, tmp_path: Path
+    ):
+        cache.get_or_configure(
+            configure_batch_definition,
+            gx.get_context(mode="ephemeral"),
+            version="1",
+        )
+        # a new ephemeral context has none of the memoized Data Source
+        gx_context = gx.get_context(mode="ephemeral")
+
+        batch_definition = cache.get_or_configure(
+            configure_batch_definition, gx_context, version="1"
+        )
+
+        assert gx_context.data_sources.get(name="test datasource") is (
+            batch_definition.data_asset.datasource
+        )
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def test_lambda_is_not_memoized(
+        self, gx_context: AbstractDataContext, tmp_path: Path
+    ):
+        cache = BatchDefinitionCache(tmp_path)
+
+        cache.get_or_configure(
+            lambda context: configure_batch_definition(context),
+            gx_context,
+            version="1",
+        )
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_factory_closures_are_not_memoized(
+        self, gx_context: AbstractDataContext, tmp_path: Path
+    ):
+        cache = BatchDefinitionCache(tmp_path)
+
+        def make(asset_name: str) -> Callable[..., BatchDefinition]:
+            def configure(context: AbstractDataContext) -> BatchDefinition:
+                return (
+                    context.data_sources.add_or_update_pandas(name=asset_name)
+                    .add_dataframe_asset(asset_name)
+                    .add_batch_definition_whole_dataframe("test batch def")
+                )
+
+            return configure
+
+        first = cache.get_or_configure(make("orders"), gx_context, version="1")
+        second = cache.get_or_configure(make("customers"), gx_context, version="1")
+
+        assert first.data_asset.name == "orders"
+        assert second.data_asset.name == "customers"
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestOperatorWithBatchDefinitionVersion:
+    def test_version_requires_cloud_context(self):
+        """Expect memoizing with a context that does not persist Data Sources to be rejected."""
+
+        # arrange, act, assert
+        with pytest.raises(ValueError, match="requires `context_type` to be `cloud`"):
+            GXValidateBatchOperator(
+                task_id="validate_batch_memoized",
+                configure_batch_definition=configure_batch_definition,
+                configure_expectations=Mock(),
+                batch_definition_version="1",
+            )
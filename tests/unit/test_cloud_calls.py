@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from great_expectations import ExpectationSuite
+from great_expectations.data_context.cloud_constants import GXCloudRESTResource
+from great_expectations.exceptions import StoreBackendError
+from great_expectations.expectations import ExpectColumnValuesToNotBeNull
+
+from great_expectations_provider.common.cloud_calls import (
+    CLOUD_CALLS_KEY,
+    CloudCallTracker,
+)
+from great_expectations_provider.common.cloud_sessions import cloud_sessions
+from great_expectations_provider.operators.validate_dataframe import (
+    GXValidateDataFrameOperator,
+)
+from tests.unit.conftest import MISSING_ID, MockGXCloud
+
+if TYPE_CHECKING:
+    from airflow.utils.context import Context
+    from great_expectations.data_context import AbstractDataContext
+
+pytestmark = pytest.mark.unit
+
+
+class TestCloudCallTracker:
+    def test_requests_of_gx_stores_are_counted(self, mock_gx_cloud: MockGXCloud):
+        # as the stores of a GX Cloud context built by load_data_context
+        with cloud_sessions.pooling():
+            suites = mock_gx_cloud.store_backend(GXCloudRESTResource.EXPECTATION_SUITE)
+            results = mock_gx_cloud.store_backend(GXCloudRESTResource.VALIDATION_RESULT)
+        tracker = CloudCallTracker()
+
+        with tracker.track():
+            suites._get_all()
+            results._get_all()
+            with pytest.raises(StoreBackendError):
+                suites._get((GXCloudRESTResource.EXPECTATION_SUITE, MISSING_ID, None))
+
+        mock_gx_cloud.assert_within_budget(3)
+        report = tracker.report()
+        assert report is not None
+        assert report["requests"] == len(mock_gx_cloud.requests) == 3
+        assert report["errors"] == 1
+        assert report["seconds"] > 0
+        endpoints = {row["endpoint"]: row for row in report["endpoints"]}
+        suites_endpoint = (
+            "/api/v2/organizations/{id}/workspaces/{id}/expectation-suites"
+        )
+        assert endpoints[suites_endpoint]["requests"] == 1
+        assert endpoints[suites_endpoint + "/{id}"]["errors"] == 1
+
+    def test_requests_outside_tracked_block_are_not_counted(
+        self, mock_gx_cloud: MockGXCloud
+    ):
+        with cloud_sessions.pooling():
+            suites = mock_gx_cloud.store_backend(GXCloudRESTResource.EXPECTATION_SUITE)
+        tracker = CloudCallTracker()
+        with tracker.track():
+            pass
+
+        suites._get_all()
+
+        report = tracker.report()
+        assert report is not None
+        assert report["requests"] == 0
+        assert len(mock_gx_cloud.requests) == 1
+
+    def test_requests_of_unpooled_sessions_are_not_counted(
+        self, mock_gx_cloud: MockGXCloud
+    ):
+        suites = mock_gx_cloud.store_backend(GXCloudRESTResource.EXPECTATION_SUITE)
+        tracker = CloudCallTracker()
+
+        with tracker.track():
+            suites._get_all()
+
+        report = tracker.report()
+        assert report is not None
+        assert report["requests"] == 0
+        assert len(mock_gx_cloud.requests) == 1
+
+    def test_disabled_tracker_has_no_report(self):
+        assert CloudCallTracker(enabled=False).report() is None
+
+
+def configure_expectations(context: AbstractDataContext) -> ExpectationSuite:
+    return ExpectationSuite(
+        name="test suite",
+        expectations=[ExpectColumnValuesToNotBeNull(column="col_A")],
+    )
+
+
+class TestOperatorWithCloudCalls:
+    def test_cloud_calls_are_pushed_with_result(self):
+        """Expect the GX Cloud request counts to be pushed with the Validation Result."""
+
+        # arrange
+        validate_df = GXValidateDataFrameOperator(
+            task_id="validate_df_cloud_calls",
+            configure_dataframe=lambda: pd.DataFrame({"col_A": [1, 2]}),
+            configure_expectations=configure_expectations,
+            track_cloud_calls=True,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_df.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        # an ephemeral context makes no requests
+        assert pushed_result[CLOUD_CALLS_KEY] == {
+            "requests": 0,
+            "seconds": 0.0,
+            "errors": 0,
+            "endpoints": [],
+        }
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from great_expectations.data_context.cloud_constants import GXCloudRESTResource
+from great_expectations.data_context.store import gx_cloud_store_backend
+
+from great_expectations_provider.common import cloud_sessions
+from great_expectations_provider.common.cloud_sessions import (
+    DEFAULT_TIMEOUT,
+    CloudSessionPool,
+    LatencyHistogram,
+)
+from great_expectations_provider.hooks.gx_cloud import GXCloudHook
+
+if TYPE_CHECKING:
+    from tests.unit.conftest import MockGXCloud
+
+pytestmark = pytest.mark.unit
+
+SUITES = GXCloudRESTResource.EXPECTATION_SUITE
+RESULTS = GXCloudRESTResource.VALIDATION_RESULT
+
+
+@pytest.fixture
+def pool() -> CloudSessionPool:
+    return CloudSessionPool()
+
+
+class TestCloudSessionPool:
+    def test_stores_of_contexts_share_one_connection(
+        self, pool: CloudSessionPool, mock_gx_cloud: MockGXCloud
+    ):
+        with pool.pooling():
+            first_context_store = mock_gx_cloud.store_backend(SUITES)
+        with pool.pooling():
+            second_context_store = mock_gx_cloud.store_backend(RESULTS)
+
+        first_context_store._get_all()
+        # GX closes the session of a store when the store is garbage collected
+        first_context_store._finalizer()
+        second_context_store._get_all()
+        second_context_store._get_all()
+
+        assert first_context_store._session is second_context_store._session
+        assert len(mock_gx_cloud.requests) == 3
+        assert len(mock_gx_cloud.client_ports) == 1
+
+    def test_stores_outside_pooling_have_own_sessions(
+        self, pool: CloudSessionPool, mock_gx_cloud: MockGXCloud
+    ):
+        with pool.pooling():
+            pooled_store = mock_gx_cloud.store_backend(SUITES)
+
+        store = mock_gx_cloud.store_backend(SUITES)
+
+        assert store._session is not pooled_store._session
+
+    def test_adapter_settings(self, pool: CloudSessionPool):
+        session = pool.get("token", pool_size=4, max_retries=2, backoff_factor=0.5)
+
+        adapter = session.get_adapter("https://api.greatexpectations.io/")
+        assert adapter._pool_maxsize == 4  # type: ignore[attr-defined]
+        assert adapter.max_retries.total == 2  # type: ignore[attr-defined]
+        assert adapter.max_retries.backoff_factor == 0.5  # type: ignore[attr-defined]
+        assert session.headers["Authorization"] == "Bearer token"
+        assert pool.get("token", pool_size=4, max_retries=2, backoff_factor=0.5) is (
+            session
+        )
+        assert pool.get("token") is not session
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_requests_time_out_by_default(
+        self, mock_send: Mock, pool: CloudSessionPool
+    ):
+        session = pool.get("token")
+        adapter = session.get_adapter("https://api.greatexpectations.io/")
+        request = requests.Request("GET", "https://api.greatexpectations.io/").prepare()
+
+        adapter.send(request)
+        adapter.send(request, timeout=3)
+
+        timeouts = [call.kwargs["timeout"] for call in mock_send.call_args_list]
+        assert timeouts == [DEFAULT_TIMEOUT, 3]
+
+    def test_unsupported_gx_keeps_its_own_sessions(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(cloud_sessions, "_installed", False)
+        monkeypatch.setattr(cloud_sessions, "internals_supported", lambda *args: False)
+        create_session = gx_cloud_store_backend.create_session
+
+        cloud_sessions._install()
+
+        assert gx_cloud_store_backend.create_session is create_session
+        assert cloud_sessions._installed is False
+
+    def test_latency_histograms_per_endpoint(
+        self, pool: CloudSessionPool, mock_gx_cloud: MockGXCloud
+    ):
+        with pool.pooling():
+            store = mock_gx_cloud.store_backend(SUITES)
+
+        store._get_all()
+        store._get_all()
+
+        histograms = pool.latency_histograms()
+        assert list(histograms) == [
+            "GET /api/v2/organizations/{id}/workspaces/{id}/expectation-suites"
+        ]
+        histogram = next(iter(histograms.values()))
+        assert histogram["count"] == 2
+        assert sum(histogram["buckets"].values()) == 2
+
+
+class TestLatencyHistogram:
+    def test_latencies_are_bucketed_by_upper_bound(self):
+        histogram = LatencyHistogram()
+
+        for seconds in (0.005, 0.01, 0.3, 60):
+            histogram.observe(seconds)
+
+        buckets = histogram.as_dict()["buckets"]
+        assert buckets["0.01"] == 2
+        assert buckets["0.5"] == 1
+        assert buckets["+Inf"] == 1
+        assert histogram.as_dict()["count"] == 4
+
+
+class TestGXCloudHookSession:
+    @patch("great_expectations_provider.hooks.gx_cloud.BaseHook.get_connection")
+    def test_session_settings_come_from_extras(self, mock_get_connection: Mock):
+        mock_conn = Mock()
+        mock_conn.password = "test_token"
+        mock_conn.login = "test_org_id"
+        mock_conn.schema = "test_workspace_id"
+        mock_conn.extra_dejson = {"pool_size": "3", "max_retries": 1}
+        mock_get_connection.return_value = mock_conn
+        hook = GXCloudHook("test_conn")
+
+        session = hook.get_session()
+
+        adapter = session.get_adapter("https://api.greatexpectations.io/")
+        assert adapter._pool_maxsize == 3  # type: ignore[attr-defined]
+        assert adapter.max_retries.total == 1  # type: ignore[attr-defined]
+        assert hook.get_session() is session
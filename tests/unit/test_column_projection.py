@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from great_expectations import ExpectationSuite
+from great_expectations.expectations import (
+    ExpectColumnPairValuesToBeEqual,
+    ExpectColumnToExist,
+    ExpectColumnValuesToBeBetween,
+    ExpectColumnValuesToNotBeNull,
+    ExpectMulticolumnSumToEqual,
+    ExpectTableRowCountToBeBetween,
+)
+
+from great_expectations_provider.common.column_projection import (
+    project_dataframe,
+    referenced_columns,
+)
+from great_expectations_provider.common.errors import GXValidationFailed
+from great_expectations_provider.operators import validate_dataframe
+from great_expectations_provider.operators.validate_dataframe import (
+    GXValidateDataFrameOperator,
+)
+
+if TYPE_CHECKING:
+    from airflow.utils.context import Context
+    from great_expectations.expectations import Expectation
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+
+def suite(*expectations: Expectation) -> ExpectationSuite:
+    return ExpectationSuite(name="projection", expectations=list(expectations))
+
+
+def wide_frame() -> pd.DataFrame:
+    return pd.DataFrame({f"column_{index}": np.arange(4) for index in range(8)})
+
+
+class FakeSparkDataFrame:
+    """Stands in for a Spark DataFrame, recording the columns selected from it."""
+
+    def __init__(self, columns: list[str]) -> None:
+        self.columns = columns
+        self.selected: tuple[str, ...] | None = None
+
+    def select(self, *columns: str) -> FakeSparkDataFrame:
+        self.selected = columns
+        return FakeSparkDataFrame(list(columns))
+
+
+class TestReferencedColumns:
+    def test_domain_columns(self):
+        columns = referenced_columns(
+            suite(
+                ExpectColumnValuesToNotBeNull(column="b"),
+                ExpectColumnPairValuesToBeEqual(column_A="a", column_B="b"),
+                ExpectMulticolumnSumToEqual(column_list=["c", "d"], sum_total=1),
+            )
+        )
+
+        assert columns == ["b", "a", "c", "d"]
+
+    @pytest.mark.parametrize(
+        "expectation",
+        [
+            ExpectTableRowCountToBeBetween(min_value=1),
+            ExpectColumnToExist(column="a", column_index=0),
+            ExpectColumnValuesToNotBeNull(
+                column="a", row_condition='b=="x"', condition_parser="pandas"
+            ),
+        ],
+    )
+    def test_whole_table_expectations(self, expectation: Expectation):
+        columns = referenced_columns(
+            suite(ExpectColumnValuesToNotBeNull(column="a"), expectation)
+        )
+
+        assert columns is None
+
+    def test_unexpected_index_columns(self):
+        columns = referenced_columns(
+            suite(
+                ExpectColumnValuesToNotBeNull(
+                    column="a",
+                    result_format={
+                        "result_format": "COMPLETE",
+                        "unexpected_index_column_names": ["c"],
+                    },
+                )
+            ),
+            {"result_format": "COMPLETE", "unexpected_index_column_names": ["id"]},
+        )
+
+        assert columns == ["id", "a", "c"]
+
+
+class TestProjectDataFrame:
+    def test_pandas_columns_share_memory(self):
+        frame = wide_frame()
+
+        projected = project_dataframe(
+            frame,
+            suite(
+                ExpectColumnValuesToNotBeNull(column="column_5"),
+                ExpectColumnValuesToNotBeNull(column="column_2"),
+            ),
+        )
+
+        assert list(projected.columns) == ["column_2", "column_5"]
+        assert np.shares_memory(
+            projected["column_2"].to_numpy(), frame["column_2"].to_numpy()
+        )
+
+    def test_missing_column_keeps_pandas_frame_whole(self):
+        frame = wide_frame()
+
+        projected = project_dataframe(
+            frame, suite(ExpectColumnValuesToNotBeNull(column="missing"))
+        )
+
+        assert projected is frame
+
+    def test_duplicate_labels_keep_pandas_frame_whole(self):
+        frame = pd.DataFrame([[1, 2, 3]], columns=["a", "b", "b"])
+
+        projected = project_dataframe(
+            frame, suite(ExpectColumnValuesToNotBeNull(column="a"))
+        )
+
+        assert projected is frame
+
+    def test_spark_columns_are_selected(self):
+        frame = FakeSparkDataFrame(["a", "b", "c"])
+
+        projected = project_dataframe(
+            frame,
+            suite(ExpectColumnPairValuesToBeEqual(column_A="c", column_B="a")),
+        )
+
+        assert frame.selected == ("a", "c")
+        assert projected.columns == ["a", "c"]
+
+    def test_table_level_expectation_keeps_spark_frame_whole(self):
+        frame = FakeSparkDataFrame(["a", "b", "c"])
+
+        projected = project_dataframe(
+            frame, suite(ExpectTableRowCountToBeBetween(min_value=1))
+        )
+
+        assert projected is frame
+        assert frame.selected is None
+
+
+class TestGXValidateDataFrameOperatorColumnProjection:
+    @pytest.mark.parametrize(
+        ("column_projection", "expected_columns"),
+        [(True, ["column_3"]), (False, list(wide_frame().columns))],
+    )
+    def test_validated_columns(
+        self,
+        mocker: MockerFixture,
+        column_projection: bool,
+        expected_columns: list[str],
+    ):
+        # arrange
+        run = mocker.spy(validate_dataframe, "run_validation_definition")
+        validate_df = GXValidateDataFrameOperator(
+            task_id="validate_projected",
+            configure_dataframe=wide_frame,
+            configure_expectations=lambda context: ExpectColumnValuesToBeBetween(
+                column="column_3", min_value=0, max_value=3
+            ),
+            column_projection=column_projection,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_df.execute(context=context)
+
+        # assert
+        dataframe = run.call_args.kwargs["batch_parameters"]["dataframe"]
+        assert list(dataframe.columns) == expected_columns
+        assert mock_ti.xcom_push.call_args[1]["value"]["success"] is True
+
+    def test_unexpected_index_columns_are_kept(self, mocker: MockerFixture):
+        # arrange
+        run = mocker.spy(validate_dataframe, "run_validation_definition")
+        frame = pd.DataFrame(
+            {"id": [1, 2, 3], "amount": [1.5, None, 3.5], "code": ["a", "b", "c"]}
+        )
+        validate_df = GXValidateDataFrameOperator(
+            task_id="validate_projected",
+            configure_dataframe=lambda: frame,
+            configure_expectations=lambda context: ExpectColumnValuesToNotBeNull(
+                column="amount"
+            ),
+            result_format={  # type: ignore[arg-type]
+                "result_format": "COMPLETE",
+                "unexpected_index_column_names": ["id"],
+            },
+            column_projection=True,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXValidationFailed):
+            validate_df.execute(context=context)
+
+        # assert
+        dataframe = run.call_args.kwargs["batch_parameters"]["dataframe"]
+        assert list(dataframe.columns) == ["id", "amount"]
+        result = mock_ti.xcom_push.call_args[1]["value"]["expectations"][0]["result"]
+        assert result["unexpected_count"] == 1
+        assert result["unexpected_index_list"] == [{"amount": None, "id": 2}]
+
+    def test_projection_is_off_by_default(self):
+        validate_df = GXValidateDataFrameOperator(
+            task_id="validate_whole",
+            configure_dataframe=wide_frame,
+            configure_expectations=lambda context: ExpectColumnValuesToNotBeNull(
+                column="column_3"
+            ),
+        )
+
+        assert validate_df.column_projection is False
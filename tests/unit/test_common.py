@@ -1,11 +1,20 @@
+from copy import copy
 from typing import Literal
-from unittest.mock import Mock
+from unittest.mock import Mock, PropertyMock
 
+import great_expectations as gx
 import great_expectations.expectations as gxe
+import pandas as pd
 import pytest
+from great_expectations.core.batch_definition import BatchDefinition
+from great_expectations.data_context import AbstractDataContext, CloudDataContext
+from pytest_mock import MockerFixture
 
 from great_expectations_provider.common.gx_context_actions import (
+    add_or_update_cloud_validation_definition,
+    add_or_update_validation_definition,
     run_validation_definition,
+    suite_fingerprint,
 )
 
 pytestmark = pytest.mark.unit
@@ -152,3 +161,212 @@ class TestRunValidationDefinition:
 
         # assert
         assert result is validation_definition.run.return_value
+
+
+def _suite() -> gx.ExpectationSuite:
+    return gx.ExpectationSuite(
+        name="test suite",
+        expectations=[gxe.ExpectColumnValuesToNotBeNull(column="col_A")],
+    )
+
+
+@pytest.fixture
+def gx_context() -> AbstractDataContext:
+    return gx.get_context(mode="ephemeral")
+
+
+class TestAddOrUpdateCloudValidationDefinition:
+    def test_unchanged_definition_is_not_written(
+        self, gx_context: AbstractDataContext, mocker: MockerFixture
+    ):
+        batch_definition = (
+            gx_context.data_sources.add_pandas(name="test datasource")
+            .add_dataframe_asset("test asset")
+            .add_batch_definition_whole_dataframe("test batch def")
+        )
+        first = add_or_update_cloud_validation_definition(
+            gx_context, "test", _suite(), batch_definition
+        )
+        writes = [
+            mocker.spy(store, method)
+            for store in (
+                gx_context.expectations_store,
+                gx_context.validation_definition_store,
+            )
+            for method in ("add", "update")
+        ]
+        save_batch_definition = mocker.spy(BatchDefinition, "save")
+
+        validation_definition = add_or_update_cloud_validation_definition(
+            gx_context, "test", _suite(), batch_definition
+        )
+
+        assert validation_definition.id == first.id
+        assert all(write.call_count == 0 for write in writes)
+        save_batch_definition.assert_not_called()
+        result = validation_definition.run(
+            batch_parameters={"dataframe": pd.DataFrame({"col_A": [1]})}
+        )
+        assert result.success
+
+    def test_changed_batch_definition_is_saved_to_cloud(
+        self, gx_context: AbstractDataContext, mocker: MockerFixture
+    ):
+        batch_definition = (
+            gx_context.data_sources.add_pandas(name="test datasource")
+            .add_dataframe_asset("test asset")
+            .add_batch_definition_whole_dataframe("test batch def")
+        )
+        add_or_update_cloud_validation_definition(
+            gx_context, "test", _suite(), batch_definition
+        )
+        stored_datasource = Mock()
+        stored_datasource.dict.return_value = {"name": "test datasource", "assets": []}
+        mocker.patch.object(
+            type(gx_context),
+            "datasource_store",
+            new_callable=PropertyMock,
+            return_value=Mock(
+                cloud_mode=True,
+                retrieve_by_name=Mock(return_value=stored_datasource),
+            ),
+        )
+        save_batch_definition = mocker.spy(BatchDefinition, "save")
+
+        add_or_update_cloud_validation_definition(
+            gx_context, "test", _suite(), batch_definition
+        )
+
+        save_batch_definition.assert_called_once()
+
+    def test_unchanged_batch_definition_is_not_saved_to_cloud(
+        self, gx_context: AbstractDataContext, mocker: MockerFixture
+    ):
+        batch_definition = (
+            gx_context.data_sources.add_pandas(name="test datasource")
+            .add_dataframe_asset("test asset")
+            .add_batch_definition_whole_dataframe("test batch def")
+        )
+        add_or_update_cloud_validation_definition(
+            gx_context, "test", _suite(), batch_definition
+        )
+        datasource_store = Mock(
+            cloud_mode=True,
+            retrieve_by_name=Mock(return_value=batch_definition.data_asset.datasource),
+        )
+        mocker.patch.object(
+            type(gx_context),
+            "datasource_store",
+            new_callable=PropertyMock,
+            return_value=datasource_store,
+        )
+        save_batch_definition = mocker.spy(BatchDefinition, "save")
+
+        add_or_update_cloud_validation_definition(
+            gx_context, "test", _suite(), batch_definition
+        )
+
+        datasource_store.retrieve_by_name.assert_called_once_with("test datasource")
+        save_batch_definition.assert_not_called()
+
+    def test_changed_suite_is_updated(self, gx_context: AbstractDataContext):
+        batch_definition = (
+            gx_context.data_sources.add_pandas(name="test datasource")
+            .add_dataframe_asset("test asset")
+            .add_batch_definition_whole_dataframe("test batch def")
+        )
+        first = add_or_update_cloud_validation_definition(
+            gx_context, "test", _suite(), batch_definition
+        )
+        suite = _suite()
+        suite.add_expectation(gxe.ExpectColumnValuesToNotBeNull(column="col_B"))
+
+        validation_definition = add_or_update_cloud_validation_definition(
+            gx_context, "test", suite, batch_definition
+        )
+
+        assert validation_definition.id == first.id
+        assert len(validation_definition.suite.expectations) == 2
+        stored = gx_context.validation_definitions.get(name="test")
+        assert len(stored.suite.expectations) == 2
+
+
+class TestAddOrUpdateValidationDefinition:
+    def test_cloud_context_writes_only_changes(self, mocker: MockerFixture):
+        add_or_update_cloud = mocker.patch(
+            "great_expectations_provider.common.gx_context_actions.add_or_update_cloud_validation_definition"
+        )
+        gx_context = Mock(spec=CloudDataContext)
+        suite = _suite()
+        batch_definition = Mock()
+
+        validation_definition = add_or_update_validation_definition(
+            gx_context, "test", suite, batch_definition
+        )
+
+        add_or_update_cloud.assert_called_once_with(
+            gx_context, "test", suite, batch_definition
+        )
+        assert validation_definition is add_or_update_cloud.return_value
+
+    def test_other_contexts_add_or_update(
+        self, gx_context: AbstractDataContext, mocker: MockerFixture
+    ):
+        add_or_update_cloud = mocker.patch(
+            "great_expectations_provider.common.gx_context_actions.add_or_update_cloud_validation_definition"
+        )
+        add_or_update = mocker.spy(gx_context.validation_definitions, "add_or_update")
+        batch_definition = (
+            gx_context.data_sources.add_pandas(name="test datasource")
+            .add_dataframe_asset("test asset")
+            .add_batch_definition_whole_dataframe("test batch def")
+        )
+
+        add_or_update_validation_definition(
+            gx_context, "test", _suite(), batch_definition
+        )
+
+        add_or_update.assert_called_once()
+        add_or_update_cloud.assert_not_called()
+
+
+class TestSuiteFingerprint:
+    def test_stored_suite_matches_suite_built_in_code(
+        self, gx_context: AbstractDataContext
+    ):
+        stored = gx_context.suites.add(_suite())
+
+        assert suite_fingerprint(stored) == suite_fingerprint(_suite())
+
+    def test_changed_expectation_changes_fingerprint(self):
+        suite = _suite()
+        suite.expectations[0].mostly = 0.5
+
+        assert suite_fingerprint(suite) != suite_fingerprint(_suite())
+
+    @pytest.mark.parametrize(
+        "attribute,value",
+        [
+            pytest.param("notes", "checked daily", id="notes"),
+            pytest.param("meta", {"owner": "data team"}, id="meta"),
+        ],
+    )
+    def test_changed_notes_and_meta_change_fingerprint(
+        self, attribute: str, value: object
+    ):
+        suite = _suite()
+        setattr(suite, attribute, value)
+
+        assert suite_fingerprint(suite) != suite_fingerprint(_suite())
+
+    def test_reordered_expectations_change_fingerprint(self):
+        not_null_a = gxe.ExpectColumnValuesToNotBeNull(column="col_A")
+        not_null_b = gxe.ExpectColumnValuesToNotBeNull(column="col_B")
+        suite = gx.ExpectationSuite(
+            name="test suite", expectations=[not_null_a, not_null_b]
+        )
+        reordered = gx.ExpectationSuite(
+            name="test suite", expectations=[copy(not_null_b), copy(not_null_a)]
+        )
+
+        assert suite_fingerprint(reordered) != suite_fingerprint(suite)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import great_expectations as gx
+import pandas as pd
+import pytest
+from great_expectations.datasource.fluent import PandasDatasource, SparkDatasource
+
+from great_expectations_provider.common.dataframe_batch_definitions import (
+    get_dataframe_batch_definition,
+)
+from great_expectations_provider.exceptions.exceptions import (
+    ExistingDataSourceTypeMismatch,
+)
+
+if TYPE_CHECKING:
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+NAME = "validate_df"
+
+
+@pytest.fixture
+def gx_context() -> AbstractDataContext:
+    return gx.get_context(mode="ephemeral")
+
+
+def _columns(batch_definition: BatchDefinition) -> list[str]:
+    batch = batch_definition.get_batch(
+        batch_parameters={"dataframe": pd.DataFrame({"col_A": [1, 2]})}
+    )
+    return batch.columns()
+
+
+class TestGetDataFrameBatchDefinition:
+    def test_missing_chain_is_added_at_once(
+        self,
+        gx_context: AbstractDataContext,
+        mocker: MockerFixture,
+    ):
+        add_pandas = mocker.patch.object(
+            gx_context.data_sources,
+            "add_pandas",
+            wraps=gx_context.data_sources.add_pandas,
+        )
+        update_datasource = mocker.spy(gx_context, "update_datasource")
+
+        batch_definition = get_dataframe_batch_definition(
+            gx_context, NAME, PandasDatasource
+        )
+
+        add_pandas.assert_called_once()
+        update_datasource.assert_not_called()
+        assert batch_definition.data_asset.datasource.name == NAME
+        assert _columns(batch_definition) == ["col_A"]
+
+    def test_missing_asset_is_added(
+        self,
+        gx_context: AbstractDataContext,
+        mocker: MockerFixture,
+    ):
+        gx_context.data_sources.add_pandas(name=NAME)
+
+        batch_definition = get_dataframe_batch_definition(
+            gx_context, NAME, PandasDatasource
+        )
+
+        assert _columns(batch_definition) == ["col_A"]
+        saved = gx_context.data_sources.get(name=NAME)
+        assert saved.get_asset(NAME).get_batch_definition(NAME).id is not None
+
+    def test_missing_batch_definition_is_added_in_one_update(
+        self,
+        gx_context: AbstractDataContext,
+        mocker: MockerFixture,
+    ):
+        gx_context.data_sources.add_pandas(name=NAME).add_dataframe_asset(name=NAME)
+        update_datasource = mocker.spy(gx_context, "update_datasource")
+
+        batch_definition = get_dataframe_batch_definition(
+            gx_context, NAME, PandasDatasource
+        )
+
+        update_datasource.assert_called_once()
+        assert _columns(batch_definition) == ["col_A"]
+
+    def test_existing_chain_is_not_written(
+        self,
+        gx_context: AbstractDataContext,
+        mocker: MockerFixture,
+    ):
+        existing = (
+            gx_context.data_sources.add_pandas(name=NAME)
+            .add_dataframe_asset(name=NAME)
+            .add_batch_definition_whole_dataframe(name=NAME)
+        )
+        update_datasource = mocker.spy(gx_context, "update_datasource")
+
+        batch_definition = get_dataframe_batch_definition(
+            gx_context, NAME, PandasDatasource
+        )
+
+        update_datasource.assert_not_called()
+        assert batch_definition.id == existing.id
+
+    def test_datasource_type_mismatch_raises(
+        self,
+        gx_context: AbstractDataContext,
+    ):
+        gx_context.data_sources.add_pandas(name=NAME)
+
+        with pytest.raises(ExistingDataSourceTypeMismatch):
+            get_dataframe_batch_definition(gx_context, NAME, SparkDatasource)
@@ -1,10 +1,14 @@
 import pytest
 
 from great_expectations_provider.common.errors import (
+    GXStatementTimeout,
     GXValidationFailed,
+    ValidationFailureCollector,
     extract_validation_failure_context,
 )
 
+pytestmark = pytest.mark.unit
+
 
 class TestExtractValidationFailureContext:
     """Test the extract_validation_failure_context function."""
@@ -286,3 +290,89 @@ class TestGXValidationFailed:
         assert "Great Expectations data validation failed." in error_msg
         assert "Task 'test_task' -> XCom key 'return_value'" in error_msg
         assert "evaluated_expectations: 3" in error_msg
+
+    def test_exception_message_includes_counts(self, sample_result_dict):
+        """Test that failure counts per type and column are part of the message."""
+        sample_result_dict["expectations"][1]["kwargs"] = {"column": "name"}
+        sample_result_dict["expectations"][2]["kwargs"] = {"column": "name"}
+        exc = GXValidationFailed(sample_result_dict, "test_task")
+
+        error_msg = str(exc)
+        assert "  - expect_column_values_to_be_unique: 1" in error_msg
+        assert "Failures by column:" in error_msg
+        assert "  - name: 2" in error_msg
+
+
+class TestValidationFailureCollector:
+    """Test the failure counts collected from a described result."""
+
+    def test_counts_are_complete_and_ranked(self):
+        """Test that counts are kept for every failed type, most frequent first."""
+        expectations = [
+            {"expectation_type": f"expect_type_{i}", "success": False}
+            for i in range(15)
+        ]
+        expectations += [
+            {
+                "expectation_type": "expect_type_3",
+                "success": False,
+                "kwargs": {"column": "a"},
+            },
+            {
+                "expectation_type": "expect_type_3",
+                "success": False,
+                "kwargs": {"column_A": "a", "column_B": "b"},
+            },
+            {
+                "expectation_type": "expect_type_4",
+                "success": True,
+                "kwargs": {"column": "a"},
+            },
+        ]
+        context = extract_validation_failure_context(
+            {"success": False, "expectations": expectations}, "test_task"
+        )
+
+        type_counts = context["failure_counts_by_expectation_type"]
+        assert len(type_counts) == 15
+        assert context["failed_expectation_type_count"] == 15
+        assert type_counts[0] == {"expectation_type": "expect_type_3", "count": 3}
+        assert context["failure_counts_by_column"] == [
+            {"column": "a", "count": 2},
+            {"column": "b", "count": 1},
+        ]
+
+    def test_worst_unexpected_percent_is_bounded_and_ranked(self):
+        """Test that only the worst unexpected_percent results are kept, highest first."""
+        collector = ValidationFailureCollector(max_ranked=3)
+        for percent in [5.0, 90.0, 12.5, 50.0, 1.0]:
+            collector.add(
+                {
+                    "expectation_type": "expect_column_values_to_not_be_null",
+                    "success": False,
+                    "kwargs": {"column": f"col_{percent}"},
+                    "result": {"unexpected_percent": percent},
+                }
+            )
+
+        worst = collector.to_context("test_task", statistics=None)[
+            "worst_unexpected_percent"
+        ]
+
+        assert [entry["unexpected_percent"] for entry in worst] == [90.0, 50.0, 12.5]
+        assert worst[0]["column"] == "col_90.0"
+
+    def test_checkpoint_results_are_collected(self):
+        """Test that expectations nested in validation_results are counted."""
+        result = {
+            "validation_results": [
+                {"expectations": [{"expectation_type": "a", "success": False}]},
+                {"expectations": [{"expectation_type": "a", "success": False}]},
+            ]
+        }
+
+        context = extract_validation_failure_context(result, "test_task")
+
+        assert context["failure_counts_by_expectation_type"] == [
+            {"expectation_type": "a", "count": 2}
+        ]
@@ -0,0 +1,99 @@
+import great_expectations as gx
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+
+from great_expectations_provider.common.expectation_timing import ExpectationTimer
+
+pytestmark = pytest.mark.unit
+
+
+def _run_validation_definition(expectations: list) -> None:
+    context = gx.get_context(mode="ephemeral")
+    batch_definition = (
+        context.data_sources.add_pandas(name="test datasource")
+        .add_dataframe_asset("test asset")
+        .add_batch_definition_whole_dataframe("test batch def")
+    )
+    suite = context.suites.add(
+        gx.ExpectationSuite(name="test suite", expectations=expectations)
+    )
+    validation_definition = context.validation_definitions.add(
+        gx.ValidationDefinition(
+            name="test validation definition", data=batch_definition, suite=suite
+        )
+    )
+    validation_definition.run(
+        batch_parameters={
+            "dataframe": pd.DataFrame({"col_A": ["1", "2", "x"], "col_B": [1, 2, 3]})
+        }
+    )
+
+
+class TestExpectationTimer:
+    def test_disabled_timer_records_nothing(self):
+        timer = ExpectationTimer(enabled=False)
+
+        with timer.track():
+            _run_validation_definition(
+                [gxe.ExpectColumnValuesToNotBeNull(column="col_A")]
+            )
+
+        assert timer.report() is None
+
+    def test_reports_each_expectation_slowest_first(self):
+        timer = ExpectationTimer()
+
+        with timer.track():
+            _run_validation_definition(
+                [
+                    gxe.ExpectColumnValuesToMatchRegex(column="col_A", regex=r"^\d+$"),
+                    gxe.ExpectColumnValuesToBeUnique(column="col_B"),
+                    gxe.ExpectTableRowCountToBeBetween(min_value=1),
+                ]
+            )
+        report = timer.report()
+
+        assert report is not None
+        rows = report["expectations"]
+        assert {row["expectation_type"] for row in rows} == {
+            "expect_column_values_to_match_regex",
+            "expect_column_values_to_be_unique",
+            "expect_table_row_count_to_be_between",
+        }
+        totals = [row["total_seconds"] for row in rows]
+        assert totals == sorted(totals, reverse=True)
+        for row in rows:
+            assert row["validation_definition"] == "test validation definition"
+            assert row["total_seconds"] == pytest.approx(
+                row["own_metric_seconds"]
+                + row["shared_metric_seconds"]
+                + row["evaluation_seconds"],
+                abs=1e-5,
+            )
+            assert row["evaluation_seconds"] > 0
+        (regex,) = [
+            row
+            for row in rows
+            if row["expectation_type"] == "expect_column_values_to_match_regex"
+        ]
+        assert regex["kwargs"] == {"column": "col_A", "regex": r"^\d+$"}
+        assert regex["own_metric_seconds"] > 0
+
+    def test_reports_metrics_shared_between_expectations(self):
+        timer = ExpectationTimer()
+
+        with timer.track():
+            _run_validation_definition(
+                [
+                    gxe.ExpectColumnValuesToNotBeNull(column="col_A"),
+                    gxe.ExpectColumnValuesToNotBeNull(column="col_B"),
+                ]
+            )
+        report = timer.report()
+
+        assert report is not None
+        shared = {row["metric_name"]: row for row in report["shared_metrics"]}
+        assert shared["table.row_count"]["expectation_count"] == 2
+        assert shared["table.row_count"]["domain"] == "table"
+        assert all(row["expectation_count"] > 1 for row in report["shared_metrics"])
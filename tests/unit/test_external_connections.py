@@ -9,6 +9,7 @@ import pytest
 from great_expectations_provider.common.external_connections import (
     SnowflakeKeyConnection,
     build_aws_connection_string,
+    build_engine_kwargs,
     build_gcpbigquery_connection_string,
     build_mssql_connection_string,
     build_mysql_connection_string,
@@ -20,6 +21,8 @@ from great_expectations_provider.common.external_connections import (
     build_trino_connection_string,
 )
 
+pytestmark = pytest.mark.unit
+
 
 class TestRedshiftConnectionString:
     """Test class for Redshift connection string."""
@@ -112,6 +115,7 @@ class TestMySQLConnectionString:
         mock_conn.host = "mysql-server.com"
         mock_conn.port = 3306
         mock_conn.schema = "mydb"
+        mock_conn.extra_dejson = {}
         mock_get_connection.return_value = mock_conn
 
         result = build_mysql_connection_string("test_conn")
@@ -216,6 +220,7 @@ class TestPostgresConnectionString:
         mock_conn.host = "postgres-server.com"
         mock_conn.port = 5432
         mock_conn.schema = "mydb"
+        mock_conn.extra_dejson = {}
         mock_get_connection.return_value = mock_conn
 
         result = build_postgres_connection_string("test_conn")
@@ -637,6 +642,7 @@ class TestAWSConnectionString:
     ):
         """Test successful AWS connection string creation with database."""
         mock_conn = Mock()
+        mock_conn.extra_dejson = {}
         mock_conn.schema = "default"
         mock_get_connection.return_value = mock_conn
 
@@ -658,6 +664,7 @@ class TestAWSConnectionString:
     ):
         """Test successful AWS connection string creation without database."""
         mock_conn = Mock()
+        mock_conn.extra_dejson = {}
         mock_conn.schema = None
         mock_get_connection.return_value = mock_conn
 
@@ -674,6 +681,7 @@ class TestAWSConnectionString:
     def test_build_aws_connection_string_missing_s3_path(self, mock_get_connection):
         """Test AWS connection string with missing s3_path."""
         mock_conn = Mock()
+        mock_conn.extra_dejson = {}
         mock_get_connection.return_value = mock_conn
 
         with pytest.raises(
@@ -687,6 +695,7 @@ class TestAWSConnectionString:
     def test_build_aws_connection_string_missing_region(self, mock_get_connection):
         """Test AWS connection string with missing region."""
         mock_conn = Mock()
+        mock_conn.extra_dejson = {}
         mock_get_connection.return_value = mock_conn
 
         with pytest.raises(
@@ -700,6 +709,7 @@ class TestAWSConnectionString:
     def test_build_aws_connection_string_schema_fallback(self, mock_get_connection):
         """Test AWS connection string uses schema as database fallback."""
         mock_conn = Mock()
+        mock_conn.extra_dejson = {}
         mock_conn.schema = "schema_db"
         mock_get_connection.return_value = mock_conn
 
@@ -713,6 +723,85 @@ class TestAWSConnectionString:
         expected = "awsathena+rest://@athena.us-east-1.amazonaws.com/schema_override?s3_staging_dir=s3://bucket/path/"
         assert result == expected
 
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_aws_connection_string_athena_extras(self, mock_get_connection):
+        """Test AWS connection string with the workgroup, result reuse, and polling extras."""
+        mock_conn = Mock()
+        mock_conn.schema = "analytics"
+        mock_conn.extra_dejson = {
+            "work_group": "validation",
+            "result_reuse_minutes": "60",
+            "poll_interval": 0.5,
+            "region_name": "us-east-1",
+        }
+        mock_get_connection.return_value = mock_conn
+
+        result = build_aws_connection_string(
+            "test_conn", s3_path="s3://bucket/path/", region="us-east-1"
+        )
+
+        expected = (
+            "awsathena+rest://@athena.us-east-1.amazonaws.com/analytics"
+            "?s3_staging_dir=s3://bucket/path/&work_group=validation"
+            "&result_reuse_enable=true&result_reuse_minutes=60&poll_interval=0.5"
+        )
+        assert result == expected
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_aws_connection_string_workgroup_without_s3_path(
+        self, mock_get_connection
+    ):
+        """Test AWS connection string relies on the workgroup's result location without s3_path."""
+        mock_conn = Mock()
+        mock_conn.schema = None
+        mock_conn.extra_dejson = {"workgroup": "validation"}
+        mock_get_connection.return_value = mock_conn
+
+        result = build_aws_connection_string("test_conn", region="us-east-1")
+
+        expected = (
+            "awsathena+rest://@athena.us-east-1.amazonaws.com/?work_group=validation"
+        )
+        assert result == expected
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_aws_connection_string_unload(self, mock_get_connection):
+        """Test AWS connection string with unload uses the pandas cursor."""
+        mock_conn = Mock()
+        mock_conn.schema = None
+        mock_conn.extra_dejson = {"unload": "true"}
+        mock_get_connection.return_value = mock_conn
+
+        result = build_aws_connection_string(
+            "test_conn", s3_path="s3://bucket/path/", region="us-east-1"
+        )
+
+        expected = "awsathena+pandas://@athena.us-east-1.amazonaws.com/?s3_staging_dir=s3://bucket/path/&unload=true"
+        assert result == expected
+
+    @pytest.mark.parametrize("extra", ["result_reuse_minutes", "poll_interval"])
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_aws_connection_string_non_positive_extra(
+        self, mock_get_connection, extra
+    ):
+        """Test AWS connection string rejects non-positive reuse ages and poll intervals."""
+        mock_conn = Mock()
+        mock_conn.extra_dejson = {extra: 0}
+        mock_get_connection.return_value = mock_conn
+
+        with pytest.raises(ValueError, match=f"{extra} must be a positive number"):
+            build_aws_connection_string(
+                "test_conn", s3_path="s3://bucket/path/", region="us-east-1"
+            )
+
 
 class TestTrinoConnectionString:
     """Test class for Trino connection string."""
@@ -831,3 +920,160 @@ class TestTrinoConnectionString:
 
         expected = "trino://trino-server.com:8443/iceberg"
         assert result == expected
+
+
+class TestEngineKwargs:
+    """Test class for SQLAlchemy engine arguments from connection extras."""
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_engine_kwargs_stream_results_with_fetch_size(
+        self, mock_get_connection
+    ):
+        """Test streaming execution options from Postgres connection extras."""
+        mock_conn = Mock()
+        mock_conn.conn_type = "postgres"
+        mock_conn.extra_dejson = {"stream_results": "true", "fetch_size": "1000"}
+        mock_get_connection.return_value = mock_conn
+
+        result = build_engine_kwargs("test_conn")
+
+        assert result == {
+            "execution_options": {"stream_results": True, "max_row_buffer": 1000}
+        }
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_engine_kwargs_without_extras(self, mock_get_connection):
+        """Test no engine arguments when the extras set none."""
+        mock_conn = Mock()
+        mock_conn.conn_type = "mysql"
+        mock_conn.extra_dejson = {"stream_results": False}
+        mock_get_connection.return_value = mock_conn
+
+        assert build_engine_kwargs("test_conn") == {}
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_engine_kwargs_unsupported_connection_type(self, mock_get_connection):
+        """Test streaming extras are ignored for connection types without server-side cursors."""
+        mock_conn = Mock()
+        mock_conn.conn_type = "mssql"
+        mock_conn.extra_dejson = {"stream_results": True}
+        mock_get_connection.return_value = mock_conn
+
+        assert build_engine_kwargs("test_conn") == {}
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_engine_kwargs_invalid_fetch_size(self, mock_get_connection):
+        """Test a fetch size below one is rejected."""
+        mock_conn = Mock()
+        mock_conn.conn_type = "trino"
+        mock_conn.extra_dejson = {"fetch_size": 0}
+        mock_get_connection.return_value = mock_conn
+
+        with pytest.raises(ValueError, match="fetch_size must be a positive integer"):
+            build_engine_kwargs("test_conn")
+
+    @pytest.mark.parametrize(
+        ("conn_type", "connect_args"),
+        [
+            ("postgres", {"options": "-c statement_timeout=90000"}),
+            ("redshift", {"options": "-c statement_timeout=90000"}),
+            ("mysql", {"init_command": "SET SESSION max_execution_time=90000"}),
+            ("trino", {"session_properties": {"query_max_run_time": "90000ms"}}),
+            ("snowflake", {"session_parameters": {"STATEMENT_TIMEOUT_IN_SECONDS": 90}}),
+        ],
+    )
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_engine_kwargs_statement_timeout(
+        self, mock_get_connection, conn_type, connect_args
+    ):
+        """Test the statement timeout is set as each database's own session setting."""
+        mock_conn = Mock()
+        mock_conn.conn_type = conn_type
+        mock_conn.extra_dejson = {"statement_timeout_seconds": "90"}
+        mock_get_connection.return_value = mock_conn
+
+        assert build_engine_kwargs("test_conn") == {"connect_args": connect_args}
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_engine_kwargs_statement_timeout_with_streaming(
+        self, mock_get_connection
+    ):
+        """Test a statement timeout is set next to streaming execution options."""
+        mock_conn = Mock()
+        mock_conn.conn_type = "postgres"
+        mock_conn.extra_dejson = {
+            "stream_results": True,
+            "statement_timeout_seconds": 0.5,
+        }
+        mock_get_connection.return_value = mock_conn
+
+        assert build_engine_kwargs("test_conn") == {
+            "execution_options": {"stream_results": True},
+            "connect_args": {"options": "-c statement_timeout=500"},
+        }
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_engine_kwargs_statement_timeout_unsupported_connection_type(
+        self, mock_get_connection
+    ):
+        """Test a statement timeout is ignored for databases without one."""
+        mock_conn = Mock()
+        mock_conn.conn_type = "mssql"
+        mock_conn.extra_dejson = {"statement_timeout_seconds": 60}
+        mock_get_connection.return_value = mock_conn
+
+        assert build_engine_kwargs("test_conn") == {}
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_build_engine_kwargs_invalid_statement_timeout(self, mock_get_connection):
+        """Test a statement timeout that is not positive is rejected."""
+        mock_conn = Mock()
+        mock_conn.conn_type = "postgres"
+        mock_conn.extra_dejson = {"statement_timeout_seconds": 0}
+        mock_get_connection.return_value = mock_conn
+
+        with pytest.raises(
+            ValueError, match="statement_timeout_seconds must be a positive number"
+        ):
+            build_engine_kwargs("test_conn")
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_trino_connection_string_excludes_engine_extras(self, mock_get_connection):
+        """Test streaming extras are not passed to Trino as connection parameters."""
+        mock_conn = Mock()
+        mock_conn.login = "user"
+        mock_conn.password = None
+        mock_conn.host = "trino-server.com"
+        mock_conn.port = 8443
+        mock_conn.schema = "default"
+        mock_conn.extra_dejson = {
+            "source": "airflow",
+            "stream_results": True,
+            "fetch_size": 500,
+            "statement_timeout_seconds": 60,
+        }
+        mock_get_connection.return_value = mock_conn
+
+        result = build_trino_connection_string("test_conn")
+
+        assert (
+            result == "trino://user@trino-server.com:8443/hive/default?source=airflow"
+        )
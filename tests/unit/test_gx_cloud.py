@@ -12,6 +12,8 @@ from great_expectations_provider.hooks.gx_cloud import (
     IncompleteGXCloudConfigError,
 )
 
+pytestmark = pytest.mark.unit
+
 
 class TestGXCloudHookGetConn:
     """Test class for GXCloudHook.get_conn method."""
@@ -23,6 +25,7 @@ class TestGXCloudHookGetConn:
         mock_conn.password = "test_token"
         mock_conn.login = "test_org_id"
         mock_conn.schema = "test_workspace_id"
+        mock_conn.extra_dejson = {}
 
         mock_get_connection.return_value = mock_conn
 
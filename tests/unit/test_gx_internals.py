@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+from typing import Iterator
+
+import great_expectations
+import pytest
+
+from great_expectations_provider.common import gx_internals
+from great_expectations_provider.common.gx_internals import internals_supported
+
+pytestmark = pytest.mark.unit
+
+
+class Internals:
+    def _private(self) -> None: ...
+
+
+@pytest.fixture(autouse=True)
+def forget_checks() -> Iterator[None]:
+    yield
+    gx_internals._checked.clear()
+
+
+class TestInternalsSupported:
+    def test_supported(self):
+        assert internals_supported("feature", (Internals, "_private")) is True
+
+    def test_missing_attribute(self, caplog: pytest.LogCaptureFixture):
+        with caplog.at_level(logging.WARNING):
+            supported = internals_supported(
+                "feature", (Internals, "_private"), (Internals, "_renamed")
+            )
+
+        assert supported is False
+        assert "does not define Internals._renamed" in caplog.text
+
+    @pytest.mark.parametrize("version", ["1.6.2", "1.25.0", "2.0.0rc1"])
+    def test_untested_version(
+        self,
+        version: str,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        monkeypatch.setattr(great_expectations, "__version__", version)
+
+        with caplog.at_level(logging.WARNING):
+            supported = internals_supported("feature", (Internals, "_private"))
+
+        assert supported is False
+        assert f"feature is turned off" in caplog.text
+        assert version in caplog.text
+
+    def test_outcome_is_kept_per_feature(self, monkeypatch: pytest.MonkeyPatch):
+        internals_supported("feature", (Internals, "_private"))
+        monkeypatch.setattr(great_expectations, "__version__", "0.18.0")
+
+        assert internals_supported("feature", (Internals, "_private")) is True
+        assert internals_supported("other feature", (Internals, "_private")) is False
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pandas as pd
+import pytest
+from great_expectations import ExpectationSuite
+from great_expectations.expectations import ExpectColumnValuesToNotBeNull
+
+from great_expectations_provider.common.cloud_calls import CLOUD_CALLS_KEY
+from great_expectations_provider.common.errors import (
+    GXStatementTimeout,
+    GXValidationFailed,
+)
+from great_expectations_provider.common.instrumentation import (
+    ValidationInstrumentation,
+    runs_in_task_process,
+    validation_failure,
+)
+from great_expectations_provider.common.time_budget import TIME_BUDGET_KEY
+from great_expectations_provider.common.xcom import TRUNCATION_KEY
+from great_expectations_provider.operators.validate_batch import GXValidateBatchOperator
+from great_expectations_provider.operators.validate_dataframe import (
+    GXValidateDataFrameOperator,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _batch_operator(**kwargs: Any) -> GXValidateBatchOperator:
+    return GXValidateBatchOperator(
+        task_id="instrumented_batch",
+        configure_batch_definition=lambda context: None,
+        configure_expectations=lambda context: ExpectationSuite(
+            name="test suite",
+            expectations=[ExpectColumnValuesToNotBeNull(column="col_A")],
+        ),
+        **kwargs,
+    )
+
+
+class TestValidationInstrumentation:
+    def test_disabled_instrumentation_has_no_reports(self):
+        instrumentation = ValidationInstrumentation(_batch_operator())
+
+        assert instrumentation.reports() == {}
+
+    def test_reports_of_enabled_instrumentation_are_merged(self):
+        instrumentation = ValidationInstrumentation(
+            _batch_operator(track_cloud_calls=True, time_budget=60)
+        )
+        with instrumentation.tracking():
+            pass
+
+        xcom_value = instrumentation.xcom_value(
+            {"success": True, "results": []}, max_xcom_bytes=None
+        )
+
+        assert xcom_value["success"] is True
+        assert set(xcom_value) == {
+            "success",
+            "results",
+            CLOUD_CALLS_KEY,
+            TIME_BUDGET_KEY,
+        }
+
+    def test_size_limit_applies_to_the_reports(self):
+        instrumentation = ValidationInstrumentation(_batch_operator(time_budget=60))
+        instrumentation.budget._unevaluated.extend(
+            [{"expectation_type": "expect", "kwargs": {"column": "col_A"}}] * 100
+        )
+
+        xcom_value = instrumentation.xcom_value(
+            {"success": False, "results": []}, max_xcom_bytes=1000
+        )
+
+        assert len(json.dumps(xcom_value)) <= 1000
+        assert "unevaluated_expectations" not in xcom_value[TIME_BUDGET_KEY]
+        assert xcom_value[TIME_BUDGET_KEY]["exhausted"] is True
+        assert xcom_value[TRUNCATION_KEY]["within_limit"] is True
+
+    def test_operator_without_athena_arguments_leaves_tracking_disabled(self):
+        operator = GXValidateDataFrameOperator(
+            task_id="instrumented_dataframe",
+            configure_dataframe=lambda: pd.DataFrame({"col_A": [1]}),
+            configure_expectations=lambda context: ExpectColumnValuesToNotBeNull(
+                column="col_A"
+            ),
+        )
+
+        instrumentation = ValidationInstrumentation(operator)
+
+        assert instrumentation.athena_queries.enabled is False
+        assert instrumentation.metric_cache.enabled is False
+
+    def test_incomplete_result_does_not_succeed(self):
+        instrumentation = ValidationInstrumentation(_batch_operator(time_budget=60))
+        instrumentation.budget._unevaluated.append({"expectation_type": "expect"})
+
+        assert instrumentation.succeeded(SimpleNamespace(success=True)) is False
+
+
+class TestRunsInTaskProcess:
+    def test_plain_operator_may_run_in_service(self):
+        assert runs_in_task_process(_batch_operator()) is False
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"track_memory": True},
+            {"time_budget": 60},
+            {"isolation": "subprocess"},
+            {"skip_unchanged": True},
+            {"track_athena_queries": True},
+        ],
+    )
+    def test_instrumented_operator_runs_in_task_process(self, kwargs: dict[str, Any]):
+        assert runs_in_task_process(_batch_operator(**kwargs)) is True
+
+
+class TestValidationFailure:
+    """Test the exception chosen for a failed validation result."""
+
+    @staticmethod
+    def result_dict(exception_message: str) -> dict:
+        return {
+            "success": False,
+            "validation_results": [
+                {
+                    "success": False,
+                    "expectations": [
+                        {
+                            "expectation_type": "expect_column_values_to_be_unique",
+                            "success": False,
+                            "kwargs": {"column": "id"},
+                            "exception_info": {
+                                "raised_exception": True,
+                                "exception_message": exception_message,
+                            },
+                        },
+                        {
+                            "expectation_type": "expect_column_to_exist",
+                            "success": False,
+                        },
+                    ],
+                }
+            ],
+        }
+
+    @pytest.mark.parametrize(
+        "exception_message",
+        [
+            "(psycopg2.errors.QueryCanceled) canceling statement due to statement timeout",
+            "(MySQLdb.OperationalError) (3024, 'Query execution was interrupted, "
+            "maximum statement execution time exceeded')",
+            "TrinoQueryError(type=INSUFFICIENT_RESOURCES, name=EXCEEDED_TIME_LIMIT, "
+            'message="Query exceeded maximum time limit of 1.00m")',
+            "000630 (57014): Statement reached its statement or warehouse timeout of 60 "
+            "second(s) and was canceled.",
+        ],
+    )
+    def test_statement_timeout(self, exception_message: str):
+        error = validation_failure(self.result_dict(exception_message), "test_task")
+
+        assert isinstance(error, GXStatementTimeout)
+        assert error.timed_out_expectations == [
+            {"expectation_type": "expect_column_values_to_be_unique", "column": "id"}
+        ]
+        assert set(error.failed_expectation_types) == {
+            "expect_column_values_to_be_unique",
+            "expect_column_to_exist",
+        }
+        assert "  - expect_column_values_to_be_unique (id)" in str(error)
+
+    def test_other_errors(self):
+        error = validation_failure(
+            self.result_dict("relation does not exist"), "test_task"
+        )
+
+        assert type(error) is GXValidationFailed
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from great_expectations import ExpectationSuite
+from great_expectations.expectations import ExpectColumnValuesToBeInSet
+
+from great_expectations_provider.common.errors import (
+    GXResourceLimitExceeded,
+    GXValidationFailed,
+    GXValidationProcessError,
+)
+from great_expectations_provider.common.isolation import (
+    check_isolation,
+    format_bytes,
+    run_isolated,
+)
+from great_expectations_provider.operators.validate_batch import GXValidateBatchOperator
+from great_expectations_provider.operators.validate_dataframe import (
+    GXValidateDataFrameOperator,
+)
+
+if TYPE_CHECKING:
+    from airflow.utils.context import Context
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="resource limits differ by OS"
+    ),
+]
+
+MiB = 1 << 20
+
+
+def _address_space_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _allocate(size: int) -> int:
+    return len(bytearray(size))
+
+
+def _spin() -> None:
+    while True:
+        pass
+
+
+def _fail() -> None:
+    raise ValueError("no such table")
+
+
+def _exit() -> None:
+    os._exit(3)
+
+
+def _run_out_of_memory() -> None:
+    raise MemoryError
+
+
+def _run_out_of_memory_while_sending() -> bytes:
+    from multiprocessing.connection import Connection
+
+    send_bytes = Connection.send_bytes
+    messages = itertools.count()
+
+    def fail_on_second_chunk(self: Connection, *args: Any, **kwargs: Any) -> None:
+        # after the header and first chunk of the result
+        if next(messages) == 2:
+            raise MemoryError
+        send_bytes(self, *args, **kwargs)
+
+    # patched in the forked child only
+    Connection.send_bytes = fail_on_second_chunk  # type: ignore[method-assign]
+    return bytes(5 * MiB)
+
+
+def configure_batch_definition(context: AbstractDataContext) -> BatchDefinition:
+    return (
+        context.data_sources.add_pandas(name="test datasource")
+        .add_dataframe_asset("test asset")
+        .add_batch_definition_whole_dataframe("test batch def")
+    )
+
+
+def configure_expectations(context: AbstractDataContext) -> ExpectationSuite:
+    return ExpectationSuite(
+        name="test suite",
+        expectations=[
+            ExpectColumnValuesToBeInSet(column="col_A", value_set=["a", "b", "c"])
+        ],
+    )
+
+
+class TestRunIsolated:
+    def test_result_is_returned(self):
+        result = run_isolated(_allocate, 3 * MiB)
+
+        assert result == 3 * MiB
+
+    def test_large_result_is_streamed(self):
+        result = run_isolated(bytes, 5 * MiB)
+
+        assert len(result) == 5 * MiB
+
+    def test_memory_limit(self):
+        limit = _address_space_bytes() + 256 * MiB
+
+        with pytest.raises(GXResourceLimitExceeded) as exc_info:
+            run_isolated(_allocate, 1024 * MiB, max_memory_bytes=limit)
+
+        assert exc_info.value.resource == "memory"
+        assert str(exc_info.value) == (
+            f"Validation exceeded its memory limit of {format_bytes(limit)}"
+        )
+
+    def test_allocation_within_memory_limit(self):
+        limit = _address_space_bytes() + 256 * MiB
+
+        assert run_isolated(_allocate, 16 * MiB, max_memory_bytes=limit) == 16 * MiB
+
+    def test_cpu_time_limit(self):
+        with pytest.raises(GXResourceLimitExceeded) as exc_info:
+            run_isolated(_spin, max_cpu_seconds=1)
+
+        assert exc_info.value.resource == "cpu_time"
+        assert str(exc_info.value) == (
+            "Validation exceeded its CPU time limit of 1 seconds"
+        )
+
+    def test_error_is_raised_in_caller(self):
+        with pytest.raises(ValueError, match="no such table"):
+            run_isolated(_fail)
+
+    def test_out_of_memory_without_limit(self):
+        with pytest.raises(GXValidationProcessError, match="ran out of memory"):
+            run_isolated(_run_out_of_memory)
+
+    def test_partly_sent_result_is_discarded(self):
+        with pytest.raises(GXValidationProcessError, match="ran out of memory"):
+            run_isolated(_run_out_of_memory_while_sending)
+
+    def test_exit_without_result(self):
+        with pytest.raises(GXValidationProcessError) as exc_info:
+            run_isolated(_exit)
+
+        assert exc_info.value.exitcode == 3
+
+
+class TestCheckIsolation:
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError, match="must be one of none, subprocess"):
+            check_isolation("thread", None, None)
+
+    def test_limits_require_subprocess(self):
+        with pytest.raises(ValueError, match="require `isolation` to be `subprocess`"):
+            check_isolation("none", 1024 * MiB, None)
+
+
+class TestOperatorsWithIsolation:
+    def test_batch_operator_validates_in_subprocess(self):
+        """Expect the batch operator to push the result of an isolated validation."""
+
+        # arrange
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_isolated",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": pd.DataFrame({"col_A": ["a", "b", "c"]})},
+            isolation="subprocess",
+            max_cpu_seconds=60,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is True
+        assert pushed_result["statistics"]["evaluated_expectations"] == 1
+
+    def test_batch_operator_failure_in_subprocess_raises(self):
+        """Expect a failed isolated validation to fail the task."""
+
+        # arrange
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_isolated_failure",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": pd.DataFrame({"col_A": ["a", "b", "z"]})},
+            isolation="subprocess",
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXValidationFailed):
+            validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is False
+
+    def test_dataframe_operator_memory_limit(self):
+        """Expect a validation over its memory limit to fail with a resource error."""
+
+        # arrange
+        validate_df = GXValidateDataFrameOperator(
+            task_id="validate_df_isolated",
+            configure_dataframe=lambda: pd.DataFrame({"col_A": ["a", "b", "c"]}),
+            configure_expectations=lambda context: _allocate(1024 * MiB),  # type: ignore[arg-type, return-value]
+            isolation="subprocess",
+            max_memory_bytes=_address_space_bytes() + 256 * MiB,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXResourceLimitExceeded):
+            validate_df.execute(context=context)
+
+        # assert
+        mock_ti.xcom_push.assert_not_called()
+
+
+class TestFormatBytes:
+    @pytest.mark.parametrize(
+        ("size", "expected"),
+        [
+            (512, "512 B"),
+            (6 * 1024**3, "6 GiB"),
+            (3 * 1024**3 // 2, "1.5 GiB"),
+            (5 * 1024**4, "5 TiB"),
+        ],
+    )
+    def test_format_bytes(self, size: int, expected: str):
+        assert format_bytes(size) == expected
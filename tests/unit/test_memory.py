@@ -0,0 +1,140 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import great_expectations as gx
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+from pytest_mock import MockerFixture
+
+from great_expectations_provider.common.gx_phases import (
+    BATCH_LOADING,
+    DEPENDENCY_GRAPH,
+    EXPECTATION_EVALUATION,
+    METRIC_COMPUTATION,
+    METRIC_RESOLUTION,
+    observe_phases,
+)
+from great_expectations_provider.common.memory import MemoryTracker
+
+pytestmark = pytest.mark.unit
+
+
+def _run_validation() -> None:
+    context = gx.get_context(mode="ephemeral")
+    batch_definition = (
+        context.data_sources.add_pandas(name="test datasource")
+        .add_dataframe_asset("test asset")
+        .add_batch_definition_whole_dataframe("test batch def")
+    )
+    batch_definition.get_batch(
+        batch_parameters={"dataframe": pd.DataFrame({"col_A": [1, 2, 3]})}
+    ).validate(gxe.ExpectColumnValuesToNotBeNull(column="col_A"))
+
+
+class TestObservePhases:
+    def test_phases_are_reported_in_order(self):
+        phases: list[str] = []
+
+        @contextmanager
+        def observer(phase: str, info: dict[str, Any]) -> Iterator[None]:
+            phases.append(phase)
+            yield
+
+        with observe_phases(observer):
+            _run_validation()
+
+        assert phases[:3] == [BATCH_LOADING, METRIC_COMPUTATION, DEPENDENCY_GRAPH]
+        assert set(phases[3:-1]) == {METRIC_RESOLUTION}
+        assert phases[-1] == EXPECTATION_EVALUATION
+
+    def test_nothing_is_reported_outside_the_block(self):
+        phases: list[str] = []
+
+        @contextmanager
+        def observer(phase: str, info: dict[str, Any]) -> Iterator[None]:
+            phases.append(phase)
+            yield
+
+        with observe_phases(observer):
+            pass
+        _run_validation()
+
+        assert phases == []
+
+    def test_nothing_is_reported_without_supported_gx(self, mocker: MockerFixture):
+        mocker.patch(
+            "great_expectations_provider.common.gx_phases._install", return_value=False
+        )
+        phases: list[str] = []
+
+        @contextmanager
+        def observer(phase: str, info: dict[str, Any]) -> Iterator[None]:
+            phases.append(phase)
+            yield
+
+        with observe_phases(observer):
+            _run_validation()
+
+        assert phases == []
+
+
+class TestMemoryTracker:
+    def test_disabled_tracker_records_nothing(self):
+        memory = MemoryTracker(enabled=False)
+
+        with memory.track():
+            with memory.phase("result_serialization"):
+                _run_validation()
+
+        assert memory.report() is None
+        assert memory.phases == {}
+
+    def test_tracker_is_disabled_without_supported_gx(self, mocker: MockerFixture):
+        mocker.patch(
+            "great_expectations_provider.common.gx_phases._install", return_value=False
+        )
+
+        memory = MemoryTracker()
+
+        assert memory.enabled is False
+        assert memory.report() is None
+
+    def test_records_peaks_per_phase(self):
+        memory = MemoryTracker()
+
+        with memory.track():
+            _run_validation()
+            with memory.phase("result_serialization"):
+                payload = bytearray(5 * 1024 * 1024)
+                del payload
+
+        report = memory.report()
+        assert report is not None
+        assert set(report["phases"]) == {
+            BATCH_LOADING,
+            METRIC_COMPUTATION,
+            "result_serialization",
+        }
+        serialization = report["phases"]["result_serialization"]
+        assert serialization["tracemalloc_peak_bytes"] >= 5 * 1024 * 1024
+        assert serialization["rss_peak_bytes"] > 0
+        assert serialization["count"] == 1
+        assert report["process_max_rss_bytes"] >= serialization["rss_peak_bytes"]
+
+    def test_emits_gauges(self, mocker: MockerFixture):
+        emit_gauge = mocker.patch(
+            "great_expectations_provider.common.memory.emit_gauge"
+        )
+        memory = MemoryTracker()
+
+        with memory.track():
+            with memory.phase("result_serialization"):
+                pass
+        memory.emit_metrics("my_task")
+
+        emitted = {call.args[0] for call in emit_gauge.call_args_list}
+        assert "memory.result_serialization.rss_peak_bytes" in emitted
+        assert "memory.result_serialization.tracemalloc_peak_bytes" in emitted
+        assert "memory.process_max_rss_bytes" in emitted
+        assert emit_gauge.call_args.kwargs["tags"] == {"task_id": "my_task"}
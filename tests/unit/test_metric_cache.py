@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import great_expectations as gx
+import pandas as pd
+import pytest
+from great_expectations import ExpectationSuite, ValidationDefinition
+from great_expectations.expectations import (
+    ExpectColumnMaxToBeBetween,
+    ExpectColumnValuesToNotBeNull,
+    ExpectTableRowCountToBeBetween,
+)
+
+from great_expectations_provider.common import metric_cache
+from great_expectations_provider.common.metric_cache import (
+    METRIC_CACHE_KEY,
+    MetricCache,
+    data_version,
+)
+from great_expectations_provider.operators.validate_sql_tables import (
+    GXValidateSQLTablesOperator,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from airflow.utils.context import Context
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+
+pytestmark = pytest.mark.unit
+
+
+def expectations() -> list:
+    return [
+        ExpectTableRowCountToBeBetween(min_value=1, max_value=100),
+        ExpectColumnValuesToNotBeNull(column="id"),
+        ExpectColumnMaxToBeBetween(column="id", min_value=0, max_value=20),
+    ]
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Path:
+    database = tmp_path / "warehouse.db"
+    with sqlite3.connect(database) as connection:
+        connection.execute("CREATE TABLE orders (id INTEGER)")
+        connection.executemany(
+            "INSERT INTO orders VALUES (?)", [(i,) for i in range(10)]
+        )
+    return database
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> Path:
+    return tmp_path / "metrics.sqlite3"
+
+
+def table_batch_definition(
+    context: AbstractDataContext, database: Path
+) -> BatchDefinition:
+    datasource = context.data_sources.add_sqlite(
+        "warehouse", connection_string=f"sqlite:///{database}"
+    )
+    asset = datasource.add_table_asset("orders", table_name="orders")
+    return asset.add_batch_definition_whole_table("orders")
+
+
+def validate(
+    cache: MetricCache,
+    configure_batch_definition,
+    data_path: Path,
+) -> bool:
+    context = gx.get_context(mode="ephemeral")
+    validation_definition = context.validation_definitions.add(
+        ValidationDefinition(
+            name="orders",
+            data=configure_batch_definition(context, data_path),
+            suite=context.suites.add(
+                ExpectationSuite("orders", expectations=expectations())
+            ),
+        )
+    )
+    with cache.caching():
+        result = validation_definition.run()
+    return result.success
+
+
+def add_row(database: Path, value: int | None) -> None:
+    with sqlite3.connect(database) as connection:
+        connection.execute("INSERT INTO orders VALUES (?)", (value,))
+    # the modification time of a quick rewrite could equal the last one
+    stat = os.stat(database)
+    os.utime(database, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestMetricCache:
+    def test_unchanged_table_is_served_from_cache(
+        self, database: Path, cache_path: Path
+    ):
+        first = MetricCache(cache_path)
+        assert validate(first, table_batch_definition, database)
+        second = MetricCache(cache_path)
+        assert validate(second, table_batch_definition, database)
+
+        assert first.report()["hits"] == 0
+        assert second.report()["hits"] > 0
+        assert second.report()["hits"] > second.report()["misses"]
+
+    def test_changed_table_is_computed_again(self, database: Path, cache_path: Path):
+        assert validate(MetricCache(cache_path), table_batch_definition, database)
+        add_row(database, None)
+        cache = MetricCache(cache_path)
+
+        # the new null fails the suite, so no stale value was served
+        assert not validate(cache, table_batch_definition, database)
+        assert cache.report()["hits"] == 0
+
+    def test_version_column_tells_whether_table_changed(
+        self, database: Path, cache_path: Path
+    ):
+        validate(
+            MetricCache(cache_path, version_column="id"),
+            table_batch_definition,
+            database,
+        )
+        # a write that leaves the data unchanged
+        stat = os.stat(database)
+        os.utime(database, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        unchanged = MetricCache(cache_path, version_column="id")
+        validate(unchanged, table_batch_definition, database)
+        add_row(database, None)
+        changed = MetricCache(cache_path, version_column="id")
+
+        assert unchanged.report()["hits"] > 0
+        assert not validate(changed, table_batch_definition, database)
+        assert changed.report()["hits"] == 0
+
+    @pytest.mark.parametrize("dialect", ["postgresql", "mysql"])
+    def test_tables_without_authoritative_version_are_not_cached(self, dialect: str):
+        execution_engine = Mock()
+        execution_engine.engine.dialect.name = dialect
+        batch = Mock()
+        batch.batch_spec = {"type": "table", "table_name": "orders"}
+
+        assert data_version(batch, execution_engine) is None
+        execution_engine.engine.connect.assert_not_called()
+
+    def test_file_batches_are_cached_per_file(self, tmp_path: Path, cache_path: Path):
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        pd.DataFrame({"id": range(10)}).to_csv(data_dir / "orders_1.csv", index=False)
+        pd.DataFrame({"id": [1, None]}).to_csv(data_dir / "orders_2.csv", index=False)
+
+        def file_batch_definition(
+            context: AbstractDataContext, data_file: Path
+        ) -> BatchDefinition:
+            asset = context.data_sources.add_pandas_filesystem(
+                "files", base_directory=data_file.parent
+            ).add_csv_asset("orders")
+            return asset.add_batch_definition_path("orders", path=data_file.name)
+
+        assert validate(
+            MetricCache(cache_path), file_batch_definition, data_dir / "orders_1.csv"
+        )
+        cache = MetricCache(cache_path)
+
+        # another file of the same asset is not served the first file's metrics
+        assert not validate(cache, file_batch_definition, data_dir / "orders_2.csv")
+        assert cache.report()["hits"] == 0
+        hit = MetricCache(cache_path)
+        assert validate(hit, file_batch_definition, data_dir / "orders_1.csv")
+        assert hit.report()["hits"] > 0
+
+    def test_least_recently_used_entries_are_evicted(
+        self, database: Path, cache_path: Path
+    ):
+        cache = MetricCache(cache_path, max_entries=2)
+        validate(cache, table_batch_definition, database)
+
+        assert cache.report()["evictions"] > 0
+        with sqlite3.connect(cache_path) as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM metrics").fetchone()
+        assert count == 2
+
+    def test_data_version_caches_batches_without_one(
+        self, database: Path, cache_path: Path
+    ):
+        def query_batch_definition(
+            context: AbstractDataContext, database: Path
+        ) -> BatchDefinition:
+            datasource = context.data_sources.add_sqlite(
+                "warehouse", connection_string=f"sqlite:///{database}"
+            )
+            asset = datasource.add_query_asset("orders", query="SELECT * FROM orders")
+            return asset.add_batch_definition_whole_table("orders")
+
+        without_version = MetricCache(cache_path)
+        validate(without_version, query_batch_definition, database)
+        validate(
+            MetricCache(cache_path, data_version="load-1"),
+            query_batch_definition,
+            database,
+        )
+        with_version = MetricCache(cache_path, data_version="load-1")
+        validate(with_version, query_batch_definition, database)
+
+        assert without_version.report() == {
+            "hits": 0,
+            "misses": 0,
+            "hit_rate": None,
+            "evictions": 0,
+        }
+        assert with_version.report()["hits"] > 0
+
+    def test_writes_do_not_hold_the_lock(self, database: Path, cache_path: Path):
+        cache = MetricCache(cache_path)
+        context = gx.get_context(mode="ephemeral")
+        batch_definition = table_batch_definition(context, database)
+
+        with cache.caching():
+            batch_definition.get_batch().validate(
+                ExpectationSuite("orders", expectations=expectations())
+            )
+            # another task writing while this one still caches
+            with sqlite3.connect(cache_path, timeout=0) as other:
+                other.execute("INSERT INTO metrics VALUES ('other', '1', 0)")
+
+        assert cache.report()["misses"] > 0
+
+    def test_locked_cache_is_a_miss(
+        self, database: Path, cache_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        MetricCache(cache_path)._connect().close()
+        monkeypatch.setattr(metric_cache, "LOCK_TIMEOUT_SECONDS", 0.01)
+        other = sqlite3.connect(cache_path, isolation_level=None)
+        other.execute("BEGIN EXCLUSIVE")
+        cache = MetricCache(cache_path)
+
+        try:
+            success = validate(cache, table_batch_definition, database)
+        finally:
+            other.rollback()
+            other.close()
+
+        assert success
+        assert cache.report()["hits"] == 0
+        with sqlite3.connect(cache_path) as connection:
+            (count,) = connection.execute("SELECT COUNT(*) FROM metrics").fetchone()
+        assert count == 0
+
+    def test_unsupported_gx_computes_every_metric(
+        self, cache_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(metric_cache, "_install", lambda: False)
+        cache = MetricCache(cache_path)
+
+        with cache.caching():
+            pass
+
+        assert cache.report() is None
+        assert not cache_path.exists()
+
+    def test_disabled_cache(self, cache_path: Path):
+        cache = MetricCache(cache_path, enabled=False)
+
+        with cache.caching():
+            pass
+
+        assert cache.report() is None
+        assert not cache_path.exists()
+
+    @patch("great_expectations_provider.common.metric_cache.emit_gauge")
+    @patch("great_expectations_provider.common.metric_cache.emit_incr")
+    def test_emit_metrics(self, mock_emit_incr: Mock, mock_emit_gauge: Mock):
+        cache = MetricCache()
+        cache.hits = 3
+        cache.misses = 1
+
+        cache.emit_metrics("validate")
+
+        tags = {"task_id": "validate"}
+        mock_emit_incr.assert_any_call("metric_cache.hits", 3, tags=tags)
+        mock_emit_incr.assert_any_call("metric_cache.misses", 1, tags=tags)
+        mock_emit_gauge.assert_called_once_with(
+            "metric_cache.hit_rate", 0.75, tags=tags
+        )
+
+
+class TestOperatorMetricCache:
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_sql_tables_operator_reports_metric_cache(
+        self, mock_get_connection: Mock, database: Path, cache_path: Path
+    ):
+        # arrange
+        conn = Mock()
+        conn.conn_type = "sqlite"
+        conn.host = str(database)
+        conn.extra_dejson = {}
+        mock_get_connection.return_value = conn
+
+        def configure_tables(context: AbstractDataContext) -> dict:
+            return {"orders": ExpectationSuite("orders", expectations=expectations())}
+
+        validate_tables = GXValidateSQLTablesOperator(
+            task_id="validate_tables",
+            conn_id="warehouse",
+            configure_tables=configure_tables,
+            metric_cache=True,
+            metric_cache_path=str(cache_path),
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_tables.execute(context=context)
+        validate_tables.execute(context=context)
+
+        # assert
+        reports = [
+            call.kwargs["value"]
+            for call in mock_ti.xcom_push.call_args_list
+            if call.kwargs["key"] == METRIC_CACHE_KEY
+        ]
+        assert reports[0]["hits"] == 0
+        assert reports[1]["hits"] > 0
+        mock_ti.xcom_push.assert_called_with(key="return_value", value={"orders": True})
@@ -0,0 +1,87 @@
+import logging
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from great_expectations_provider.common.profiling import profile_validation
+
+pytestmark = pytest.mark.unit
+
+
+def _busy_function() -> int:
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+class TestProfileValidation:
+    def test_disabled_is_a_no_op(self, tmp_path: Path):
+        manager = profile_validation(
+            enabled=False, task_id="my_task", profile_dir=str(tmp_path)
+        )
+
+        assert isinstance(manager, nullcontext)
+        with manager:
+            _busy_function()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_writes_collapsed_stacks(
+        self, tmp_path: Path, caplog: pytest.LogCaptureFixture
+    ):
+        with caplog.at_level(logging.INFO):
+            with profile_validation(
+                enabled=True,
+                task_id="my_task",
+                profile_dir=str(tmp_path),
+                interval=0.001,
+            ):
+                _busy_function()
+
+        assert not list(tmp_path.glob("*.prof"))
+        folded_file = next(tmp_path.glob("my_task-*.folded"))
+        folded_lines = folded_file.read_text().splitlines()
+        assert any("_busy_function" in line for line in folded_lines)
+        stack, count = folded_lines[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert "Top 20 functions by own time" in caplog.text
+        assert "_busy_function" in caplog.text
+
+    def test_output_is_written_when_validation_raises(self, tmp_path: Path):
+        with pytest.raises(RuntimeError):
+            with profile_validation(
+                enabled=True, task_id="my_task", profile_dir=str(tmp_path)
+            ):
+                raise RuntimeError("validation failed")
+
+        assert list(tmp_path.glob("my_task-*.folded"))
+
+    def test_file_is_named_after_task_instance(self, tmp_path: Path):
+        ti = Mock(map_index=3, try_number=2)
+
+        with profile_validation(
+            enabled=True,
+            task_id="group.sub_group.my_task",
+            profile_dir=str(tmp_path),
+            ti=ti,
+        ):
+            pass
+
+        [folded_file] = tmp_path.iterdir()
+        assert folded_file.name.startswith("group.sub_group.my_task-map3-try2-")
+        assert folded_file.suffix == ".folded"
+
+    def test_unmapped_task_instance_has_no_map_index(self, tmp_path: Path):
+        ti = Mock(map_index=-1, try_number=1)
+
+        with profile_validation(
+            enabled=True, task_id="my_task", profile_dir=str(tmp_path), ti=ti
+        ):
+            pass
+
+        [folded_file] = tmp_path.iterdir()
+        assert folded_file.name.startswith("my_task-try1-")
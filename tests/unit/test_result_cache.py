@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from great_expectations import ExpectationSuite
+from great_expectations.expectations import ExpectColumnValuesToBeBetween
+
+from great_expectations_provider.common.errors import (
+    GXTimeBudgetExceeded,
+    GXValidationFailed,
+)
+from great_expectations_provider.common.result_cache import (
+    REUSED_RESULT_KEY,
+    DataFrameResultCache,
+    dataframe_hash,
+)
+from great_expectations_provider.common.time_budget import TimeBudget
+from great_expectations_provider.operators import validate_dataframe
+from great_expectations_provider.operators.validate_dataframe import (
+    GXValidateDataFrameOperator,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from airflow.utils.context import Context
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+
+def reference_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": np.arange(6),
+            "amount": [1.5, 2.5, 3.5, 4.5, 5.5, 6.5],
+            "code": ["a", "b", "c", "d", "e", "f"],
+            "created": pd.date_range("2024-01-01", periods=6),
+            "quantity": pd.array([1, 2, None, 4, 5, 6], dtype="Int64"),
+        }
+    )
+
+
+class TestDataFrameHash:
+    def test_identical_frames(self):
+        assert dataframe_hash(reference_frame()) == dataframe_hash(reference_frame())
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda frame: frame.assign(amount=frame["amount"] + 1),
+            lambda frame: frame.assign(code=frame["code"].str.upper()),
+            lambda frame: frame.assign(quantity=frame["quantity"].fillna(3)),
+            lambda frame: frame.rename(columns={"id": "key"}),
+            lambda frame: frame.astype({"id": "int32"}),
+            lambda frame: frame.set_index("id"),
+            lambda frame: frame.iloc[::-1],
+        ],
+    )
+    def test_changed_frames(self, change):
+        frame = reference_frame()
+
+        assert dataframe_hash(change(frame)) != dataframe_hash(frame)
+
+    def test_slices(self):
+        frame = reference_frame()
+
+        assert dataframe_hash(frame.iloc[1:4]) != dataframe_hash(frame.iloc[2:5])
+
+
+def operator(
+    task_id: str,
+    dataframe: pd.DataFrame,
+    cache_dir: Path,
+    max_id: int = 10,
+    **kwargs,
+) -> GXValidateDataFrameOperator:
+    return GXValidateDataFrameOperator(
+        task_id=task_id,
+        configure_dataframe=lambda: dataframe,
+        configure_expectations=lambda context: ExpectationSuite(
+            name="reference",
+            expectations=[
+                ExpectColumnValuesToBeBetween(
+                    column="id", min_value=0, max_value=max_id
+                )
+            ],
+        ),
+        result_cache=True,
+        result_cache_dir=str(cache_dir),
+        **kwargs,
+    )
+
+
+class TestGXValidateDataFrameOperatorResultCache:
+    def test_identical_frame_reuses_the_result(
+        self, tmp_path: Path, mocker: MockerFixture
+    ):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        operator("validate_a", reference_frame(), tmp_path).execute(context=context)
+        first_result = mock_ti.xcom_push.call_args[1]["value"]
+        run = mocker.spy(validate_dataframe, "run_validation_definition")
+
+        # act
+        operator("validate_b", reference_frame(), tmp_path).execute(context=context)
+
+        # assert
+        second_result = mock_ti.xcom_push.call_args[1]["value"]
+        run.assert_not_called()
+        assert second_result[REUSED_RESULT_KEY]["task_id"] == "validate_a"
+        assert second_result["statistics"] == first_result["statistics"]
+        assert REUSED_RESULT_KEY not in first_result
+
+    def test_changed_frame_is_validated(self, tmp_path: Path):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        operator("validate_a", reference_frame(), tmp_path).execute(context=context)
+        changed = reference_frame()
+        changed.loc[0, "id"] = 7
+
+        # act
+        operator("validate_a", changed, tmp_path).execute(context=context)
+
+        # assert
+        assert REUSED_RESULT_KEY not in mock_ti.xcom_push.call_args[1]["value"]
+
+    def test_failed_validation_is_not_reused(self, tmp_path: Path):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        with pytest.raises(GXValidationFailed):
+            operator("validate_a", reference_frame(), tmp_path, max_id=2).execute(
+                context=context
+            )
+
+        # act
+        with pytest.raises(GXValidationFailed):
+            operator("validate_a", reference_frame(), tmp_path, max_id=2).execute(
+                context=context
+            )
+
+        # assert
+        assert REUSED_RESULT_KEY not in mock_ti.xcom_push.call_args[1]["value"]
+
+    def test_time_budgeted_validation_is_not_reused(
+        self, tmp_path: Path, mocker: MockerFixture
+    ):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        elapsed = mocker.patch.object(TimeBudget, "_elapsed", return_value=60.0)
+        with pytest.raises(GXTimeBudgetExceeded):
+            operator("validate_a", reference_frame(), tmp_path, time_budget=30).execute(
+                context=context
+            )
+        elapsed.stop()
+
+        # act
+        operator("validate_a", reference_frame(), tmp_path).execute(context=context)
+
+        # assert
+        assert REUSED_RESULT_KEY not in mock_ti.xcom_push.call_args[1]["value"]
+
+
+class TestDataFrameResultCache:
+    def test_other_dataframes_are_not_hashed(self, tmp_path: Path):
+        cache = DataFrameResultCache(tmp_path)
+
+        assert cache.key(Mock(), ExpectationSuite("suite")) is None
+
+    def test_disabled_cache(self, tmp_path: Path):
+        cache = DataFrameResultCache(tmp_path, enabled=False)
+
+        assert cache.key(reference_frame(), ExpectationSuite("suite")) is None
+        assert cache.lookup(None) is None
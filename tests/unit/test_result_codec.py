@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import pytest
+
+from great_expectations_provider.common import result_codec
+from great_expectations_provider.common.result_codec import (
+    decode_result,
+    decode_result_summary,
+    encode_result,
+    is_validation_result,
+)
+from great_expectations_provider.xcom.backend import (
+    ENCODED_RESULT_PREFIX,
+    GXResultXComBackend,
+    decode_xcom_result_summary,
+    pull_result_summary,
+)
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def suite_result() -> dict:
+    return {
+        "success": False,
+        "statistics": {
+            "evaluated_expectations": 50,
+            "successful_expectations": 25,
+            "unsuccessful_expectations": 25,
+            "success_percent": 50.0,
+        },
+        "expectations": [
+            {
+                "expectation_type": "expect_column_values_to_be_in_set",
+                "success": i % 2 == 0,
+                "kwargs": {
+                    "batch_id": "ds-asset",
+                    "column": f"col_{i % 5}",
+                    "value_set": ["a", "b"],
+                },
+                "result": {
+                    "element_count": 100,
+                    "unexpected_count": 3,
+                    "unexpected_percent": 3.0,
+                    "partial_unexpected_list": ["x", "y", None],
+                },
+            }
+            for i in range(50)
+        ],
+        "result_url": None,
+    }
+
+
+@pytest.fixture
+def checkpoint_result(suite_result: dict) -> dict:
+    return {
+        "success": False,
+        "statistics": {"evaluated_validations": 2, "successful_validations": 1},
+        "validation_results": [suite_result, {**suite_result, "success": True}],
+    }
+
+
+class TestResultCodec:
+    def test_round_trip(self, suite_result: dict):
+        assert decode_result(encode_result(suite_result)) == suite_result
+
+    def test_round_trip_checkpoint_result(self, checkpoint_result: dict):
+        assert decode_result(encode_result(checkpoint_result)) == checkpoint_result
+
+    def test_round_trip_without_compression(self, suite_result: dict):
+        assert decode_result(encode_result(suite_result, compress=False)) == (
+            suite_result
+        )
+
+    def test_round_trip_with_zlib_fallback(self, suite_result: dict, mocker):
+        mocker.patch.dict("sys.modules", {"zstandard": None})
+
+        encoded = encode_result(suite_result)
+
+        assert encoded[4] == result_codec.COMPRESSION_ZLIB
+        assert decode_result(encoded) == suite_result
+
+    def test_unsupported_values_are_stringified(self):
+        timestamp = datetime(2024, 1, 1)
+        result = {
+            "success": True,
+            "statistics": {"evaluated_expectations": 0},
+            "expectations": [],
+            "run_time": timestamp,
+        }
+
+        assert decode_result(encode_result(result))["run_time"] == str(timestamp)
+
+    def test_repeated_strings_are_interned(self, suite_result: dict):
+        uncompressed = encode_result(suite_result, compress=False)
+
+        assert uncompressed.count(b"expect_column_values_to_be_in_set") == 1
+        assert len(uncompressed) < len(json.dumps(suite_result)) / 2
+
+    def test_summary_decodes_without_body(self, checkpoint_result: dict, mocker):
+        encoded = encode_result(checkpoint_result)
+        decompress = mocker.spy(result_codec, "_decompress")
+
+        summary = decode_result_summary(encoded)
+
+        decompress.assert_not_called()
+        assert summary["success"] is False
+        assert summary["statistics"] == checkpoint_result["statistics"]
+        assert summary["validation_results"][1] == {
+            "success": True,
+            "statistics": checkpoint_result["validation_results"][1]["statistics"],
+            "result_url": None,
+        }
+
+    def test_rejects_other_payloads(self):
+        with pytest.raises(ValueError, match="not an encoded validation result"):
+            decode_result(b'{"success": true}')
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            pytest.param(
+                {
+                    "success": True,
+                    "statistics": {"evaluated_expectations": 0},
+                    "expectations": [],
+                },
+                True,
+                id="suite",
+            ),
+            pytest.param(
+                {
+                    "success": True,
+                    "statistics": {"evaluated_validations": 0},
+                    "validation_results": [],
+                },
+                True,
+                id="checkpoint",
+            ),
+            pytest.param(
+                {"success": True, "expectations": []}, False, id="no_statistics"
+            ),
+            pytest.param(
+                {
+                    "success": True,
+                    "statistics": {"evaluated_expectations": 1},
+                    "expectations": [{"name": "not null"}],
+                },
+                False,
+                id="user_expectations",
+            ),
+            pytest.param(
+                {
+                    "success": "yes",
+                    "statistics": {"evaluated_expectations": 0},
+                    "expectations": [],
+                },
+                False,
+                id="success_not_a_flag",
+            ),
+            pytest.param({"success": True}, False, id="no_results"),
+            pytest.param("success", False, id="not_a_dict"),
+        ],
+    )
+    def test_is_validation_result(self, value, expected: bool):
+        assert is_validation_result(value) is expected
+
+
+class TestGXResultXComBackend:
+    def test_validation_result_round_trip(self, suite_result: dict):
+        stored = GXResultXComBackend.serialize_value(suite_result)
+
+        assert len(stored) < len(json.dumps(suite_result))
+        assert GXResultXComBackend.deserialize_value(Mock(value=stored)) == (
+            suite_result
+        )
+        assert decode_xcom_result_summary(stored)["success"] is False
+
+    def test_other_values_use_default_serialization(self):
+        value = {"rows": 3}
+
+        stored = GXResultXComBackend.serialize_value(value)
+
+        assert GXResultXComBackend.deserialize_value(Mock(value=stored)) == value
+
+    def test_stored_result_is_base85_text(self, suite_result: dict):
+        stored = GXResultXComBackend.serialize_value(suite_result)
+
+        encoded_length = len(stored) - len(ENCODED_RESULT_PREFIX)
+        assert encoded_length <= len(encode_result(suite_result)) * 5 / 4 + 4
+
+    def test_pull_decodes_only_the_summary(
+        self, checkpoint_result: dict, mocker: MockerFixture
+    ):
+        stored = GXResultXComBackend.serialize_value(checkpoint_result)
+        ti = Mock()
+        ti.xcom_pull.side_effect = lambda **kwargs: (
+            GXResultXComBackend.deserialize_value(Mock(value=stored))
+        )
+        decompress = mocker.spy(result_codec, "_decompress")
+
+        summary = pull_result_summary(ti, task_ids="validate")
+
+        decompress.assert_not_called()
+        ti.xcom_pull.assert_called_once_with(task_ids="validate")
+        assert summary["statistics"] == checkpoint_result["statistics"]
+        assert "expectations" not in summary["validation_results"][0]
+        assert GXResultXComBackend.deserialize_value(Mock(value=stored)) == (
+            checkpoint_result
+        )
+
+    def test_pull_summarizes_results_of_other_backends(self, suite_result: dict):
+        ti = Mock()
+        ti.xcom_pull.return_value = suite_result
+
+        summary = pull_result_summary(ti, task_ids="validate")
+
+        assert summary == {
+            "success": False,
+            "statistics": suite_result["statistics"],
+            "result_url": None,
+        }
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from great_expectations.data_context.cloud_constants import GXCloudRESTResource
+from great_expectations.data_context.types.refs import GXCloudResourceRef
+
+from great_expectations_provider.common import result_spool
+from great_expectations_provider.common.errors import GXResultUploadError
+from great_expectations_provider.common.result_spool import (
+    REJECTED_DIR,
+    STALE_CLAIM_SECONDS,
+    ResultSpool,
+)
+from great_expectations_provider.hooks.gx_cloud import GXCloudConfig
+from great_expectations_provider.operators.upload_spooled_results import (
+    GXUploadSpooledResultsOperator,
+)
+from great_expectations_provider.operators.validate_dataframe import (
+    GXValidateDataFrameOperator,
+)
+from tests.unit.conftest import ORGANIZATION_ID, WORKSPACE_ID
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from airflow.utils.context import Context
+
+    from tests.unit.conftest import MockGXCloud
+
+pytestmark = pytest.mark.unit
+
+RESULTS = GXCloudRESTResource.VALIDATION_RESULT
+RESULT = {"success": True, "results": []}
+
+
+@pytest.fixture
+def spool(tmp_path: Path) -> ResultSpool:
+    return ResultSpool(tmp_path)
+
+
+@pytest.fixture
+def session() -> requests.Session:
+    # without the retries of the shared sessions, so each pass sends one request
+    return requests.Session()
+
+
+def spool_result(spool: ResultSpool, mock_gx_cloud: MockGXCloud) -> object:
+    store = mock_gx_cloud.store_backend(RESULTS)
+    with spool.spooling():
+        return store._set((RESULTS, None, None), RESULT)
+
+
+class TestResultSpool:
+    def test_result_is_spooled_instead_of_uploaded(
+        self, spool: ResultSpool, mock_gx_cloud: MockGXCloud
+    ):
+        ref = spool_result(spool, mock_gx_cloud)
+
+        assert isinstance(ref, GXCloudResourceRef)
+        assert ref.id is None
+        assert ref.response["data"]["result_url"] is None
+        assert mock_gx_cloud.requests == []
+        assert [path.name for path in spool.pending()] == spool.spooled
+        assert "token" not in spool.pending()[0].read_text()
+
+    def test_unsupported_gx_uploads_during_the_run(
+        self, spool: ResultSpool, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(result_spool, "_install", lambda: False)
+
+        with spool.spooling():
+            pass
+
+        assert spool.enabled is False
+        assert spool.report() is None
+
+    def test_other_resources_are_uploaded(
+        self, spool: ResultSpool, mock_gx_cloud: MockGXCloud
+    ):
+        store = mock_gx_cloud.store_backend(GXCloudRESTResource.EXPECTATION_SUITE)
+
+        with spool.spooling(), pytest.raises(Exception):
+            # the mock answers with a list, which GX cannot read a suite ID from
+            store._set((GXCloudRESTResource.EXPECTATION_SUITE, None, None), {})
+
+        assert len(mock_gx_cloud.requests) == 1
+        assert spool.pending() == []
+
+    def test_failed_upload_is_retried_in_next_pass(
+        self,
+        spool: ResultSpool,
+        session: requests.Session,
+        mock_gx_cloud: MockGXCloud,
+    ):
+        spool_result(spool, mock_gx_cloud)
+        spool_result(spool, mock_gx_cloud)
+        mock_gx_cloud.fail_with.append(500)
+
+        first = spool.upload(session, ORGANIZATION_ID, WORKSPACE_ID)
+        second = spool.upload(session, ORGANIZATION_ID, WORKSPACE_ID)
+
+        assert first.as_dict() == {
+            "uploaded": 0,
+            "rejected": 0,
+            "failed": 1,
+            "remaining": 2,
+        }
+        assert second.uploaded == 2
+        assert second.remaining == 0
+        method, path = mock_gx_cloud.requests[-1]
+        assert method == "POST"
+        assert path.endswith("/validation-results")
+        assert mock_gx_cloud.bodies[-1] == {"data": RESULT}
+
+    def test_rejected_result_is_set_aside(
+        self,
+        spool: ResultSpool,
+        session: requests.Session,
+        mock_gx_cloud: MockGXCloud,
+    ):
+        spool_result(spool, mock_gx_cloud)
+        spool_result(spool, mock_gx_cloud)
+        mock_gx_cloud.fail_with.append(422)
+
+        report = spool.upload(session, ORGANIZATION_ID, WORKSPACE_ID)
+
+        assert (report.uploaded, report.rejected, report.remaining) == (1, 1, 0)
+        assert len(list((spool.spool_dir / REJECTED_DIR).iterdir())) == 1
+
+    def test_only_results_of_the_workspace_are_uploaded(
+        self,
+        spool: ResultSpool,
+        session: requests.Session,
+        mock_gx_cloud: MockGXCloud,
+    ):
+        spool_result(spool, mock_gx_cloud)
+
+        report = spool.upload(session, ORGANIZATION_ID, "other workspace")
+
+        assert report.uploaded == 0
+        assert report.remaining == 1
+        assert mock_gx_cloud.requests == []
+
+    def claim(self, spool: ResultSpool, host: str, pid: int) -> Path:
+        path = spool.pending()[0]
+        claim = path.with_name(f"{path.name}@{host}@{pid}.uploading")
+        os.replace(path, claim)
+        stale = time.time() - STALE_CLAIM_SECONDS - 1
+        os.utime(claim, (stale, stale))
+        return claim
+
+    def test_claim_of_running_uploader_is_kept(
+        self,
+        spool: ResultSpool,
+        session: requests.Session,
+        mock_gx_cloud: MockGXCloud,
+    ):
+        spool_result(spool, mock_gx_cloud)
+        claim = self.claim(spool, socket.gethostname(), os.getpid())
+
+        report = spool.upload(session, ORGANIZATION_ID, WORKSPACE_ID)
+
+        assert report.uploaded == 0
+        assert claim.exists()
+        assert mock_gx_cloud.requests == []
+
+    def test_claim_of_exited_uploader_is_released(
+        self,
+        spool: ResultSpool,
+        session: requests.Session,
+        mock_gx_cloud: MockGXCloud,
+    ):
+        spool_result(spool, mock_gx_cloud)
+        exited = subprocess.Popen([sys.executable, "-c", ""])
+        exited.wait()
+        self.claim(spool, socket.gethostname(), exited.pid)
+
+        assert spool.upload(session, ORGANIZATION_ID, WORKSPACE_ID).uploaded == 1
+
+    def test_claim_of_other_host_is_logged(
+        self,
+        spool: ResultSpool,
+        session: requests.Session,
+        mock_gx_cloud: MockGXCloud,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        spool_result(spool, mock_gx_cloud)
+        claim = self.claim(spool, "other-host", 1)
+
+        report = spool.upload(session, ORGANIZATION_ID, WORKSPACE_ID)
+
+        assert report.uploaded == 0
+        assert claim.exists()
+        assert "claimed by process 1 on other-host" in caplog.text
+
+    def test_spool_directory_is_required(self):
+        with pytest.raises(ValueError, match="requires a spool directory"):
+            ResultSpool(None)
+
+
+class TestOperatorWithResultSpool:
+    def test_spooling_requires_cloud_context(self):
+        """Expect spooling results without GX Cloud to be rejected."""
+
+        # arrange, act, assert
+        with pytest.raises(ValueError, match="requires `context_type` to be `cloud`"):
+            GXValidateDataFrameOperator(
+                task_id="validate_df_spooled",
+                configure_dataframe=Mock(),
+                configure_expectations=Mock(),
+                result_upload="spool",
+            )
+
+    def test_spooling_requires_spool_directory(self):
+        """Expect spooling results without a spool directory to be rejected."""
+
+        # arrange, act, assert
+        with pytest.raises(ValueError, match="requires `result_spool_dir`"):
+            GXValidateDataFrameOperator(
+                task_id="validate_df_spooled",
+                configure_dataframe=Mock(),
+                configure_expectations=Mock(),
+                context_type="cloud",
+                result_upload="spool",
+            )
+
+
+class TestGXUploadSpooledResultsOperator:
+    @patch(
+        "great_expectations_provider.operators.upload_spooled_results.GXCloudHook.get_conn"
+    )
+    def test_failed_upload_fails_task(
+        self,
+        mock_get_conn: Mock,
+        spool: ResultSpool,
+        mock_gx_cloud: MockGXCloud,
+    ):
+        """Expect the task to fail while spooled results cannot be uploaded, and succeed once they are."""
+
+        # arrange
+        mock_get_conn.return_value = GXCloudConfig(
+            cloud_access_token="token",
+            cloud_organization_id=ORGANIZATION_ID,
+            cloud_workspace_id=WORKSPACE_ID,
+            max_retries=0,
+        )
+        spool_result(spool, mock_gx_cloud)
+        mock_gx_cloud.fail_with.append(500)
+        upload = GXUploadSpooledResultsOperator(
+            task_id="upload_spooled_results",
+            conn_id="gx_cloud",
+            result_spool_dir=str(spool.spool_dir),
+        )
+        context: Context = {"ti": Mock()}  # type: ignore[typeddict-item]
+
+        # act, assert
+        with pytest.raises(GXResultUploadError, match="1 are left"):
+            upload.execute(context=context)
+        assert upload.execute(context=context) == {
+            "uploaded": 1,
+            "rejected": 0,
+            "failed": 0,
+            "remaining": 0,
+        }
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import Iterator
+from unittest.mock import Mock, patch
+
+import pytest
+
+from great_expectations_provider.common.spark_sessions import SparkSessionPool
+
+pytestmark = pytest.mark.unit
+
+
+class FakeSession:
+    """Stands in for a SparkSession, answering the health check until it is broken."""
+
+    def __init__(self) -> None:
+        self.healthy = True
+        self.stopped = False
+
+    def sql(self, query: str) -> Mock:
+        if not self.healthy:
+            raise RuntimeError("SparkContext was shut down")
+        return Mock()
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.fixture
+def pool() -> Iterator[SparkSessionPool]:
+    pool = SparkSessionPool()
+    with patch.object(
+        SparkSessionPool, "_create", side_effect=lambda *args: FakeSession()
+    ):
+        yield pool
+    pool.close()
+
+
+class TestSparkSessionPool:
+    def test_session_is_reused(self, pool: SparkSessionPool):
+        first = pool.get(master="local[1]", config={"a": "1", "b": "2"})
+
+        second = pool.get(master="local[1]", config={"b": "2", "a": "1"})
+
+        assert second is first
+
+    def test_spark_connect_sessions_are_kept_side_by_side(self, pool: SparkSessionPool):
+        first = pool.get(remote="sc://spark:15002")
+
+        second = pool.get(remote="sc://spark:15002", config={"a": "1"})
+
+        assert second is not first
+        assert not first.stopped
+        assert pool.get(remote="sc://spark:15002") is first
+
+    def test_other_classic_session_stops_the_kept_one(self, pool: SparkSessionPool):
+        first = pool.get(master="local[1]")
+
+        second = pool.get(master="local[2]")
+
+        assert second is not first
+        assert first.stopped
+
+    def test_classic_session_in_use_is_not_stopped(self, pool: SparkSessionPool):
+        first = pool.get(master="local[1]")
+
+        with pool.using(Mock(sparkSession=first)):
+            with pytest.raises(RuntimeError, match="in use"):
+                pool.get(master="local[2]")
+
+        assert not first.stopped
+        assert pool.get(master="local[1]") is first
+
+    def test_health_check_runs_without_the_lock(self, pool: SparkSessionPool):
+        session = pool.get(remote="sc://spark:15002")
+        locked_during_check = []
+
+        def sql(query: str) -> Mock:
+            locked_during_check.append(pool._lock.locked())
+            return Mock()
+
+        session.sql = sql
+
+        assert pool.get(remote="sc://spark:15002") is session
+        assert locked_during_check == [False]
+
+    def test_unhealthy_session_is_replaced(self, pool: SparkSessionPool):
+        first = pool.get(remote="sc://spark:15002")
+        first.healthy = False
+
+        second = pool.get(remote="sc://spark:15002")
+
+        assert second is not first
+        assert first.stopped
+
+    @patch("great_expectations_provider.common.spark_sessions.time.monotonic")
+    def test_idle_session_is_stopped(
+        self, mock_monotonic: Mock, pool: SparkSessionPool
+    ):
+        mock_monotonic.return_value = 100.0
+        session = pool.get(remote="sc://spark:15002", idle_timeout=60)
+        mock_monotonic.return_value = 161.0
+
+        pool.stop_idle()
+
+        assert session.stopped
+        assert pool.get(remote="sc://spark:15002") is not session
+
+    @patch("great_expectations_provider.common.spark_sessions.time.monotonic")
+    def test_session_in_use_is_not_stopped(
+        self, mock_monotonic: Mock, pool: SparkSessionPool
+    ):
+        mock_monotonic.return_value = 100.0
+        session = pool.get(remote="sc://spark:15002", idle_timeout=60)
+        dataframe = Mock(sparkSession=session)
+
+        with pool.using(dataframe):
+            mock_monotonic.return_value = 500.0
+            pool.stop_idle()
+            assert not session.stopped
+
+        pool.stop_idle()
+        assert not session.stopped
+        mock_monotonic.return_value = 561.0
+        pool.stop_idle()
+        assert session.stopped
+
+    @pytest.mark.parametrize(
+        "kwargs", [{}, {"master": "local[1]", "remote": "sc://spark:15002"}]
+    )
+    def test_master_or_remote_is_required(self, pool: SparkSessionPool, kwargs: dict):
+        with pytest.raises(ValueError, match="exactly one of master and remote"):
+            pool.get(**kwargs)
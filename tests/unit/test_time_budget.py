@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import itertools
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock
+
+import great_expectations as gx
+import pandas as pd
+import pytest
+from great_expectations import ExpectationSuite
+from great_expectations.core.validation_definition import ValidationDefinition
+from great_expectations.expectations import (
+    ExpectColumnValuesToBeInSet,
+    ExpectColumnValuesToNotBeNull,
+    ExpectTableRowCountToBeBetween,
+)
+
+from great_expectations_provider.common import time_budget
+from great_expectations_provider.common.errors import GXTimeBudgetExceeded
+from great_expectations_provider.common.gx_phases import VALIDATION_DEFINITION
+from great_expectations_provider.common.time_budget import (
+    TIME_BUDGET_KEY,
+    TimeBudget,
+    check_time_budget,
+)
+from great_expectations_provider.operators.validate_batch import GXValidateBatchOperator
+
+if TYPE_CHECKING:
+    from airflow.utils.context import Context
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+SAMPLED_VALIDATOR = object()
+
+
+def _configs(*columns: str) -> list[Any]:
+    return [
+        SimpleNamespace(type=f"expect_{index}", kwargs={"column": column})
+        for index, column in enumerate(columns)
+    ]
+
+
+class FakeClock:
+    """Advance one second per Expectation evaluated, or 0.1 seconds on a sample."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def elapsed(self) -> float:
+        return self.now
+
+    def validate(self, validator: Any, expectation_configs: list[Any]) -> list[Any]:
+        step = 0.1 if validator is SAMPLED_VALIDATOR else 1.0
+        self.now += step * len(expectation_configs)
+        return [SimpleNamespace(meta=None, config=c) for c in expectation_configs]
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def _budget(clock: FakeClock, mocker: MockerFixture, **kwargs: Any) -> TimeBudget:
+    budget = TimeBudget(5, **kwargs)
+    mocker.patch.object(budget, "_elapsed", side_effect=clock.elapsed)
+    return budget
+
+
+def configure_batch_definition(context: AbstractDataContext) -> BatchDefinition:
+    return (
+        context.data_sources.add_pandas(name="test datasource")
+        .add_dataframe_asset("test asset")
+        .add_batch_definition_whole_dataframe("test batch def")
+    )
+
+
+def configure_expectations(context: AbstractDataContext) -> ExpectationSuite:
+    return ExpectationSuite(
+        name="test suite",
+        expectations=[
+            ExpectColumnValuesToBeInSet(column="col_A", value_set=["a", "b", "c"]),
+            ExpectColumnValuesToNotBeNull(column="col_B"),
+            ExpectTableRowCountToBeBetween(min_value=1, max_value=10),
+        ],
+    )
+
+
+class TestTimeBudget:
+    def test_disabled_budget_has_no_report(self):
+        assert TimeBudget(None).report() is None
+
+    def test_stop_leaves_remaining_groups_unevaluated(
+        self, clock: FakeClock, mocker: MockerFixture
+    ):
+        budget = _budget(clock, mocker)
+        configs = _configs("a", "b", "a", "b", "c", "c")
+
+        results = budget.validate(clock.validate, Mock(), configs)
+
+        # the third group is expected to take 2 seconds with 1 left
+        assert [result.config.kwargs["column"] for result in results] == [
+            "a",
+            "a",
+            "b",
+            "b",
+        ]
+        report = budget.report()
+        assert report is not None
+        assert report["exhausted"] is True
+        assert report["unevaluated_expectations"] == [
+            {"expectation_type": "expect_4", "kwargs": {"column": "c"}},
+            {"expectation_type": "expect_5", "kwargs": {"column": "c"}},
+        ]
+        assert report["sampled_expectations"] == []
+
+    def test_sample_evaluates_remaining_groups_on_sample(
+        self, clock: FakeClock, mocker: MockerFixture
+    ):
+        budget = _budget(clock, mocker, action="sample", sample_fraction=0.1)
+        mocker.patch.object(
+            budget, "_sampled_validator", return_value=SAMPLED_VALIDATOR
+        )
+        configs = _configs("a", "a", "b", "b", "c", "c")
+
+        results = budget.validate(clock.validate, Mock(), configs)
+
+        assert len(results) == 6
+        assert [result.meta for result in results[4:]] == [
+            {"sample_fraction": 0.1},
+            {"sample_fraction": 0.1},
+        ]
+        report = budget.report()
+        assert report is not None
+        assert report["unevaluated_expectations"] == []
+        assert [row["kwargs"] for row in report["sampled_expectations"]] == [
+            {"column": "c"},
+            {"column": "c"},
+        ]
+
+    def test_sampled_result_is_marked_failed(
+        self, clock: FakeClock, mocker: MockerFixture
+    ):
+        budget = _budget(clock, mocker, action="sample", sample_fraction=0.1)
+        mocker.patch.object(
+            budget, "_sampled_validator", return_value=SAMPLED_VALIDATOR
+        )
+        budget.validate(clock.validate, Mock(), _configs("a", "a", "b", "b", "c", "c"))
+        result_dict = {"success": True, "expectations": []}
+
+        budget.mark_incomplete(result_dict)
+
+        assert result_dict["success"] is False
+        assert len(result_dict[TIME_BUDGET_KEY]["sampled_expectations"]) == 2
+
+    def test_complete_result_is_not_marked(
+        self, clock: FakeClock, mocker: MockerFixture
+    ):
+        budget = _budget(clock, mocker)
+        budget.validate(clock.validate, Mock(), _configs("a", "b"))
+        result_dict = {"success": True, "expectations": []}
+
+        budget.mark_incomplete(result_dict)
+
+        assert result_dict == {"success": True, "expectations": []}
+
+    def test_sample_without_dataframe_stops(
+        self, clock: FakeClock, mocker: MockerFixture
+    ):
+        budget = _budget(clock, mocker, action="sample")
+        configs = _configs("a", "a", "b", "b", "c", "c")
+
+        results = budget.validate(clock.validate, Mock(), configs)
+
+        assert len(results) == 4
+        report = budget.report()
+        assert report is not None
+        assert len(report["unevaluated_expectations"]) == 2
+
+    def test_sampled_validator_uses_the_running_batch(self):
+        context = gx.get_context(mode="ephemeral")
+        batch_definition = configure_batch_definition(context)
+        dataframe = pd.DataFrame({"col_A": range(100)})
+        budget = TimeBudget(5, action="sample", sample_fraction=0.1)
+
+        with budget._observe(
+            VALIDATION_DEFINITION,
+            {
+                "name": "test validation",
+                "batch_definition": batch_definition,
+                "batch_parameters": {"dataframe": dataframe},
+            },
+        ):
+            sampled_validator = budget._sampled_validator(Mock(result_format="SUMMARY"))
+
+        assert sampled_validator is not None
+        assert sampled_validator.result_format == "SUMMARY"
+        assert len(sampled_validator._batch_parameters["dataframe"]) == 10
+
+    def test_incomplete_suite_result_is_failed(
+        self, clock: FakeClock, mocker: MockerFixture
+    ):
+        budget = _budget(clock, mocker)
+
+        def validate_expectation_suite(validator: Any) -> Any:
+            budget.validate(
+                clock.validate, validator, _configs("a", "b", "c", "d", "e", "f")
+            )
+            return SimpleNamespace(success=True)
+
+        result = budget.validate_suite(validate_expectation_suite, Mock())
+
+        assert result.success is False
+
+    def test_complete_suite_result_is_kept(
+        self, clock: FakeClock, mocker: MockerFixture
+    ):
+        budget = _budget(clock, mocker)
+
+        def validate_expectation_suite(validator: Any) -> Any:
+            budget.validate(clock.validate, validator, _configs("a", "b"))
+            return SimpleNamespace(success=True)
+
+        result = budget.validate_suite(validate_expectation_suite, Mock())
+
+        assert result.success is True
+
+    @pytest.mark.parametrize(
+        ("time_budget", "action", "sample_fraction", "message"),
+        [
+            (0, "stop", 0.1, "must be positive"),
+            (timedelta(seconds=-1), "stop", 0.1, "must be positive"),
+            (10, "skip", 0.1, "must be one of stop, sample"),
+            (10, "sample", 1.5, "greater than 0 and at most 1"),
+        ],
+    )
+    def test_invalid_arguments(
+        self, time_budget: Any, action: str, sample_fraction: float, message: str
+    ):
+        with pytest.raises(ValueError, match=message):
+            check_time_budget(time_budget, action, sample_fraction)
+
+
+class TestOperatorWithTimeBudget:
+    def test_result_within_budget_is_complete(self):
+        """Expect every Expectation to be evaluated when the budget is not exhausted."""
+
+        # arrange
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_within_budget",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={
+                "dataframe": pd.DataFrame({"col_A": ["a", "b"], "col_B": [1, 2]})
+            },
+            time_budget=timedelta(minutes=5),
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["statistics"]["evaluated_expectations"] == 3
+        assert pushed_result[TIME_BUDGET_KEY]["budget_seconds"] == 300
+        assert pushed_result[TIME_BUDGET_KEY]["exhausted"] is False
+        assert pushed_result[TIME_BUDGET_KEY]["unevaluated_expectations"] == []
+
+    def test_exhausted_budget_fails_with_partial_result(self, mocker: MockerFixture):
+        """Expect the Expectations left when the budget runs out to be listed as unevaluated, failing the task."""
+
+        # arrange
+        mocker.patch.object(TimeBudget, "_elapsed", return_value=60.0)
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_exhausted_budget",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={
+                "dataframe": pd.DataFrame({"col_A": ["a", "b"], "col_B": [1, 2]})
+            },
+            time_budget=30,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        run = mocker.spy(ValidationDefinition, "run")
+
+        # act
+        with pytest.raises(GXTimeBudgetExceeded) as error:
+            validate_batch.execute(context=context)
+
+        # assert
+        # the result GX stores, uploads, and passes to actions fails too
+        assert run.spy_return.success is False
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is False
+        assert pushed_result["statistics"]["evaluated_expectations"] == 0
+        unevaluated = pushed_result[TIME_BUDGET_KEY]["unevaluated_expectations"]
+        assert [row["expectation_type"] for row in unevaluated] == [
+            "expect_column_values_to_be_in_set",
+            "expect_column_values_to_not_be_null",
+            "expect_table_row_count_to_be_between",
+        ]
+        assert unevaluated[0]["validation_definition"] == (
+            "validate_batch_exhausted_budget"
+        )
+        assert error.value.unevaluated_expectations == unevaluated
+
+    def test_budget_exhausted_before_failing_expectation_fails(
+        self, mocker: MockerFixture
+    ):
+        """Expect a task whose evaluated Expectations pass to fail when the budget left a failing one unevaluated."""
+
+        # arrange
+        # two column groups are evaluated within the budget, the table group is not
+        mocker.patch.object(
+            TimeBudget,
+            "_elapsed",
+            side_effect=itertools.chain([0.0] * 6, itertools.repeat(60.0)),
+        )
+
+        def configure_failing_expectations(
+            context: AbstractDataContext,
+        ) -> ExpectationSuite:
+            return ExpectationSuite(
+                name="test suite",
+                expectations=[
+                    ExpectColumnValuesToBeInSet(column="col_A", value_set=["a", "b"]),
+                    ExpectColumnValuesToNotBeNull(column="col_B"),
+                    ExpectTableRowCountToBeBetween(min_value=5),
+                ],
+            )
+
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_exhausted_before_failure",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_failing_expectations,
+            batch_parameters={
+                "dataframe": pd.DataFrame({"col_A": ["a", "b"], "col_B": [1, 2]})
+            },
+            time_budget=30,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXTimeBudgetExceeded, match="not evaluated within"):
+            validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is False
+        assert pushed_result["statistics"]["unsuccessful_expectations"] == 0
+        assert [
+            row["expectation_type"]
+            for row in pushed_result[TIME_BUDGET_KEY]["unevaluated_expectations"]
+        ] == ["expect_table_row_count_to_be_between"]
+
+    def test_unsupported_gx_validates_the_whole_suite(
+        self, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Expect the budget to be turned off when GX does not support it."""
+
+        # arrange
+        monkeypatch.setattr(time_budget, "_install", lambda: False)
+        mocker.patch.object(TimeBudget, "_elapsed", return_value=60.0)
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_unsupported_budget",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={
+                "dataframe": pd.DataFrame({"col_A": ["a", "b"], "col_B": [1, 2]})
+            },
+            time_budget=30,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is True
+        assert pushed_result["statistics"]["evaluated_expectations"] == 3
+        assert TIME_BUDGET_KEY not in pushed_result
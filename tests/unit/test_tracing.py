@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock
+
+import great_expectations as gx
+import great_expectations.expectations as gxe
+import pandas as pd
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from great_expectations_provider.common.errors import GXValidationFailed
+from great_expectations_provider.common.tracing import ValidationTracer
+from great_expectations_provider.operators.validate_batch import (
+    GXValidateBatchOperator,
+)
+from great_expectations_provider.operators.validate_checkpoint import (
+    GXValidateCheckpointOperator,
+)
+
+if TYPE_CHECKING:
+    from airflow.utils.context import Context
+    from great_expectations import Checkpoint
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+
+pytestmark = pytest.mark.unit
+
+_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture
+def span_exporter() -> InMemorySpanExporter:
+    # the global tracer provider can only be set once per process
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(_exporter))
+        trace.set_tracer_provider(provider)
+    _exporter.clear()
+    return _exporter
+
+
+def _by_name(spans: tuple[ReadableSpan, ...], name: str) -> list[ReadableSpan]:
+    return [span for span in spans if span.name == name]
+
+
+def _parent(spans: tuple[ReadableSpan, ...], span: ReadableSpan) -> ReadableSpan:
+    assert span.parent is not None
+    (parent,) = [s for s in spans if s.context.span_id == span.parent.span_id]
+    return parent
+
+
+def _attributes(span: ReadableSpan) -> dict[str, Any]:
+    return dict(span.attributes or {})
+
+
+def _add_batch_definition(context: AbstractDataContext, name: str) -> BatchDefinition:
+    return (
+        context.data_sources.add_pandas(name=name)
+        .add_dataframe_asset(name)
+        .add_batch_definition_whole_dataframe(name)
+    )
+
+
+class TestValidationTracer:
+    def test_disabled_tracer_records_nothing(self, span_exporter):
+        tracer = ValidationTracer(enabled=False, task_id="task")
+
+        with tracer.track():
+            with tracer.span("load_context") as span:
+                tracer.record_result(span, {"success": True})
+
+        assert span is None
+        assert span_exporter.get_finished_spans() == ()
+
+    def test_missing_opentelemetry_disables_tracing(self, mocker):
+        mocker.patch(
+            "great_expectations_provider.common.tracing._get_tracer",
+            return_value=None,
+        )
+
+        tracer = ValidationTracer(enabled=True, task_id="task")
+
+        assert tracer.enabled is False
+
+
+class TestOperatorTracing:
+    def test_batch_operator_spans(self, span_exporter):
+        """Expect the operator phases, the validation definition and each expectation as nested spans."""
+
+        # arrange
+        df = pd.DataFrame({"col_A": ["a", "b", "c"], "col_B": [1, 2, None]})
+
+        def configure_expectations(context: AbstractDataContext) -> gx.ExpectationSuite:
+            return gx.ExpectationSuite(
+                name="tracing suite",
+                expectations=[
+                    gxe.ExpectColumnValuesToBeInSet(
+                        column="col_A", value_set=["a", "b", "c"]
+                    ),
+                    gxe.ExpectColumnValuesToNotBeNull(column="col_B"),
+                ],
+            )
+
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_tracing",
+            configure_batch_definition=lambda context: _add_batch_definition(
+                context, "tracing"
+            ),
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": df},
+            tracing=True,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXValidationFailed):
+            validate_batch.execute(context=context)
+
+        # assert
+        spans = span_exporter.get_finished_spans()
+        (root,) = _by_name(spans, "gx.validate")
+        assert root.parent is None
+        for name in (
+            "gx.load_context",
+            "gx.configure_batch_definition",
+            "gx.configure_expectations",
+            "gx.validation_definition",
+            "gx.result_serialization",
+        ):
+            (span,) = _by_name(spans, name)
+            assert _parent(spans, span) is root
+            assert _attributes(span)["gx.task_id"] == "validate_batch_tracing"
+
+        (validation_definition,) = _by_name(spans, "gx.validation_definition")
+        assert _attributes(validation_definition)["gx.success"] is False
+        assert _attributes(validation_definition)["gx.row_count"] == 3
+        assert (
+            _attributes(validation_definition)[
+                "gx.validation_definition.expectation_count"
+            ]
+            == 2
+        )
+        for name in ("gx.batch_loading", "gx.metric_computation"):
+            (span,) = _by_name(spans, name)
+            assert _parent(spans, span) is validation_definition
+
+        (metric_computation,) = _by_name(spans, "gx.metric_computation")
+        expectations = _by_name(spans, "gx.expectation")
+        assert all(_parent(spans, span) is metric_computation for span in expectations)
+        by_column = {
+            _attributes(span)["gx.expectation.column"]: span for span in expectations
+        }
+        assert _attributes(by_column["col_A"])["gx.expectation.success"] is True
+        assert _attributes(by_column["col_B"])["gx.expectation.success"] is False
+        assert _attributes(by_column["col_B"])["gx.expectation.unexpected_count"] == 1
+
+        (serialization,) = _by_name(spans, "gx.result_serialization")
+        assert _attributes(serialization)["gx.result.size_bytes"] > 0
+        assert _attributes(serialization)["gx.unsuccessful_expectations"] == 1
+
+    def test_checkpoint_operator_records_each_validation_definition(
+        self, span_exporter
+    ):
+        """Expect one validation definition span per validation definition in the checkpoint."""
+
+        # arrange
+        df = pd.DataFrame({"col_A": ["a", "b", "c"]})
+
+        def configure_checkpoint(context: AbstractDataContext) -> Checkpoint:
+            validation_definitions = [
+                context.validation_definitions.add(
+                    gx.ValidationDefinition(
+                        name=name,
+                        data=_add_batch_definition(context, name),
+                        suite=context.suites.add(
+                            gx.ExpectationSuite(
+                                name=name,
+                                expectations=[
+                                    gxe.ExpectColumnValuesToNotBeNull(column="col_A")
+                                ],
+                            )
+                        ),
+                    )
+                )
+                for name in ("first", "second")
+            ]
+            return context.checkpoints.add(
+                gx.Checkpoint(
+                    name="tracing checkpoint",
+                    validation_definitions=validation_definitions,
+                )
+            )
+
+        validate_checkpoint = GXValidateCheckpointOperator(
+            task_id="validate_checkpoint_tracing",
+            configure_checkpoint=configure_checkpoint,
+            batch_parameters={"dataframe": df},
+            tracing=True,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_checkpoint.execute(context=context)
+
+        # assert
+        spans = span_exporter.get_finished_spans()
+        validation_definitions = _by_name(spans, "gx.validation_definition")
+        assert sorted(
+            _attributes(span)["gx.validation_definition.name"]
+            for span in validation_definitions
+        ) == ["first", "second"]
+        assert len(_by_name(spans, "gx.expectation")) == 2
+        assert _by_name(spans, "gx.configure_checkpoint")
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import great_expectations as gx
+import pandas as pd
+import pytest
+from great_expectations import Checkpoint, ExpectationSuite, ValidationDefinition
+from great_expectations.checkpoint import UpdateDataDocsAction
+from great_expectations.expectations import ExpectColumnValuesToBeBetween
+
+from great_expectations_provider.common import unchanged_batches
+from great_expectations_provider.common.errors import (
+    GXTimeBudgetExceeded,
+    GXValidationFailed,
+)
+from great_expectations_provider.common.time_budget import TimeBudget
+from great_expectations_provider.common.unchanged_batches import (
+    SKIPPED_UNCHANGED_KEY,
+    UnchangedBatchSkipper,
+)
+from great_expectations_provider.operators.validate_batch import (
+    GXValidateBatchOperator,
+)
+from great_expectations_provider.operators.validate_checkpoint import (
+    GXValidateCheckpointOperator,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from airflow.utils.context import Context
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+MONTHLY_REGEX = r"yellow_tripdata_sample_(?P<year>\d{4})-(?P<month>\d{2})\.csv"
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for month in ("01", "02"):
+        pd.DataFrame({"passenger_count": [1, 2, 3]}).to_csv(
+            data_dir / f"yellow_tripdata_sample_2024-{month}.csv", index=False
+        )
+    return data_dir
+
+
+def touch(path: Path) -> None:
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def batch_definition(
+    context: AbstractDataContext, data_dir: Path, **reader_options
+) -> BatchDefinition:
+    asset = context.data_sources.add_pandas_filesystem(
+        "trips", base_directory=data_dir
+    ).add_csv_asset("yellow_tripdata", **reader_options)
+    return asset.add_batch_definition_monthly("monthly", regex=MONTHLY_REGEX)
+
+
+def expectation(max_value: int = 6) -> ExpectColumnValuesToBeBetween:
+    return ExpectColumnValuesToBeBetween(
+        column="passenger_count", min_value=0, max_value=max_value
+    )
+
+
+def batch_operator(
+    data_dir: Path,
+    fingerprint_dir: Path,
+    max_value: int = 6,
+    reader_options: dict | None = None,
+    **kwargs,
+) -> GXValidateBatchOperator:
+    return GXValidateBatchOperator(
+        task_id="validate_trips",
+        configure_batch_definition=lambda context: batch_definition(
+            context, data_dir, **(reader_options or {})
+        ),
+        configure_expectations=lambda context: expectation(max_value),
+        skip_unchanged=True,
+        skip_unchanged_dir=str(fingerprint_dir),
+        **kwargs,
+    )
+
+
+def pushed_result(mock_ti: Mock) -> dict:
+    return mock_ti.xcom_push.call_args[1]["value"]
+
+
+class TestGXValidateBatchOperatorSkipUnchanged:
+    def test_unchanged_file_is_not_read(
+        self, data_dir: Path, tmp_path: Path, mocker: MockerFixture
+    ):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+        first_result = pushed_result(mock_ti)
+        read_csv = mocker.spy(pd, "read_csv")
+
+        # act
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+
+        # assert
+        second_result = pushed_result(mock_ti)
+        read_csv.assert_not_called()
+        assert second_result[SKIPPED_UNCHANGED_KEY]["validated_at"]
+        assert second_result["statistics"] == first_result["statistics"]
+        assert SKIPPED_UNCHANGED_KEY not in first_result
+
+    def test_modified_file_is_validated(self, data_dir: Path, tmp_path: Path):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+        touch(data_dir / "yellow_tripdata_sample_2024-02.csv")
+
+        # act
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+
+        # assert
+        assert SKIPPED_UNCHANGED_KEY not in pushed_result(mock_ti)
+
+    def test_other_batch_of_the_asset_is_validated(
+        self, data_dir: Path, tmp_path: Path
+    ):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+
+        # act
+        batch_operator(
+            data_dir,
+            tmp_path / "fingerprints",
+            batch_parameters={"year": "2024", "month": "01"},
+        ).execute(context=context)
+
+        # assert
+        assert SKIPPED_UNCHANGED_KEY not in pushed_result(mock_ti)
+
+    def test_changed_reader_options_are_validated(self, data_dir: Path, tmp_path: Path):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+
+        # act
+        batch_operator(
+            data_dir, tmp_path / "fingerprints", reader_options={"sep": ","}
+        ).execute(context=context)
+
+        # assert
+        assert SKIPPED_UNCHANGED_KEY not in pushed_result(mock_ti)
+
+    def test_unsupported_gx_validates_unchanged_files(
+        self, data_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+        monkeypatch.setattr(unchanged_batches, "_supported", lambda: False)
+
+        # act
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+
+        # assert
+        assert SKIPPED_UNCHANGED_KEY not in pushed_result(mock_ti)
+
+    def test_changed_suite_is_validated(self, data_dir: Path, tmp_path: Path):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+
+        # act
+        with pytest.raises(GXValidationFailed):
+            batch_operator(data_dir, tmp_path / "fingerprints", max_value=2).execute(
+                context=context
+            )
+
+        # assert
+        assert SKIPPED_UNCHANGED_KEY not in pushed_result(mock_ti)
+
+    def test_failed_validation_is_not_skipped(self, data_dir: Path, tmp_path: Path):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        with pytest.raises(GXValidationFailed):
+            batch_operator(data_dir, tmp_path / "fingerprints", max_value=2).execute(
+                context=context
+            )
+
+        # act
+        with pytest.raises(GXValidationFailed):
+            batch_operator(data_dir, tmp_path / "fingerprints", max_value=2).execute(
+                context=context
+            )
+
+        # assert
+        assert SKIPPED_UNCHANGED_KEY not in pushed_result(mock_ti)
+
+    def test_time_budgeted_validation_is_not_skipped(
+        self, data_dir: Path, tmp_path: Path, mocker: MockerFixture
+    ):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        elapsed = mocker.patch.object(TimeBudget, "_elapsed", return_value=60.0)
+        with pytest.raises(GXTimeBudgetExceeded):
+            batch_operator(data_dir, tmp_path / "fingerprints", time_budget=30).execute(
+                context=context
+            )
+        elapsed.stop()
+
+        # act
+        batch_operator(data_dir, tmp_path / "fingerprints").execute(context=context)
+
+        # assert
+        assert SKIPPED_UNCHANGED_KEY not in pushed_result(mock_ti)
+        assert pushed_result(mock_ti)["statistics"]["evaluated_expectations"] == 1
+
+    def test_content_hash_skips_rewritten_file(self, data_dir: Path, tmp_path: Path):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        batch_operator(
+            data_dir, tmp_path / "fingerprints", skip_unchanged_content_hash=True
+        ).execute(context=context)
+        touch(data_dir / "yellow_tripdata_sample_2024-02.csv")
+
+        # act
+        batch_operator(
+            data_dir, tmp_path / "fingerprints", skip_unchanged_content_hash=True
+        ).execute(context=context)
+
+        # assert
+        assert SKIPPED_UNCHANGED_KEY in pushed_result(mock_ti)
+
+
+def checkpoint_operator(
+    data_dir: Path, fingerprint_dir: Path, actions: list | None = None
+) -> GXValidateCheckpointOperator:
+    def configure_checkpoint(context: AbstractDataContext) -> Checkpoint:
+        validation_definition = context.validation_definitions.add(
+            ValidationDefinition(
+                name="trips",
+                data=batch_definition(context, data_dir),
+                suite=context.suites.add(
+                    ExpectationSuite("trips", expectations=[expectation()])
+                ),
+            )
+        )
+        return context.checkpoints.add(
+            Checkpoint(
+                name="trips",
+                validation_definitions=[validation_definition],
+                actions=actions or [],
+            )
+        )
+
+    return GXValidateCheckpointOperator(
+        task_id="validate_trips",
+        configure_checkpoint=configure_checkpoint,
+        skip_unchanged=True,
+        skip_unchanged_dir=str(fingerprint_dir),
+    )
+
+
+class TestGXValidateCheckpointOperatorSkipUnchanged:
+    def test_unchanged_files_skip_the_checkpoint(
+        self, data_dir: Path, tmp_path: Path, mocker: MockerFixture
+    ):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        checkpoint_operator(data_dir, tmp_path / "fingerprints").execute(
+            context=context
+        )
+        run = mocker.spy(Checkpoint, "run")
+
+        # act
+        checkpoint_operator(data_dir, tmp_path / "fingerprints").execute(
+            context=context
+        )
+
+        # assert
+        run.assert_not_called()
+        assert pushed_result(mock_ti)["success"] is True
+        assert SKIPPED_UNCHANGED_KEY in pushed_result(mock_ti)
+
+    def test_checkpoint_with_actions_is_always_run(
+        self, data_dir: Path, tmp_path: Path, mocker: MockerFixture
+    ):
+        # arrange
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+        actions = [UpdateDataDocsAction(name="update_data_docs")]
+        checkpoint_operator(data_dir, tmp_path / "fingerprints", actions).execute(
+            context=context
+        )
+        run = mocker.spy(Checkpoint, "run")
+
+        # act
+        checkpoint_operator(data_dir, tmp_path / "fingerprints", actions).execute(
+            context=context
+        )
+
+        # assert
+        run.assert_called_once()
+        assert SKIPPED_UNCHANGED_KEY not in pushed_result(mock_ti)
+
+
+class TestUnchangedBatchSkipper:
+    def test_other_assets_are_not_fingerprinted(self):
+        batch_definition = Mock()
+
+        fingerprint = UnchangedBatchSkipper().fingerprint(
+            "dag", "validate", [(batch_definition, ExpectationSuite("suite"))], None
+        )
+
+        assert fingerprint is None
+
+    def test_disabled_skipper(self, data_dir: Path, tmp_path: Path):
+        skipper = UnchangedBatchSkipper(tmp_path, enabled=False)
+
+        assert skipper.fingerprint("dag", "validate", [], None) is None
+        assert skipper.lookup(None) is None
+
+    def test_same_task_of_other_dag_is_not_skipped(
+        self, data_dir: Path, tmp_path: Path
+    ):
+        # arrange
+        skipper = UnchangedBatchSkipper(tmp_path / "fingerprints")
+        context = gx.get_context(mode="ephemeral")
+        validations = [(batch_definition(context, data_dir), ExpectationSuite("suite"))]
+        skipper.store(
+            skipper.fingerprint("orders_dag", "validate", validations, None),
+            {"success": True},
+        )
+
+        # act
+        fingerprint = skipper.fingerprint("trips_dag", "validate", validations, None)
+
+        # assert
+        assert skipper.lookup(fingerprint) is None
+        assert skipper.lookup(
+            skipper.fingerprint("orders_dag", "validate", validations, None)
+        )
@@ -1,5 +1,7 @@
 import json
+import sqlite3
 import warnings
+from pathlib import Path
 from typing import TYPE_CHECKING, Literal
 from unittest.mock import Mock, create_autospec
 
@@ -9,10 +11,17 @@ from great_expectations import ExpectationSuite
 from great_expectations.core import ExpectationValidationResult
 from great_expectations.core.batch_definition import BatchDefinition
 from great_expectations.data_context import AbstractDataContext
-from great_expectations.expectations import ExpectColumnValuesToBeInSet
+from great_expectations.expectations import (
+    ExpectColumnValuesToBeBetween,
+    ExpectColumnValuesToBeInSet,
+    ExpectTableRowCountToEqual,
+)
 
 from great_expectations_provider.common.constants import USER_AGENT_STR
-from great_expectations_provider.common.errors import GXValidationFailed
+from great_expectations_provider.common.errors import (
+    GXStatementTimeout,
+    GXValidationFailed,
+)
 from great_expectations_provider.operators.validate_batch import GXValidateBatchOperator
 
 if TYPE_CHECKING:
@@ -571,3 +580,262 @@ class TestValidateBatchOperator:
                 configure_batch_definition=configure_ephemeral_batch_definition,
                 batch_parameters={"dataframe": pd.DataFrame()},
             )
+
+    def test_max_xcom_bytes_truncates_pushed_result(self):
+        """Expect that a result larger than max_xcom_bytes is trimmed before it is pushed."""
+
+        # arrange
+        def configure_ephemeral_batch_definition(
+            context: AbstractDataContext,
+        ) -> BatchDefinition:
+            return (
+                context.data_sources.add_pandas(name="test datasource")
+                .add_dataframe_asset("test asset")
+                .add_batch_definition_whole_dataframe("test batch def")
+            )
+
+        column_name = "col_A"
+        df = pd.DataFrame({column_name: [f"value_{i}" for i in range(500)]})
+
+        def configure_expectations(
+            context: AbstractDataContext,
+        ) -> ExpectColumnValuesToBeInSet:
+            return ExpectColumnValuesToBeInSet(column=column_name, value_set=["a"])
+
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_truncated",
+            configure_batch_definition=configure_ephemeral_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": df},
+            result_format="COMPLETE",
+            max_xcom_bytes=2000,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXValidationFailed) as exc_info:
+            validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert len(json.dumps(pushed_result)) <= 2000
+        assert pushed_result["xcom_truncation"]["dropped"]
+        assert pushed_result["expectations"][0]["result"]["unexpected_count"] == 500
+        assert exc_info.value.worst_unexpected_percent[0]["unexpected_percent"] == 100.0
+
+    def test_profile_writes_output(self, tmp_path):
+        """Expect that profile=True writes profiling output to profile_dir."""
+
+        # arrange
+        def configure_ephemeral_batch_definition(
+            context: AbstractDataContext,
+        ) -> BatchDefinition:
+            return (
+                context.data_sources.add_pandas(name="test datasource")
+                .add_dataframe_asset("test asset")
+                .add_batch_definition_whole_dataframe("test batch def")
+            )
+
+        column_name = "col_A"
+        df = pd.DataFrame({column_name: ["a", "b", "c"]})
+
+        def configure_expectations(
+            context: AbstractDataContext,
+        ) -> ExpectColumnValuesToBeInSet:
+            return ExpectColumnValuesToBeInSet(
+                column=column_name, value_set=["a", "b", "c"]
+            )
+
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_profiled",
+            configure_batch_definition=configure_ephemeral_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": df},
+            profile=True,
+            profile_dir=str(tmp_path),
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        assert list(tmp_path.glob("validate_batch_profiled-*.folded"))
+
+    def test_track_memory_pushes_memory_usage(self):
+        """Expect that track_memory=True pushes per-phase memory usage with the result."""
+
+        # arrange
+        def configure_ephemeral_batch_definition(
+            context: AbstractDataContext,
+        ) -> BatchDefinition:
+            return (
+                context.data_sources.add_pandas(name="test datasource")
+                .add_dataframe_asset("test asset")
+                .add_batch_definition_whole_dataframe("test batch def")
+            )
+
+        column_name = "col_A"
+        df = pd.DataFrame({column_name: ["a", "b", "c"]})
+
+        def configure_expectations(
+            context: AbstractDataContext,
+        ) -> ExpectColumnValuesToBeInSet:
+            return ExpectColumnValuesToBeInSet(
+                column=column_name, value_set=["a", "b", "c"]
+            )
+
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_memory",
+            configure_batch_definition=configure_ephemeral_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": df},
+            track_memory=True,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is True
+        json.dumps(pushed_result)  # result must be json serializable
+        assert set(pushed_result["memory_usage"]["phases"]) == {
+            "batch_loading",
+            "metric_computation",
+            "result_serialization",
+        }
+
+    def test_time_expectations_pushes_timing_table(self):
+        """Expect that time_expectations=True pushes per-expectation timings, slowest first."""
+
+        # arrange
+        def configure_ephemeral_batch_definition(
+            context: AbstractDataContext,
+        ) -> BatchDefinition:
+            return (
+                context.data_sources.add_pandas(name="test datasource")
+                .add_dataframe_asset("test asset")
+                .add_batch_definition_whole_dataframe("test batch def")
+            )
+
+        df = pd.DataFrame({"col_A": ["a", "b", "c"], "col_B": [1, 2, 3]})
+
+        def configure_expectations(context: AbstractDataContext) -> ExpectationSuite:
+            return ExpectationSuite(
+                name="test suite",
+                expectations=[
+                    ExpectColumnValuesToBeInSet(
+                        column="col_A", value_set=["a", "b", "c"]
+                    ),
+                    ExpectColumnValuesToBeInSet(column="col_B", value_set=[1, 2, 3]),
+                ],
+            )
+
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_timing",
+            configure_batch_definition=configure_ephemeral_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": df},
+            time_expectations=True,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        json.dumps(pushed_result)  # result must be json serializable
+        timings = pushed_result["expectation_timings"]
+        assert sorted(row["kwargs"]["column"] for row in timings["expectations"]) == [
+            "col_A",
+            "col_B",
+        ]
+        totals = [row["total_seconds"] for row in timings["expectations"]]
+        assert totals == sorted(totals, reverse=True)
+
+
+class TimingOutCursor(sqlite3.Cursor):
+    """A SQLite cursor failing queries of the `total` column as Postgres does at its statement timeout."""
+
+    def execute(self, sql, *args, **kwargs):  # type: ignore[override]
+        if "total" in sql:
+            raise sqlite3.OperationalError(
+                "canceling statement due to statement timeout"
+            )
+        return super().execute(sql, *args, **kwargs)
+
+
+class TimingOutConnection(sqlite3.Connection):
+    def cursor(self, *args, **kwargs):  # type: ignore[override]
+        return super().cursor(TimingOutCursor)
+
+
+class TestValidateBatchOperatorStatementTimeout:
+    def test_statement_timeout_is_a_distinct_failure(self, tmp_path: Path):
+        """Expect expectations whose query timed out to fail the task with GXStatementTimeout."""
+
+        # arrange
+        database = tmp_path / "warehouse.db"
+        with sqlite3.connect(database) as connection:
+            connection.execute("CREATE TABLE orders (id INTEGER, total INTEGER)")
+            connection.executemany(
+                "INSERT INTO orders VALUES (?, ?)", [(i, i) for i in range(10)]
+            )
+
+        def configure_batch_definition(context: AbstractDataContext) -> BatchDefinition:
+            datasource = context.data_sources.add_sql(
+                name="warehouse",
+                connection_string="sqlite://",
+                kwargs={  # type: ignore[call-arg]
+                    "creator": lambda: sqlite3.connect(
+                        database, factory=TimingOutConnection, check_same_thread=False
+                    )
+                },
+            )
+            asset = datasource.add_table_asset("orders", table_name="orders")
+            return asset.add_batch_definition_whole_table("orders")
+
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_orders",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=lambda context: ExpectationSuite(
+                name="orders",
+                expectations=[
+                    ExpectTableRowCountToEqual(value=10),
+                    ExpectColumnValuesToBeBetween(
+                        column="total", min_value=0, max_value=9
+                    ),
+                ],
+            ),
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXStatementTimeout) as error:
+            validate_batch.execute(context=context)
+
+        # assert
+        assert error.value.timed_out_expectations == [
+            {
+                "expectation_type": "expect_column_values_to_be_between",
+                "column": "total",
+            }
+        ]
+        assert "exceeding the statement timeout (1)" in str(error.value)
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        (timed_out,) = [
+            expectation
+            for expectation in pushed_result["expectations"]
+            if "exception_info" in expectation
+        ]
+        assert timed_out["exception_info"]["exception_message"] == (
+            "(sqlite3.OperationalError) canceling statement due to statement timeout"
+        )
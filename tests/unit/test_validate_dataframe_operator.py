@@ -483,6 +483,51 @@ class TestValidateDataFrameOperator:
                 configure_dataframe=configure_dataframe,
             )
 
+    def test_dataframe_is_configured_when_the_task_runs(self) -> None:
+        """Expect configure_dataframe to be called by execute, not when the DAG is parsed."""
+
+        # arrange
+        configure_dataframe = Mock(return_value=pd.DataFrame({"col": [1, 2, 3]}))
+        validate_df = GXValidateDataFrameOperator(
+            task_id="validate_df_configured_at_runtime",
+            configure_dataframe=configure_dataframe,
+            configure_expectations=lambda context: ExpectColumnValuesToBeInSet(
+                column="col", value_set=[1, 2, 3]
+            ),
+        )
+        configure_dataframe.assert_not_called()
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_df.execute(context=context)
+
+        # assert
+        configure_dataframe.assert_called_once_with()
+        assert mock_ti.xcom_push.call_args[1]["value"]["success"] is True
+
+    def test_deprecated_dataframe_attribute(self) -> None:
+        """Expect the deprecated 'dataframe' attribute to warn and map to configure_dataframe."""
+        # arrange
+        validate_df = GXValidateDataFrameOperator(
+            task_id="validate_df_deprecated_dataframe",
+            configure_dataframe=lambda: pd.DataFrame({"col": [1, 2, 3]}),
+            configure_expectations=lambda context: ExpectColumnValuesToBeInSet(
+                column="col", value_set=[1, 2, 3]
+            ),
+        )
+        replacement = pd.DataFrame({"col": [4]})
+
+        # act
+        with pytest.warns(DeprecationWarning, match="'dataframe' attribute"):
+            configured = validate_df.dataframe
+        with pytest.warns(DeprecationWarning, match="'dataframe' attribute"):
+            validate_df.dataframe = replacement
+
+        # assert
+        assert list(configured["col"]) == [1, 2, 3]
+        assert validate_df.configure_dataframe() is replacement
+
     @pytest.fixture
     def mock_gx_no_datasource(
         self,
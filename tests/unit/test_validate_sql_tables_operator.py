@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
+
+import pytest
+import sqlalchemy
+from great_expectations import ExpectationSuite, ValidationDefinition
+from great_expectations.data_context.store.validation_results_store import (
+    ValidationResultsStore,
+)
+from great_expectations.datasource.fluent import SQLDatasource
+from great_expectations.expectations import (
+    ExpectColumnValuesToBeBetween,
+    ExpectTableRowCountToEqual,
+)
+
+from great_expectations_provider.common.errors import GXValidationFailed
+from great_expectations_provider.common.external_connections import (
+    build_connection_string,
+)
+from great_expectations_provider.operators.validate_sql_tables import (
+    GXValidateSQLTablesOperator,
+    asset_name,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from airflow.utils.context import Context
+    from great_expectations.data_context import AbstractDataContext
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+TABLES = ("orders", "customers", "products")
+QUERY = "SELECT id FROM orders WHERE id < 5"
+
+
+@pytest.fixture
+def sqlite_conn(tmp_path: Path) -> Mock:
+    database = tmp_path / "warehouse.db"
+    with sqlite3.connect(database) as connection:
+        for table in TABLES:
+            connection.execute(f"CREATE TABLE {table} (id INTEGER)")
+            connection.executemany(
+                f"INSERT INTO {table} VALUES (?)", [(i,) for i in range(10)]
+            )
+    conn = Mock()
+    conn.conn_type = "sqlite"
+    conn.host = str(database)
+    conn.extra_dejson = {}
+    return conn
+
+
+def suite(name: str, max_id: int = 9) -> ExpectationSuite:
+    return ExpectationSuite(
+        name=name,
+        expectations=[
+            ExpectColumnValuesToBeBetween(column="id", min_value=0, max_value=max_id)
+        ],
+    )
+
+
+class TestValidateSQLTablesOperator:
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_tables_share_one_engine(
+        self, mock_get_connection: Mock, sqlite_conn: Mock, mocker: MockerFixture
+    ):
+        """Expect every table to be validated over a single SQLAlchemy engine, at most two at a time."""
+
+        # arrange
+        mock_get_connection.return_value = sqlite_conn
+        create_engine = mocker.spy(sqlalchemy, "create_engine")
+        threads = set()
+
+        def configure_tables(context: AbstractDataContext) -> dict:
+            return {table: suite(f"{table} suite") for table in TABLES}
+
+        validate_tables = GXValidateSQLTablesOperator(
+            task_id="validate_tables",
+            conn_id="warehouse",
+            configure_tables=configure_tables,
+            max_concurrency=2,
+        )
+        run = ValidationDefinition.run
+
+        def run_recording_thread(*args, **kwargs):
+            threads.add(threading.get_ident())
+            return run(*args, **kwargs)
+
+        mocker.patch.object(
+            ValidationDefinition, "run", autospec=True, side_effect=run_recording_thread
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_tables.execute(context=context)
+
+        # assert
+        create_engine.assert_called_once()
+        assert len(threads) <= 2
+        pushed = {
+            call.kwargs["key"]: call.kwargs["value"]
+            for call in mock_ti.xcom_push.call_args_list
+        }
+        assert pushed["return_value"] == {table: True for table in TABLES}
+        for table in TABLES:
+            assert pushed[table]["success"] is True
+            assert pushed[table]["statistics"]["evaluated_expectations"] == 1
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_failed_table_fails_task_after_all_tables(
+        self, mock_get_connection: Mock, sqlite_conn: Mock
+    ):
+        """Expect a failing query to fail the task, with the results of every table pushed."""
+
+        # arrange
+        mock_get_connection.return_value = sqlite_conn
+
+        def configure_tables(context: AbstractDataContext) -> dict:
+            return {
+                "orders": suite("orders suite"),
+                QUERY: ExpectationSuite(
+                    name="query suite",
+                    expectations=[ExpectTableRowCountToEqual(value=4)],
+                ),
+            }
+
+        validate_tables = GXValidateSQLTablesOperator(
+            task_id="validate_tables_failure",
+            conn_id="warehouse",
+            configure_tables=configure_tables,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXValidationFailed):
+            validate_tables.execute(context=context)
+
+        # assert
+        mock_ti.xcom_push.assert_called_with(
+            key="return_value", value={"orders": True, asset_name(QUERY): False}
+        )
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_table_error_is_raised_after_all_tables(
+        self, mock_get_connection: Mock, sqlite_conn: Mock, mocker: MockerFixture
+    ):
+        """Expect an error validating one table to be raised once the other tables' results are pushed."""
+
+        # arrange
+        mock_get_connection.return_value = sqlite_conn
+        run = ValidationDefinition.run
+
+        def run_failing_products(self, *args, **kwargs):
+            if self.name.endswith(".products"):
+                raise RuntimeError("products is unavailable")
+            return run(self, *args, **kwargs)
+
+        mocker.patch.object(
+            ValidationDefinition, "run", autospec=True, side_effect=run_failing_products
+        )
+        validate_tables = GXValidateSQLTablesOperator(
+            task_id="validate_tables_error",
+            conn_id="warehouse",
+            configure_tables=lambda context: {
+                table: suite(f"{table} suite") for table in TABLES
+            },
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(RuntimeError, match="products is unavailable"):
+            validate_tables.execute(context=context)
+
+        # assert
+        pushed = {
+            call.kwargs["key"]: call.kwargs["value"]
+            for call in mock_ti.xcom_push.call_args_list
+        }
+        assert pushed["orders"]["success"] is True
+        assert pushed["customers"]["success"] is True
+        assert "products" not in pushed
+        assert pushed["return_value"] == {
+            "orders": True,
+            "customers": True,
+            "products": False,
+        }
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_results_are_stored_one_at_a_time(
+        self, mock_get_connection: Mock, sqlite_conn: Mock, mocker: MockerFixture
+    ):
+        """Expect the validating threads to write their results to the store one at a time, and GX to be restored."""
+
+        # arrange
+        mock_get_connection.return_value = sqlite_conn
+        store_validation_results = ValidationResultsStore.store_validation_results
+        writing = []
+        overlapping = []
+
+        def slow_store_validation_results(*args, **kwargs):
+            writing.append(threading.get_ident())
+            overlapping.append(len(writing) > 1)
+            time.sleep(0.05)
+            writing.pop()
+            return store_validation_results(*args, **kwargs)
+
+        mocker.patch.object(
+            ValidationResultsStore,
+            "store_validation_results",
+            autospec=True,
+            side_effect=slow_store_validation_results,
+        )
+        get_execution_engine = SQLDatasource.get_execution_engine
+        validate_tables = GXValidateSQLTablesOperator(
+            task_id="validate_tables_store",
+            conn_id="warehouse",
+            configure_tables=lambda context: {
+                table: suite(f"{table} suite") for table in TABLES
+            },
+            max_concurrency=3,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_tables.execute(context=context)
+
+        # assert
+        assert overlapping == [False] * len(TABLES)
+        assert SQLDatasource.get_execution_engine is get_execution_engine
+
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_tables_named_like_other_xcom_keys_are_rejected(
+        self, mock_get_connection: Mock, sqlite_conn: Mock
+    ):
+        """Expect a table whose result would overwrite another XCom value to be rejected."""
+
+        # arrange
+        mock_get_connection.return_value = sqlite_conn
+        validate_tables = GXValidateSQLTablesOperator(
+            task_id="validate_tables_reserved",
+            conn_id="warehouse",
+            configure_tables=lambda context: {
+                "orders": suite("orders suite"),
+                "metric_cache": suite("metric cache suite"),
+            },
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act, assert
+        with pytest.raises(ValueError, match="SELECT \\* FROM metric_cache"):
+            validate_tables.execute(context=context)
+        mock_ti.xcom_push.assert_not_called()
+
+    def test_max_concurrency_must_be_positive(self):
+        """Expect a concurrency limit below one to be rejected."""
+
+        # arrange, act, assert
+        with pytest.raises(ValueError, match="must be at least 1"):
+            GXValidateSQLTablesOperator(
+                task_id="validate_tables_invalid",
+                conn_id="warehouse",
+                configure_tables=Mock(),
+                max_concurrency=0,
+            )
+
+
+class TestBuildConnectionString:
+    @patch(
+        "great_expectations_provider.common.external_connections.BaseHook.get_connection"
+    )
+    def test_unsupported_connection_type(self, mock_get_connection: Mock):
+        mock_get_connection.return_value = Mock(conn_type="http")
+
+        with pytest.raises(ValueError, match="Connection type 'http'"):
+            build_connection_string("test_conn")
@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+from great_expectations import Checkpoint, ExpectationSuite, ValidationDefinition
+from great_expectations.expectations import ExpectColumnValuesToBeInSet
+
+from great_expectations_provider.common import validation_service
+from great_expectations_provider.common.errors import (
+    GXValidationFailed,
+    GXValidationServiceError,
+)
+from great_expectations_provider.common.validation_service import (
+    CallableRef,
+    ValidationJob,
+    ValidationService,
+    submit_validation_job,
+)
+from great_expectations_provider.operators.validate_batch import GXValidateBatchOperator
+from great_expectations_provider.operators.validate_checkpoint import (
+    GXValidateCheckpointOperator,
+)
+
+if TYPE_CHECKING:
+    from airflow.utils.context import Context
+    from great_expectations.core.batch_definition import BatchDefinition
+    from great_expectations.data_context import AbstractDataContext
+    from pytest_mock import MockerFixture
+
+pytestmark = pytest.mark.unit
+
+
+def configure_batch_definition(context: AbstractDataContext) -> BatchDefinition:
+    return (
+        context.data_sources.add_pandas(name="test datasource")
+        .add_dataframe_asset("test asset")
+        .add_batch_definition_whole_dataframe("test batch def")
+    )
+
+
+def configure_expectations(context: AbstractDataContext) -> ExpectationSuite:
+    return ExpectationSuite(
+        name="test suite",
+        expectations=[
+            ExpectColumnValuesToBeInSet(column="col_A", value_set=["a", "b", "c"])
+        ],
+    )
+
+
+def configure_checkpoint(context: AbstractDataContext) -> Checkpoint:
+    validation_definition = context.validation_definitions.add(
+        ValidationDefinition(
+            name="test validation definition",
+            data=configure_batch_definition(context),
+            suite=context.suites.add(configure_expectations(context)),
+        )
+    )
+    return context.checkpoints.add(
+        Checkpoint(
+            name="test checkpoint", validation_definitions=[validation_definition]
+        )
+    )
+
+
+def configure_batch_definition_with_engines(
+    context: AbstractDataContext,
+) -> BatchDefinition:
+    import sqlalchemy
+
+    sqlalchemy.create_engine("postgresql://host/db")
+    sqlalchemy.create_engine("postgresql://host/db")
+    return configure_batch_definition(context)
+
+
+def configure_failing_batch_definition(context: AbstractDataContext) -> None:
+    raise ValueError("no such table")
+
+
+class UnpicklableError(Exception):
+    def __init__(self, code: int, detail: str) -> None:
+        super().__init__(f"{code}: {detail}")
+
+
+def configure_unpicklable_failure(context: AbstractDataContext) -> None:
+    raise UnpicklableError(42, "broken")
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> Iterator[ValidationService]:
+    service = ValidationService(socket_path=str(tmp_path / "gx.sock"))
+    thread = threading.Thread(target=service.serve_forever, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not Path(service.socket_path).exists():
+        assert time.monotonic() < deadline, "validation service did not start"
+        time.sleep(0.01)
+    yield service
+    service.shutdown()
+    thread.join()
+
+
+def _job(**fields) -> ValidationJob:
+    return ValidationJob(
+        kind="batch",
+        task_id="test_task",
+        context_type="ephemeral",
+        batch_parameters={"dataframe": pd.DataFrame({"col_A": ["a", "b", "c"]})},
+        configure_expectations=CallableRef.from_callable(configure_expectations),
+        **fields,
+    )
+
+
+class TestCallableRef:
+    def test_references_module_level_function(self):
+        ref = CallableRef.from_callable(configure_expectations)
+
+        assert ref is not None
+        assert ref.module == __name__
+        assert ref.qualname == "configure_expectations"
+        assert ref.path == __file__
+
+    def test_lambda_and_nested_functions_are_not_referenced(self):
+        def nested(context: AbstractDataContext) -> None:
+            pass
+
+        assert CallableRef.from_callable(lambda context: None) is None
+        assert CallableRef.from_callable(nested) is None
+
+    def test_resolves_dag_file_imported_under_generated_name(self, tmp_path: Path):
+        dag_file = tmp_path / "my_dag.py"
+        dag_file.write_text("def configure(context):\n    return 'configured'\n")
+        ref = CallableRef(
+            module="unusual_prefix_0123_my_dag",
+            qualname="configure",
+            path=str(dag_file),
+        )
+        service = ValidationService()
+
+        assert service.resolve(ref)(None) == "configured"
+        # the module is kept for later jobs
+        assert service.resolve(ref) is service.resolve(ref)
+
+    def test_changed_dag_file_replaces_its_module(self, tmp_path: Path):
+        dag_file = tmp_path / "my_dag.py"
+        dag_file.write_text("def configure(context):\n    return 'first'\n")
+        ref = CallableRef(
+            module="unusual_prefix_0123_my_dag",
+            qualname="configure",
+            path=str(dag_file),
+        )
+        service = ValidationService()
+        service.resolve(ref)
+
+        dag_file.write_text("def configure(context):\n    return 'second'\n")
+        later = os.path.getmtime(dag_file) + 1
+        os.utime(dag_file, (later, later))
+
+        assert service.resolve(ref)(None) == "second"
+        assert len(service._modules) == 1
+
+    def test_changed_module_is_reloaded(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        module_file = tmp_path / "gx_service_config.py"
+        module_file.write_text("def configure(context):\n    return 'first'\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "gx_service_config", raising=False)
+        ref = CallableRef(module="gx_service_config", qualname="configure")
+        service = ValidationService()
+        assert service.resolve(ref)(None) == "first"
+
+        module_file.write_text("def configure(context):\n    return 'second'\n")
+        later = os.path.getmtime(module_file) + 1
+        os.utime(module_file, (later, later))
+
+        assert service.resolve(ref)(None) == "second"
+
+
+class TestValidationService:
+    def test_submit_returns_result(self, service: ValidationService):
+        result = submit_validation_job(
+            service.socket_path,
+            _job(
+                configure_batch_definition=CallableRef.from_callable(
+                    configure_batch_definition
+                )
+            ),
+        )
+
+        assert result is not None
+        assert result["success"] is True
+        assert result["expectations"][0]["expectation_type"] == (
+            "expect_column_values_to_be_in_set"
+        )
+
+    def test_submit_without_service_returns_none(self, tmp_path: Path):
+        assert submit_validation_job(str(tmp_path / "missing.sock"), _job()) is None
+
+    def test_job_error_is_raised_in_caller(self, service: ValidationService):
+        with pytest.raises(ValueError, match="no such table"):
+            submit_validation_job(
+                service.socket_path,
+                _job(
+                    configure_batch_definition=CallableRef.from_callable(
+                        configure_failing_batch_definition
+                    )
+                ),
+            )
+
+    def test_unpicklable_job_error_is_described(self, service: ValidationService):
+        with pytest.raises(GXValidationServiceError) as exc_info:
+            submit_validation_job(
+                service.socket_path,
+                _job(
+                    configure_batch_definition=CallableRef.from_callable(
+                        configure_unpicklable_failure
+                    )
+                ),
+            )
+
+        assert "UnpicklableError: 42: broken" in str(exc_info.value)
+        assert exc_info.value.remote_traceback is not None
+
+    def test_engines_are_shared_except_sqlite(self):
+        service = ValidationService()
+        create_engine = Mock(side_effect=lambda *args, **kwargs: object())
+
+        postgres = service._create_engine(
+            create_engine, "postgresql://host/db", pool_size=5
+        )
+        postgres_again = service._create_engine(
+            create_engine, "postgresql://host/db", pool_size=5
+        )
+        other = service._create_engine(create_engine, "postgresql://host/db")
+        sqlite = service._create_engine(create_engine, "sqlite://")
+        sqlite_again = service._create_engine(create_engine, "sqlite://")
+
+        assert postgres is postgres_again
+        assert other is not postgres
+        assert sqlite is not sqlite_again
+
+    def test_engines_are_shared_only_within_jobs(
+        self, mocker: MockerFixture, monkeypatch: pytest.MonkeyPatch
+    ):
+        import sqlalchemy
+
+        create_engine = mocker.patch(
+            "sqlalchemy.create_engine", side_effect=lambda *args, **kwargs: object()
+        )
+        monkeypatch.setattr(validation_service, "_installed", False)
+        service = ValidationService()
+        service.share_engines()
+
+        service.run_job(
+            _job(
+                configure_batch_definition=CallableRef.from_callable(
+                    configure_batch_definition_with_engines
+                )
+            )
+        )
+        assert create_engine.call_count == 1
+
+        first = sqlalchemy.create_engine("postgresql://host/db")
+        second = sqlalchemy.create_engine("postgresql://host/db")
+        assert first is not second
+
+    def test_jobs_sharing_a_cloud_context_run_one_at_a_time(
+        self, mocker: MockerFixture
+    ):
+        gx_context = Mock()
+        mocker.patch(
+            "great_expectations_provider.common.gx_context_actions.load_data_context",
+            return_value=gx_context,
+        )
+        service = ValidationService()
+        job = ValidationJob(kind="batch", task_id="test_task", context_type="cloud")
+        used: list[object] = []
+
+        def use_context() -> None:
+            with service._data_context(job) as context:
+                used.append(context)
+
+        with service._data_context(job):
+            thread = threading.Thread(target=use_context, daemon=True)
+            thread.start()
+            thread.join(timeout=0.2)
+            # waits for the context while the first job uses it
+            assert thread.is_alive()
+            assert used == []
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert used == [gx_context]
+
+    def test_does_not_remove_the_socket_of_a_running_service(
+        self, service: ValidationService
+    ):
+        second = ValidationService(socket_path=service.socket_path)
+
+        with pytest.raises(GXValidationServiceError, match="Another validation"):
+            second.serve_forever()
+
+        job = _job(
+            configure_batch_definition=CallableRef.from_callable(
+                configure_batch_definition
+            )
+        )
+        assert submit_validation_job(service.socket_path, job) is not None
+
+    def test_replaces_a_stale_socket(self, tmp_path: Path):
+        socket_path = str(tmp_path / "gx.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        service = ValidationService(socket_path=socket_path)
+
+        service._remove_stale_socket()
+
+        assert not os.path.exists(socket_path)
+
+
+class TestOperatorsWithValidationService:
+    def test_batch_operator_runs_in_service(
+        self, service: ValidationService, mocker: MockerFixture
+    ):
+        """Expect the batch operator to send its job to the service and push the result."""
+
+        # arrange
+        run_job = mocker.spy(service, "run_job")
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_service",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": pd.DataFrame({"col_A": ["a", "b", "c"]})},
+            validation_socket=service.socket_path,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        run_job.assert_called_once()
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is True
+
+    def test_batch_operator_failure_in_service_raises(self, service: ValidationService):
+        """Expect a failed validation in the service to fail the task."""
+
+        # arrange
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_service_failure",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": pd.DataFrame({"col_A": ["a", "b", "z"]})},
+            validation_socket=service.socket_path,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        with pytest.raises(GXValidationFailed):
+            validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is False
+
+    def test_batch_operator_falls_back_without_service(self, tmp_path: Path):
+        """Expect the batch operator to validate in-process when no service is listening."""
+
+        # arrange
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_fallback",
+            configure_batch_definition=configure_batch_definition,
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": pd.DataFrame({"col_A": ["a", "b", "c"]})},
+            validation_socket=str(tmp_path / "missing.sock"),
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is True
+
+    def test_batch_operator_with_lambda_runs_in_process(
+        self, service: ValidationService, mocker: MockerFixture
+    ):
+        """Expect callables that cannot be imported by the service to run in-process."""
+
+        # arrange
+        run_job = mocker.spy(service, "run_job")
+        validate_batch = GXValidateBatchOperator(
+            task_id="validate_batch_lambda",
+            configure_batch_definition=lambda context: configure_batch_definition(
+                context
+            ),
+            configure_expectations=configure_expectations,
+            batch_parameters={"dataframe": pd.DataFrame({"col_A": ["a", "b", "c"]})},
+            validation_socket=service.socket_path,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_batch.execute(context=context)
+
+        # assert
+        run_job.assert_not_called()
+        assert mock_ti.xcom_push.call_args[1]["value"]["success"] is True
+
+    def test_checkpoint_operator_runs_in_service(
+        self, service: ValidationService, mocker: MockerFixture
+    ):
+        """Expect the checkpoint operator to send its job to the service and push the result."""
+
+        # arrange
+        run_job = mocker.spy(service, "run_job")
+        validate_checkpoint = GXValidateCheckpointOperator(
+            task_id="validate_checkpoint_service",
+            configure_checkpoint=configure_checkpoint,
+            batch_parameters={"dataframe": pd.DataFrame({"col_A": ["a", "b", "c"]})},
+            validation_socket=service.socket_path,
+        )
+        mock_ti = Mock()
+        context: Context = {"ti": mock_ti}  # type: ignore[typeddict-item]
+
+        # act
+        validate_checkpoint.execute(context=context)
+
+        # assert
+        run_job.assert_called_once()
+        pushed_result = mock_ti.xcom_push.call_args[1]["value"]
+        assert pushed_result["success"] is True
+        assert len(pushed_result["validation_results"]) == 1
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from great_expectations_provider.common.xcom import (
+    TRUNCATION_KEY,
+    truncate_result_for_xcom,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _expectation_result(size: int) -> dict:
+    return {
+        "expectation_type": "expect_column_values_to_be_in_set",
+        "success": False,
+        "kwargs": {"column": "col_A", "value_set": ["a"]},
+        "result": {
+            "element_count": size,
+            "unexpected_count": size,
+            "unexpected_percent": 100.0,
+            "partial_unexpected_list": ["x"] * 20,
+            "partial_unexpected_counts": [{"value": "x", "count": size}],
+            "partial_unexpected_index_list": list(range(20)),
+            "unexpected_list": ["x"] * size,
+            "unexpected_index_list": list(range(size)),
+            "unexpected_index_query": "df.filter(items=[...], axis=0)",
+        },
+    }
+
+
+class TestTruncateResultForXcom:
+    def test_no_limit_returns_input(self):
+        result = {"success": True, "expectations": [_expectation_result(1000)]}
+
+        assert truncate_result_for_xcom(result, None) is result
+
+    def test_small_result_is_untouched(self):
+        result = {"success": True, "expectations": [_expectation_result(3)]}
+
+        assert truncate_result_for_xcom(result, 100_000) is result
+
+    def test_row_samples_are_dropped_first(self):
+        result = {
+            "success": False,
+            "statistics": {"evaluated_expectations": 1},
+            "expectations": [_expectation_result(1000)],
+        }
+        full_size = len(json.dumps(result))
+
+        truncated = truncate_result_for_xcom(result, full_size - 100)
+
+        trimmed = truncated["expectations"][0]["result"]
+        assert "unexpected_list" not in trimmed
+        assert "unexpected_index_list" in trimmed
+        assert trimmed["unexpected_count"] == 1000
+        assert truncated["statistics"] == {"evaluated_expectations": 1}
+        assert truncated["expectations"][0]["success"] is False
+        assert truncated[TRUNCATION_KEY]["dropped"][0]["path"] == (
+            "expectations[0].result.unexpected_list"
+        )
+        assert len(json.dumps(truncated)) <= full_size - 100
+
+    def test_input_is_not_modified(self):
+        result = {"success": False, "expectations": [_expectation_result(1000)]}
+        original = json.dumps(result)
+
+        truncate_result_for_xcom(result, 500)
+
+        assert json.dumps(result) == original
+
+    def test_trims_to_statistics_and_records_drops(self):
+        result = {
+            "success": False,
+            "validation_results": [
+                {"success": False, "expectations": [_expectation_result(1000)]},
+                {"success": True, "expectations": [_expectation_result(10)]},
+            ],
+        }
+
+        truncated = truncate_result_for_xcom(result, 2500)
+
+        record = truncated[TRUNCATION_KEY]
+        assert record["within_limit"] is True
+        assert len(json.dumps(truncated)) <= 2500
+        assert record["estimated_bytes"] >= len(json.dumps(truncated))
+        trimmed = truncated["validation_results"][0]["expectations"][0]["result"]
+        assert trimmed["unexpected_percent"] == 100.0
+        assert not any(isinstance(value, list) for value in trimmed.values())
+        dropped_paths = {entry["path"] for entry in record["dropped"]}
+        assert (
+            "validation_results[0].expectations[0].result.unexpected_index_list"
+            in dropped_paths
+        )
+
+    def test_reports_when_limit_cannot_be_met(self):
+        result = {"success": False, "expectations": [_expectation_result(1000)]}
+
+        truncated = truncate_result_for_xcom(result, 10)
+
+        assert truncated[TRUNCATION_KEY]["within_limit"] is False
+        assert truncated["expectations"][0]["result"]["unexpected_count"] == 1000
+
+    def test_report_tables_are_dropped_after_row_samples_and_index_lists(self):
+        report = {
+            "total_seconds": 1.5,
+            "expectations": [{"expectation_type": "expect", "seconds": 0.1}] * 100,
+        }
+        result = {
+            "success": False,
+            "expectations": [_expectation_result(10)],
+            "expectation_timings": report,
+        }
+
+        truncated = truncate_result_for_xcom(
+            result, 2000, report_keys=["expectation_timings"]
+        )
+
+        assert truncated["expectation_timings"] == {"total_seconds": 1.5}
+        assert "expectations" in report
+        dropped_paths = [
+            entry["path"] for entry in truncated[TRUNCATION_KEY]["dropped"]
+        ]
+        # after the row samples and index lists, which are not enough here
+        assert dropped_paths[-1] == "expectation_timings.expectations"
+        assert truncated["expectations"][0]["result"]["unexpected_count"] == 10
+        assert len(json.dumps(truncated)) <= 2000